@@ -1,11 +1,18 @@
 """Database related helper functions."""
 
+from threading import Lock
+
 from neomodel import db
 
 from clinical_mdr_api.domains.versioned_object_aggregate import LibraryItemStatus
 from clinical_mdr_api.models.concepts.concept import VersionProperties
+from common.cache import cache_registry
 from common.telemetry import trace_calls
 
+# Built SoA tables, keyed by (study_uid, study_value_version, layout, time_unit, soa_tables_stamp)
+cache_store_soa_tables = cache_registry.register_ttl_cache("study.soa_tables")
+lock_store_soa_tables = Lock()
+
 
 @trace_calls
 def acquire_write_lock_study_value(uid: str) -> None:
@@ -24,6 +31,53 @@ def acquire_write_lock_study_value(uid: str) -> None:
     )
 
 
+def clear_soa_tables_cache(study_uid: str) -> None:
+    """
+    Drops the cached SoA tables of the latest version of a Study.
+    Must be called on any change of the Study activities, schedules, visits, epochs, SoA footnotes or SoA preferences.
+    Tables of locked Study versions are kept as those can't change anymore.
+
+    The Study root also gets a new `soa_tables_stamp`, which is part of the cache key.
+    It is written in the transaction of the change, so a table built from data read before the change is committed
+    is cached under the previous stamp, and is not found by the reads that follow the commit, in any process.
+    :param study_uid:
+    :return:
+    """
+    db.cypher_query(
+        """
+        MATCH (sr:StudyRoot {uid: $uid})
+        SET sr.soa_tables_stamp = randomUUID()
+        """,
+        {"uid": study_uid},
+    )
+
+    with lock_store_soa_tables:
+        for key in [
+            key
+            for key in cache_store_soa_tables
+            if key[0] == study_uid and key[1] is None
+        ]:
+            cache_store_soa_tables.pop(key, None)
+
+    cache_store_soa_tables.publish_invalidation()
+
+
+def get_soa_tables_stamp(study_uid: str) -> str | None:
+    """
+    Gets the stamp of the last committed change of the SoA content of a Study, see `clear_soa_tables_cache`.
+    :param study_uid:
+    :return:
+    """
+    rows, _ = db.cypher_query(
+        """
+        MATCH (sr:StudyRoot {uid: $uid})
+        RETURN sr.soa_tables_stamp
+        """,
+        {"uid": study_uid},
+    )
+    return rows[0][0] if rows else None
+
+
 # Helper to get the version properties of the latest version of a versioned item.
 def get_latest_version_properties(item) -> VersionProperties | None:
     latest = item.has_latest_value.get_or_none()
@@ -1,7 +1,7 @@
 from threading import Lock
 from typing import Collection
 
-from cachetools import TTLCache, cached
+from cachetools import cached
 from cachetools.keys import hashkey
 from neomodel import db
 
@@ -15,13 +15,13 @@ from clinical_mdr_api.domains.clinical_programmes.clinical_programme import (
     ClinicalProgrammeAR,
 )
 from clinical_mdr_api.repositories._utils import sb_clear_cache
-from common.config import settings
+from common.cache import cache_registry
 from common.exceptions import BusinessLogicException, NotFoundException
 
 
 class ClinicalProgrammeRepository:
-    cache_store_item_by_uid = TTLCache(
-        maxsize=settings.cache_max_size, ttl=settings.cache_ttl
+    cache_store_item_by_uid = cache_registry.register_ttl_cache(
+        "clinical_programme.item_by_uid"
     )
     lock_store_item_by_uid = Lock()
 
@@ -778,12 +778,7 @@ class ActivityRepository(ConceptGenericRepository[ActivityAR]):
 
         items = [get_db_result_as_dict(row, attributes_names) for row in result_array]
 
-        count_result, _ = db.cypher_query(
-            query=query.count_query, params=query.parameters
-        )
-        total_amount = (
-            count_result[0][0] if len(count_result) > 0 and total_count else 0
-        )
+        total_amount = query.execute_count()
 
         return items, total_amount
 
@@ -835,10 +830,9 @@ class ActivityRepository(ConceptGenericRepository[ActivityAR]):
         )
 
         query.parameters.update(filter_query_parameters)
-        query.full_query = query.build_header_query(
-            header_alias=field_name, page_size=page_size
+        result_array, _ = query.execute_header_query(
+            header_alias=field_name, page_size=page_size, cache=self.cache_store_headers
         )
-        result_array, _ = query.execute()
 
         return (
             format_generic_header_values(result_array[0][0])
@@ -270,6 +270,8 @@ class ConceptGenericRepository(
         sort_by: dict[str, bool] | None = None,
         page_number: int = 1,
         page_size: int = 0,
+        page_token: str | None = None,
+        total_count_mode: str | None = None,
         filter_by: dict[str, dict[str, Any]] | None = None,
         filter_operator: FilterOperator = FilterOperator.AND,
         total_count: bool = False,
@@ -287,6 +289,8 @@ class ConceptGenericRepository(
         :param sort_by:
         :param page_number:
         :param page_size:
+        :param page_token:
+        :param total_count_mode:
         :param filter_by:
         :param filter_operator:
         :param total_count:
@@ -316,6 +320,8 @@ class ConceptGenericRepository(
             sort_by=sort_by,
             page_number=page_number,
             page_size=page_size,
+            page_token=page_token,
+            total_count_mode=total_count_mode,
             filter_by=FilterDict.model_validate({"elements": filter_by}),
             filter_operator=filter_operator,
             total_count=total_count,
@@ -331,12 +337,7 @@ class ConceptGenericRepository(
             result_array, attributes_names
         )
 
-        count_result, _ = db.cypher_query(
-            query=query.count_query, params=query.parameters
-        )
-        total_amount = (
-            count_result[0][0] if len(count_result) > 0 and total_count else 0
-        )
+        total_amount = query.execute_count()
 
         return extracted_items, total_amount
 
@@ -420,10 +421,9 @@ class ConceptGenericRepository(
 
         query.parameters.update(filter_query_parameters)
 
-        query.full_query = query.build_header_query(
-            header_alias=field_name, page_size=page_size
+        result_array, _ = query.execute_header_query(
+            header_alias=field_name, page_size=page_size, cache=self.cache_store_headers
         )
-        result_array, _ = query.execute()
 
         return (
             format_generic_header_values(result_array[0][0])
@@ -591,10 +591,11 @@ class ConceptGenericRepository(
 
         query.parameters.update(filter_query_parameters)
 
-        query.full_query = query.build_header_query(
-            header_alias=field_name.replace(".", "_"), page_size=page_size
+        result_array, _ = query.execute_header_query(
+            header_alias=field_name.replace(".", "_"),
+            page_size=page_size,
+            cache=self.cache_store_headers,
         )
-        result_array, _ = query.execute()
 
         return (
             format_generic_header_values(result_array[0][0])
@@ -602,7 +603,7 @@ class ConceptGenericRepository(
             else []
         )
 
-    @sb_clear_cache(caches=["cache_store_item_by_uid"])
+    @sb_clear_cache(caches=["cache_store_item_by_uid", "cache_store_headers"])
     def save(self, item: _AggregateRootType) -> None:
         if item.uid is not None and item.repository_closure_data is None:
             self._create(item)
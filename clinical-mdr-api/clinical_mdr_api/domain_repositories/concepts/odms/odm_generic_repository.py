@@ -43,6 +43,8 @@ class OdmGenericRepository(ConceptGenericRepository[_AggregateRootType], ABC):
         sort_by: dict[str, bool] | None = None,
         page_number: int = 1,
         page_size: int = 0,
+        page_token: str | None = None,
+        total_count_mode: str | None = None,
         filter_by: dict[str, dict[str, Any]] | None = None,
         filter_operator: FilterOperator = FilterOperator.AND,
         total_count: bool = False,
@@ -61,6 +63,8 @@ class OdmGenericRepository(ConceptGenericRepository[_AggregateRootType], ABC):
         :param sort_by:
         :param page_number:
         :param page_size:
+        :param page_token:
+        :param total_count_mode:
         :param filter_by:
         :param filter_operator:
         :param total_count:
@@ -84,6 +88,8 @@ class OdmGenericRepository(ConceptGenericRepository[_AggregateRootType], ABC):
             sort_by=sort_by,
             page_number=page_number,
             page_size=page_size,
+            page_token=page_token,
+            total_count_mode=total_count_mode,
             filter_by=FilterDict.model_validate({"elements": filter_by}),
             filter_operator=filter_operator,
             total_count=total_count,
@@ -96,12 +102,7 @@ class OdmGenericRepository(ConceptGenericRepository[_AggregateRootType], ABC):
             result_array, attributes_names
         )
 
-        count_result, _ = db.cypher_query(
-            query=query.count_query, params=query.parameters
-        )
-        total_amount = (
-            count_result[0][0] if len(count_result) > 0 and total_count else 0
-        )
+        total_amount = query.execute_count()
 
         return extracted_items, total_amount
 
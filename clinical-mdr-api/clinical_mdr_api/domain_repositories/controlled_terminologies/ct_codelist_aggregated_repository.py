@@ -1,6 +1,7 @@
 from datetime import datetime
 from typing import Any
 
+from cachetools import TTLCache
 from neomodel import db
 
 from clinical_mdr_api.domain_repositories.controlled_terminologies.ct_get_all_query_utils import (
@@ -13,6 +14,10 @@ from clinical_mdr_api.domain_repositories.controlled_terminologies.ct_get_all_qu
 from clinical_mdr_api.domain_repositories.models._utils import (
     format_generic_header_values,
 )
+from clinical_mdr_api.domain_repositories.models.controlled_terminology import (
+    CTCodelistRoot,
+    CTTermRoot,
+)
 from clinical_mdr_api.domains.controlled_terminologies.ct_codelist_attributes import (
     CTCodelistAttributesAR,
     CTPairedCodelists,
@@ -30,6 +35,7 @@ from clinical_mdr_api.repositories._utils import (
     CypherQueryBuilder,
     FilterDict,
     FilterOperator,
+    get_headers_cache,
     validate_filters_and_add_search_string,
 )
 from common.exceptions import BusinessLogicException, ValidationException
@@ -122,6 +128,14 @@ class CTCodelistAggregatedRepository:
         {generic_final_alias_clause}
     """
 
+    @property
+    def cache_store_headers(self) -> TTLCache:
+        return get_headers_cache(CTCodelistRoot)
+
+    @property
+    def cache_store_term_headers(self) -> TTLCache:
+        return get_headers_cache(CTTermRoot)
+
     def _create_codelist_aggregate_instances_from_cypher_result(
         self, codelist_dict: dict[str, Any]
     ) -> tuple[CTCodelistNameAR, CTCodelistAttributesAR, CTPairedCodelists]:
@@ -155,6 +169,8 @@ class CTCodelistAggregatedRepository:
         sort_by: dict[str, bool] | None = None,
         page_number: int = 1,
         page_size: int = 0,
+        page_token: str | None = None,
+        total_count_mode: str | None = None,
         filter_by: dict[str, dict[str, Any]] | None = None,
         filter_operator: FilterOperator = FilterOperator.AND,
         total_count: bool = False,
@@ -176,6 +192,8 @@ class CTCodelistAggregatedRepository:
         :param sort_by:
         :param page_number:
         :param page_size:
+        :param page_token:
+        :param total_count_mode:
         :param filter_by:
         :param filter_operator:
         :param total_count:
@@ -210,11 +228,14 @@ class CTCodelistAggregatedRepository:
             sort_by=sort_by,
             page_number=page_number,
             page_size=page_size,
+            page_token=page_token,
+            total_count_mode=total_count_mode,
             filter_by=FilterDict.model_validate({"elements": filter_by}),
             filter_operator=filter_operator,
             total_count=total_count,
             wildcard_properties_list=list_codelist_wildcard_properties(),
             format_filter_sort_keys=format_codelist_filter_sort_keys,
+            cursor_tie_breaker="codelist_uid",
         )
 
         query.parameters.update(filter_query_parameters)
@@ -231,13 +252,7 @@ class CTCodelistAggregatedRepository:
                 )
             )
 
-        total = 0
-        if total_count:
-            count_result, _ = db.cypher_query(
-                query=query.count_query, params=query.parameters
-            )
-            if len(count_result) > 0:
-                total = count_result[0][0]
+        total = query.execute_count()
 
         return codelists_ars, total
 
@@ -302,14 +317,14 @@ class CTCodelistAggregatedRepository:
             format_filter_sort_keys=format_codelist_filter_sort_keys,
         )
 
-        query.full_query = query.build_header_query(
+        query.parameters.update(filter_query_parameters)
+
+        result_array, _ = query.execute_header_query(
             header_alias=format_codelist_filter_sort_keys(field_name),
             page_size=page_size,
+            cache=self.cache_store_headers,
         )
 
-        query.parameters.update(filter_query_parameters)
-        result_array, _ = query.execute()
-
         return (
             format_generic_header_values(result_array[0][0])
             if len(result_array) > 0
@@ -474,6 +489,8 @@ class CTCodelistAggregatedRepository:
         sort_by: dict[str, bool] | None = None,
         page_number: int = 1,
         page_size: int = 0,
+        page_token: str | None = None,
+        total_count_mode: str | None = None,
         filter_by: dict[str, dict[str, Any]] | None = None,
         filter_operator: FilterOperator = FilterOperator.AND,
         total_count: bool = False,
@@ -604,7 +621,11 @@ class CTCodelistAggregatedRepository:
             sort_by=sort_by,
             page_number=page_number,
             page_size=page_size,
+            page_token=page_token,
+            total_count_mode=total_count_mode,
             total_count=total_count,
+            # a term can be added to a codelist again after being removed
+            cursor_tie_breaker=["term_uid", "start_date"],
         )
         query.parameters.update({"codelist_uid": codelist_uid})
         if package:
@@ -629,13 +650,7 @@ class CTCodelistAggregatedRepository:
                 term_dictionary[attribute_name] = term_property
             codelist_term_ars.append(CTCodelistTermAR.from_result_dict(term_dictionary))
 
-        total = 0
-        if total_count:
-            count_result, _ = db.cypher_query(
-                query=query.count_query, params=query.parameters
-            )
-            if len(count_result) > 0:
-                total = count_result[0][0]
+        total = query.execute_count()
 
         return codelist_term_ars, total
 
@@ -774,13 +789,12 @@ class CTCodelistAggregatedRepository:
         if package:
             query.parameters.update({"package": package})
 
-        query.full_query = query.build_header_query(
+        result_array, _ = query.execute_header_query(
             header_alias=field_name,
             page_size=page_size,
+            cache=self.cache_store_term_headers,
         )
 
-        result_array, _ = query.execute()
-
         return (
             format_generic_header_values(result_array[0][0])
             if len(result_array) > 0
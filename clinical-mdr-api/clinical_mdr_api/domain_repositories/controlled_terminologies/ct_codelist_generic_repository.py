@@ -2,7 +2,7 @@ from abc import ABC, abstractmethod
 from datetime import datetime, timezone
 from typing import Any, Generic, Iterable, cast
 
-from cachetools import cached
+from cachetools import TTLCache, cached
 from cachetools.keys import hashkey
 from neomodel import db
 
@@ -51,6 +51,7 @@ from clinical_mdr_api.repositories._utils import (
     CypherQueryBuilder,
     FilterDict,
     FilterOperator,
+    get_headers_cache,
     sb_clear_cache,
     validate_filters_and_add_search_string,
 )
@@ -109,6 +110,15 @@ class CTCodelistGenericRepository(
         WITH * 
     """
 
+    @property
+    def cache_store_headers(self) -> TTLCache:
+        # Codelist names, attributes and aggregated codelists share the headers of the codelist root
+        return get_headers_cache(CTCodelistRoot)
+
+    @property
+    def cache_store_term_headers(self) -> TTLCache:
+        return get_headers_cache(CTTermRoot)
+
     def generate_uid(self) -> str:
         return CTCodelistRoot.get_next_free_uid_and_increment_counter()
 
@@ -164,6 +174,8 @@ class CTCodelistGenericRepository(
         sort_by: dict[str, bool] | None = None,
         page_number: int = 1,
         page_size: int = 0,
+        page_token: str | None = None,
+        total_count_mode: str | None = None,
         filter_by: dict[str, dict[str, Any]] | None = None,
         filter_operator: FilterOperator = FilterOperator.AND,
         total_count: bool = False,
@@ -182,6 +194,8 @@ class CTCodelistGenericRepository(
         :param sort_by:
         :param page_number:
         :param page_size:
+        :param page_token:
+        :param total_count_mode:
         :param filter_by:
         :param filter_operator:
         :param total_count:
@@ -216,11 +230,14 @@ class CTCodelistGenericRepository(
             sort_by=sort_by,
             page_number=page_number,
             page_size=page_size,
+            page_token=page_token,
+            total_count_mode=total_count_mode,
             filter_by=FilterDict.model_validate({"elements": filter_by}),
             filter_operator=filter_operator,
             total_count=total_count,
             return_model=_return_model,
             format_filter_sort_keys=format_codelist_filter_sort_keys,
+            cursor_tie_breaker="codelist_uid",
         )
         query.parameters.update(filter_query_parameters)
         result_array, attributes_names = query.execute()
@@ -228,13 +245,7 @@ class CTCodelistGenericRepository(
             result_array, attributes_names
         )
 
-        total = 0
-        if total_count:
-            count_result, _ = db.cypher_query(
-                query=query.count_query, params=query.parameters
-            )
-            if len(count_result) > 0:
-                total = count_result[0][0]
+        total = query.execute_count()
 
         return GenericFilteringReturn(items=extracted_items, total=total)
 
@@ -289,14 +300,14 @@ class CTCodelistGenericRepository(
             format_filter_sort_keys=format_codelist_filter_sort_keys,
         )
 
-        query.full_query = query.build_header_query(
+        query.parameters.update(filter_query_parameters)
+
+        result_array, _ = query.execute_header_query(
             header_alias=format_codelist_filter_sort_keys(field_name),
             page_size=page_size,
+            cache=self.cache_store_headers,
         )
 
-        query.parameters.update(filter_query_parameters)
-        result_array, _ = query.execute()
-
         return (
             format_generic_header_values(result_array[0][0])
             if len(result_array) > 0
@@ -406,7 +417,11 @@ class CTCodelistGenericRepository(
         return None
 
     @sb_clear_cache(
-        caches=["cache_store_item_by_uid", "cache_store_term_by_uid_and_submval"]
+        caches=[
+            "cache_store_item_by_uid",
+            "cache_store_term_by_uid_and_submval",
+            "cache_store_headers",
+        ]
     )
     def save(self, item: _AggregateRootType) -> None:
         if item.uid is not None and item.repository_closure_data is None:
@@ -429,7 +444,12 @@ class CTCodelistGenericRepository(
         return False
 
     @sb_clear_cache(
-        caches=["cache_store_item_by_uid", "cache_store_term_by_uid_and_submval"]
+        caches=[
+            "cache_store_item_by_uid",
+            "cache_store_term_by_uid_and_submval",
+            "cache_store_headers",
+            "cache_store_term_headers",
+        ]
     )
     def add_term(
         self,
@@ -534,7 +554,12 @@ class CTCodelistGenericRepository(
         TemplateParameterTermRoot.generate_node_uids_if_not_present()
 
     @sb_clear_cache(
-        caches=["cache_store_item_by_uid", "cache_store_term_by_uid_and_submval"]
+        caches=[
+            "cache_store_item_by_uid",
+            "cache_store_term_by_uid_and_submval",
+            "cache_store_headers",
+            "cache_store_term_headers",
+        ]
     )
     def remove_term(self, codelist_uid: str, term_uid: str, author_id: str) -> None:
         """
@@ -1,6 +1,7 @@
 from datetime import datetime
 from typing import Any
 
+from cachetools import TTLCache
 from neomodel import db
 
 from clinical_mdr_api.domain_repositories.controlled_terminologies.ct_get_all_query_utils import (
@@ -15,6 +16,9 @@ from clinical_mdr_api.domain_repositories.models._utils import (
     convert_to_datetime,
     format_generic_header_values,
 )
+from clinical_mdr_api.domain_repositories.models.controlled_terminology import (
+    CTTermRoot,
+)
 from clinical_mdr_api.domains.controlled_terminologies.ct_term_attributes import (
     CTTermAttributesAR,
 )
@@ -33,6 +37,7 @@ from clinical_mdr_api.repositories._utils import (
     CypherQueryBuilder,
     FilterDict,
     FilterOperator,
+    get_headers_cache,
     validate_filters_and_add_search_string,
 )
 from common.exceptions import ValidationException
@@ -80,6 +85,10 @@ class CTTermAggregatedRepository:
             } AS rel_data_name
     """
 
+    @property
+    def cache_store_headers(self) -> TTLCache:
+        return get_headers_cache(CTTermRoot)
+
     def generic_alias_clause(self, package: str | None = None) -> str:
         if package is not None:
             has_term_where = ""
@@ -220,6 +229,8 @@ class CTTermAggregatedRepository:
         sort_by: dict[str, bool] | None = None,
         page_number: int = 1,
         page_size: int = 0,
+        page_token: str | None = None,
+        total_count_mode: str | None = None,
         filter_by: dict[str, dict[str, Any]] | None = None,
         filter_operator: FilterOperator = FilterOperator.AND,
         total_count: bool = False,
@@ -268,6 +279,8 @@ class CTTermAggregatedRepository:
             implicit_sort_by="term_uid",
             page_number=page_number,
             page_size=page_size,
+            page_token=page_token,
+            total_count_mode=total_count_mode,
             filter_by=FilterDict.model_validate({"elements": filter_by}),
             filter_operator=filter_operator,
             total_count=total_count,
@@ -290,13 +303,7 @@ class CTTermAggregatedRepository:
                 )
             )
 
-        total = 0
-        if total_count:
-            count_result, _ = db.cypher_query(
-                query=query.count_query, params=query.parameters
-            )
-            if len(count_result) > 0:
-                total = count_result[0][0]
+        total = query.execute_count()
 
         return terms_ars, total
 
@@ -359,14 +366,14 @@ class CTTermAggregatedRepository:
             format_filter_sort_keys=format_term_filter_sort_keys,
             return_model=CTTermNameAndAttributes,
         )
-        query.full_query = query.build_header_query(
+        query.parameters.update(filter_query_parameters)
+
+        result_array, _ = query.execute_header_query(
             header_alias=format_term_filter_sort_keys(field_name),
             page_size=page_size,
+            cache=self.cache_store_headers,
         )
 
-        query.parameters.update(filter_query_parameters)
-        result_array, _ = query.execute()
-
         return (
             format_generic_header_values(result_array[0][0])
             if len(result_array) > 0
@@ -2,7 +2,7 @@ from abc import ABC, abstractmethod
 from datetime import datetime
 from typing import Any, Generic, cast
 
-from cachetools import cached
+from cachetools import TTLCache, cached
 from cachetools.keys import hashkey
 from neomodel import db
 
@@ -40,6 +40,7 @@ from clinical_mdr_api.repositories._utils import (
     CypherQueryBuilder,
     FilterDict,
     FilterOperator,
+    get_headers_cache,
     sb_clear_cache,
     validate_filters_and_add_search_string,
 )
@@ -105,6 +106,11 @@ class CTTermGenericRepository(
         WITH * 
         """
 
+    @property
+    def cache_store_headers(self) -> TTLCache:
+        # Term names, attributes and aggregated terms share the headers of the term root
+        return get_headers_cache(CTTermRoot)
+
     def generate_uid(self) -> str:
         return CTTermRoot.get_next_free_uid_and_increment_counter()
 
@@ -284,13 +290,7 @@ class CTTermGenericRepository(
             result_array, attributes_names
         )
 
-        total = 0
-        if total_count:
-            count_result, _ = db.cypher_query(
-                query=query.count_query, params=query.parameters
-            )
-            if len(count_result) > 0:
-                total = count_result[0][0]
+        total = query.execute_count()
 
         return GenericFilteringReturn(items=extracted_items, total=total)
 
@@ -345,14 +345,14 @@ class CTTermGenericRepository(
             format_filter_sort_keys=format_term_filter_sort_keys,
         )
 
-        query.full_query = query.build_header_query(
+        query.parameters.update(filter_query_parameters)
+
+        result_array, _ = query.execute_header_query(
             header_alias=format_term_filter_sort_keys(field_name),
             page_size=page_size,
+            cache=self.cache_store_headers,
         )
 
-        query.parameters.update(filter_query_parameters)
-        result_array, _ = query.execute()
-
         return (
             format_generic_header_values(result_array[0][0])
             if len(result_array) > 0
@@ -513,7 +513,11 @@ class CTTermGenericRepository(
         return None
 
     @sb_clear_cache(
-        caches=["cache_store_item_by_uid", "cache_store_term_by_uid_and_submval"]
+        caches=[
+            "cache_store_item_by_uid",
+            "cache_store_term_by_uid_and_submval",
+            "cache_store_headers",
+        ]
     )
     def save(self, item: _AggregateRootType) -> None:
         if item.uid is not None and item.repository_closure_data is None:
@@ -528,7 +532,11 @@ class CTTermGenericRepository(
         return True
 
     @sb_clear_cache(
-        caches=["cache_store_item_by_uid", "cache_store_term_by_uid_and_submval"]
+        caches=[
+            "cache_store_item_by_uid",
+            "cache_store_term_by_uid_and_submval",
+            "cache_store_headers",
+        ]
     )
     def add_parent(
         self, term_uid: str, parent_uid: str, relationship_type: TermParentType
@@ -567,7 +575,11 @@ class CTTermGenericRepository(
             ct_term_root_node.has_parent_subtype.connect(ct_term_root_parent_node)
 
     @sb_clear_cache(
-        caches=["cache_store_item_by_uid", "cache_store_term_by_uid_and_submval"]
+        caches=[
+            "cache_store_item_by_uid",
+            "cache_store_term_by_uid_and_submval",
+            "cache_store_headers",
+        ]
     )
     def remove_parent(
         self, term_uid: str, parent_uid: str, relationship_type: TermParentType
@@ -729,7 +741,11 @@ class CTTermGenericRepository(
         return match_clause, filter_query_parameters
 
     @sb_clear_cache(
-        caches=["cache_store_item_by_uid", "cache_store_term_by_uid_and_submval"]
+        caches=[
+            "cache_store_item_by_uid",
+            "cache_store_term_by_uid_and_submval",
+            "cache_store_headers",
+        ]
     )
     def update_term_codelist(
         self,
@@ -211,6 +211,8 @@ class DictionaryTermGenericRepository(
         filter_operator: FilterOperator = FilterOperator.AND,
         page_number: int = 1,
         page_size: int = 0,
+        page_token: str | None = None,
+        total_count_mode: str | None = None,
         total_count: bool = False,
         **_kwargs,
     ) -> tuple[list[DictionaryTermAR], int]:
@@ -225,6 +227,8 @@ class DictionaryTermGenericRepository(
         :param sort_by:
         :param page_number:
         :param page_size:
+        :param page_token:
+        :param total_count_mode:
         :param filter_by:
         :param filter_operator:
         :param total_count:
@@ -239,10 +243,13 @@ class DictionaryTermGenericRepository(
             sort_by=sort_by,
             page_number=page_number,
             page_size=page_size,
+            page_token=page_token,
+            total_count_mode=total_count_mode,
             filter_by=FilterDict.model_validate({"elements": filter_by}),
             filter_operator=filter_operator,
             total_count=total_count,
             return_model=DictionaryCodelist,
+            cursor_tie_breaker="term_uid",
         )
 
         query.parameters.update({"codelist_uid": codelist_uid})
@@ -251,12 +258,7 @@ class DictionaryTermGenericRepository(
             result_array, attributes_names
         )
 
-        count_result, _ = db.cypher_query(
-            query=query.count_query, params=query.parameters
-        )
-        total_amount = (
-            count_result[0][0] if len(count_result) > 0 and total_count else 0
-        )
+        total_amount = query.execute_count()
 
         return extracted_items, total_amount
 
@@ -309,10 +311,9 @@ class DictionaryTermGenericRepository(
         )
 
         query.parameters.update({"codelist_uid": codelist_uid})
-        query.full_query = query.build_header_query(
-            header_alias=field_name, page_size=page_size
+        result_array, _ = query.execute_header_query(
+            header_alias=field_name, page_size=page_size, cache=self.cache_store_headers
         )
-        result_array, _ = query.execute()
 
         return (
             format_generic_header_values(result_array[0][0])
@@ -330,7 +331,7 @@ class DictionaryTermGenericRepository(
         """
         return self.find_by_uid_2(uid=term_uid, for_update=for_update)
 
-    @sb_clear_cache(caches=["cache_store_item_by_uid"])
+    @sb_clear_cache(caches=["cache_store_item_by_uid", "cache_store_headers"])
     def save(self, item: DictionaryTermAR) -> None:
         if item.uid is not None and item.repository_closure_data is None:
             self._create(item)
@@ -1,7 +1,5 @@
 from typing import Any
 
-from neomodel import db
-
 from clinical_mdr_api.domain_repositories._generic_repository_interface import (
     _AggregateRootType,
 )
@@ -136,6 +134,8 @@ class DictionaryTermSubstanceRepository(DictionaryTermGenericRepository):
         filter_operator: FilterOperator = FilterOperator.AND,
         page_number: int = 1,
         page_size: int = 0,
+        page_token: str | None = None,
+        total_count_mode: str | None = None,
         total_count: bool = False,
         codelist_name: str | None = None,
     ) -> tuple[list[DictionaryTermSubstanceAR], int]:
@@ -150,6 +150,8 @@ class DictionaryTermSubstanceRepository(DictionaryTermGenericRepository):
         :param sort_by:
         :param page_number:
         :param page_size:
+        :param page_token:
+        :param total_count_mode:
         :param filter_by:
         :param filter_operator:
         :param total_count:
@@ -164,10 +166,13 @@ class DictionaryTermSubstanceRepository(DictionaryTermGenericRepository):
             sort_by=sort_by,
             page_number=page_number,
             page_size=page_size,
+            page_token=page_token,
+            total_count_mode=total_count_mode,
             filter_by=FilterDict.model_validate({"elements": filter_by}),
             filter_operator=filter_operator,
             total_count=total_count,
             return_model=DictionaryCodelist,
+            cursor_tie_breaker="term_uid",
         )
 
         query.parameters.update({"codelist_name": codelist_name})
@@ -176,12 +181,7 @@ class DictionaryTermSubstanceRepository(DictionaryTermGenericRepository):
             result_array, attributes_names
         )
 
-        count_result, _ = db.cypher_query(
-            query=query.count_query, params=query.parameters
-        )
-        total_amount = (
-            count_result[0][0] if len(count_result) > 0 and total_count else 0
-        )
+        total_amount = query.execute_count()
 
         return extracted_items, total_amount
 
@@ -12,8 +12,8 @@ from clinical_mdr_api.domain_repositories.models.generic import (
 from clinical_mdr_api.domain_repositories.models.study_audit_trail import StudyAction
 from clinical_mdr_api.domain_repositories.models.study_field import StudyField
 from clinical_mdr_api.domain_repositories.models.study_selections import StudySelection
-from clinical_mdr_api.repositories._utils import sb_clear_cache
-from common.config import settings
+from clinical_mdr_api.repositories._utils import get_headers_cache, sb_clear_cache
+from common.cache import cache_registry
 from common.exceptions import ValidationException
 
 
@@ -38,9 +38,7 @@ class RepositoryImpl:
     Results from a repository should be used to build aggregate root (AR) objects.
     """
 
-    cache_store_item_by_uid = TTLCache(
-        maxsize=settings.cache_max_size, ttl=settings.cache_ttl
-    )
+    cache_store_item_by_uid = cache_registry.register_ttl_cache("generic.item_by_uid")
 
     value_class: type
     root_class: type
@@ -49,6 +47,10 @@ class RepositoryImpl:
     def author_id(self) -> str | None:
         return self._author_id
 
+    @property
+    def cache_store_headers(self) -> TTLCache:
+        return get_headers_cache(self.root_class)
+
     def __init__(self, user: str | None = None):
         self._author_id = user
 
@@ -78,7 +80,7 @@ class RepositoryImpl:
             root_node.latest_retired,
         )
 
-    @sb_clear_cache(caches=["cache_store_item_by_uid"])
+    @sb_clear_cache(caches=["cache_store_item_by_uid", "cache_store_headers"])
     def _db_create_and_link_nodes(
         self,
         root: ClinicalMdrNode,
@@ -113,7 +115,7 @@ class RepositoryImpl:
             latest_final = self._db_create_relationship(latest_final, value)
         return root, value, latest_value, latest_draft, latest_final
 
-    @sb_clear_cache(caches=["cache_store_item_by_uid"])
+    @sb_clear_cache(caches=["cache_store_item_by_uid", "cache_store_headers"])
     def _db_save_node(self, node: ClinicalMdrNode) -> ClinicalMdrNode:
         """
         Saves a Neomodel node object in the graph.
@@ -123,7 +125,7 @@ class RepositoryImpl:
             node.save()
         return node
 
-    @sb_clear_cache(caches=["cache_store_item_by_uid"])
+    @sb_clear_cache(caches=["cache_store_item_by_uid", "cache_store_headers"])
     def _db_create_relationship(
         self,
         origin: RelationshipManager,
@@ -141,7 +143,7 @@ class RepositoryImpl:
             return origin.connect(destination, parameters)
         return origin.connect(destination)
 
-    @sb_clear_cache(caches=["cache_store_item_by_uid"])
+    @sb_clear_cache(caches=["cache_store_item_by_uid", "cache_store_headers"])
     def _db_remove_relationship(
         self, relationship: RelationshipManager, value: ClinicalMdrNode | None = None
     ):
@@ -5,7 +5,7 @@ from threading import Lock
 from typing import Any, Iterable, Literal, Mapping, TypeVar, overload
 
 import neo4j.time
-from cachetools import TTLCache, cached
+from cachetools import cached
 from cachetools.keys import hashkey
 from neomodel import (
     OUTGOING,
@@ -44,7 +44,7 @@ from clinical_mdr_api.repositories._utils import (
 )
 from clinical_mdr_api.services.user_info import UserInfoService
 from clinical_mdr_api.utils import convert_to_plain, validate_dict
-from common.config import settings
+from common.cache import cache_registry
 from common.exceptions import (
     BusinessLogicException,
     NotFoundException,
@@ -64,12 +64,12 @@ MATCH_NODE_BY_ID = "MATCH (node) WHERE elementId(node)=$id RETURN node"
 class LibraryItemRepositoryImplBase(
     RepositoryImpl, GenericRepository[_AggregateRootType], abc.ABC
 ):
-    cache_store_item_by_uid = TTLCache(
-        maxsize=settings.cache_max_size, ttl=settings.cache_ttl
+    cache_store_item_by_uid = cache_registry.register_ttl_cache(
+        "library_item.item_by_uid"
     )
     lock_store_item_by_uid = Lock()
-    cache_store_term_by_uid_and_submval = TTLCache(
-        maxsize=settings.cache_max_size, ttl=settings.cache_ttl
+    cache_store_term_by_uid_and_submval = cache_registry.register_ttl_cache(
+        "library_item.term_by_uid_and_submval"
     )
     lock_store_term_by_uid_and_submval = Lock()
     has_library = True
@@ -174,7 +174,7 @@ class LibraryItemRepositoryImplBase(
             itm.__WRITE_LOCK__ = None
             itm.save()
 
-    @sb_clear_cache(caches=["cache_store_item_by_uid"])
+    @sb_clear_cache(caches=["cache_store_item_by_uid", "cache_store_headers"])
     def _get_or_create_value(
         self, root: VersionRoot, ar: _AggregateRootType
     ) -> VersionValue:
@@ -332,7 +332,7 @@ class LibraryItemRepositoryImplBase(
             and new_status == LibraryItemStatus.DRAFT
         )
 
-    @sb_clear_cache(caches=["cache_store_item_by_uid"])
+    @sb_clear_cache(caches=["cache_store_item_by_uid", "cache_store_headers"])
     def _recreate_relationship(
         self,
         root: VersionRoot,
@@ -360,7 +360,7 @@ class LibraryItemRepositoryImplBase(
         has_version_rel.connect(value, parameters)
         self._db_create_relationship(relation, value)
 
-    @sb_clear_cache(caches=["cache_store_item_by_uid"])
+    @sb_clear_cache(caches=["cache_store_item_by_uid", "cache_store_headers"])
     def _close_previous_versions(
         self,
         root: VersionRoot,
@@ -455,57 +455,100 @@ class LibraryItemRepositoryImplBase(
     ) -> Iterable[_AggregateRootType]:
         """
         GetAll implementation - gets all objects. Ignores versions.
-        """
-        aggregates = []
-        items = []
-        if status is None:
-            items = self.root_class.nodes.order_by("-uid")
-        elif status == LibraryItemStatus.FINAL:
-            items = self.root_class.nodes.has(latest_final=True)
-        elif status == LibraryItemStatus.DRAFT:
-            items = self.root_class.nodes.has(latest_draft=True)
-        elif status == LibraryItemStatus.RETIRED:
-            items = self.root_class.nodes.has(latest_retired=True)
-
-        for item in items:
-            root: VersionRoot = item
-            library: Library = root.has_library.get_or_none()
-            (
-                _,
-                has_latest_value_rel,
-                latest_draft_rel,
-                latest_final_rel,
-                latest_retired_rel,
-            ) = self._get_version_relation_keys(root)
 
-            if library and library_name is not None and library_name != library.name:
-                continue
-
-            value: VersionValue
-            if status is None:
-                value = has_latest_value_rel.single()
-            elif status == LibraryItemStatus.FINAL:
-                value = latest_final_rel.single()
-            elif status == LibraryItemStatus.DRAFT:
-                value = latest_draft_rel.single()
-            elif status == LibraryItemStatus.RETIRED:
-                value = latest_retired_rel.single()
+        Roots, libraries, latest values, version relationships and study counts of all items
+        are fetched in a single query, see `_find_all_query`.
+        """
+        count_studies_in_query = (
+            return_study_count and self._can_count_studies_in_query()
+        )
+        query = self._find_all_query(
+            status=status, return_study_count=count_studies_in_query
+        )
+        result, _ = db.cypher_query(
+            query, params={"library_name": library_name}, resolve_objects=True
+        )
 
-            relationship: VersionRelationship = self._get_latest_version(root, value)
+        aggregates = []
+        for root, library, value, relationships, study_count in result:
+            if return_study_count and not count_studies_in_query:
+                study_count = self._get_study_count(value)
 
-            ar = self._create_aggregate_root_instance_based_on_return_counts(
-                library=library,
+            ar = self._create_aggregate_root_instance_from_version_root_relationship_and_value(
                 root=root,
+                library=library,
+                relationship=self._get_latest_version_in(relationships),
                 value=value,
-                relationship=relationship,
-                return_instantiation_counts=False,
-                return_study_count=return_study_count,
+                study_count=study_count,
             )
 
             ar.repository_closure_data = RETRIEVED_READ_ONLY_MARK
             aggregates.append(ar)
         return aggregates
 
+    def _find_all_query(
+        self, status: LibraryItemStatus | None, return_study_count: bool
+    ) -> str:
+        """
+        Builds the query of `find_all`, returning one row per item with
+        root, library, value, list of HAS_VERSION relationships between root and value, and study count.
+
+        Relationship types come from the neomodel definitions of `root_class`,
+        so that overrides of `_get_version_relation_keys` are honoured.
+        """
+        (
+            has_version_rel,
+            has_latest_value_rel,
+            latest_draft_rel,
+            latest_final_rel,
+            latest_retired_rel,
+        ) = self._get_version_relation_keys(self.root_class)
+        latest_rel = {
+            None: has_latest_value_rel,
+            LibraryItemStatus.FINAL: latest_final_rel,
+            LibraryItemStatus.DRAFT: latest_draft_rel,
+            LibraryItemStatus.RETIRED: latest_retired_rel,
+        }[status]
+        library_rel_type = self.root_class.has_library.definition["relation_type"]
+
+        query = f"""
+            MATCH (root:{self.root_class.__name__})-[:{latest_rel.definition["relation_type"]}]->(value)
+            OPTIONAL MATCH (library:Library)-[:{library_rel_type}]->(root)
+            WITH root, value, library
+            WHERE $library_name IS NULL OR library IS NULL OR library.name = $library_name
+            MATCH (root)-[version_rel:{has_version_rel.definition["relation_type"]}]->(value)
+            WITH root, library, value, collect(version_rel) AS version_rels
+        """
+
+        if return_study_count:
+            query += f"""
+            CALL {{
+                WITH value
+                OPTIONAL MATCH (value)<-[:{self.value_class.STUDY_SELECTION_REL_LABEL}]-(:StudySelection)
+                    <-[:{self.value_class.STUDY_VALUE_REL_LABEL}]-(:StudyValue)<--(study_root:StudyRoot)
+                RETURN count(DISTINCT study_root) AS study_count
+            }}
+            RETURN root, library, value, version_rels, study_count
+            """
+        else:
+            query += "RETURN root, library, value, version_rels, 0 AS study_count"
+
+        if status is None:
+            query += " ORDER BY root.uid DESC"
+
+        return query
+
+    def _can_count_studies_in_query(self) -> bool:
+        # Study count can be computed by the `find_all` query unless the repository or value class
+        # count studies their own way, otherwise it falls back to `_get_study_count` per item
+        return (
+            type(self)._get_study_count
+            is LibraryItemRepositoryImplBase._get_study_count
+            and self.value_class.get_study_count is VersionValue.get_study_count
+            and bool(self.value_class.STUDY_SELECTION_REL_LABEL)
+            and bool(self.value_class.STUDY_VALUE_REL_LABEL)
+        )
+
     def _get_study_count(self, item: VersionValue) -> int:
         return item.get_study_count()
 
@@ -548,14 +591,18 @@ class LibraryItemRepositoryImplBase(
             _,
         ) = self._get_version_relation_keys(root)
         if status is None:
-            all_rels = has_version_rel.all_relationships(value)
-            if len(all_rels) == 0:
-                raise RuntimeError("No HAS_VERSION relationship was found")
-            highest_version = self._get_max_version(all_rels)
-            all_latest = [rel for rel in all_rels if rel.version == highest_version]
-            return self._find_latest_version_in(all_latest)
+            return self._get_latest_version_in(has_version_rel.all_relationships(value))
         return self._get_latest_version_for_status(root, value, status)
 
+    def _get_latest_version_in(
+        self, relationships: list[VersionRelationship]
+    ) -> VersionRelationship:
+        if len(relationships) == 0:
+            raise RuntimeError("No HAS_VERSION relationship was found")
+        highest_version = self._get_max_version(relationships)
+        all_latest = [rel for rel in relationships if rel.version == highest_version]
+        return self._find_latest_version_in(all_latest)
+
     def _get_max_version(self, relationships):
         all_versions = [rel.version for rel in relationships]
         highest_version = max(
@@ -1086,7 +1133,7 @@ class LibraryItemRepositoryImplBase(
             minor_version=int(minor),
         )
 
-    @sb_clear_cache(caches=["cache_store_item_by_uid"])
+    @sb_clear_cache(caches=["cache_store_item_by_uid", "cache_store_headers"])
     def save(self, item: _AggregateRootType) -> None:
         if item.repository_closure_data is RETRIEVED_READ_ONLY_MARK:
             raise NotImplementedError(
@@ -93,6 +93,32 @@ class ClinicalMdrNodeWithUID(ClinicalMdrNode):
         )
         return digits
 
+    @classmethod
+    def get_next_free_uids_and_increment_counter(cls, count: int) -> list[str]:
+        """
+        Reserves the next `count` free UIDs for a given object at once,
+        the same UIDs as `save` would assign to `count` new nodes one by one.
+        """
+        if count <= 0:
+            return []
+        object_name = cls.__name__.removesuffix("Root")
+
+        last_uid_number = db.cypher_query(
+            """
+        MERGE (m:Counter{{counterId:'{LABEL}Counter'}})
+        ON CREATE SET m:{LABEL}Counter, m.count=0
+        SET m.count = m.count + $count
+        RETURN toInteger(m.count)
+        """.format(
+                LABEL=object_name
+            ),
+            {"count": count},
+        )[0][0][0]
+        return [
+            f"{object_name}_{str(uid_number).zfill(settings.number_of_uid_digits)}"
+            for uid_number in range(last_uid_number - count + 1, last_uid_number + 1)
+        ]
+
     @classmethod
     def generate_node_uids_if_not_present(cls) -> None:
         """
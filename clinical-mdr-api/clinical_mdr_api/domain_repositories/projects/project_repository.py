@@ -1,7 +1,7 @@
 from threading import Lock
 from typing import Collection
 
-from cachetools import TTLCache, cached
+from cachetools import cached
 from cachetools.keys import hashkey
 from neomodel import db, exceptions
 
@@ -15,7 +15,7 @@ from clinical_mdr_api.domain_repositories.models.project import Project
 from clinical_mdr_api.domain_repositories.models.study import StudyRoot
 from clinical_mdr_api.domains.projects.project import ProjectAR
 from clinical_mdr_api.repositories._utils import sb_clear_cache
-from common.config import settings
+from common.cache import cache_registry
 from common.exceptions import (
     AlreadyExistsException,
     BusinessLogicException,
@@ -24,16 +24,14 @@ from common.exceptions import (
 
 
 class ProjectRepository:
-    cache_store_item_by_uid = TTLCache(
-        maxsize=settings.cache_max_size, ttl=settings.cache_ttl
-    )
+    cache_store_item_by_uid = cache_registry.register_ttl_cache("project.item_by_uid")
     lock_store_item_by_uid = Lock()
-    cache_store_item_by_study_uid = TTLCache(
-        maxsize=settings.cache_max_size, ttl=settings.cache_ttl
+    cache_store_item_by_study_uid = cache_registry.register_ttl_cache(
+        "project.item_by_study_uid"
     )
     lock_store_item_by_study_uid = Lock()
-    cache_store_item_by_project_number = TTLCache(
-        maxsize=settings.cache_max_size, ttl=settings.cache_ttl
+    cache_store_item_by_project_number = cache_registry.register_ttl_cache(
+        "project.item_by_project_number"
     )
     lock_store_item_by_project_number = Lock()
 
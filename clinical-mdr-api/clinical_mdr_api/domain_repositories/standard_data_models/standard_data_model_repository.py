@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
 from typing import Any
 
-from neomodel import db
+from cachetools import TTLCache
 
 from clinical_mdr_api.domain_repositories.concepts.utils import (
     list_concept_wildcard_properties,
@@ -14,6 +14,7 @@ from clinical_mdr_api.repositories._utils import (
     CypherQueryBuilder,
     FilterDict,
     FilterOperator,
+    get_headers_cache,
     validate_filters_and_add_search_string,
 )
 from common.exceptions import NotFoundException, ValidationException
@@ -24,6 +25,10 @@ class StandardDataModelRepository(ABC):
     value_class = type
     return_model: type
 
+    @property
+    def cache_store_headers(self) -> TTLCache:
+        return get_headers_cache(self.root_class)
+
     def _create_base_model_from_cypher_result(self, input_dict: dict[str, Any]):
         return self.return_model.from_repository_output(input_dict)
 
@@ -210,16 +215,7 @@ class StandardDataModelRepository(ABC):
             result_array, attributes_names
         )
 
-        count_result, _ = db.cypher_query(
-            query=query.count_query, params=query.parameters
-        )
-        if len(count_result) > 0 and total_count:
-            if query.union_match_clause:
-                total_amount = count_result[0][0] + count_result[1][0]
-            else:
-                total_amount = count_result[0][0]
-        else:
-            total_amount = 0
+        total_amount = query.execute_count()
 
         return extracted_items, total_amount
 
@@ -274,10 +270,9 @@ class StandardDataModelRepository(ABC):
         )
 
         query.parameters.update(filter_query_parameters)
-        query.full_query = query.build_header_query(
-            header_alias=field_name, page_size=page_size
+        result_array, _ = query.execute_header_query(
+            header_alias=field_name, page_size=page_size, cache=self.cache_store_headers
         )
-        result_array, _ = query.execute()
 
         return (
             format_generic_header_values(result_array[0][0])
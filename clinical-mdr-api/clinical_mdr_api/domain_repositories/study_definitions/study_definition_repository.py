@@ -1106,3 +1106,17 @@ return *
         Returns:
             bool: True if the study exists, False otherwise.
         """
+
+    @staticmethod
+    @abstractmethod
+    def get_locked_study_value_version(study_uid: str) -> str | None:
+        """
+        Returns the version of the study with the given study_uid if the study is locked,
+        that is if its latest value is its latest locked value.
+
+        Args:
+            study_uid (str): The unique identifier of the study.
+
+        Returns:
+            str | None: The version of the latest locked value, or None if the study is not locked.
+        """
@@ -12,6 +12,7 @@ from neomodel.sync_.match import Collect, Last
 from clinical_mdr_api import utils
 from clinical_mdr_api.domain_repositories._utils.helpers import (
     acquire_write_lock_study_value,
+    clear_soa_tables_cache,
 )
 from clinical_mdr_api.domain_repositories.controlled_terminologies.ct_codelist_attributes_repository import (
     CTCodelistAttributesRepository,
@@ -111,6 +112,54 @@ MAINTAIN_RELATIONSHIPS_FOR_NEW_STUDY_VALUE = {
     "has_study_visit",
 }
 
+# Properties of the metadata versions (current, released, draft and locked) kept in the StudySummary projection
+STUDY_SUMMARY_METADATA_FIELDS = (
+    "study_id",
+    "study_number",
+    "subpart_id",
+    "study_acronym",
+    "study_subpart_acronym",
+    "study_id_prefix",
+    "description",
+    "project_number",
+    "study_title",
+    "study_short_title",
+    "version_timestamp",
+    "version_number",
+    "version_author_id",
+)
+
+# Rebuilds the StudySummary of each study matched, following _build_snapshot_alias_clause.
+# The summary is merged on its unique uid and locked by setting its properties before its metadata is replaced,
+# so concurrent refreshes of a study are serialized and never leave two summaries or two sets of metadata.
+#
+# The summary is only derived from the study values, their text fields and the project number,
+# which all change through the save of the study: project numbers can't be changed,
+# and projects can't be edited while they are used by a study.
+# Data changed outside of the repository (like a data correction) must delete the summaries of the studies it changes,
+# such studies are listed from their live data until their next save.
+STUDY_SUMMARY_WRITE_CLAUSE = """
+MERGE (ss:StudySummary {uid: uid})
+MERGE (sr)-[:HAS_SUMMARY]->(ss)
+SET ss.study_status = study_status, ss.refreshed_at = datetime()
+WITH *
+CALL {
+    WITH ss
+    MATCH (ss)-[:HAS_METADATA]->(previous:StudySummaryMetadata)
+    DETACH DELETE previous
+}
+FOREACH (metadata IN [metadata IN [current_metadata] WHERE metadata IS NOT NULL] |
+    CREATE (ss)-[:HAS_METADATA {kind: 'current'}]->(node:StudySummaryMetadata) SET node = metadata)
+FOREACH (metadata IN [metadata IN [released_metadata] WHERE metadata IS NOT NULL] |
+    CREATE (ss)-[:HAS_METADATA {kind: 'released'}]->(node:StudySummaryMetadata) SET node = metadata)
+FOREACH (metadata IN [metadata IN [draft_metadata] WHERE metadata IS NOT NULL] |
+    CREATE (ss)-[:HAS_METADATA {kind: 'draft'}]->(node:StudySummaryMetadata) SET node = metadata)
+WITH ss, coalesce(locked_metadata_versions.locked_metadata_array, []) AS locked_metadata_array
+FOREACH (position IN range(0, size(locked_metadata_array) - 1) |
+    CREATE (ss)-[:HAS_METADATA {kind: 'locked', position: position}]->(node:StudySummaryMetadata)
+    SET node = locked_metadata_array[position])
+"""
+
 
 def _is_metadata_snapshot_and_status_equal_comparing_study_value_properties(
     current: StudyDefinitionSnapshot, previous: StudyDefinitionSnapshot
@@ -659,6 +708,7 @@ class StudyDefinitionRepositoryImpl(StudyDefinitionRepository, RepositoryImpl):
         self._maintain_study_soa_preferences_relationship_on_save(
             expected_latest_value=expected_latest_value, previous_value=previous_value
         )
+        self._refresh_study_summary(current_snapshot.uid)
 
     def _maintain_study_relationship_on_save(
         self,
@@ -1993,6 +2043,7 @@ class StudyDefinitionRepositoryImpl(StudyDefinitionRepository, RepositoryImpl):
             author_id=self.audit_info.author_id,
             date=date,
         )
+        self._refresh_study_summary(snapshot.uid)
 
     @staticmethod
     def _generate_study_value_audit_node(
@@ -2337,6 +2388,83 @@ MATCH (sr:StudyRoot)-[:LATEST]->(sv)
                     """
         return alias_clause
 
+    def _build_summary_match_clause(self) -> str:
+        """
+        Reads the metadata of the matched studies (sr, sv) from their StudySummary projection (ss),
+        with the same aliases as _build_snapshot_alias_clause.
+        Studies without a projection, whose data was changed outside of the repository since their last save,
+        are read from their live data instead.
+        """
+        metadata_projection = ", ".join(
+            f".{field}" for field in STUDY_SUMMARY_METADATA_FIELDS
+        )
+        return f"""
+CALL {{
+    WITH sr
+    MATCH (sr)-[:HAS_SUMMARY]->(ss:StudySummary)
+    RETURN
+        ss.uid AS uid,
+        ss.study_status AS study_status,
+        head([(ss)-[:HAS_METADATA {{kind: 'current'}}]->(m:StudySummaryMetadata)
+         | m{{{metadata_projection}}}]) AS current_metadata,
+        head([(ss)-[:HAS_METADATA {{kind: 'released'}}]->(m:StudySummaryMetadata)
+         | m{{{metadata_projection}}}]) AS released_metadata,
+        head([(ss)-[:HAS_METADATA {{kind: 'draft'}}]->(m:StudySummaryMetadata)
+         | m{{{metadata_projection}}}]) AS draft_metadata,
+        {{
+            locked_metadata_array: COLLECT {{
+                MATCH (ss)-[l:HAS_METADATA {{kind: 'locked'}}]->(m:StudySummaryMetadata)
+                RETURN m{{{metadata_projection}}}
+                ORDER BY l.position
+            }}
+        }} AS locked_metadata_versions
+    UNION ALL
+    WITH sr, sv
+    WITH sr, sv
+    WHERE NOT EXISTS((sr)-[:HAS_SUMMARY]->(:StudySummary))
+    WITH {self._build_snapshot_alias_clause()}
+    RETURN uid, study_status, current_metadata, released_metadata, draft_metadata, locked_metadata_versions
+}}
+"""
+
+    def _build_summary_alias_clause(self) -> str:
+        """
+        Aliases of the studies read by _build_summary_match_clause.
+        Subparts and links to study selections aren't part of the projection, as they change without saving the study.
+        """
+        return """
+                    sr, sv,
+                    uid,
+                    study_status,
+                    current_metadata,
+                    released_metadata,
+                    draft_metadata,
+                    locked_metadata_versions,
+                    head([(sv)<-[:HAS_STUDY_SUBPART]-(:StudyValue)<-[:LATEST]-(parent:StudyRoot) | parent.uid]) AS study_parent_part_uid,
+                    [(sv)-[:HAS_STUDY_SUBPART]->(:StudyValue)<-[:LATEST]-(sub:StudyRoot)
+                     | sub.uid] AS study_subpart_uids,
+                    exists((sv)-[:HAS_STUDY_FOOTNOTE]->()) AS has_study_footnote,
+                    exists((sv)-[:HAS_STUDY_OBJECTIVE]->()) AS has_study_objective,
+                    exists((sv)-[:HAS_STUDY_ENDPOINT]->()) AS has_study_endpoint,
+                    exists((sv)-[:HAS_STUDY_CRITERIA]->()) AS has_study_criteria,
+                    exists((sv)-[:HAS_STUDY_ACTIVITY]->()) AS has_study_activity,
+                    exists((sv)-[:HAS_STUDY_ACTIVITY_INSTRUCTION]->()) AS has_study_activity_instruction
+                    """
+
+    def _refresh_study_summary(self, study_uid: str) -> None:
+        """Rebuilds the StudySummary projection of the given study, see STUDY_SUMMARY_WRITE_CLAUSE"""
+        db.cypher_query(
+            " ".join(
+                [
+                    "MATCH (sr:StudyRoot {uid: $uid})-[:LATEST]->(sv:StudyValue)",
+                    "WITH",
+                    self._build_snapshot_alias_clause(),
+                    STUDY_SUMMARY_WRITE_CLAUSE,
+                ]
+            ),
+            {"uid": study_uid},
+        )
+
     def _update_snapshot_filter_by(
         self,
         filter_by: dict[str, dict[str, Any]],
@@ -2403,13 +2531,16 @@ MATCH (sr:StudyRoot)-[:LATEST]->(sv)
         # Specific filtering
         filter_query_parameters: dict[Any, Any] = {}
 
+        # Studies are listed from their StudySummary projection, maintained on save,
+        # which saves assembling the metadata of all versions of every study
         match_clause = self._build_snapshot_match_clause(
             study_selection_object_node_id,
             study_selection_object_node_type,
             filter_query_parameters,
             deleted,
         )
-        alias_clause = self._build_snapshot_alias_clause()
+        match_clause += self._build_summary_match_clause()
+        alias_clause = self._build_summary_alias_clause()
         filter_by = self._update_snapshot_filter_by(
             filter_by,
             has_study_footnote,
@@ -2445,16 +2576,7 @@ MATCH (sr:StudyRoot)-[:LATEST]->(sv)
                 study_dictionary[attribute_name] = study_property
             studies.append(study_dictionary)
 
-        if total_count:
-            count_result, _ = db.cypher_query(
-                query=query.count_query, params=query.parameters
-            )
-            if len(count_result) > 0:
-                total = count_result[0][0]
-            else:
-                total = 0
-        else:
-            total = 0
+        total = query.execute_count()
 
         return GenericFilteringReturn(
             items=self._retrieve_all_snapshots_from_cypher_query_result(
@@ -2596,16 +2718,7 @@ MATCH (sr:StudyRoot)-[:LATEST]->(sv)
             for study_property, attribute_name in zip(study, attributes_names):
                 study_dictionary[attribute_name] = study_property
             studies.append(study_dictionary)
-        if total_count:
-            count_result, _ = db.cypher_query(
-                query=query.count_query, params=query.parameters
-            )
-            if len(count_result) > 0:
-                total = count_result[0][0]
-            else:
-                total = 0
-        else:
-            total = 0
+        total = query.execute_count()
 
         return GenericFilteringReturn(
             items=self._retrieve_all_snapshots_from_cypher_query_result(studies),
@@ -2716,6 +2829,9 @@ MATCH (sr:StudyRoot)-[:LATEST]->(sv)
             author_id=self.audit_info.author_id,
             date=datetime.now(timezone.utc),
         )
+
+        clear_soa_tables_cache(study_uid)
+
         return self.get_preferred_time_unit(
             study_uid=study_uid, for_protocol_soa=for_protocol_soa
         )
@@ -2777,6 +2893,9 @@ MATCH (sr:StudyRoot)-[:LATEST]->(sv)
             author_id=self.audit_info.author_id,
             date=datetime.now(timezone.utc),
         )
+
+        clear_soa_tables_cache(study_uid)
+
         return self.get_preferred_time_unit(
             study_uid=study_uid, for_protocol_soa=for_protocol_soa
         )
@@ -2830,6 +2949,21 @@ MATCH (sr:StudyRoot)-[:LATEST]->(sv)
 
         return len(result) > 0 and len(result[0]) > 0
 
+    @staticmethod
+    def get_locked_study_value_version(study_uid: str) -> str | None:
+        result, _ = db.cypher_query(
+            """
+            MATCH (r:StudyRoot {uid: $uid})-[:LATEST_LOCKED]->(v:StudyValue)<-[:LATEST]-(r)
+            MATCH (r)-[hv:HAS_VERSION {status: 'LOCKED'}]->(v)
+            RETURN hv.version
+            ORDER BY hv.start_date DESC
+            LIMIT 1
+            """,
+            {"uid": study_uid},
+        )
+
+        return result[0][0] if result else None
+
     def get_latest_released_version_from_specific_datetime(
         self, study_uid: str, specified_datetime: str
     ) -> str | None:
@@ -3054,6 +3188,8 @@ MATCH (sr:StudyRoot)-[:LATEST]->(sv)
                 date=datetime.now(timezone.utc),
             )
 
+        clear_soa_tables_cache(study_uid)
+
         return self.get_soa_preferences(study_uid=study_uid)
 
     def edit_soa_preferences(
@@ -3092,4 +3228,6 @@ MATCH (sr:StudyRoot)-[:LATEST]->(sv)
                 date=datetime.now(timezone.utc),
             )
 
+        clear_soa_tables_cache(study_uid)
+
         return self.get_soa_preferences(study_uid=study_uid)
@@ -7,6 +7,7 @@ from neomodel import db
 from clinical_mdr_api import utils
 from clinical_mdr_api.domain_repositories._utils.helpers import (
     acquire_write_lock_study_value,
+    clear_soa_tables_cache,
 )
 from clinical_mdr_api.domain_repositories.models.study import StudyRoot, StudyValue
 from clinical_mdr_api.domain_repositories.models.study_audit_trail import (
@@ -394,6 +395,8 @@ class StudySelectionActivityBaseRepository(Generic[_AggregateRootType], abc.ABC)
                 False,
             )
 
+        clear_soa_tables_cache(study_selection.study_uid)
+
     @staticmethod
     def _set_before_audit_info(
         study_activity_selection_node: StudySelection,
@@ -1,9 +1,11 @@
+import datetime
 from dataclasses import dataclass
 from typing import Any
 
 from neomodel import db
 
 from clinical_mdr_api import utils
+from clinical_mdr_api.domain_repositories._utils.helpers import clear_soa_tables_cache
 from clinical_mdr_api.domain_repositories.models._utils import ListDistinct
 from clinical_mdr_api.domain_repositories.models.study import StudyValue
 from clinical_mdr_api.domain_repositories.models.study_selections import (
@@ -29,6 +31,17 @@ class SelectionHistory(base.SelectionHistory):
     study_activity_instance_uid: str | None
 
 
+@dataclass
+class StudyScheduleState:
+    """Study activities, study visits and schedules of the latest version of a study, for batch operations."""
+
+    # uids of the study activities, mapped to the uid of their study activity instance
+    study_activity_instance_uids: dict[str, str | None]
+    study_visit_uids: set[str]
+    # uids of the schedules, mapped to the uids of their study activity and study visit
+    schedules: dict[str, tuple[str, str]]
+
+
 class StudyActivityScheduleRepository(base.StudySelectionRepository):
 
     def _from_repository_values(
@@ -101,6 +114,8 @@ class StudyActivityScheduleRepository(base.StudySelectionRepository):
         schedule.study_visit.connect(study_visit_node)
         study_value_node.has_study_activity_schedule.connect(schedule)
 
+        clear_soa_tables_cache(selection_vo.study_uid)
+
         return schedule
 
     def find_schedule_for_study_visit_and_study_activity(
@@ -294,6 +309,141 @@ class StudyActivityScheduleRepository(base.StudySelectionRepository):
             )
         return result
 
+    def get_schedule_state(self, study_uid: str) -> StudyScheduleState:
+        """
+        Returns the study activities, study visits and schedules of the latest version of a study in a single query,
+        to validate a batch of schedule operations against them.
+        """
+        result, _ = db.cypher_query(
+            """
+            MATCH (:StudyRoot {uid: $study_uid})-[:LATEST]->(study_value:StudyValue)
+            CALL {
+                WITH study_value
+                MATCH (study_value)-[:HAS_STUDY_ACTIVITY]->(study_activity:StudyActivity)
+                OPTIONAL MATCH (study_activity)-[:STUDY_ACTIVITY_HAS_STUDY_ACTIVITY_INSTANCE]->(study_activity_instance:StudyActivityInstance)
+                WITH study_activity, head(collect(study_activity_instance.uid)) AS study_activity_instance_uid
+                RETURN collect([study_activity.uid, study_activity_instance_uid]) AS study_activities
+            }
+            CALL {
+                WITH study_value
+                MATCH (study_value)-[:HAS_STUDY_VISIT]->(study_visit:StudyVisit)
+                RETURN collect(study_visit.uid) AS study_visits
+            }
+            CALL {
+                WITH study_value
+                MATCH (study_value)-[:HAS_STUDY_ACTIVITY_SCHEDULE]->(schedule:StudyActivitySchedule)
+                MATCH (schedule)<-[:STUDY_ACTIVITY_HAS_SCHEDULE]-(study_activity:StudyActivity)
+                MATCH (schedule)<-[:STUDY_VISIT_HAS_SCHEDULE]-(study_visit:StudyVisit)
+                RETURN collect(DISTINCT [schedule.uid, study_activity.uid, study_visit.uid]) AS schedules
+            }
+            RETURN study_activities, study_visits, schedules
+            """,
+            {"study_uid": study_uid},
+        )
+        NotFoundException.raise_if(not result, "Study", study_uid)
+        study_activities, study_visits, schedules = result[0]
+        return StudyScheduleState(
+            study_activity_instance_uids=dict(study_activities),
+            study_visit_uids=set(study_visits),
+            schedules={
+                schedule_uid: (study_activity_uid, study_visit_uid)
+                for schedule_uid, study_activity_uid, study_visit_uid in schedules
+            },
+        )
+
+    def save_batch(
+        self,
+        study_uid: str,
+        created: list[StudyActivityScheduleVO],
+        deleted: list[StudyActivityScheduleVO],
+        author_id: str,
+    ) -> None:
+        """
+        Creates and deletes schedules of the latest version of a study with one query each,
+        with the same nodes and audit trail as `save` and `delete` of each schedule.
+        The created schedules get their uid and start date assigned.
+        """
+        date = datetime.datetime.now(datetime.timezone.utc)
+        if deleted:
+            result, _ = db.cypher_query(
+                """
+                MATCH (study_root:StudyRoot {uid: $study_uid})-[:LATEST]->(study_value:StudyValue)
+                UNWIND $schedules AS schedule
+                MATCH (study_value)-[has_schedule:HAS_STUDY_ACTIVITY_SCHEDULE]->(previous:StudyActivitySchedule {uid: schedule.uid})
+                MATCH (study_value)-[:HAS_STUDY_ACTIVITY]->(study_activity:StudyActivity {uid: schedule.study_activity_uid})
+                MATCH (study_value)-[:HAS_STUDY_VISIT]->(study_visit:StudyVisit {uid: schedule.study_visit_uid})
+                DELETE has_schedule
+                CREATE (new:StudyActivitySchedule:StudySelection {uid: schedule.uid})
+                CREATE (study_activity)-[:STUDY_ACTIVITY_HAS_SCHEDULE]->(new)
+                CREATE (study_visit)-[:STUDY_VISIT_HAS_SCHEDULE]->(new)
+                CREATE (study_root)-[:AUDIT_TRAIL]->(action:StudyAction:Delete {author_id: $author_id, date: $date})
+                CREATE (action)-[:BEFORE]->(previous)
+                CREATE (action)-[:AFTER]->(new)
+                RETURN count(new)
+                """,
+                {
+                    "study_uid": study_uid,
+                    "author_id": author_id,
+                    "date": date,
+                    "schedules": [
+                        {
+                            "uid": schedule.uid,
+                            "study_activity_uid": schedule.study_activity_uid,
+                            "study_visit_uid": schedule.study_visit_uid,
+                        }
+                        for schedule in deleted
+                    ],
+                },
+            )
+            BusinessLogicException.raise_if(
+                result[0][0] != len(deleted),
+                msg=f"Deleted {result[0][0]} out of {len(deleted)} study activity schedules in the Study with UID '{study_uid}'.",
+            )
+        if created:
+            for schedule, uid in zip(
+                created,
+                StudyActivitySchedule.get_next_free_uids_and_increment_counter(
+                    len(created)
+                ),
+            ):
+                schedule.uid = uid
+                schedule.start_date = date
+                schedule.author_id = author_id
+            result, _ = db.cypher_query(
+                """
+                MATCH (study_root:StudyRoot {uid: $study_uid})-[:LATEST]->(study_value:StudyValue)
+                UNWIND $schedules AS schedule
+                MATCH (study_value)-[:HAS_STUDY_ACTIVITY]->(study_activity:StudyActivity {uid: schedule.study_activity_uid})
+                MATCH (study_value)-[:HAS_STUDY_VISIT]->(study_visit:StudyVisit {uid: schedule.study_visit_uid})
+                CREATE (new:StudyActivitySchedule:StudySelection {uid: schedule.uid})
+                CREATE (study_activity)-[:STUDY_ACTIVITY_HAS_SCHEDULE]->(new)
+                CREATE (study_visit)-[:STUDY_VISIT_HAS_SCHEDULE]->(new)
+                CREATE (study_value)-[:HAS_STUDY_ACTIVITY_SCHEDULE]->(new)
+                CREATE (study_root)-[:AUDIT_TRAIL]->(action:StudyAction:Create {author_id: $author_id, date: $date})
+                CREATE (action)-[:AFTER]->(new)
+                RETURN count(new)
+                """,
+                {
+                    "study_uid": study_uid,
+                    "author_id": author_id,
+                    "date": date,
+                    "schedules": [
+                        {
+                            "uid": schedule.uid,
+                            "study_activity_uid": schedule.study_activity_uid,
+                            "study_visit_uid": schedule.study_visit_uid,
+                        }
+                        for schedule in created
+                    ],
+                },
+            )
+            BusinessLogicException.raise_if(
+                result[0][0] != len(created),
+                msg=f"Created {result[0][0]} out of {len(created)} study activity schedules in the Study with UID '{study_uid}'.",
+            )
+        if created or deleted:
+            clear_soa_tables_cache(study_uid)
+
     def close(self) -> None:
         # Our repository guidelines state that repos should have a close method
         # But nothing needs to be done in this one
@@ -54,6 +54,13 @@ class StudyDesignCellHistory:
 
 
 class StudyDesignCellRepository:
+    # Relationships from the StudyArm, StudyBranchArm, StudyEpoch and StudyElement of a StudyDesignCell
+    # that a reordered version keeps, all of them except the study value and the audit trail ones.
+    REORDERING_COPIED_RELATIONSHIPS = [
+        relationship.definition["relation_type"]
+        for name, relationship in StudyDesignCell.__all_relationships__
+        if name not in ("study_value", "has_before", "has_after")
+    ]
 
     def find_by_uid(self, study_uid: str, uid: str) -> StudyDesignCellVO:
         unique_design_cells = ListDistinct(
@@ -414,6 +421,61 @@ class StudyDesignCellRepository:
         # return the json response model
         return self._from_repository_values(design_cell_vo.study_uid, design_cell)
 
+    def save_reordered_design_cells(
+        self, study_uid: str, design_cells: list[StudyDesignCellVO], author_id: str
+    ):
+        """
+        Saves the design cells whose order changed, in a single write.
+
+        Each design cell gets a new version with an Edit action in the study audit trail, as with `save`.
+        The new version keeps the properties of the previous one except for the order,
+        and its relationships from the selections of the latest study value.
+
+        :param study_uid: uid of the study the design cells belong to
+        :param design_cells: StudyDesignCellVOs with their new order assigned
+        :param author_id: id of the user reordering the design cells
+        """
+        if not design_cells:
+            return
+        query = """
+            UNWIND $design_cells AS design_cell
+            MATCH (study_root:StudyRoot {uid: $study_uid})-[:LATEST]->(study_value:StudyValue)
+                -[has_design_cell:HAS_STUDY_DESIGN_CELL]->(previous:StudyDesignCell {uid: design_cell.uid})
+            CREATE (new:StudyDesignCell:StudySelection)
+            SET new = properties(previous), new.order = design_cell.order
+            CREATE (study_value)-[:HAS_STUDY_DESIGN_CELL]->(new)
+            DELETE has_design_cell
+            CREATE (study_root)-[:AUDIT_TRAIL]->(action:StudyAction:Edit {date: $date, author_id: $author_id})
+            CREATE (action)-[:BEFORE]->(previous)
+            CREATE (action)-[:AFTER]->(new)
+            WITH study_value, previous, new
+            CALL {
+                WITH study_value, previous, new
+                MATCH (study_value)-->(selection:StudySelection)-[rel]->(previous)
+                WHERE type(rel) IN $copied_relationships
+                CALL apoc.create.relationship(selection, type(rel), properties(rel), new) YIELD rel AS copied
+                RETURN count(copied) AS copied
+            }
+            RETURN count(new)
+            """
+        result, _ = db.cypher_query(
+            query=query,
+            params={
+                "study_uid": study_uid,
+                "date": datetime.datetime.now(datetime.timezone.utc),
+                "author_id": author_id,
+                "copied_relationships": self.REORDERING_COPIED_RELATIONSHIPS,
+                "design_cells": [
+                    {"uid": design_cell.uid, "order": design_cell.order}
+                    for design_cell in design_cells
+                ],
+            },
+        )
+        exceptions.ValidationException.raise_if(
+            result[0][0] != len(design_cells),
+            msg=f"Saved {result[0][0]} out of {len(design_cells)} reordered StudyDesignCells of Study '{study_uid}'.",
+        )
+
     def manage_versioning_update(
         self,
         study_root: StudyRoot,
@@ -6,6 +6,7 @@ from neomodel import db
 
 from clinical_mdr_api.domain_repositories._utils.helpers import (
     acquire_write_lock_study_value,
+    clear_soa_tables_cache,
 )
 from clinical_mdr_api.domain_repositories.controlled_terminologies.ct_codelist_attributes_repository import (
     CTCodelistAttributesRepository,
@@ -523,6 +524,8 @@ class StudyEpochRepository:
                 exclude_study_selection_relationships=[],
             )
 
+        clear_soa_tables_cache(item.study_uid)
+
         return item
 
     def manage_versioning_create(
@@ -5,6 +5,7 @@ from typing import Any
 from neomodel import db
 
 from clinical_mdr_api import utils
+from clinical_mdr_api.domain_repositories._utils.helpers import clear_soa_tables_cache
 from clinical_mdr_api.domain_repositories.models.study import StudyRoot
 from clinical_mdr_api.domain_repositories.models.study_audit_trail import (
     Create,
@@ -735,6 +736,8 @@ class StudySoAFootnoteRepository:
             # disconnect old StudyValue node to only keep StudyValue connection to the Latest value of StudySoAFootnote
             previous_item.study_value.disconnect(study_value)
 
+        clear_soa_tables_cache(soa_footnote_vo.study_uid)
+
     def get_all_versions_for_specific_footnote(
         self, uid: str, study_uid: str
     ) -> list[StudySoAFootnoteVOHistory]:
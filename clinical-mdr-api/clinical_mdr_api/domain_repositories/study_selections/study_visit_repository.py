@@ -2,10 +2,11 @@ import datetime
 from textwrap import dedent
 from typing import Any
 
-from neomodel import db
+from neomodel import OUTGOING, db
 
 from clinical_mdr_api.domain_repositories._utils.helpers import (
     acquire_write_lock_study_value,
+    clear_soa_tables_cache,
 )
 from clinical_mdr_api.domain_repositories.concepts.unit_definitions.unit_definition_repository import (
     UnitDefinitionRepository,
@@ -125,6 +126,17 @@ def get_valid_time_references_for_study(
 
 
 class StudyVisitRepository:
+    # Outgoing relationships of a StudyVisit that a renumbered version keeps as they are,
+    # all of them except the visit name, which changes, and the schedules, which are only kept
+    # when they belong to the latest study value, see `save_renumbered_visits`.
+    RENUMBERING_COPIED_RELATIONSHIPS = [
+        relationship.definition["relation_type"]
+        for _, relationship in StudyVisit.__all_relationships__
+        if relationship.definition["direction"] == OUTGOING
+        and relationship.definition["relation_type"]
+        not in ("HAS_VISIT_NAME", "STUDY_VISIT_HAS_SCHEDULE")
+    ]
+
     def __init__(self):
         self.author_id = user().id()
         unit_repository = UnitDefinitionRepository(self.author_id)
@@ -766,6 +778,106 @@ class StudyVisitRepository:
         action.has_after.connect(new_item)
         study_root.audit_trail.connect(action)
 
+    @staticmethod
+    def _study_visit_properties(study_visit: StudyVisitVO) -> dict[str, Any]:
+        return {
+            "uid": study_visit.uid,
+            "visit_number": study_visit.visit_number,
+            "visit_sublabel_reference": study_visit.visit_sublabel_reference,
+            "short_visit_label": study_visit.visit_short_name,
+            "unique_visit_number": study_visit.unique_visit_number,
+            "show_visit": study_visit.show_visit,
+            "visit_window_min": study_visit.visit_window_min,
+            "visit_window_max": study_visit.visit_window_max,
+            "description": study_visit.description,
+            "start_rule": study_visit.start_rule,
+            "end_rule": study_visit.end_rule,
+            "status": study_visit.status.name,
+            "visit_class": study_visit.visit_class.name,
+            "visit_subclass": (
+                study_visit.visit_subclass.name if study_visit.visit_subclass else None
+            ),
+            "is_global_anchor_visit": study_visit.is_global_anchor_visit,
+            "is_soa_milestone": study_visit.is_soa_milestone,
+        }
+
+    def save_renumbered_visits(self, study_uid: str, visits: list[StudyVisitVO]):
+        """
+        Saves the visits whose visit number and the properties derived from it changed, in a single write.
+
+        Each visit gets a new version with an Edit action in the study audit trail, as with `save`.
+        The new version keeps the relationships of the previous one, except for the visit name,
+        and the study epoch that is linked by its uid.
+
+        :param study_uid: uid of the study the visits belong to
+        :param visits: StudyVisitVOs with their visit number derived properties assigned
+        """
+        if not visits:
+            return
+        query = """
+            UNWIND $visits AS visit
+            MATCH (study_root:StudyRoot {uid: $study_uid})-[:LATEST]->(study_value:StudyValue)
+                -[has_study_visit:HAS_STUDY_VISIT]->(previous:StudyVisit {uid: visit.properties.uid})
+            MATCH (visit_name:VisitNameRoot {uid: visit.visit_name_uid})
+            MATCH (study_epoch:StudyEpoch {uid: visit.epoch_uid})<-[:AFTER]-(:StudyAction)
+            WHERE NOT (study_epoch)<-[:BEFORE]-(:StudyAction)
+            CREATE (new:StudyVisit:StudySelection)
+            SET new = visit.properties
+            CREATE (study_value)-[:HAS_STUDY_VISIT]->(new)
+            DELETE has_study_visit
+            CREATE (study_epoch)-[:STUDY_EPOCH_HAS_STUDY_VISIT]->(new)
+            CREATE (new)-[:HAS_VISIT_NAME]->(visit_name)
+            CREATE (study_root)-[:AUDIT_TRAIL]->(action:StudyAction:Edit {date: $date, status: visit.status, author_id: visit.author_id})
+            CREATE (action)-[:BEFORE]->(previous)
+            CREATE (action)-[:AFTER]->(new)
+            WITH study_value, previous, new
+            CALL {
+                WITH previous, new
+                MATCH (previous)-[rel]->(target)
+                WHERE type(rel) IN $copied_relationships
+                CALL apoc.create.relationship(new, type(rel), properties(rel), target) YIELD rel AS copied
+                RETURN count(copied) AS copied
+            }
+            CALL {
+                WITH study_value, previous, new
+                MATCH (previous)-[:STUDY_VISIT_HAS_SCHEDULE]->(schedule:StudyActivitySchedule)<-[:HAS_STUDY_ACTIVITY_SCHEDULE]-(study_value)
+                CREATE (new)-[:STUDY_VISIT_HAS_SCHEDULE]->(schedule)
+                RETURN count(schedule) AS schedules
+            }
+            CALL {
+                WITH study_value, previous, new
+                MATCH (previous)<-[:REFERENCES_STUDY_VISIT]-(footnote:StudySoAFootnote)<-[:HAS_STUDY_FOOTNOTE]-(study_value)
+                CREATE (new)<-[:REFERENCES_STUDY_VISIT]-(footnote)
+                RETURN count(footnote) AS footnotes
+            }
+            RETURN count(new)
+            """
+        result, _ = db.cypher_query(
+            query=query,
+            params={
+                "study_uid": study_uid,
+                "date": datetime.datetime.now(datetime.timezone.utc),
+                "copied_relationships": self.RENUMBERING_COPIED_RELATIONSHIPS,
+                "visits": [
+                    {
+                        "properties": StudyVisit.deflate(
+                            self._study_visit_properties(visit), skip_empty=True
+                        ),
+                        "visit_name_uid": visit.visit_name_sc.uid,
+                        "epoch_uid": visit.epoch_uid,
+                        "status": visit.status.value,
+                        "author_id": visit.author_id,
+                    }
+                    for visit in visits
+                ],
+            },
+        )
+        ValidationException.raise_if(
+            result[0][0] != len(visits),
+            msg=f"Saved {result[0][0]} out of {len(visits)} renumbered StudyVisits of Study '{study_uid}'.",
+        )
+        clear_soa_tables_cache(study_uid)
+
     def _update(self, study_visit: StudyVisitVO, create: bool = False):
         study_root: StudyRoot = StudyRoot.nodes.get(uid=study_visit.study_uid)
         study_value: StudyValue = study_root.latest_value.get_or_none()
@@ -775,26 +887,7 @@ class StudyVisitRepository:
         if not create:
             previous_item = study_value.has_study_visit.get(uid=study_visit.uid)
 
-        new_visit = StudyVisit(
-            uid=study_visit.uid,
-            visit_number=study_visit.visit_number,
-            visit_sublabel_reference=study_visit.visit_sublabel_reference,
-            short_visit_label=study_visit.visit_short_name,
-            unique_visit_number=study_visit.unique_visit_number,
-            show_visit=study_visit.show_visit,
-            visit_window_min=study_visit.visit_window_min,
-            visit_window_max=study_visit.visit_window_max,
-            description=study_visit.description,
-            start_rule=study_visit.start_rule,
-            end_rule=study_visit.end_rule,
-            status=study_visit.status.name,
-            visit_class=study_visit.visit_class.name,
-            visit_subclass=(
-                study_visit.visit_subclass.name if study_visit.visit_subclass else None
-            ),
-            is_global_anchor_visit=study_visit.is_global_anchor_visit,
-            is_soa_milestone=study_visit.is_soa_milestone,
-        )
+        new_visit = StudyVisit(**self._study_visit_properties(study_visit))
         if study_visit.uid:
             new_visit.uid = study_visit.uid
         new_visit.save()
@@ -944,4 +1037,6 @@ class StudyVisitRepository:
                 study_root=study_root, study_visit=study_visit, new_item=new_visit
             )
 
+        clear_soa_tables_cache(study_visit.study_uid)
+
         return study_visit
@@ -2,13 +2,16 @@
 import json
 from datetime import datetime
 
-from cachetools import TTLCache, cached
+from cachetools import cached
 from neomodel import db
 
 from clinical_mdr_api.domain_repositories.models.user import User as UserNode
 from clinical_mdr_api.models.user import UserInfo, UserInfoPatchInput
+from common.cache import cache_registry
 
-cache_get_user = TTLCache(maxsize=1000, ttl=10)
+cache_get_user = cache_registry.register_ttl_cache(
+    "user.get_user", maxsize=1000, ttl=10
+)
 
 
 class UserRepository:
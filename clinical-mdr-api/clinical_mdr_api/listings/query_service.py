@@ -14,6 +14,8 @@ from clinical_mdr_api.repositories._utils import (
 )
 from common.config import settings
 
+METADATA_FILE = os.path.join(os.path.dirname(__file__), "metadata.json")
+
 MATCH_SPECIFIC_STUDY_VERSION = """
     MATCH (sr:StudyRoot {uid: $study_uid})-[l:HAS_VERSION{status:'RELEASED', version:$study_value_version}]->(sv:StudyValue)
 """
@@ -23,9 +25,25 @@ MATCH_LATEST_STUDY = """
 """
 
 
+def _load_metadata_index() -> dict[str, list[dict[str, Any]]]:
+    """Loads metadata.json and indexes the columns by dataset_name, keeping the order of the file"""
+
+    with open(METADATA_FILE, "r", encoding="UTF-8") as metadata:
+        meta = json.load(metadata)
+
+    index: dict[str, list[dict[str, Any]]] = {}
+    for column in meta:
+        index.setdefault(column["dataset_name"], []).append(column)
+
+    return index
+
+
 class QueryService:
     """class holding the queries for the listing endpoints."""
 
+    # metadata.json is static, so it's loaded once when the module is imported
+    metadata_index: dict[str, list[dict[str, Any]]] = _load_metadata_index()
+
     @staticmethod
     def _filter_for_cdisc_ct(
         catalogue_name: str | None = None,
@@ -56,24 +74,23 @@ class QueryService:
         )
         return filter_statements, filter_query_parameters
 
-    def get_metadata(self, dataset_name) -> list[Any]:
-        """Get metadata for legacy (and other) datasets"""
+    def get_metadata_datasets(self, dataset_name: str | None) -> list[str]:
+        """Get names of the legacy datasets selected by comma separated dataset_name, all datasets if not specified"""
 
-        with open(
-            os.getcwd() + "/clinical_mdr_api/listings/metadata.json",
-            "r",
-            encoding="UTF-8",
-        ) as metadata:
-            meta = json.load(metadata)
+        if not dataset_name:
+            return list(self.metadata_index)
 
-        if dataset_name:
-            meta = [
-                x
-                for x in meta
-                if x["dataset_name"] in dataset_name.replace(" ", "").lower().split(",")
-            ]
+        requested = dataset_name.replace(" ", "").lower().split(",")
+        return [name for name in self.metadata_index if name in requested]
 
-        return meta
+    def get_metadata(self, dataset_name) -> list[Any]:
+        """Get metadata for legacy (and other) datasets"""
+
+        return [
+            column
+            for name in self.get_metadata_datasets(dataset_name)
+            for column in self.metadata_index[name]
+        ]
 
     def get_topic_codes(
         self,
@@ -81,6 +98,8 @@ class QueryService:
         sort_by: dict[str, bool] | None = None,
         page_number: int = 1,
         page_size: int = 0,
+        page_token: str | None = None,
+        total_count_mode: str | None = None,
         filter_by: dict[str, dict[str, Any]] | None = None,
         filter_operator: FilterOperator = FilterOperator.AND,
         total_count: bool = False,
@@ -144,9 +163,12 @@ class QueryService:
             sort_by=sort_by,
             page_number=page_number,
             page_size=page_size,
+            page_token=page_token,
+            total_count_mode=total_count_mode,
             filter_by=FilterDict.model_validate({"elements": filter_by}),
             filter_operator=filter_operator,
             total_count=total_count,
+            cursor_tie_breaker="topic_cd",
         )
 
         if at_specific_date:
@@ -156,13 +178,7 @@ class QueryService:
         res = (result_array, attributes_names)
         result = utils.db_result_to_list(res)
 
-        total = 0
-        if total_count:
-            count_result, _ = db.cypher_query(
-                query=query.count_query, params=query.parameters
-            )
-            if len(count_result) > 0:
-                total = count_result[0][0]
+        total = query.execute_count()
 
         return GenericFilteringReturn(items=result, total=total)
 
@@ -173,6 +189,8 @@ class QueryService:
         sort_by: dict[str, bool] | None = None,
         page_number: int = 1,
         page_size: int = 0,
+        page_token: str | None = None,
+        total_count_mode: str | None = None,
         filter_by: dict[str, dict[str, Any]] | None = None,
         filter_operator: FilterOperator = FilterOperator.AND,
         total_count: bool = False,
@@ -200,9 +218,12 @@ class QueryService:
             sort_by=sort_by,
             page_number=page_number,
             page_size=page_size,
+            page_token=page_token,
+            total_count_mode=total_count_mode,
             filter_by=FilterDict.model_validate({"elements": filter_by}),
             filter_operator=filter_operator,
             total_count=total_count,
+            cursor_tie_breaker="pkg_nm",
         )
 
         query.parameters.update(filter_query_parameters)
@@ -210,13 +231,7 @@ class QueryService:
         res = (result_array, attributes_names)
         result = utils.db_result_to_list(res)
 
-        total = 0
-        if total_count:
-            count_result, _ = db.cypher_query(
-                query=query.count_query, params=query.parameters
-            )
-            if len(count_result) > 0:
-                total = count_result[0][0]
+        total = query.execute_count()
 
         return GenericFilteringReturn(items=result, total=total)
 
@@ -227,6 +242,8 @@ class QueryService:
         sort_by: dict[str, bool] | None = None,
         page_number: int = 1,
         page_size: int = 0,
+        page_token: str | None = None,
+        total_count_mode: str | None = None,
         filter_by: dict[str, dict[str, Any]] | None = None,
         filter_operator: FilterOperator = FilterOperator.AND,
         total_count: bool = False,
@@ -252,9 +269,12 @@ class QueryService:
             sort_by=sort_by,
             page_number=page_number,
             page_size=page_size,
+            page_token=page_token,
+            total_count_mode=total_count_mode,
             filter_by=FilterDict.model_validate({"elements": filter_by}),
             filter_operator=filter_operator,
             total_count=total_count,
+            cursor_tie_breaker="pkg_nm",
         )
 
         query.parameters.update(filter_query_parameters)
@@ -263,13 +283,7 @@ class QueryService:
         res = (result_array, attributes_names)
         result = utils.db_result_to_list(res)
 
-        total = 0
-        if total_count:
-            count_result, _ = db.cypher_query(
-                query=query.count_query, params=query.parameters
-            )
-            if len(count_result) > 0:
-                total = count_result[0][0]
+        total = query.execute_count()
 
         return GenericFilteringReturn(items=result, total=total)
 
@@ -281,6 +295,8 @@ class QueryService:
         sort_by: dict[str, bool] | None = None,
         page_number: int = 1,
         page_size: int = 0,
+        page_token: str | None = None,
+        total_count_mode: str | None = None,
         filter_by: dict[str, dict[str, Any]] | None = None,
         filter_operator: FilterOperator = FilterOperator.AND,
         total_count: bool = False,
@@ -323,9 +339,12 @@ class QueryService:
             sort_by=sort_by,
             page_number=page_number,
             page_size=page_size,
+            page_token=page_token,
+            total_count_mode=total_count_mode,
             filter_by=FilterDict.model_validate({"elements": filter_by}),
             filter_operator=filter_operator,
             total_count=total_count,
+            cursor_tie_breaker=["pkg_nm", "ct_cd_list_cd"],
         )
 
         query.parameters.update(filter_query_parameters)
@@ -334,13 +353,7 @@ class QueryService:
         res = (result_array, attributes_names)
         result = utils.db_result_to_list(res)
 
-        total = 0
-        if total_count:
-            count_result, _ = db.cypher_query(
-                query=query.count_query, params=query.parameters
-            )
-            if len(count_result) > 0:
-                total = count_result[0][0]
+        total = query.execute_count()
 
         return GenericFilteringReturn(items=result, total=total)
 
@@ -352,6 +365,8 @@ class QueryService:
         sort_by: dict[str, bool] | None = None,
         page_number: int = 1,
         page_size: int = 0,
+        page_token: str | None = None,
+        total_count_mode: str | None = None,
         filter_by: dict[str, dict[str, Any]] | None = None,
         filter_operator: FilterOperator = FilterOperator.AND,
         total_count: bool = False,
@@ -392,9 +407,12 @@ class QueryService:
             sort_by=sort_by,
             page_number=page_number,
             page_size=page_size,
+            page_token=page_token,
+            total_count_mode=total_count_mode,
             filter_by=FilterDict.model_validate({"elements": filter_by}),
             filter_operator=filter_operator,
             total_count=total_count,
+            cursor_tie_breaker=["pkg_nm", "ct_cd_list_submval", "ct_cd"],
         )
 
         query.parameters.update(filter_query_parameters)
@@ -403,13 +421,7 @@ class QueryService:
         res = (result_array, attributes_names)
         result = utils.db_result_to_list(res)
 
-        total = 0
-        if total_count:
-            count_result, _ = db.cypher_query(
-                query=query.count_query, params=query.parameters
-            )
-            if len(count_result) > 0:
-                total = count_result[0][0]
+        total = query.execute_count()
 
         return GenericFilteringReturn(items=result, total=total)
 
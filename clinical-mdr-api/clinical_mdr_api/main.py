@@ -33,11 +33,19 @@ from starlette.middleware import Middleware
 from starlette_context.middleware import RawContextMiddleware
 
 from clinical_mdr_api.utils.api_version import get_api_version
+from clinical_mdr_api.utils.lazy_imports import import_deferred_modules
+from clinical_mdr_api.utils.pagination import (
+    NEXT_PAGE_TOKEN_HEADER_NAME,
+    TOTAL_COUNT_ACCURACY_HEADER_NAME,
+    PageTokenPlugin,
+    TotalCountModePlugin,
+)
 from common.auth.dependencies import security
 from common.auth.discovery import reconfigure_with_openid_discovery
 from common.exceptions import MDRApiBaseException
 from common.models.error import ErrorResponse
 from common.telemetry.request_metrics import patch_neomodel_database
+from common.telemetry.request_metrics_middleware import RequestMetricsMiddleware
 from common.telemetry.traceback_middleware import ExceptionTracebackMiddleware
 from common.telemetry.tracing_middleware import TracingMiddleware
 
@@ -58,7 +66,15 @@ if settings.gzip_response_min_size:
     )
 
 # Context middleware - must come before TracingMiddleware
-middlewares.append(Middleware(RawContextMiddleware))
+middlewares.append(
+    Middleware(
+        RawContextMiddleware, plugins=[PageTokenPlugin(), TotalCountModePlugin()]
+    )
+)
+
+# Request and Cypher query metrics, collected whether tracing is enabled or not
+middlewares.append(Middleware(RequestMetricsMiddleware))
+patch_neomodel_database()
 
 # Tracing middleware
 if settings.tracing_enabled:
@@ -94,8 +110,6 @@ if settings.tracing_enabled:
         )
     )
 
-    patch_neomodel_database()
-
 
 middlewares.append(
     Middleware(
@@ -104,7 +118,11 @@ middlewares.append(
         allow_credentials=settings.allow_credentials,
         allow_methods=settings.allow_methods,
         allow_headers=settings.allow_headers,
-        expose_headers=["traceresponse"],
+        expose_headers=[
+            "traceresponse",
+            NEXT_PAGE_TOKEN_HEADER_NAME,
+            TOTAL_COUNT_ACCURACY_HEADER_NAME,
+        ],
     )
 )
 
@@ -214,6 +232,9 @@ async def value_error_handler(request: Request, exception: ValueError):
 # pylint: disable=wrong-import-position,ungrouped-imports
 from clinical_mdr_api import routers
 
+if not settings.lazy_imports:
+    import_deferred_modules()
+
 # Include routers here
 app.include_router(routers.system_router, tags=["System"])
 
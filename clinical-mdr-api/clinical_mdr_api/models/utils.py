@@ -94,6 +94,8 @@ class BaseModel(PydanticBaseModel):
     model_config = ConfigDict(
         from_attributes=True,
         json_schema_extra=_json_schema_extra,
+        # validators and serializers are built on first use, see `clinical_mdr_api.utils.lazy_imports`
+        defer_build=settings.lazy_imports,
     )
 
     @classmethod
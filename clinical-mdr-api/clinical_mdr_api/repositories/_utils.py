@@ -1,10 +1,13 @@
 import functools
+import json
 import logging
 import re
 from datetime import datetime
 from enum import Enum
+from threading import Lock
 from typing import Annotated, Any, Callable, Generic
 
+from cachetools import Cache, TTLCache
 from dateutil.parser import isoparse
 from neo4j.exceptions import CypherSyntaxError
 from neomodel import Q, db
@@ -17,6 +20,17 @@ from clinical_mdr_api.models.concepts.activities.activity import (
 from clinical_mdr_api.models.concepts.concept import VersionProperties
 from clinical_mdr_api.models.controlled_terminologies.ct_term import SimpleTermModel
 from clinical_mdr_api.models.standard_data_models.sponsor_model import SponsorModelBase
+from clinical_mdr_api.utils.pagination import (
+    TotalCountMode,
+    decode_page_token,
+    encode_page_token,
+    parse_total_count_mode,
+    set_next_page_token,
+    set_total_count_accuracy,
+    sort_signature,
+)
+from common.cache import cache_registry, invalidate_cache
+from common.config import settings
 from common.exceptions import ValidationException
 from common.utils import (
     filter_sort_valid_keys_re,
@@ -30,6 +44,25 @@ nested_regex = re.compile(r"\.")
 
 log = logging.getLogger(__name__)
 
+# Total counts of listings requested with `total_count_mode=cached`,
+# keyed by the normalised count query and its parameters
+cache_store_total_count = cache_registry.register_ttl_cache(
+    "listing.total_count", ttl=settings.total_count_cache_ttl
+)
+lock_store_total_count = Lock()
+
+# Compiled filter and sort clauses of CypherQueryBuilder, keyed by the query shape.
+# The filter values are not part of the key, they are bound as query parameters.
+cache_store_filter_clause = cache_registry.register_lru_cache("listing.filter_clause")
+lock_store_filter_clause = Lock()
+cache_store_sort_expressions = cache_registry.register_lru_cache(
+    "listing.sort_expressions"
+)
+lock_store_sort_expressions = Lock()
+
+# Distinct header values of the `/headers` endpoints, one cache per root type, see `get_headers_cache`
+lock_store_headers = Lock()
+
 
 class ComparisonOperator(Enum):
     EQUALS = "eq"
@@ -109,10 +142,30 @@ def get_wildcard_filter(filter_elem, model: type[BaseModel]):
         The created wildcard filter.
     """
 
-    wildcard_filter = []
+    wildcard_filter = [
+        Q(**{f"{field_source}__icontains": filter_elem.v[0]})
+        for field_source in get_wildcard_field_sources(model=model)
+    ]
+    return functools.reduce(lambda filter1, filter2: filter1 | filter2, wildcard_filter)
+
+
+@functools.lru_cache(maxsize=None)
+def get_wildcard_field_sources(model: type[BaseModel]) -> tuple[str, ...]:
+    """
+    Returns the sources of all string properties of the model, also nested ones, searched by the wildcard filter.
+    Models are static, so the result is computed once per model.
+
+    Args:
+        model (type[BaseModel]): The model to search the string properties in.
+
+    Returns:
+        tuple[str, ...]: The neomodel field paths of the string properties.
+    """
+
+    field_sources: list[str] = []
+    model_sources = get_version_properties_sources()
     for name, field in model.model_fields.items():
         field_source = get_field_path(prop=name, field=field)
-        model_sources = get_version_properties_sources()
         jse = field.json_schema_extra or {}
         if not (
             field_source in model_sources
@@ -120,16 +173,14 @@ def get_wildcard_filter(filter_elem, model: type[BaseModel]):
             and not issubclass(model, SponsorModelBase)
         ) and not jse.get("remove_from_wildcard", False):
             if issubclass(get_field_type(field.annotation), BaseModel):
-                q_obj = get_wildcard_filter(
-                    filter_elem=filter_elem, model=get_field_type(field.annotation)
+                field_sources.extend(
+                    get_wildcard_field_sources(model=get_field_type(field.annotation))
                 )
-                wildcard_filter.append(q_obj)
             elif get_field_type(field.annotation) is str and name not in [
                 "possible_actions"
             ]:
-                q_obj = Q(**{f"{field_source}__icontains": filter_elem.v[0]})
-                wildcard_filter.append(q_obj)
-    return functools.reduce(lambda filter1, filter2: filter1 | filter2, wildcard_filter)
+                field_sources.append(field_source)
+    return tuple(field_sources)
 
 
 def get_embedded_field(fields: list[Any], model: type[BaseModel]):
@@ -369,6 +420,13 @@ def transform_filters_into_neomodel(
     return q_filters
 
 
+def _filter_value_kind(value: Any) -> Any:
+    """The part of a filter value that changes the generated filter clause : its type, and for strings whether it is a date."""
+    if isinstance(value, str):
+        return str, is_date(value)
+    return type(value)
+
+
 def is_date(string):
     try:
         # changing into isoparse instead of parse as
@@ -475,6 +533,16 @@ class CypherQueryBuilder:
         page_number : int, number of the page to return. 1-based (will be converted
             to 0-based for Cypher by class methods).
         page_size : int, number of results per page
+        page_token : str, opaque cursor returned by a previous call in the `X-Next-Page-Token` header.
+            When set (an empty string requests the first page), keyset pagination is used instead of
+            SKIP/LIMIT, so the cost of a page doesn't depend on how deep it is.
+            Only the builders given a token set the next page token of the response.
+        cursor_tie_breaker : alias that is unique per row, used as the last sort key in keyset pagination,
+            or a list of aliases that are unique together. The aliases of a list are concatenated,
+            each one wrapped in coalesce so that a null alias doesn't make the whole key null.
+            Defaults to implicit_sort_by, or `uid` if that is not set either.
+        total_count_mode : TotalCountMode or its value, how execute_count computes the total count.
+            Defaults to `exact`. Only validated when total_count is requested.
         filter_by : dict, keys are field names for filter_variable and values are
             objects describing the filtering to execute
             * v = list of values to filter against
@@ -496,6 +564,8 @@ class CypherQueryBuilder:
         count_query : Cypher query with match, filter clauses, and results count. See
             build_count_query method definition for more details.
         parameters : Parameters object to pass along with the cypher query.
+        total_count_value : int - Set by execute when the total count was computed
+            in the same round trip as the page (`inline` total count mode).
 
     Internal properties :
         filter_clause : str - Generated on class init ; adds filtering on aliases as
@@ -503,8 +573,13 @@ class CypherQueryBuilder:
         sort_clause : str - Generated on class init ; adds sorting on aliases as
             defined in the sort_by dictionary.
         pagination_clause : str - Generated on class init ; adds pagination.
+        cursor_clause : str - Generated on class init in keyset pagination mode ;
+            skips the rows up to and including the cursor position.
+        next_page_token : str - Set by execute in keyset pagination mode when a full page was returned.
     """
 
+    CURSOR_ALIAS = "_page_cursor"
+
     def __init__(
         self,
         match_clause: str,
@@ -520,6 +595,9 @@ class CypherQueryBuilder:
         wildcard_properties_list: list[str] | None = None,
         format_filter_sort_keys: Callable | None = None,
         union_match_clause: str | None = None,
+        page_token: str | None = None,
+        cursor_tie_breaker: str | list[str] | None = None,
+        total_count_mode: TotalCountMode | str | None = None,
     ):
         if wildcard_properties_list is None:
             wildcard_properties_list = []
@@ -537,9 +615,26 @@ class CypherQueryBuilder:
         self.return_model = return_model
         self.wildcard_properties_list = wildcard_properties_list
         self.format_filter_sort_keys = format_filter_sort_keys
+        self.page_token = page_token
+        if isinstance(cursor_tie_breaker, list):
+            cursor_tie_breaker = " + '|' + ".join(
+                f"coalesce(toString({alias}), '')" for alias in cursor_tie_breaker
+            )
+        self.cursor_tie_breaker = cursor_tie_breaker or implicit_sort_by or "uid"
+        self.total_count_mode = (
+            parse_total_count_mode(total_count_mode)
+            if total_count
+            else TotalCountMode.EXACT
+        )
+        self.total_count_value: int | None = None
         self.filter_clause = ""
         self.sort_clause = ""
         self.pagination_clause = ""
+        self.cursor_clause = ""
+        self.cursor_projection = ""
+        self.cursor_signature = ""
+        self.next_page_token: str | None = None
+        self._filter_parameter_bindings: list[tuple[str, str, int, str | None]] = []
         self.parameters: dict[Any, Any] = {}
 
         # Auto-generate internal clauses
@@ -548,11 +643,13 @@ class CypherQueryBuilder:
 
         if filter_by and len(self.filter_by.elements) > 0:
             self.build_filter_clause()
-        if self.page_size > 0:
+        if self.page_size > 0 and not self.is_keyset_pagination:
             self.build_pagination_clause()
         if self.sort_by:
             self.sort_by = validate_sort_by_dict(sort_by=self.sort_by)
             self.build_sort_clause()
+        if self.is_keyset_pagination:
+            self.build_keyset_pagination_clause()
 
         # Auto-generate final queries
         self.build_full_query()
@@ -565,11 +662,13 @@ class CypherQueryBuilder:
         _parsed_operator: str,
         _query_param_name: str,
         elm: Any,
+        filter_key: str,
+        value_index: int,
     ):
         if elm is not None:
-            if isinstance(elm, str):
-                elm = elm.lower()
-            self.parameters[f"{_query_param_name}"] = elm
+            self._bind_filter_parameter(
+                _query_param_name, filter_key, value_index, transform="lower"
+            )
 
         if "." in _alias:
             nested_path = _alias.split(".")
@@ -623,8 +722,55 @@ class CypherQueryBuilder:
                         f"any(attr in {_alias} WHERE toLower(attr.name) {_parsed_operator} ${_query_param_name})"
                     )
 
-    # pylint: disable=too-many-statements
     def build_filter_clause(self) -> None:
+        """
+        Sets the filter clause and its parameters.
+        The clause text only depends on the shape of the filter (keys, operators and value types),
+        so it is compiled once per shape and return model, and the filter values are bound as parameters.
+        """
+        cache_key = self._filter_clause_cache_key()
+        with lock_store_filter_clause:
+            compiled = cache_store_filter_clause.get(cache_key)
+        if compiled is None:
+            compiled = self._compile_filter_clause()
+            with lock_store_filter_clause:
+                cache_store_filter_clause[cache_key] = compiled
+
+        self.filter_clause, bindings = compiled
+        for name, key, index, transform in bindings:
+            values = self.filter_by.elements[key].v
+            value = sorted(values)[index] if transform == "sort" else values[index]
+            if transform == "lower" and isinstance(value, str):
+                value = value.lower()
+            self.parameters[name] = value
+
+    def _filter_clause_cache_key(self) -> tuple[Any, ...]:
+        return (
+            self.return_model,
+            tuple(self.wildcard_properties_list),
+            self.format_filter_sort_keys,
+            self.filter_operator,
+            tuple(
+                (key, element.op, tuple(_filter_value_kind(v) for v in element.v))
+                for key, element in self.filter_by.elements.items()
+            ),
+        )
+
+    def _bind_filter_parameter(
+        self, name: str, key: str, index: int, transform: str | None = None
+    ) -> None:
+        """
+        Records that the parameter `name` gets the value at `index` of the filter `key`.
+        transform : `lower` to lowercase string values, `sort` to take the value from the sorted values.
+        """
+        self._filter_parameter_bindings.append((name, key, index, transform))
+
+    # pylint: disable=too-many-statements
+    def _compile_filter_clause(
+        self,
+    ) -> tuple[str, tuple[tuple[str, str, int, str | None], ...]]:
+        """Builds the filter clause text, and the bindings of its parameters to the filter values."""
+        self._filter_parameter_bindings = []
         _filter_clause = "WHERE "
         filter_predicates = []
 
@@ -687,7 +833,7 @@ class CypherQueryBuilder:
                     _alias = self.format_filter_sort_keys(_alias)
                     if not filter_sort_valid_keys_re.fullmatch(key):
                         raise ValueError(f"Invalid filter key: {key}")
-                _values.sort()
+                _values = sorted(_values)
                 _query_param_prefix = f"{self.escape_alias(_alias)}"
                 _predicate = (
                     f"${_query_param_prefix}_0<={_alias}<=${_query_param_prefix}_1"
@@ -697,8 +843,12 @@ class CypherQueryBuilder:
                     _date_predicate = f"datetime(${_query_param_prefix}_0)<={_alias}<=datetime(${_query_param_prefix}_1)"
                     _predicate += f" OR {_date_predicate}"
                 filter_predicates.append(_predicate)
-                self.parameters[f"{_query_param_prefix}_0"] = _values[0]
-                self.parameters[f"{_query_param_prefix}_1"] = _values[1]
+                self._bind_filter_parameter(
+                    f"{_query_param_prefix}_0", key, 0, transform="sort"
+                )
+                self._bind_filter_parameter(
+                    f"{_query_param_prefix}_1", key, 1, transform="sort"
+                )
             else:
                 # If necessary, replace key using return-model-to-cypher fieldname mapping
                 if self.format_filter_sort_keys and _alias != "*":
@@ -794,7 +944,9 @@ class CypherQueryBuilder:
                                 raise ValidationException(
                                     msg="Wildcard filtering not properly covered for this object"
                                 )
-                            self.parameters[f"wildcard_{index}"] = elm.lower()
+                            self._bind_filter_parameter(
+                                f"wildcard_{index}", key, index, transform="lower"
+                            )
                         else:
                             # name=$name_0 with name_0 defined in parameter objects
                             # . for nested properties will be replaced by _
@@ -832,6 +984,8 @@ class CypherQueryBuilder:
                                     _parsed_operator=_parsed_operator,
                                     _query_param_name=_query_param_name,
                                     elm=elm,
+                                    filter_key=key,
+                                    value_index=index,
                                 )
                             elif (
                                 # pylint: disable=too-many-boolean-expressions
@@ -851,7 +1005,9 @@ class CypherQueryBuilder:
                                 and not jse.get("is_json", False)
                             ):
                                 _predicates.append(f"${_query_param_name} IN {_alias}")
-                                self.parameters[_query_param_name] = elm
+                                self._bind_filter_parameter(
+                                    _query_param_name, key, index
+                                )
                             elif (
                                 isinstance(elm, str)
                                 and ComparisonOperator(_operator)
@@ -860,7 +1016,9 @@ class CypherQueryBuilder:
                                 _predicates.append(
                                     f"toLower(toString({_alias})){_parsed_operator}${_query_param_name}"
                                 )
-                                self.parameters[f"{_query_param_name}"] = elm.lower()
+                                self._bind_filter_parameter(
+                                    _query_param_name, key, index, transform="lower"
+                                )
                             else:
                                 _predicates.append(
                                     f"{_alias}{_parsed_operator}${_query_param_name}"
@@ -872,7 +1030,9 @@ class CypherQueryBuilder:
                                     _predicates.append(
                                         f"{_alias}{_parsed_operator}datetime(${_query_param_name})"
                                     )
-                                self.parameters[_query_param_name] = elm
+                                self._bind_filter_parameter(
+                                    _query_param_name, key, index
+                                )
 
                 # If multiple values, will create a clause with OR or AND, between ()
                 _predicate = _predicate_operator.join(_predicates)
@@ -882,11 +1042,9 @@ class CypherQueryBuilder:
                 # Add to list of predicates
                 filter_predicates.append(_predicate)
 
-        # Set clause
-        self.filter_clause = (
-            _filter_clause
-            + f" {self.filter_operator.value.upper()} ".join(list(filter_predicates))
-        )
+        return _filter_clause + f" {self.filter_operator.value.upper()} ".join(
+            list(filter_predicates)
+        ), tuple(self._filter_parameter_bindings)
 
     def build_pagination_clause(self) -> None:
         validate_max_skip_clause(page_number=self.page_number, page_size=self.page_size)
@@ -898,16 +1056,100 @@ class CypherQueryBuilder:
         self.parameters["page_number"] = self.page_number - 1
         self.parameters["page_size"] = self.page_size
 
-    def build_sort_clause(self) -> None:
-        _sort_clause = "ORDER BY "
+    @property
+    def is_keyset_pagination(self) -> bool:
+        return self.page_token is not None and self.page_size > 0
+
+    def build_keyset_pagination_clause(self) -> None:
+        """
+        Keyset pagination : instead of skipping the rows of previous pages, only the rows sorted after
+        the cursor position (the sort-key values of the last row of the previous page) are kept.
+        The sort keys are always completed with a unique tie-breaker alias, to get a total order.
+        """
+        ValidationException.raise_if(
+            self.union_match_clause is not None,
+            msg="Page token is not supported for this listing, use page_number instead.",
+        )
+
+        sort_keys = self._sort_expressions()
+        if self.cursor_tie_breaker not in [expression for expression, _ in sort_keys]:
+            sort_keys.append((self.cursor_tie_breaker, True))
+        self.sort_clause = "ORDER BY " + ",".join(
+            f"{expression} {'ASC' if ascending else 'DESC'}"
+            for expression, ascending in sort_keys
+        )
+
+        self.cursor_signature = sort_signature(
+            [f"{expression} {ascending}" for expression, ascending in sort_keys]
+        )
+        self.cursor_projection = f"[{', '.join(expression for expression, _ in sort_keys)}] AS {self.CURSOR_ALIAS}"
+
+        if self.page_token:
+            cursor = decode_page_token(self.page_token, signature=self.cursor_signature)
+            ValidationException.raise_if(
+                len(cursor) != len(sort_keys),
+                msg="Page token doesn't match the requested sorting, request the first page again.",
+            )
+
+            # Rows after the cursor in lexicographic order of the sort keys :
+            # (k0 after c0) OR (k0 = c0 AND k1 after c1) OR ...
+            equal_predicates: list[str] = []
+            after_predicates: list[str] = []
+            for index, ((expression, ascending), (value, value_type)) in enumerate(
+                zip(sort_keys, cursor)
+            ):
+                param = f"$cursor_{index}"
+                if value_type:
+                    param = f"{value_type}({param})"
+                self.parameters[f"cursor_{index}"] = value
+
+                # Neo4j sorts null values last in ascending order, and first in descending order
+                after: str | None
+                if value is None:
+                    after = None if ascending else f"{expression} IS NOT NULL"
+                    equal = f"{expression} IS NULL"
+                elif ascending:
+                    after = f"({expression} > {param} OR {expression} IS NULL)"
+                    equal = f"{expression} = {param}"
+                else:
+                    after = f"{expression} < {param}"
+                    equal = f"{expression} = {param}"
+
+                if after is not None:
+                    after_predicates.append(" AND ".join(equal_predicates + [after]))
+                equal_predicates.append(equal)
+
+            self.cursor_clause = "WITH * WHERE " + " OR ".join(
+                f"({predicate})" for predicate in after_predicates
+            )
+
+        # Set clause
+        self.pagination_clause = "LIMIT $page_size"
+
+        # Add corresponding parameters
+        self.parameters["page_size"] = self.page_size
+
+    def _sort_expressions(self) -> list[tuple[str, bool]]:
+        """Returns (Cypher expression, ascending) pairs of the requested sorting, including implicit_sort_by."""
+        cache_key = (
+            self.return_model,
+            self.format_filter_sort_keys,
+            tuple((key, bool(value)) for key, value in self.sort_by.items()),
+            self.implicit_sort_by,
+        )
+        with lock_store_sort_expressions:
+            sort_expressions = cache_store_sort_expressions.get(cache_key)
+        if sort_expressions is None:
+            sort_expressions = tuple(self._compile_sort_expressions())
+            with lock_store_sort_expressions:
+                cache_store_sort_expressions[cache_key] = sort_expressions
+        return list(sort_expressions)
+
+    def _compile_sort_expressions(self) -> list[tuple[str, bool]]:
         # Add list of order by statements parsed from dict
         # If necessary, replace key using return-model-to-cypher fieldname mapping
         sort_by_statements = []
         for key, value in self.sort_by.items():
-            if value:
-                sort_order = " ASC"
-            else:
-                sort_order = " DESC"
             if self.format_filter_sort_keys:
                 key = self.format_filter_sort_keys(key)
             if self.return_model and issubclass(self.return_model, BaseModel):
@@ -919,17 +1161,30 @@ class CypherQueryBuilder:
                     and get_sub_fields(attr_desc) is None
                 ):
                     key = f"toLower({key})"
-            sort_by_statements.append(key + sort_order)
+            sort_by_statements.append((key, bool(value)))
 
         if (
             self.implicit_sort_by is not None
             and self.implicit_sort_by not in self.sort_by
         ):
             sort_by_statements.append(
-                self.format_filter_sort_keys(self.implicit_sort_by)
-                if self.format_filter_sort_keys
-                else self.implicit_sort_by
+                (
+                    (
+                        self.format_filter_sort_keys(self.implicit_sort_by)
+                        if self.format_filter_sort_keys
+                        else self.implicit_sort_by
+                    ),
+                    True,
+                )
             )
+        return sort_by_statements
+
+    def build_sort_clause(self) -> None:
+        _sort_clause = "ORDER BY "
+        sort_by_statements = [
+            f"{expression} {'ASC' if ascending else 'DESC'}"
+            for expression, ascending in self._sort_expressions()
+        ]
         # Set clause
         self.sort_clause = _sort_clause + ",".join(sort_by_statements)
 
@@ -939,12 +1194,15 @@ class CypherQueryBuilder:
             MATCH caller-provided (and WITH, CALL, ... any custom pattern matching necessary)
             > WITH alias_clause caller-provided
             > WHERE filter_clause using aliases
+            > WITH * WHERE cursor_clause to skip the previous pages (keyset pagination only)
             > RETURN * to return results as is
             > ORDER BY to sort results using aliases
             > SKIP * LIMIT * to paginate results
         """
         _with_alias_clause = f"WITH {self.alias_clause}"
         _return_clause = "RETURN *"
+        if self.cursor_projection:
+            _return_clause += f", {self.cursor_projection}"
 
         # Set clause
         self.full_query = " ".join(
@@ -952,6 +1210,7 @@ class CypherQueryBuilder:
                 self.match_clause,
                 _with_alias_clause,
                 self.filter_clause,
+                self.cursor_clause,
                 _return_clause,
                 self.sort_clause,
                 self.pagination_clause,
@@ -998,7 +1257,8 @@ class CypherQueryBuilder:
                     _with_alias_clause,
                     self.filter_clause,
                     _return_count_clause,
-                    "UNION",
+                    # UNION ALL, as UNION would merge the two counts when they are equal
+                    "UNION ALL",
                     self.union_match_clause,
                     _with_alias_clause,
                     self.filter_clause,
@@ -1078,17 +1338,203 @@ class CypherQueryBuilder:
         """
         return re.sub(nested_regex, "_", alias)
 
+    def build_inline_count_query(self) -> str:
+        """
+        The generated query returns the page rows together with the total count, in one round trip :
+            CALL count_query as a subquery, summing the counts of the union parts
+            > CALL full_query as a subquery
+            > RETURN * - the page rows with an extra total_count column
+        """
+        return " ".join(
+            [
+                f"CALL {{ {self.count_query} }}",
+                "WITH sum(total_count) AS total_count",
+                f"CALL {{ {self.full_query} }}",
+                "RETURN *",
+            ]
+        )
+
     def execute(self) -> tuple[Any, Any]:
+        inline_count = (
+            self.total_count and self.total_count_mode == TotalCountMode.INLINE
+        )
+        result_array, attributes_names = self._run_query(
+            self.build_inline_count_query() if inline_count else self.full_query
+        )
+
+        if inline_count:
+            result_array, attributes_names = self._pop_inline_count(
+                result_array, attributes_names
+            )
+        if self.cursor_projection:
+            result_array, attributes_names = self._pop_page_cursor(
+                result_array, attributes_names
+            )
+        return result_array, attributes_names
+
+    def _run_query(self, query: str) -> tuple[Any, Any]:
         try:
-            result_array, attributes_names = db.cypher_query(
-                query=self.full_query, params=self.parameters
+            return db.cypher_query(query=query, params=self.parameters)
+        except CypherSyntaxError as ex:
+            log.error("%s: %s", ex.code, ex.message)
+            raise ValidationException(
+                msg="Unsupported filtering or sort parameters or other syntax error in Cypher query"
+            ) from ex
+
+    def _pop_page_cursor(
+        self, result_array: list[Any], attributes_names: list[str]
+    ) -> tuple[list[Any], list[str]]:
+        """Removes the cursor column from the results, and keeps the last cursor as the next page token"""
+        cursor_index = attributes_names.index(self.CURSOR_ALIAS)
+        if len(result_array) == self.page_size:
+            self.next_page_token = encode_page_token(
+                result_array[-1][cursor_index], signature=self.cursor_signature
             )
+        set_next_page_token(self.next_page_token)
+
+        return [row[:cursor_index] + row[cursor_index + 1 :] for row in result_array], [
+            name for name in attributes_names if name != self.CURSOR_ALIAS
+        ]
+
+    def _pop_inline_count(
+        self, result_array: list[Any], attributes_names: list[str]
+    ) -> tuple[list[Any], list[str]]:
+        """Removes the total count column from the results, and keeps its value for execute_count"""
+        count_index = attributes_names.index("total_count")
+        # An empty page (e.g. past the last page) carries no count, execute_count will query it
+        if result_array:
+            self.total_count_value = result_array[0][count_index]
+
+        return [row[:count_index] + row[count_index + 1 :] for row in result_array], [
+            name for name in attributes_names if name != "total_count"
+        ]
+
+    def execute_count(self) -> int:
+        """
+        Returns the total count of the listing, or 0 if total_count wasn't requested.
+        Depending on total_count_mode, the count is :
+            * exact - counted by count_query
+            * cached - counted by count_query, or reused from an identical count of the last seconds
+            * estimated - estimated by the query planner without counting the rows,
+                counted by count_query if no estimate is available
+            * inline - counted by execute in the same round trip as the page
+        """
+        if not self.total_count:
+            return 0
+
+        if self.total_count_value is not None:
+            set_total_count_accuracy(estimated=False)
+            return self.total_count_value
+
+        if self.total_count_mode == TotalCountMode.ESTIMATED:
+            estimate = self._estimate_count()
+            if estimate is not None:
+                set_total_count_accuracy(estimated=True)
+                return estimate
+
+        cache_key = None
+        if self.total_count_mode == TotalCountMode.CACHED:
+            cache_key = self._count_cache_key()
+            with lock_store_total_count:
+                cached_count = cache_store_total_count.get(cache_key)
+            if cached_count is not None:
+                set_total_count_accuracy(estimated=False)
+                return cached_count
+
+        count_result, _ = db.cypher_query(
+            query=self.count_query, params=self.parameters
+        )
+        self.total_count_value = sum(row[0] for row in count_result)
+        if cache_key is not None:
+            with lock_store_total_count:
+                cache_store_total_count[cache_key] = self.total_count_value
+
+        set_total_count_accuracy(estimated=False)
+        return self.total_count_value
+
+    def _count_cache_key(self) -> tuple[str, str]:
+        """Cache key of the count, the pagination parameters don't change the count"""
+        count_parameters = {
+            key: value
+            for key, value in self.parameters.items()
+            if key not in ("page_number", "page_size")
+            and not str(key).startswith("cursor_")
+        }
+        return _query_cache_key(self.count_query, count_parameters)
+
+    def execute_header_query(
+        self, header_alias: str, page_size: int, cache: TTLCache | None = None
+    ) -> tuple[Any, Any]:
+        """
+        Executes the header query built by build_header_query, without changing full_query.
+        If a cache is given, the results are reused for the same header query and parameters,
+        which covers the endpoint, the header field, the filters and the search string.
+        """
+        header_query = self.build_header_query(
+            header_alias=header_alias, page_size=page_size
+        )
+        if cache is None:
+            return self._run_query(header_query)
+
+        cache_key = _query_cache_key(header_query, self.parameters)
+        with lock_store_headers:
+            result = cache.get(cache_key)
+        if result is None:
+            result = self._run_query(header_query)
+            with lock_store_headers:
+                cache[cache_key] = result
+        return result
+
+    def _estimate_count(self) -> int | None:
+        """Number of rows the query planner estimates for the unpaginated query, None if not available"""
+        if db.driver is None:
+            return None
+
+        _with_alias_clause = f"WITH {self.alias_clause}"
+        estimate_query = " ".join(
+            [
+                "EXPLAIN",
+                self.match_clause,
+                _with_alias_clause,
+                self.filter_clause,
+                "RETURN *",
+            ]
+        )
+        if self.union_match_clause:
+            estimate_query += " ".join(
+                [
+                    " UNION ALL",
+                    self.union_match_clause,
+                    _with_alias_clause,
+                    self.filter_clause,
+                    "RETURN *",
+                ]
+            )
+        try:
+            # pylint: disable=protected-access
+            with db.driver.session(database=db._database_name) as session:
+                plan = session.run(estimate_query, self.parameters).consume().plan
         except CypherSyntaxError as ex:
             log.error("%s: %s", ex.code, ex.message)
             raise ValidationException(
                 msg="Unsupported filtering or sort parameters or other syntax error in Cypher query"
             ) from ex
-        return result_array, attributes_names
+
+        estimated_rows = (plan or {}).get("args", {}).get("EstimatedRows")
+        return round(estimated_rows) if estimated_rows is not None else None
+
+
+def _query_cache_key(query: str, parameters: dict[Any, Any]) -> tuple[str, str]:
+    return " ".join(query.split()), json.dumps(parameters, sort_keys=True, default=str)
+
+
+def get_headers_cache(root_class: type) -> TTLCache:
+    """
+    Returns the cache of the distinct header values read from the given root type.
+    Repositories expose it as `cache_store_headers`, so that the writes of a root type
+    decorated with `sb_clear_cache(caches=[..., "cache_store_headers"])` invalidate its headers.
+    """
+    return cache_registry.register_ttl_cache(f"headers.{root_class.__name__}")
 
 
 def sb_clear_cache(caches: list[str] | None = None):
@@ -1106,15 +1552,17 @@ def sb_clear_cache(caches: list[str] | None = None):
                 return result
             finally:
                 for cache_name in caches:
-                    cache = getattr(self, cache_name, None)
-                    if cache:
-                        log.info(
-                            "Clear cache '%s.%s' of size: %s",
-                            type(self).__name__,
-                            cache_name,
-                            cache.currsize,
-                        )
-                        cache.clear()
+                    cache: Cache | None = getattr(self, cache_name, None)
+                    # also when empty here, other processes may have cached items
+                    if cache is not None:
+                        if cache.currsize:
+                            log.info(
+                                "Clear cache '%s.%s' of size: %s",
+                                type(self).__name__,
+                                cache_name,
+                                cache.currsize,
+                            )
+                        invalidate_cache(cache)
 
         return wrapper
 
@@ -1,7 +1,21 @@
+import gzip
+import json
 from typing import Any
 
+from neo4j.time import DateTime
 from neomodel import db
 
+# Version of the format of the changes stored as gzip compressed JSON on CTPackageChanges nodes
+# by the `update_ct_stats` script of neo4j-mdr-db, changes stored in another format are ignored
+CT_PACKAGES_CHANGES_FORMAT = 2
+
+STORED_CHANGES_QUERY = """
+MATCH (old_package:CTPackage {name:$old_package_name})-[:NEXT_PACKAGE]->(new_package:CTPackage {name:$new_package_name})
+MATCH (old_package)-[:HAS_CHANGES]->(changes:CTPackageChanges)-[:CHANGES_TO]->(new_package)
+WHERE changes.format = $changes_format
+RETURN changes.changes
+"""
+
 CODELIST_DATA_RETRIEVAL_SPECIFIC_QUERY = """
 MATCH (old_package:CTPackage {name:$old_package_name})-[:CONTAINS_CODELIST]->(package_codelist:CTPackageCodelist)-[:CONTAINS_ATTRIBUTES]->
 (codelist_attr_val)<-[old_versions:HAS_VERSION]-(codelist_attr_root)<-[:HAS_ATTRIBUTES_ROOT]-(old_codelist_root {uid:$codelist_uid})
@@ -309,10 +323,41 @@ def codelist_diff(left_cl, right_cl):
     return result
 
 
+def get_stored_ct_packages_changes(
+    old_package_name: str, new_package_name: str
+) -> dict[str, Any] | None:
+    """
+    Returns the changes between two consecutive packages, as precomputed by the `update_ct_stats` script,
+    or None if they aren't consecutive or their changes weren't computed yet.
+    """
+    rows, _ = db.cypher_query(
+        STORED_CHANGES_QUERY,
+        {
+            "old_package_name": old_package_name,
+            "new_package_name": new_package_name,
+            "changes_format": CT_PACKAGES_CHANGES_FORMAT,
+        },
+    )
+    if not rows or rows[0][0] is None:
+        return None
+
+    output = json.loads(gzip.decompress(bytes(rows[0][0])))
+    for items in output.values():
+        for item in items:
+            item["change_date"] = DateTime.from_iso_format(item["change_date"])
+    return output
+
+
 @db.transaction
 def get_ct_packages_changes(
     old_package_name: str, new_package_name: str
 ) -> dict[str, Any]:
+    stored_output = get_stored_ct_packages_changes(
+        old_package_name=old_package_name, new_package_name=new_package_name
+    )
+    if stored_output is not None:
+        return stored_output
+
     output = {}
     # codelists query
     # Fetch the codelists and terms and do the comparison here.
@@ -61,6 +61,13 @@ Functionality : provided together with `page_size`, selects a page to retrieve f
 Errors: `page_size` not provided, `page_number` must be equal or greater than 1.
 """
 
+PAGE_TOKEN = """
+Opaque cursor for cursor pagination, deep pages of large listings are retrieved faster than with `page_number`.\n
+Functionality: send an empty `page_token` to get the first page, then pass the value of the `X-Next-Page-Token`
+response header as `page_token` to get the next one. `page_number` is ignored when `page_token` is provided.\n
+Errors: the token doesn't match the requested `sort_by`.
+"""
+
 PAGE_SIZE = f"""
 Number of items to be returned per page.\n
 Default: {settings.default_page_size}\n
@@ -151,6 +158,14 @@ TOTAL_COUNT = (
     "Functionality: retrieve total count of queried entities.\n\n"
 )
 
+TOTAL_COUNT_MODE = (
+    "How the total count is computed when `total_count` is requested, ignored otherwise.\n\n"
+    "Functionality: `exact` (default), `cached` (reuses a recent count of the same query), "
+    "`estimated` (query planner estimate) or `inline` (counted in the same database round trip as the page). "
+    "The `X-Total-Count-Accuracy` response header tells whether the returned total is `exact` or `estimated`.\n\n"
+    "Errors: unsupported total count mode.\n\n"
+)
+
 HEADER_FIELD_NAME = (
     "The field name for which to lookup possible values in the database.\n\n"
     "Functionality: searches for possible values (aka 'headers') of this field in the database."
@@ -1,6 +1,7 @@
 from typing import Annotated, Any
 
 from fastapi import APIRouter, Query
+from fastapi.responses import PlainTextResponse
 
 from clinical_mdr_api.domain_repositories.user_repository import UserRepository
 from clinical_mdr_api.models.user import UserInfo, UserInfoPatchInput
@@ -9,6 +10,8 @@ from clinical_mdr_api.services._meta_repository import MetaRepository
 from common import exceptions
 from common.auth import rbac
 from common.auth.dependencies import security
+from common.cache import cache_registry
+from common.telemetry.query_metrics import PROMETHEUS_CONTENT_TYPE, query_metrics
 
 # Prefixed with "/admin"
 router = APIRouter()
@@ -55,9 +58,70 @@ def clear_caches() -> list[dict[Any, Any]]:
             if cache_store is not None:
                 cache_store.clear()
 
+    cache_registry.invalidate_all()
+
     return get_caches()
 
 
+@router.get(
+    "/caches/stats",
+    dependencies=[security, rbac.ADMIN_READ],
+    summary="Returns size, hit, miss, eviction and expiration counters of all named caches",
+    description="Counters are per process, since start of the process or the last reset of the metrics.",
+    status_code=200,
+    responses={
+        403: _generic_descriptions.ERROR_403,
+        404: _generic_descriptions.ERROR_404,
+    },
+)
+def get_cache_stats() -> list[dict[str, Any]]:
+    return cache_registry.stats()
+
+
+@router.get(
+    "/metrics",
+    dependencies=[security, rbac.ADMIN_READ],
+    summary="Returns request and Cypher query metrics in Prometheus text format",
+    description="""
+Per-route histograms of request latency and of the number of Cypher queries executed per request,
+cumulative Cypher walltime and server error counts by route,
+the slowest Cypher queries executed since start of the process (or the last reset),
+and the counters of the named caches.
+
+Query parameters of the slowest queries are reported by type only, values are not kept.
+
+Metrics are aggregated per process, a scraper should address each worker separately.
+""",
+    status_code=200,
+    response_class=PlainTextResponse,
+    responses={
+        200: {"content": {PROMETHEUS_CONTENT_TYPE: {}}},
+        403: _generic_descriptions.ERROR_403,
+        404: _generic_descriptions.ERROR_404,
+    },
+)
+def get_metrics() -> PlainTextResponse:
+    return PlainTextResponse(
+        query_metrics.to_prometheus() + cache_registry.to_prometheus(),
+        media_type=PROMETHEUS_CONTENT_TYPE,
+    )
+
+
+@router.delete(
+    "/metrics",
+    dependencies=[security, rbac.ADMIN_WRITE],
+    summary="Resets request and Cypher query metrics",
+    status_code=204,
+    responses={
+        403: _generic_descriptions.ERROR_403,
+        404: _generic_descriptions.ERROR_404,
+    },
+)
+def reset_metrics() -> None:
+    query_metrics.reset()
+    cache_registry.reset_stats()
+
+
 @router.get(
     "/users",
     dependencies=[security, rbac.ADMIN_READ],
@@ -137,6 +137,9 @@ def get_activities(
     page_number: Annotated[
         int, Query(ge=1, description=_generic_descriptions.PAGE_NUMBER)
     ] = settings.default_page_number,
+    page_token: Annotated[
+        str | None, Query(description=_generic_descriptions.PAGE_TOKEN)
+    ] = None,
     page_size: Annotated[
         int,
         Query(
@@ -158,6 +161,9 @@ def get_activities(
     total_count: Annotated[
         bool, Query(description=_generic_descriptions.TOTAL_COUNT)
     ] = False,
+    total_count_mode: Annotated[
+        str | None, Query(description=_generic_descriptions.TOTAL_COUNT_MODE)
+    ] = None,
     split_activity_by_groupings: Annotated[
         bool,
         Query(
@@ -183,6 +189,8 @@ If equals to true, only library_name, sort_by, page_number, page_size, total_cou
             library=library_name,
             sort_by=sort_by,
             page_number=page_number,
+            page_token=page_token,
+            total_count_mode=total_count_mode,
             page_size=page_size,
             total_count=total_count,
             filter_by=filters,
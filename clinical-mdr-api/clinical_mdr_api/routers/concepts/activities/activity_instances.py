@@ -134,6 +134,9 @@ def get_activities(
     page_number: Annotated[
         int, Query(ge=1, description=_generic_descriptions.PAGE_NUMBER)
     ] = settings.default_page_number,
+    page_token: Annotated[
+        str | None, Query(description=_generic_descriptions.PAGE_TOKEN)
+    ] = None,
     page_size: Annotated[
         int,
         Query(
@@ -155,6 +158,9 @@ def get_activities(
     total_count: Annotated[
         bool, Query(description=_generic_descriptions.TOTAL_COUNT)
     ] = False,
+    total_count_mode: Annotated[
+        str | None, Query(description=_generic_descriptions.TOTAL_COUNT_MODE)
+    ] = None,
 ) -> CustomPage[ActivityInstance]:
     activity_instance_service = ActivityInstanceService()
     results = activity_instance_service.get_all_concepts(
@@ -166,6 +172,8 @@ def get_activities(
         activity_instance_names=names,
         sort_by=sort_by,
         page_number=page_number,
+        page_token=page_token,
+        total_count_mode=total_count_mode,
         page_size=page_size,
         total_count=total_count,
         filter_by=filters,
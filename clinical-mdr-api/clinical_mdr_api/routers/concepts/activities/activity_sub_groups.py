@@ -72,6 +72,9 @@ def get_activity_subgroups(
     page_number: Annotated[
         int, Query(ge=1, description=_generic_descriptions.PAGE_NUMBER)
     ] = settings.default_page_number,
+    page_token: Annotated[
+        str | None, Query(description=_generic_descriptions.PAGE_TOKEN)
+    ] = None,
     page_size: Annotated[
         int,
         Query(
@@ -93,12 +96,17 @@ def get_activity_subgroups(
     total_count: Annotated[
         bool, Query(description=_generic_descriptions.TOTAL_COUNT)
     ] = False,
+    total_count_mode: Annotated[
+        str | None, Query(description=_generic_descriptions.TOTAL_COUNT_MODE)
+    ] = None,
 ) -> CustomPage[ActivitySubGroup]:
     activity_subgroup_service = ActivitySubGroupService()
     results = activity_subgroup_service.get_all_concepts(
         library=library_name,
         sort_by=sort_by,
         page_number=page_number,
+        page_token=page_token,
+        total_count_mode=total_count_mode,
         page_size=page_size,
         total_count=total_count,
         filter_by=filters,
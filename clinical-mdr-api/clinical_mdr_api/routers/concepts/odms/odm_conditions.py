@@ -42,6 +42,9 @@ def get_all_odm_conditions(
     page_number: Annotated[
         int, Query(ge=1, description=_generic_descriptions.PAGE_NUMBER)
     ] = settings.default_page_number,
+    page_token: Annotated[
+        str | None, Query(description=_generic_descriptions.PAGE_TOKEN)
+    ] = None,
     page_size: Annotated[
         int,
         Query(
@@ -63,12 +66,17 @@ def get_all_odm_conditions(
     total_count: Annotated[
         bool, Query(description=_generic_descriptions.TOTAL_COUNT)
     ] = False,
+    total_count_mode: Annotated[
+        str | None, Query(description=_generic_descriptions.TOTAL_COUNT_MODE)
+    ] = None,
 ) -> CustomPage[OdmCondition]:
     odm_condition_service = OdmConditionService()
     results = odm_condition_service.get_all_concepts(
         library=library_name,
         sort_by=sort_by,
         page_number=page_number,
+        page_token=page_token,
+        total_count_mode=total_count_mode,
         page_size=page_size,
         total_count=total_count,
         filter_by=filters,
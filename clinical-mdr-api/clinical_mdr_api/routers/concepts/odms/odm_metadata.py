@@ -10,18 +10,9 @@ from fastapi.responses import StreamingResponse
 from clinical_mdr_api.domains._utils import ObjectStatus
 from clinical_mdr_api.domains.concepts.utils import ExporterType, TargetType
 from clinical_mdr_api.routers import _generic_descriptions
-from clinical_mdr_api.services.concepts.odms.odm_clinspark_import import (
-    OdmClinicalXmlImporterService,
-)
 from clinical_mdr_api.services.concepts.odms.odm_csv_exporter import (
     OdmCsvExporterService,
 )
-from clinical_mdr_api.services.concepts.odms.odm_xml_exporter import (
-    OdmXmlExporterService,
-)
-from clinical_mdr_api.services.concepts.odms.odm_xml_importer import (
-    OdmXmlImporterService,
-)
 from clinical_mdr_api.services.concepts.odms.odm_xml_stylesheets import (
     OdmXmlStylesheetService,
 )
@@ -78,6 +69,11 @@ def get_odm_document(
         UploadFile | None, File(description=MAPPER_DESCRIPTION)
     ] = None,
 ):
+    # deferred import of the XML/PDF stack, see `clinical_mdr_api.utils.lazy_imports`
+    from clinical_mdr_api.services.concepts.odms.odm_xml_exporter import (
+        OdmXmlExporterService,
+    )
+
     if allowed_namespaces is None:
         allowed_namespaces = []
     odm_xml_export_service = OdmXmlExporterService(
@@ -89,9 +85,9 @@ def get_odm_document(
         stylesheet,
         mapper_file,
     )
-    rs = odm_xml_export_service.get_odm_document()
 
     if pdf:
+        rs = odm_xml_export_service.get_odm_document()
         buffer_io = BytesIO()
         buffer_io.write(rs)
         pdf_bytes = buffer_io.getvalue()
@@ -104,8 +100,8 @@ def get_odm_document(
             media_type="application/pdf",
         )
 
-    return Response(
-        content=rs,
+    return StreamingResponse(
+        content=odm_xml_export_service.iter_odm_document(),
         media_type="application/xml",
         headers={
             "Content-Disposition": f'attachment; filename="odm_export_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xml"',
@@ -162,6 +158,14 @@ def store_odm_xml(
         UploadFile | None, File(description=MAPPER_DESCRIPTION)
     ] = None,
 ):
+    # deferred import of the XML stack, see `clinical_mdr_api.utils.lazy_imports`
+    from clinical_mdr_api.services.concepts.odms.odm_clinspark_import import (
+        OdmClinicalXmlImporterService,
+    )
+    from clinical_mdr_api.services.concepts.odms.odm_xml_importer import (
+        OdmXmlImporterService,
+    )
+
     if exporter == ExporterType.OSB:
         odm_xml_importer_service = OdmXmlImporterService(xml_file, mapper_file)
     else:
@@ -3,21 +3,16 @@
 from typing import Annotated
 
 from fastapi import Path
-from fastapi.responses import Response
+from fastapi.responses import StreamingResponse
 
 from clinical_mdr_api.routers import _generic_descriptions
 from clinical_mdr_api.routers.studies.study import router
-from clinical_mdr_api.services.ctr_xml.ctr_xml_service import CTRXMLService
 from common.auth import rbac
 from common.auth.dependencies import security
 
 StudyUID = Path(description="The unique id of the study.")
 
 
-class XMLResponse(Response):
-    media_type = "text/xml"
-
-
 @router.get(
     "/studies/{study_uid}/ctr/odm.xml",
     dependencies=[security, rbac.STUDY_READ],
@@ -31,5 +26,14 @@ class XMLResponse(Response):
 )
 def get_odm_xml(
     study_uid: Annotated[str, StudyUID],
-) -> XMLResponse:
-    return XMLResponse(content=CTRXMLService().get_ctr_odm(study_uid))
+    study_value_version: Annotated[
+        str | None, _generic_descriptions.STUDY_VALUE_VERSION_QUERY
+    ] = None,
+) -> StreamingResponse:
+    # deferred import of the ctrxml bindings, see `clinical_mdr_api.utils.lazy_imports`
+    from clinical_mdr_api.services.ctr_xml.ctr_xml_service import CTRXMLService
+
+    return StreamingResponse(
+        CTRXMLService().iter_ctr_odm(study_uid, study_value_version),
+        media_type="text/xml",
+    )
@@ -2,7 +2,7 @@ import re
 from pathlib import Path as PathFromPathLib
 from typing import Annotated, Any
 
-from fastapi import APIRouter, Path, Request
+from fastapi import APIRouter, Path, Request, Response
 from fastapi.templating import Jinja2Templates
 
 from clinical_mdr_api.domain_repositories.study_selections.study_soa_repository import (
@@ -10,7 +10,6 @@ from clinical_mdr_api.domain_repositories.study_selections.study_soa_repository
 )
 from clinical_mdr_api.models.utils import PrettyJSONResponse
 from clinical_mdr_api.routers import _generic_descriptions
-from clinical_mdr_api.services.ddf.usdm_service import USDMService
 from clinical_mdr_api.services.studies.study_design_figure import (
     StudyDesignFigureService,
 )
@@ -31,6 +30,8 @@ templates = Jinja2Templates(directory=str(M11_TEMPLATES_DIR_PATH))
     path="/{study_uid}",
     dependencies=[security, rbac.STUDY_READ],
     response_class=PrettyJSONResponse,
+    # documents the rendered USDM JSON returned as a response
+    response_model=dict[str, Any],
     status_code=200,
     responses={
         403: _generic_descriptions.ERROR_403,
@@ -52,11 +53,19 @@ Possible errors:
 """,
 )
 def get_study(
-    study_uid: Annotated[str, Path(description="The unique uid of the study.")]
-) -> dict[str, Any]:
+    study_uid: Annotated[str, Path(description="The unique uid of the study.")],
+    study_value_version: Annotated[
+        str | None, _generic_descriptions.STUDY_VALUE_VERSION_QUERY
+    ] = None,
+) -> Response:
+    # deferred import of the USDM model, see `clinical_mdr_api.utils.lazy_imports`
+    from clinical_mdr_api.services.ddf.usdm_service import USDMService
+
     usdm_service = USDMService()
-    ddf_study_wrapper = usdm_service.get_by_uid(study_uid)
-    return ddf_study_wrapper
+    return Response(
+        content=usdm_service.get_rendered_by_uid(study_uid, study_value_version),
+        media_type=PrettyJSONResponse.media_type,
+    )
 
 
 @router.get(
@@ -83,6 +92,9 @@ def get_study_m11_protocol(
     request: Request,
     study_uid: Annotated[str, Path(description="The unique uid of the study.")],
 ):
+    # deferred import of the USDM model, see `clinical_mdr_api.utils.lazy_imports`
+    from clinical_mdr_api.services.ddf.usdm_service import USDMService
+
     usdm_service = USDMService()
     ddf_study_wrapper = usdm_service.get_by_uid(study_uid)
     ddf_study = ddf_study_wrapper.get("study")
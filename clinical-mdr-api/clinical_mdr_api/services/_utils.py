@@ -539,80 +539,55 @@ def generic_item_filtering(
         validate_is_dict("filter_by", filter_by)
 
         filters = FilterDict.model_validate({"elements": filter_by})
+        predicates = {
+            key: _compile_filter(key, element.op, element.v)
+            for key, element in filters.elements.items()
+        }
+        # Filters and sorts share the values extracted from each item
+        projections = [_ItemProjection(item) for item in items]
         if filter_operator == FilterOperator.AND:
             # Start from full list, then only keep items that match filter elements, one by one
-            filtered_items = items
+            filtered = projections
             # The list will decrease after each step (aka filtering out)
-            for key in filters.elements:
-                _values = filters.elements[key].v
-                _operator = filters.elements[key].op
-                filtered_items = [
-                    item
-                    for item in filtered_items
-                    if filter_aggregated_items(item, key, _values, _operator)
+            for predicate in predicates.values():
+                filtered = [
+                    projection for projection in filtered if predicate(projection)
                 ]
         elif filter_operator == FilterOperator.OR:
-            # Start from empty list then add element one by one
-            _filtered_items = []
-            # The list will increase after each step
-            for key in filters.elements:
-                _values = filters.elements[key].v
-                _operator = filters.elements[key].op
-                matching_items: list[Any] = [
-                    item
-                    for item in items
-                    if filter_aggregated_items(item, key, _values, _operator)
-                ]
-                _filtered_items += matching_items
             # if passed filter dict is empty we should return all elements without any filtering
-            if not filters.elements:
-                filtered_items = items
+            if not predicates:
+                filtered = projections
             else:
-                # Finally, deduplicate list
+                # Start from empty list then add matching elements of each filter,
+                # deduplicated on uid
                 uids = set()
-                filtered_items = []
-                for item in _filtered_items:
-                    if item.uid not in uids:
-                        filtered_items.append(item)
-                        uids.add(item.uid)
+                filtered = []
+                for predicate in predicates.values():
+                    for projection in projections:
+                        if projection.item.uid not in uids and predicate(projection):
+                            filtered.append(projection)
+                            uids.add(projection.item.uid)
         else:
             raise ValidationException(msg=f"Invalid filter_operator: {filter_operator}")
 
         # Do sorting
-        distinct_sort_orders = set(list(sort_by.values()))
+        distinct_sort_orders = set(sort_by.values())
+        sort_values = {sort_key: _compile_sort_value(sort_key) for sort_key in sort_by}
         # If all orders for SortKeys are the same we can order the list in a single sort function call
         if len(distinct_sort_orders) == 1:
-            filtered_items.sort(
-                key=lambda x: [
-                    (
-                        elm
-                        if (elm := extract_nested_key_value(x, sort_key)) is not None
-                        else (
-                            "-1"
-                            if issubclass(extract_nested_key_type(x, sort_key), str)
-                            else -1
-                        )
-                    )
-                    for sort_key in sort_by.keys()
+            filtered.sort(
+                key=lambda projection: [
+                    sort_value(projection) for sort_value in sort_values.values()
                 ],
                 reverse=not distinct_sort_orders.pop(),
             )
-        # If orders for SortKeys are different we have to order list calling sort function a few times, once per each SortKey
+        # If orders for SortKeys are different, the list is sorted once per SortKey, from the last to the first one,
+        # each (stable) sort keeping the order of the previous ones for equal values
         elif len(distinct_sort_orders) > 1:
-            for sort_key, sort_order in sort_by.items():
-                filtered_items.sort(
-                    key=lambda x, y=sort_key: (  # type: ignore[misc]
-                        elm
-                        if (elm := extract_nested_key_value(x, y)) is not None
-                        else (
-                            "-1"
-                            if issubclass(extract_nested_key_type(x, y), str)
-                            else -1
-                        )
-                    ),
-                    reverse=not sort_order,
-                )
+            for sort_key, sort_order in reversed(sort_by.items()):
+                filtered.sort(key=sort_values[sort_key], reverse=not sort_order)
 
+        filtered_items = [projection.item for projection in filtered]
         span.add_attribute("call.num_output", len(filtered_items))
 
         return filtered_items
@@ -735,37 +710,32 @@ def service_level_generic_header_filtering(
                 "op": ComparisonOperator.CONTAINS,
             }
         filters = FilterDict.model_validate({"elements": filter_by})
+        predicates = [
+            _compile_filter(key, element.op, element.v)
+            for key, element in filters.elements.items()
+        ]
+        projections = [_ItemProjection(item) for item in items]
         if filter_operator == FilterOperator.AND:
             # Start from full list, then only keep items that match filter elements, one by one
-            filtered_items = items
+            filtered = projections
             # The list will decrease after each step (aka filtering out)
-            for key in filters.elements:
-                _values = filters.elements[key].v
-                _operator = filters.elements[key].op
-                filtered_items = [
-                    item
-                    for item in filtered_items
-                    if filter_aggregated_items(item, key, _values, _operator)
+            for predicate in predicates:
+                filtered = [
+                    projection for projection in filtered if predicate(projection)
                 ]
         else:
-            # Start from full list, then add items that match filter elements, one by one
-            _filtered_items = []
+            # Start from empty list, then add items that match filter elements, one by one
+            filtered = []
             # The list will increase after each step
-            for key in filters.elements:
-                _values = filters.elements[key].v
-                _operator = filters.elements[key].op
-                matching_items: list[Any] = [
-                    item
-                    for item in items
-                    if filter_aggregated_items(item, key, _values, _operator)
+            for predicate in predicates:
+                filtered += [
+                    projection for projection in projections if predicate(projection)
                 ]
-                _filtered_items += matching_items
-            filtered_items = _filtered_items
 
         # Return values for field_name
         extracted_values: list[Any] = []
-        for item in filtered_items:
-            extracted_value = extract_nested_key_value(item, field_name)
+        for projection in filtered:
+            extracted_value = projection.get(field_name)
             # The extracted value can be
             # * A list when the property associated with key is a list of objects
             # ** (e.g. categories.name.sponsor_preferred_name for an Objective Template)
@@ -822,28 +792,19 @@ def extract_properties_for_wildcard(item, prefix: str = ""):
         if isinstance(item, list | tuple) and len(item) > 0:
             return extract_properties_for_wildcard(item[0], prefix[:-1])
         # Otherwise, let's iterate over all the attributes of the single item we have
-        for attribute, attr_desc in item.model_fields.items():
-            # if we have marked a field to be removed from wildcard filtering we have to continue to next row
-            jse = attr_desc.json_schema_extra or {}
-            if jse.get("remove_from_wildcard", False):
-                continue
+        for attribute, is_nested_model in _wildcard_fields(type(item)):
+            value = getattr(item, attribute)
             # The attribute might be a non-class dictionary
             # In that case, we extract the first value and make a recursive call on it
-            if (
-                isinstance(getattr(item, attribute), dict)
-                and len(getattr(item, attribute)) > 0
-            ):
+            if isinstance(value, dict) and len(value) > 0:
                 output = output + extract_properties_for_wildcard(
-                    list(getattr(item, attribute).values())[0], attribute
+                    next(iter(value.values())), attribute
                 )
             # An attribute can be a nested class, which will inherit from Pydantic's BaseModel
             # In that case, we do a recursive call and add the attribute key of the class as a prefix, like "nested_class."
-            # Checking for isinstance of type will make sure that the attribute is a class before checking if it is a subclass
-            elif isinstance(get_field_type(attr_desc.annotation), type) and issubclass(
-                get_field_type(attr_desc.annotation), BaseModel
-            ):
+            elif is_nested_model:
                 output = output + extract_properties_for_wildcard(
-                    getattr(item, attribute), prefix=prefix + attribute
+                    value, prefix=prefix + attribute
                 )
             # Or a "plain" attribute
             else:
@@ -851,6 +812,31 @@ def extract_properties_for_wildcard(item, prefix: str = ""):
     return output
 
 
+@functools.cache
+def _wildcard_fields(model: type[BaseModel]) -> tuple[tuple[str, bool], ...]:
+    """
+    Fields of a model searched by wildcard filtering, with whether they hold nested models.
+
+    Fields marked with `remove_from_wildcard` are left out.
+    Resolved once per model class, as it only depends on the field annotations.
+    """
+
+    fields = []
+    for attribute, attr_desc in model.model_fields.items():
+        jse = attr_desc.json_schema_extra or {}
+        if jse.get("remove_from_wildcard", False):
+            continue
+        # Checking for isinstance of type will make sure that the attribute is a class before checking if it is a subclass
+        field_type = get_field_type(attr_desc.annotation)
+        fields.append(
+            (
+                attribute,
+                isinstance(field_type, type) and issubclass(field_type, BaseModel),
+            )
+        )
+    return tuple(fields)
+
+
 def filter_aggregated_items(item, filter_key, filter_values, filter_operator):
     if filter_key == "*":
         # Only accept requests with default operator (set to equal by FilterDict class) or specified contains operator
@@ -940,6 +926,214 @@ def apply_filter_operator(
     return value is None
 
 
+# ---------- Compiled filtering of generic_item_filtering and service_level_generic_header_filtering ----------
+# Filters and sort keys are compiled once per request into closures,
+# instead of resolving keys and operators again for each item,
+# and the values of an item are extracted once and shared by all filters and sort keys.
+# They behave like `filter_aggregated_items` and `apply_filter_operator`.
+
+
+_WILDCARD_TEXT_SEPARATOR = "\0"
+
+
+class _ItemProjection:
+    """
+    Values of an item by (dotted) key, and values searched by wildcard filtering,
+    extracted on first access.
+    """
+
+    __slots__ = ("item", "values", "wildcard_values", "wildcard_text")
+
+    def __init__(self, item: Any):
+        self.item = item
+        self.values: dict[str, Any] = {}
+        self.wildcard_values: list[Any] | None = None
+        self.wildcard_text: str | None = None
+
+    def get(self, key: str) -> Any:
+        if key in self.values:
+            return self.values[key]
+        value = self.values[key] = _compile_accessor(key)(self.item)
+        return value
+
+    def get_wildcard_values(self) -> list[Any]:
+        if self.wildcard_values is None:
+            self.wildcard_values = _extract_wildcard_values(
+                self.item, self.item, self.item, []
+            )
+        return self.wildcard_values
+
+    def get_wildcard_text(self) -> str:
+        """
+        Lowercase text of the values searched by wildcard filtering, separated by `_WILDCARD_TEXT_SEPARATOR`,
+        so that a "contains" filter checks the text once instead of each value.
+        Empty when there is no value (not even an empty string) to search.
+        """
+
+        if self.wildcard_text is None:
+            texts = []
+            for value in self.get_wildcard_values():
+                if isinstance(value, list):
+                    texts.extend(str(_val).lower() for _val in value)
+                elif isinstance(value, Enum):
+                    texts.append(str(value.value).lower())
+                else:
+                    texts.append(str(value).lower())
+            # a leading separator tells apart no value from a single empty value
+            self.wildcard_text = "".join(
+                _WILDCARD_TEXT_SEPARATOR + text for text in texts
+            )
+        return self.wildcard_text
+
+
+def _extract_wildcard_values(item, root, node, output: list[Any]) -> list[Any]:
+    """
+    Values of the keys returned by `extract_properties_for_wildcard(root)`, like `rgetattr(root, key)`.
+
+    Follows the same traversal, keeping the value resolved for the current prefix in `node`
+    instead of resolving each key again from the root item.
+    """
+
+    # item can be None - ignore if it is
+    if item:
+        # We only want to extract the property keys from one of the items in the list
+        if isinstance(item, list | tuple) and len(item) > 0:
+            return _extract_wildcard_values(item[0], root, node, output)
+        for attribute, is_nested_model in _wildcard_fields(type(item)):
+            value = getattr(item, attribute)
+            # unless lists were met on the way, the node is the item itself
+            node_value = value if node is item else _rgetattr_step(node, attribute)
+            if isinstance(value, dict) and len(value) > 0:
+                # extract_properties_for_wildcard prefixes these keys with the attribute only
+                _extract_wildcard_values(
+                    next(iter(value.values())),
+                    root,
+                    _rgetattr_step(root, attribute),
+                    output,
+                )
+            elif is_nested_model:
+                _extract_wildcard_values(value, root, node_value, output)
+            else:
+                output.append(node_value)
+    return output
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile_accessor(key: str) -> Callable[[Any], Any]:
+    """Compiled `rgetattr(obj, key)`"""
+
+    attributes = tuple(key.split("."))
+    if len(attributes) == 1:
+        return functools.partial(_rgetattr_step, attr=attributes[0])
+    return lambda obj: functools.reduce(_rgetattr_step, attributes, obj)
+
+
+def _compile_operator(operator, filter_values: list[Any]) -> Callable[[Any], bool]:
+    """Compiled `apply_filter_operator(value, operator, filter_values)`"""
+
+    if filter_values and operator is not None:
+        operator = ComparisonOperator(operator)
+        if operator == ComparisonOperator.EQUALS:
+            return lambda value: value in filter_values
+        if operator == ComparisonOperator.NOT_EQUALS:
+            return lambda value: value not in filter_values
+        if operator == ComparisonOperator.CONTAINS:
+            lowered = [str(_v).lower() for _v in filter_values]
+
+            def _contains(value) -> bool:
+                text = str(value).lower()
+                return any(_v in text for _v in lowered)
+
+            return _contains
+        first = filter_values[0]
+        if operator == ComparisonOperator.GREATER_THAN:
+            return lambda value: str(value) > first
+        if operator == ComparisonOperator.GREATER_THAN_OR_EQUAL_TO:
+            return lambda value: str(value) >= first
+        if operator == ComparisonOperator.LESS_THAN:
+            return lambda value: str(value) < first
+        if operator == ComparisonOperator.LESS_THAN_OR_EQUAL_TO:
+            return lambda value: str(value) <= first
+        if operator == ComparisonOperator.BETWEEN and len(filter_values) > 1:
+            low, high = (_v.lower() for _v in sorted(filter_values)[:2])
+            return lambda value: low <= str(value).lower() <= high
+
+    # null value filters and unsupported operators
+    return functools.partial(
+        apply_filter_operator, operator=operator, filter_values=filter_values
+    )
+
+
+def _compile_value_filter(operator, filter_values: list[Any]) -> Callable[[Any], bool]:
+    """Compiled filter of a value extracted by key, which can be a list of values or an Enum"""
+
+    apply = _compile_operator(operator, filter_values)
+
+    def _filter(value) -> bool:
+        # Filtering on a list of values is "if any of the values matches with the operator"
+        if isinstance(value, list):
+            if not filter_values:
+                return not value
+            return any(apply(_val) for _val in value)
+        if isinstance(value, Enum):
+            return apply(value.value)
+        return apply(value)
+
+    return _filter
+
+
+def _compile_filter(
+    filter_key: str, filter_operator, filter_values: list[Any]
+) -> Callable[[_ItemProjection], bool]:
+    """Compiled `filter_aggregated_items(item, filter_key, filter_values, filter_operator)`"""
+
+    if filter_key == "*":
+        # Only accept requests with default operator (set to equal by FilterDict class) or specified contains operator
+        ValidationException.raise_if(
+            ComparisonOperator(filter_operator) != ComparisonOperator.EQUALS
+            and ComparisonOperator(filter_operator) != ComparisonOperator.CONTAINS,
+            msg="Only the default 'contains' operator is supported for wildcard filtering.",
+        )
+        lowered = [str(_v).lower() for _v in filter_values]
+        if lowered and not any(_WILDCARD_TEXT_SEPARATOR in _v for _v in lowered):
+
+            def _contains(projection: _ItemProjection) -> bool:
+                text = projection.get_wildcard_text()
+                return bool(text) and any(_v in text for _v in lowered)
+
+            return _contains
+
+        value_filter = _compile_value_filter(ComparisonOperator.CONTAINS, filter_values)
+        return lambda projection: any(
+            value_filter(value) for value in projection.get_wildcard_values()
+        )
+
+    value_filter = _compile_value_filter(filter_operator, filter_values)
+    return lambda projection: value_filter(projection.get(filter_key))
+
+
+def _compile_sort_value(sort_key: str) -> Callable[[_ItemProjection], Any]:
+    """Sort value of an item, where null values are sorted like "-1" or -1 depending on the field type"""
+
+    null_values: dict[type, Any] = {}
+
+    def _sort_value(projection: _ItemProjection) -> Any:
+        value = projection.get(sort_key)
+        if value is not None:
+            return value
+        # the field type only depends on the model class
+        item_type = type(projection.item)
+        if item_type not in null_values:
+            null_values[item_type] = (
+                "-1"
+                if issubclass(extract_nested_key_type(projection.item, sort_key), str)
+                else -1
+            )
+        return null_values[item_type]
+
+    return _sort_value
+
+
 # Recursive getattr to access properties in nested objects
 def rgetattr(obj, attr):
     """
@@ -954,14 +1148,15 @@ def rgetattr(obj, attr):
         list | Any | None: The value of the attribute, or None if the attribute doesn't exist.
     """
 
-    def _getattr(obj, attr):
-        if isinstance(obj, list):
-            return [_getattr(element, attr) for element in obj]
-        if isinstance(obj, dict):
-            return [_getattr(element, attr) for element in obj.values()]
-        return getattr(obj, attr, None)
+    return functools.reduce(_rgetattr_step, attr.split("."), obj)
 
-    return functools.reduce(_getattr, attr.split("."), obj)
+
+def _rgetattr_step(obj, attr):
+    if isinstance(obj, list):
+        return [_rgetattr_step(element, attr) for element in obj]
+    if isinstance(obj, dict):
+        return [_rgetattr_step(element, attr) for element in obj.values()]
+    return getattr(obj, attr, None)
 
 
 def rgetattr_type(obj, attr):
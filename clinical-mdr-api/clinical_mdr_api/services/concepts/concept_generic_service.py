@@ -208,6 +208,8 @@ class ConceptGenericService(Generic[_AggregateRootType], ABC):
         sort_by: dict[str, bool] | None = None,
         page_number: int = 1,
         page_size: int = 0,
+        page_token: str | None = None,
+        total_count_mode: str | None = None,
         filter_by: dict[str, dict[str, Any]] | None = None,
         filter_operator: FilterOperator = FilterOperator.AND,
         total_count: bool = False,
@@ -219,6 +221,8 @@ class ConceptGenericService(Generic[_AggregateRootType], ABC):
             sort_by,
             page_number,
             page_size,
+            page_token,
+            total_count_mode,
             filter_by,
             filter_operator,
             total_count,
@@ -232,6 +236,8 @@ class ConceptGenericService(Generic[_AggregateRootType], ABC):
         sort_by: dict[str, bool] | None = None,
         page_number: int = 1,
         page_size: int = 0,
+        page_token: str | None = None,
+        total_count_mode: str | None = None,
         filter_by: dict[str, dict[str, Any]] | None = None,
         filter_operator: FilterOperator = FilterOperator.AND,
         total_count: bool = False,
@@ -248,6 +254,8 @@ class ConceptGenericService(Generic[_AggregateRootType], ABC):
             filter_operator=filter_operator,
             page_number=page_number,
             page_size=page_size,
+            page_token=page_token,
+            total_count_mode=total_count_mode,
             only_specific_status=only_specific_status,
             **kwargs,
         )
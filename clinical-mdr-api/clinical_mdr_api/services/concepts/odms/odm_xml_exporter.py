@@ -1,11 +1,11 @@
+import re
 from datetime import datetime, timezone
+from io import BytesIO
 from time import time
-from typing import Any
-from xml.dom.minidom import Document
+from typing import Any, Iterator
 
 from fastapi import UploadFile
 from lxml import etree
-from weasyprint import HTML
 
 from clinical_mdr_api.domains._utils import ObjectStatus, get_iso_lang_data
 from clinical_mdr_api.domains.concepts.odms.odm_xml_definition import (
@@ -51,13 +51,17 @@ from clinical_mdr_api.services.concepts.odms.odm_data_extractor import OdmDataEx
 from clinical_mdr_api.services.concepts.odms.odm_xml_stylesheets import (
     OdmXmlStylesheetService,
 )
-from clinical_mdr_api.services.utils.odm_xml_mapper import map_xml
+from clinical_mdr_api.services.utils.odm_xml_mapper import XML_NAMESPACE, map_xml
 from common.exceptions import BusinessLogicException
 
+# characters that are not allowed in XML 1.0 documents, not even escaped
+_XML_INVALID_CHARACTERS = re.compile(
+    "[^\u0009\u000a\u000d\u0020-\ud7ff\ue000-\ufffd\U00010000-\U0010ffff]"
+)
+
 
 class OdmXmlExporterService:
     odm_data_extractor: OdmDataExtractor
-    xml_document: Document
     odm: ODM
     used_vendor_namespaces: dict[str, dict[str, Any]]
     allowed_namespaces: list[str]
@@ -71,6 +75,7 @@ class OdmXmlExporterService:
     OSB_INSTRUCTION = "osb:instruction"
     OSB_SPONSOR_INSTRUCTION = "osb:sponsorInstruction"
     SDTM_MSG_COLOURS = ["#bfffff", "#ffff96", "#96ff96", "#ffbf9c", "#ffffff"]
+    STREAM_CHUNK_SIZE = 64 * 1024
 
     def __init__(
         self,
@@ -116,13 +121,6 @@ class OdmXmlExporterService:
                     self.used_vendor_namespaces[uid] = ext
 
         self.odm = self._create_odm_object()
-        self.xml_document = Document()
-        if self.stylesheet:
-            self.xml_document.appendChild(
-                self.xml_document.createProcessingInstruction(
-                    "xml-stylesheet", f'type="text/xsl" href="{stylesheet}"'
-                )
-            )
 
     def get_odm_document(self):
         """
@@ -134,87 +132,298 @@ class OdmXmlExporterService:
         Raises:
             BusinessLogicException: If an error occurs while generating the PDF.
         """
-        doc = self._generate_odm_xml(self.odm, self.xml_document)
+        if not self.pdf:
+            return b"".join(self.iter_odm_document())
 
-        map_xml(self.xml_document, self.mapper_file)
+        try:
+            if self.stylesheet is None:
+                raise BusinessLogicException(
+                    msg="Stylesheet is required for PDF generation."
+                )
 
-        rs = doc.toprettyxml(encoding="utf-8")
+            stylesheet_filename = OdmXmlStylesheetService.get_xml_filename_by_name(
+                self.stylesheet
+            )
+
+            root = self._build_odm_tree()
+            map_xml(root, self.mapper_file)
+
+            xslt = etree.parse(
+                stylesheet_filename, parser=etree.XMLParser(resolve_entities=False)
+            )
+            transform = etree.XSLT(
+                xslt, access_control=etree.XSLTAccessControl.DENY_ALL
+            )
 
-        if self.pdf:
-            try:
-                if self.stylesheet is None:
-                    raise BusinessLogicException(
-                        msg="Stylesheet is required for PDF generation."
+            # weasyprint is slow to import and only used for PDF exports
+            from weasyprint import HTML
+
+            rs = HTML(string=etree.tostring(transform(root.getroottree()))).write_pdf()
+        except Exception as exc:
+            raise BusinessLogicException(msg=exc.args[0]) from exc
+
+        return rs
+
+    def iter_odm_document(self) -> Iterator[bytes]:
+        """
+        Streams the pretty-printed ODM XML document in chunks of about `STREAM_CHUNK_SIZE` bytes.
+
+        The document is written straight from the ODM object tree by the incremental lxml writer,
+        it is never held in memory as a whole. The names and values of all elements are checked before the
+        first chunk is returned, so that an invalid document fails the request instead of truncating the response.
+        Only when a mapper file is given, the document is built as a tree first, as the mapping rules are applied on the tree.
+
+        Returns:
+            Iterator[bytes]: UTF-8 encoded chunks of the XML document.
+
+        Raises:
+            BusinessLogicException: If an element or attribute can't be written to XML.
+        """
+        namespaces = self._get_declared_namespaces()
+
+        if self.mapper_file:
+            # mapped right away, while the uploaded mapper file is still open
+            root = self._build_odm_tree(namespaces)
+            map_xml(root, self.mapper_file)
+            etree.indent(root, space="\t")
+            return iter(
+                [
+                    etree.tostring(
+                        root.getroottree(), xml_declaration=True, encoding="utf-8"
                     )
+                    + b"\n"
+                ]
+            )
 
-                stylesheet_filename = OdmXmlStylesheetService.get_xml_filename_by_name(
-                    self.stylesheet
-                )
+        self._validate_odm_element(self.odm, namespaces)
+        return self._iter_odm_xml_chunks(namespaces)
+
+    def _iter_odm_xml_chunks(self, namespaces: dict[str, str]) -> Iterator[bytes]:
+        buffer = BytesIO()
+        # the incremental writer can't write anything but elements at the document level
+        buffer.write(b'<?xml version="1.0" encoding="utf-8"?>\n')
+        if self.stylesheet:
+            buffer.write(
+                f'<?xml-stylesheet type="text/xsl" href="{self.stylesheet}"?>\n'.encode()
+            )
+
+        with etree.xmlfile(buffer, encoding="utf-8", buffered=False) as xf:
+            for _ in self._write_odm_element(xf, self.odm, "", namespaces):
+                if buffer.tell() >= self.STREAM_CHUNK_SIZE:
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+
+        buffer.write(b"\n")
+        yield buffer.getvalue()
+
+    def _write_odm_element(
+        self, xf, odm_element, indent: str, namespaces: dict[str, str]
+    ) -> Iterator[None]:
+        """
+        Writes an ODM element and its children with the incremental lxml writer, indented with tabs.
+
+        Args:
+            xf: The incremental writer of `etree.xmlfile`.
+            odm_element: The ODM element to write.
+            indent (str): The indentation of the XML element.
+            namespaces (dict[str, str]): The declared namespaces by their prefix.
+
+        Returns:
+            Iterator[None]: Yields after each written element, so that the caller can flush the output.
+        """
+        name, attributes, children = self._get_odm_element_parts(odm_element)
+
+        if not children and ":" not in name and not any(":" in k for k in attributes):
+            # only a standalone element is written as an empty element tag
+            xf.write(etree.Element(name, attributes))
+            yield
+            return
+
+        # the writer only knows the implicit xml prefix by its literal name
+        attrib = {
+            k if k.startswith("xml:") else self._qualified_name(k, namespaces): v
+            for k, v in attributes.items()
+        }
+        nsmap = (
+            {prefix: uri for prefix, uri in namespaces.items() if prefix != "xml"}
+            if odm_element is self.odm
+            else None
+        )
+        with xf.element(self._qualified_name(name, namespaces), attrib, nsmap=nsmap):
+            if len(children) == 1 and isinstance(children[0], str):
+                xf.write(children[0])
+            else:
+                for child in children:
+                    xf.write(f"\n{indent}\t")
+                    if isinstance(child, str):
+                        xf.write(child)
+                    else:
+                        yield from self._write_odm_element(
+                            xf, child, f"{indent}\t", namespaces
+                        )
+                if children:
+                    xf.write(f"\n{indent}")
+        yield
+
+    def _build_odm_tree(
+        self, namespaces: dict[str, str] | None = None
+    ) -> etree._Element:
+        """
+        Builds the ODM XML document as an lxml tree, for the mapper file and the XSLT transformation.
 
-                parser = etree.XMLParser(resolve_entities=False)
-                dom = etree.fromstring(rs, parser=parser)
-                xslt = etree.parse(stylesheet_filename, parser=parser)
-                transform = etree.XSLT(
-                    xslt, access_control=etree.XSLTAccessControl.DENY_ALL
+        Args:
+            namespaces (dict[str, str] | None): The declared namespaces by their prefix.
+
+        Returns:
+            etree._Element: The root element of the document.
+        """
+        if namespaces is None:
+            namespaces = self._get_declared_namespaces()
+
+        root = self._build_odm_element(self.odm, None, namespaces)
+        if self.stylesheet:
+            root.addprevious(
+                etree.ProcessingInstruction(
+                    "xml-stylesheet", f'type="text/xsl" href="{self.stylesheet}"'
                 )
+            )
+        return root
+
+    def _build_odm_element(
+        self, odm_element, parent: etree._Element | None, namespaces: dict[str, str]
+    ) -> etree._Element:
+        name, attributes, children = self._get_odm_element_parts(odm_element)
+        tag = self._qualified_name(name, namespaces)
+        attrib = {self._qualified_name(k, namespaces): v for k, v in attributes.items()}
+
+        if parent is None:
+            element = etree.Element(
+                tag,
+                attrib,
+                nsmap={
+                    prefix: uri for prefix, uri in namespaces.items() if prefix != "xml"
+                },
+            )
+        else:
+            element = etree.SubElement(parent, tag, attrib)
+
+        for child in children:
+            if not isinstance(child, str):
+                self._build_odm_element(child, element, namespaces)
+            elif len(element):
+                element[-1].tail = (element[-1].tail or "") + child
+            else:
+                element.text = (element.text or "") + child
+        return element
 
-                rs = HTML(string=etree.tostring(transform(dom))).write_pdf()
-            except Exception as exc:
-                raise BusinessLogicException(msg=exc.args[0]) from exc
+    def _validate_odm_element(self, odm_element, namespaces: dict[str, str]):
+        """
+        Checks that an ODM element and its children can be written to XML.
 
-        return rs
+        Args:
+            odm_element: The ODM element to check.
+            namespaces (dict[str, str]): The declared namespaces by their prefix.
+
+        Raises:
+            BusinessLogicException: If a name has an undeclared prefix or is not a valid XML name,
+            or if a value contains characters that are not allowed in XML.
+        """
+        name, attributes, children = self._get_odm_element_parts(odm_element)
+        self._qualified_name(name, namespaces)
+        for attribute_name, attribute_value in attributes.items():
+            self._qualified_name(attribute_name, namespaces)
+            self._validate_xml_text(attribute_value)
+
+        for child in children:
+            if isinstance(child, str):
+                self._validate_xml_text(child)
+            else:
+                self._validate_odm_element(child, namespaces)
+
+    @staticmethod
+    def _validate_xml_text(text: str):
+        BusinessLogicException.raise_if(
+            _XML_INVALID_CHARACTERS.search(text),
+            msg=f"'{text}' contains characters that are not allowed in XML.",
+        )
 
-    def _generate_odm_xml(self, odm_element, current_xml_element):
+    @staticmethod
+    def _qualified_name(name: str, namespaces: dict[str, str]) -> str:
         """
-        Generates an ODM XML document from an ODM element.
+        Resolves a prefixed name, like `osb:version`, to the `{namespace}local` notation of lxml.
 
         Args:
-            odm_element: The ODM element to generate the XML document from.
-            current_xml_element: The current XML element in the document.
+            name (str): The name to resolve.
+            namespaces (dict[str, str]): The declared namespaces by their prefix.
 
         Returns:
-            Document: The generated XML document.
+            str: The resolved name.
+
+        Raises:
+            BusinessLogicException: If the prefix is not declared, or if the name is not a valid XML name.
+        """
+        prefix, _, local_name = name.rpartition(":")
+        BusinessLogicException.raise_if(
+            prefix and prefix not in namespaces,
+            msg=f"Namespace prefix '{prefix}' of '{name}' is not declared.",
+        )
+
+        try:
+            return etree.QName(namespaces[prefix] if prefix else None, local_name).text
+        except ValueError as exc:
+            raise BusinessLogicException(
+                msg=f"'{name}' is not a valid XML name."
+            ) from exc
+
+    def _get_declared_namespaces(self) -> dict[str, str]:
+        """
+        Returns the namespaces declared by the `xmlns:` attributes of the ODM element, and the implicit `xml` namespace.
+        """
+        namespaces = {"xml": XML_NAMESPACE}
+        for attribute in vars(self.odm).values():
+            if isinstance(attribute, Attribute) and attribute.name.startswith("xmlns:"):
+                namespaces[attribute.name.removeprefix("xmlns:")] = str(attribute.value)
+        return namespaces
+
+    @staticmethod
+    def _get_odm_element_parts(odm_element) -> tuple[str, dict[str, str], list[Any]]:
+        """
+        Splits an ODM element into its XML element name, attributes and children.
+
+        `Attribute`s become XML attributes, except the namespace declarations.
+        Strings become text nodes, other values and the items of lists become child elements.
+
+        Args:
+            odm_element: The ODM element to split.
+
+        Returns:
+            tuple[str, dict[str, str], list[Any]]: The element name, the attributes and the children.
         """
         if hasattr(odm_element, "_custom_element_name") and isinstance(
             odm_element._custom_element_name, str
         ):
-            new_xml_element = self.xml_document.createElement(
-                odm_element._custom_element_name
-            )
+            name = odm_element._custom_element_name
         else:
-            new_xml_element = self.xml_document.createElement(
-                odm_element.__class__.__name__
-            )
+            name = odm_element.__class__.__name__
 
-        attributes = vars(odm_element).items()
+        attributes: dict[str, str] = {}
+        children: list[Any] = []
 
-        for attribute_name, attribute_value in attributes:
+        for attribute_name, attribute_value in vars(odm_element).items():
             if isinstance(attribute_value, Attribute):
-                attribute_value.value = str(attribute_value.value)
-                if ":" in attribute_value.name:
-                    prefix, _ = attribute_value.name.split(":")
-                    new_xml_element.setAttributeNS(
-                        prefix, attribute_value.name, attribute_value.value
-                    )
-                else:
-                    new_xml_element.setAttribute(
-                        attribute_value.name, attribute_value.value
-                    )
+                if not attribute_value.name.startswith("xmlns:"):
+                    attributes[attribute_value.name] = str(attribute_value.value)
             elif isinstance(attribute_value, str):
                 if attribute_name == "_custom_element_name":
                     continue
-                new_xml_element.appendChild(
-                    self.xml_document.createTextNode(attribute_value)
-                )
+                children.append(attribute_value)
             elif isinstance(attribute_value, list):
-                for odm_element_from_list in attribute_value:
-                    self._generate_odm_xml(odm_element_from_list, new_xml_element)
+                children.extend(attribute_value)
             else:
-                self._generate_odm_xml(attribute_value, new_xml_element)
-
-        current_xml_element.appendChild(new_xml_element)
+                children.append(attribute_value)
 
-        return self.xml_document
+        return name, attributes, children
 
     def _get_vendor_attributes_or_empty_dict(
         self, elements: dict[str, Attribute] | Any
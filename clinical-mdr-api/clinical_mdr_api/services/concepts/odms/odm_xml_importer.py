@@ -1,8 +1,11 @@
+import logging
 import re
-from time import time
+from time import perf_counter, time
+from typing import Callable
 from xml.dom import minicompat, minidom
 
 from fastapi import UploadFile
+from lxml import etree
 from neomodel import db
 
 from clinical_mdr_api.domain_repositories.concepts.odms.odm_generic_repository import (
@@ -128,6 +131,8 @@ from common.auth.user import user
 from common.config import settings
 from common.utils import strtobool
 
+log = logging.getLogger(__name__)
+
 
 class OdmXmlImporterService:
     _repos: MetaRepository
@@ -174,6 +179,20 @@ class OdmXmlImporterService:
     db_unit_definitions: list[UnitDefinitionModel]
     measurement_unit_names_by_oid: dict[str, str]
 
+    # lookups of the elements of the XML document and of the database nodes
+    # by their identifying values, filled once instead of scanning the lists for each def element
+    measurement_units_by_oid: dict[str, minidom.Element]
+    codelists_by_oid: dict[str, minidom.Element]
+    unit_definition_uids_by_name: dict[str, str]
+    vendor_attribute_uids_by: dict[tuple[str, str], str]
+    vendor_element_uids_by: dict[tuple[str, str], str]
+    vendor_element_attribute_uids_by: dict[tuple[str, str], str]
+    vendor_attribute_regexes_by_uid: dict[str, str | None]
+    libraries_by_name: dict[str, LibraryVO]
+
+    # element type -> (number of elements, duration in seconds) of the last import
+    import_statistics: dict[str, tuple[int, float]]
+
     mapper_file: UploadFile | None = None
 
     OSB_PREFIX = "osb"
@@ -225,29 +244,90 @@ class OdmXmlImporterService:
         self.db_ct_codelists = []
         self.db_unit_definitions = []
 
-        self.mapper_file = mapper_file
+        self.unit_definition_uids_by_name = {}
+        self.vendor_attribute_uids_by = {}
+        self.vendor_element_uids_by = {}
+        self.vendor_element_attribute_uids_by = {}
+        self.vendor_attribute_regexes_by_uid = {}
+        self.libraries_by_name = {}
+        self.import_statistics = {}
 
-        self.xml_document = minidom.parseString(xml_file.file.read())
+        self.mapper_file = mapper_file
 
-        map_xml(self.xml_document, mapper_file)
+        if mapper_file:
+            # the mapping rules are applied on an lxml tree
+            root = etree.parse(
+                xml_file.file, parser=etree.XMLParser(resolve_entities=False)
+            ).getroot()
+            map_xml(root, mapper_file)
+            self.xml_document = minidom.parseString(etree.tostring(root))
+        else:
+            # parse from the file object, expat reads it in chunks instead of copying the whole upload into memory first
+            self.xml_document = minidom.parse(xml_file.file)
 
         self._set_def_elements()
 
     @db.transaction
     def store_odm_xml(self):
-        self._set_vendor_namespaces()
-        self._create_missing_vendor_namespaces()
-        self._set_vendor_attributes()
-        self._set_vendor_elements()
+        self.import_statistics = {}
+
+        self._timed(
+            "lookups",
+            self._set_vendor_namespaces,
+            lambda: len(self.db_vendor_namespaces),
+        )
+        self._timed(
+            "vendor_namespaces",
+            self._create_missing_vendor_namespaces,
+            len(self.namespace_prefixes),
+        )
+        self._timed(
+            "lookups",
+            self._set_vendor_attributes,
+            lambda: len(self.db_vendor_attributes),
+        )
+        self._timed(
+            "lookups", self._set_vendor_elements, lambda: len(self.db_vendor_elements)
+        )
         if not self.db_unit_definitions:
-            self._set_unit_definitions()
-        self._set_ct_term_attributes()
-        self._create_methods_with_relations()
-        self._create_conditions_with_relations()
-        self._create_items_with_relations()
-        self._create_item_groups_with_relations()
-        self._create_forms_with_relations()
-        self._create_study_event_with_relations()
+            self._timed(
+                "lookups",
+                self._set_unit_definitions,
+                lambda: len(self.db_unit_definitions),
+            )
+        self._timed(
+            "lookups",
+            self._set_ct_term_attributes,
+            lambda: len(self.db_ct_term_attributes),
+        )
+        # Concepts are created and approved one by one through their services, see `_create` and `_approve`.
+        # Whether a concept already exists is decided by the validation of its aggregate on all of its values,
+        # an existing concept gets a new version and approving a concept cascades to the concepts using it,
+        # so they aren't written with batched queries.
+        self._timed(
+            "methods", self._create_methods_with_relations, len(self.method_defs)
+        )
+        self._timed(
+            "conditions",
+            self._create_conditions_with_relations,
+            len(self.condition_defs),
+        )
+        self._timed("items", self._create_items_with_relations, len(self.item_defs))
+        self._timed(
+            "item_groups",
+            self._create_item_groups_with_relations,
+            len(self.item_group_defs),
+        )
+        self._timed("forms", self._create_forms_with_relations, len(self.form_defs))
+        self._timed("study_events", self._create_study_event_with_relations, 1)
+
+        for element_type, (count, duration) in self.import_statistics.items():
+            log.info(
+                "ODM XML import: %i %s in %.0f ms",
+                count,
+                element_type,
+                duration * 1000,
+            )
 
         return {
             "vendor_namespaces": self._get_newly_created_vendor_namespaces(),
@@ -261,8 +341,36 @@ class OdmXmlImporterService:
             "methods": self._get_newly_created_methods(),
             "codelists": self._get_newly_created_codelists(),
             "terms": self._get_newly_created_terms(),
+            "import_statistics": {
+                element_type: {"count": count, "duration_ms": round(duration * 1000)}
+                for element_type, (count, duration) in self.import_statistics.items()
+            },
         }
 
+    def _timed(
+        self,
+        element_type: str,
+        step: Callable[[], None],
+        count: int | Callable[[], int] = 0,
+    ):
+        """
+        Runs an import step, adding its duration and element count to the import statistics.
+        The count of a lookup step is the number of database nodes it loaded, given as a callable evaluated after the step.
+        """
+
+        started = perf_counter()
+        step()
+        duration = perf_counter() - started
+        if callable(count):
+            count = count()
+        previous_count, previous_duration = self.import_statistics.get(
+            element_type, (0, 0.0)
+        )
+        self.import_statistics[element_type] = (
+            previous_count + count,
+            previous_duration + duration,
+        )
+
     def _set_def_elements(self):
         self.measurement_units = self.xml_document.getElementsByTagName(
             "MeasurementUnit"
@@ -274,6 +382,56 @@ class OdmXmlImporterService:
         self.method_defs = self.xml_document.getElementsByTagName("MethodDef")
         self.codelists = self.xml_document.getElementsByTagName("CodeList")
 
+        self.measurement_units_by_oid = {
+            measurement_unit.getAttribute("OID"): measurement_unit
+            for measurement_unit in self.measurement_units
+        }
+        self.codelists_by_oid = {
+            codelist.getAttribute("OID"): codelist for codelist in self.codelists
+        }
+
+    def _index_vendors(self):
+        """Indexes the known vendor attributes and elements by their namespace prefix and name"""
+
+        self.vendor_element_uids_by = {
+            (db_vendor_element.vendor_namespace.prefix, db_vendor_element.name): (
+                db_vendor_element.uid
+            )
+            for db_vendor_element in self.db_vendor_elements
+            if db_vendor_element.vendor_namespace
+        }
+        vendor_element_prefixes_by_uid = {
+            db_vendor_element.uid: db_vendor_element.vendor_namespace.prefix
+            for db_vendor_element in self.db_vendor_elements
+            if db_vendor_element.vendor_namespace
+        }
+
+        self.vendor_attribute_uids_by = {}
+        self.vendor_element_attribute_uids_by = {}
+        for db_vendor_attribute in self.db_vendor_attributes:
+            if db_vendor_attribute.vendor_namespace:
+                self.vendor_attribute_uids_by.setdefault(
+                    (
+                        db_vendor_attribute.vendor_namespace.prefix,
+                        db_vendor_attribute.name,
+                    ),
+                    db_vendor_attribute.uid,
+                )
+            if db_vendor_attribute.vendor_element and (
+                vendor_element_prefix := vendor_element_prefixes_by_uid.get(
+                    db_vendor_attribute.vendor_element.uid
+                )
+            ):
+                self.vendor_element_attribute_uids_by.setdefault(
+                    (vendor_element_prefix, db_vendor_attribute.name),
+                    db_vendor_attribute.uid,
+                )
+
+        self.vendor_attribute_regexes_by_uid = {
+            db_vendor_attribute.uid: db_vendor_attribute.value_regex
+            for db_vendor_attribute in self.db_vendor_attributes
+        }
+
     def _set_vendor_namespaces(self):
         odm_element = self.xml_document.getElementsByTagName("ODM")[0]
         for attribute in odm_element.attributes.values():
@@ -315,6 +473,8 @@ class OdmXmlImporterService:
             for concept_ar in rs
         ]
 
+        self._index_vendors()
+
     def _set_vendor_elements(self):
         vendor_element_uids = [
             vendor_element.uid
@@ -335,6 +495,8 @@ class OdmXmlImporterService:
             for concept_ar in rs
         ]
 
+        self._index_vendors()
+
     def _create_missing_vendor_namespaces(self):
         missing_prefixes = sorted(
             set(self.namespace_prefixes.keys())
@@ -405,7 +567,9 @@ class OdmXmlImporterService:
                     rs,
                 )
 
-        self.db_vendor_attributes.extend(new_vendor_attributes)
+        if new_vendor_attributes:
+            self.db_vendor_attributes.extend(new_vendor_attributes)
+            self._index_vendors()
 
     def _create_missing_vendor_elements(self, elements: minicompat.NodeList):
         new_vendor_elements: list[OdmVendorElement] = []
@@ -438,7 +602,9 @@ class OdmXmlImporterService:
                     rs,
                 )
 
-        self.db_vendor_elements.extend(new_vendor_elements)
+        if new_vendor_elements:
+            self.db_vendor_elements.extend(new_vendor_elements)
+            self._index_vendors()
 
     def _create_missing_vendor_element_attributes(self, elements: minicompat.NodeList):
         for element in elements:
@@ -462,13 +628,9 @@ class OdmXmlImporterService:
                         new_vendor_element_attributes,
                         OdmVendorAttributePostInput(
                             name=element_attribute.localName or "TBD",
-                            vendor_element_uid=next(
-                                db_vendor_element.uid
-                                for db_vendor_element in self.db_vendor_elements
-                                if db_vendor_element.vendor_namespace.prefix
-                                == element_attribute.prefix
-                                and db_vendor_element.name == element.localName
-                            ),
+                            vendor_element_uid=self.vendor_element_uids_by[
+                                (element_attribute.prefix, element.localName)
+                            ],
                         ),
                     )
 
@@ -478,7 +640,9 @@ class OdmXmlImporterService:
                         rs,
                     )
 
-            self.db_vendor_attributes.extend(new_vendor_element_attributes)
+            if new_vendor_element_attributes:
+                self.db_vendor_attributes.extend(new_vendor_element_attributes)
+                self._index_vendors()
 
     def _create_relationships_with_vendors(
         self,
@@ -517,33 +681,18 @@ class OdmXmlImporterService:
             ):
                 continue
 
-            vendor_attribute_uid = next(
-                db_vendor_attribute.uid
-                for db_vendor_attribute in self.db_vendor_attributes
-                if elm_attribute.localName == db_vendor_attribute.name
-                and (
-                    db_vendor_attribute.vendor_namespace
-                    and elm_attribute.prefix
-                    == db_vendor_attribute.vendor_namespace.prefix
-                )
-            )
-
             odm_vendor_relations.append(
                 OdmVendorRelationPostInput(
-                    uid=vendor_attribute_uid, value=elm_attribute.nodeValue
+                    uid=self.vendor_attribute_uids_by[
+                        (elm_attribute.prefix, elm_attribute.localName)
+                    ],
+                    value=elm_attribute.nodeValue,
                 )
             )
 
-            vendor_attribute_patterns = (
-                self.odm_vendor_attribute_service.get_regex_patterns_of_attributes(
-                    [
-                        odm_vendor_relation.uid
-                        for odm_vendor_relation in odm_vendor_relations
-                    ]
-                )
-            )
+        if odm_vendor_relations:
             self.odm_vendor_attribute_service.attribute_values_matches_their_regex(
-                odm_vendor_relations, vendor_attribute_patterns
+                odm_vendor_relations, self.vendor_attribute_regexes_by_uid
             )
             self.odm_vendor_attribute_service.are_attributes_vendor_compatible(
                 odm_vendor_relations, compatible_type
@@ -576,20 +725,11 @@ class OdmXmlImporterService:
             ):
                 continue
 
-            vendor_element_uid = next(
-                db_vendor_element.uid
-                for db_vendor_element in self.db_vendor_elements
-                if child_element.localName == db_vendor_element.name
-                and (
-                    db_vendor_element.vendor_namespace
-                    and child_element.prefix
-                    == db_vendor_element.vendor_namespace.prefix
-                )
-            )
-
             odm_vendor_relations.append(
                 OdmVendorElementRelationPostInput(
-                    uid=vendor_element_uid,
+                    uid=self.vendor_element_uids_by[
+                        (child_element.prefix, child_element.localName)
+                    ],
                     value=(
                         child_element.firstChild.nodeValue
                         if child_element.firstChild
@@ -598,6 +738,7 @@ class OdmXmlImporterService:
                 )
             )
 
+        if odm_vendor_relations:
             self.odm_vendor_element_service.are_elements_vendor_compatible(
                 odm_vendor_relations, compatible_type
             )
@@ -640,28 +781,14 @@ class OdmXmlImporterService:
                 ):
                     continue
 
-                vendor_element_attribute_uid = next(
-                    db_vendor_attribute.uid
-                    for db_vendor_attribute in self.db_vendor_attributes
-                    if child_element_attribute.localName == db_vendor_attribute.name
-                    and (
-                        db_vendor_attribute.vendor_element
-                        and child_element_attribute.prefix
-                        == next(
-                            (
-                                db_vendor_element.vendor_namespace.prefix
-                                for db_vendor_element in self.db_vendor_elements
-                                if db_vendor_element.uid
-                                == db_vendor_attribute.vendor_element.uid
-                            ),
-                            None,
-                        )
-                    )
-                )
-
                 odm_vendor_relations.append(
                     OdmVendorRelationPostInput(
-                        uid=vendor_element_attribute_uid,
+                        uid=self.vendor_element_attribute_uids_by[
+                            (
+                                child_element_attribute.prefix,
+                                child_element_attribute.localName,
+                            )
+                        ],
                         value=child_element_attribute.nodeValue,
                     )
                 )
@@ -681,13 +808,7 @@ class OdmXmlImporterService:
         ):
             return True
 
-        for db_vendor_attribute in self.db_vendor_attributes:
-            if vendor_attribute_name == db_vendor_attribute.name and (
-                db_vendor_attribute.vendor_namespace
-                and prefix == db_vendor_attribute.vendor_namespace.prefix
-            ):
-                return True
-        return False
+        return (prefix, vendor_attribute_name) in self.vendor_attribute_uids_by
 
     def vendor_element_exists(self, prefix, vendor_element_name):
         if (
@@ -696,13 +817,7 @@ class OdmXmlImporterService:
         ):
             return True
 
-        for db_vendor_element in self.db_vendor_elements:
-            if vendor_element_name == db_vendor_element.name and (
-                db_vendor_element.vendor_namespace
-                and prefix == db_vendor_element.vendor_namespace.prefix
-            ):
-                return True
-        return False
+        return (prefix, vendor_element_name) in self.vendor_element_uids_by
 
     def _vendor_element_attribute_exists(self, prefix, vendor_attribute_name):
         if (
@@ -711,22 +826,7 @@ class OdmXmlImporterService:
         ):
             return True
 
-        for db_vendor_attribute in self.db_vendor_attributes:
-            if vendor_attribute_name == db_vendor_attribute.name and (
-                db_vendor_attribute.vendor_element
-                and prefix
-                == next(
-                    (
-                        db_vendor_element.vendor_namespace.prefix
-                        for db_vendor_element in self.db_vendor_elements
-                        if db_vendor_element.uid
-                        == db_vendor_attribute.vendor_element.uid
-                    ),
-                    None,
-                )
-            ):
-                return True
-        return False
+        return (prefix, vendor_attribute_name) in self.vendor_element_attribute_uids_by
 
     def _set_unit_definitions(self):
         measurement_unit_names = {
@@ -746,6 +846,10 @@ class OdmXmlImporterService:
             )
             for unit_definition_ar in rs
         ]
+        self.unit_definition_uids_by_name = {
+            db_unit_definition.name: db_unit_definition.uid
+            for db_unit_definition in self.db_unit_definitions
+        }
 
     def _set_ct_term_attributes(self):
         rs, _count = (
@@ -902,6 +1006,8 @@ class OdmXmlImporterService:
             self._approve(self._repos.odm_item_repository, self.odm_item_service, rs)
 
     def _create_item_groups_with_relations(self):
+        item_uids_by_oid = {db_item.oid: db_item.uid for db_item in self.db_items}
+
         for item_group_def in self.item_group_defs:
             self._create_missing_vendors(item_group_def)
 
@@ -924,14 +1030,7 @@ class OdmXmlImporterService:
             for item_ref in item_group_def.getElementsByTagName("ItemRef"):
                 self._create_missing_vendor_attributes(item_ref.attributes.values())
 
-                item_uid = next(
-                    (
-                        db_item.uid
-                        for db_item in self.db_items
-                        if db_item.oid == item_ref.getAttribute("ItemOID")
-                    ),
-                    None,
-                )
+                item_uid = item_uids_by_oid.get(item_ref.getAttribute("ItemOID"))
 
                 if not item_uid:
                     raise exceptions.BusinessLogicException(
@@ -968,6 +1067,11 @@ class OdmXmlImporterService:
             )
 
     def _create_forms_with_relations(self):
+        item_group_uids_by_oid = {
+            db_item_group.oid: db_item_group.uid
+            for db_item_group in self.db_item_groups
+        }
+
         for form_def in self.form_defs:
             self._create_missing_vendors(form_def)
 
@@ -991,14 +1095,8 @@ class OdmXmlImporterService:
                     item_group_ref.attributes.values()
                 )
 
-                item_group_uid = next(
-                    (
-                        db_item_group.uid
-                        for db_item_group in self.db_item_groups
-                        if db_item_group.oid
-                        == item_group_ref.getAttribute("ItemGroupOID")
-                    ),
-                    None,
+                item_group_uid = item_group_uids_by_oid.get(
+                    item_group_ref.getAttribute("ItemGroupOID")
                 )
 
                 if not item_group_uid:
@@ -1413,8 +1511,7 @@ class OdmXmlImporterService:
         )[0]
 
         rs.sort(key=lambda elm: elm[0].uid)
-        print("ååååå")
-        print(rs)
+
         return [
             CTTerm.from_ct_term_ars(
                 ct_term_name_ar, ct_term_attributes_ar, ct_term_codelists
@@ -1423,6 +1520,9 @@ class OdmXmlImporterService:
         ]
 
     def _get_library(self, concept_input):
+        if concept_input.library_name in self.libraries_by_name:
+            return self.libraries_by_name[concept_input.library_name]
+
         exceptions.BusinessLogicException.raise_if_not(
             self._repos.library_repository.library_exists(
                 normalize_string(concept_input.library_name)
@@ -1430,10 +1530,12 @@ class OdmXmlImporterService:
             msg=f"Library with Name '{concept_input.library_name}' doesn't exist.",
         )
 
-        return LibraryVO.from_input_values_2(
+        library_vo = LibraryVO.from_input_values_2(
             library_name=concept_input.library_name,
             is_library_editable_callback=is_library_editable,
         )
+        self.libraries_by_name[concept_input.library_name] = library_vo
+        return library_vo
 
     @staticmethod
     def _get_codelist_description_translatedtext_value(codelist):
@@ -1453,17 +1555,11 @@ class OdmXmlImporterService:
 
         item_unit_definitions = self._get_item_unit_definition_inputs(item_def)
 
-        codelist = next(
-            (
-                codelist
-                for codelist in self.codelists
-                if item_def.getElementsByTagName("CodeListRef")
-                and codelist.getAttribute("OID")
-                == item_def.getElementsByTagName("CodeListRef")[0].getAttribute(
-                    "CodeListOID"
-                )
-            ),
-            None,
+        codelist_refs = item_def.getElementsByTagName("CodeListRef")
+        codelist = (
+            self.codelists_by_oid.get(codelist_refs[0].getAttribute("CodeListOID"))
+            if codelist_refs
+            else None
         )
 
         input_terms = []
@@ -1692,10 +1788,6 @@ class OdmXmlImporterService:
         )
 
     def _get_item_unit_definition_inputs(self, item_def):
-        mu_oid_map = {mu.getAttribute("OID"): mu for mu in self.measurement_units}
-
-        unit_name_to_uid = {ud.name: ud.uid for ud in self.db_unit_definitions}
-
         measurement_unit_oids = [
             ref.getAttribute("MeasurementUnitOID")
             for ref in item_def.getElementsByTagName("MeasurementUnitRef")
@@ -1703,13 +1795,13 @@ class OdmXmlImporterService:
 
         uids = []
         for mu_oid in measurement_unit_oids:
-            mu = mu_oid_map.get(mu_oid)
+            mu = self.measurement_units_by_oid.get(mu_oid)
             if not mu:
                 raise exceptions.BusinessLogicException(
                     msg=f"MeasurementUnit with OID '{mu_oid}' was not provided."
                 )
             unit_name = mu.getAttribute("Name").removeprefix("mu.")
-            uid = unit_name_to_uid.get(unit_name)
+            uid = self.unit_definition_uids_by_name.get(unit_name)
             if not uid:
                 raise exceptions.BusinessLogicException(
                     msg=f"MeasurementUnit with Name '{unit_name}' doesn't exist."
@@ -1724,17 +1816,11 @@ class OdmXmlImporterService:
             if ":" in name:
                 prefix, local_name = name.split(":")
 
-                vendor_attribute_uid = next(
-                    db_vendor_attribute.uid
-                    for db_vendor_attribute in self.db_vendor_attributes
-                    if local_name == db_vendor_attribute.name
-                    and (
-                        db_vendor_attribute.vendor_namespace
-                        and prefix == db_vendor_attribute.vendor_namespace.prefix
-                    )
-                )
                 rs.append(
-                    OdmVendorRelationPostInput(uid=vendor_attribute_uid, value=value)
+                    OdmVendorRelationPostInput(
+                        uid=self.vendor_attribute_uids_by[(prefix, local_name)],
+                        value=value,
+                    )
                 )
         return rs
 
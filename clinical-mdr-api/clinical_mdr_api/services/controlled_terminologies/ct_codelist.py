@@ -236,6 +236,8 @@ class CTCodelistService:
         sort_by: dict[str, bool] | None = None,
         page_number: int = 1,
         page_size: int = 0,
+        page_token: str | None = None,
+        total_count_mode: str | None = None,
         filter_by: dict[str, dict[str, Any]] | None = None,
         filter_operator: FilterOperator = FilterOperator.AND,
         total_count: bool = False,
@@ -255,6 +257,8 @@ class CTCodelistService:
                 filter_operator=filter_operator,
                 page_number=page_number,
                 page_size=page_size,
+                page_token=page_token,
+                total_count_mode=total_count_mode,
                 term_filter=term_filter,
             )
         )
@@ -543,6 +547,8 @@ class CTCodelistService:
         sort_by: dict[str, bool] | None = None,
         page_number: int = 1,
         page_size: int = 0,
+        page_token: str | None = None,
+        total_count_mode: str | None = None,
         filter_by: dict[str, dict[str, Any]] | None = None,
         filter_operator: FilterOperator = FilterOperator.AND,
         total_count: bool = False,
@@ -561,6 +567,8 @@ class CTCodelistService:
                 filter_operator=filter_operator,
                 page_number=page_number,
                 page_size=page_size,
+                page_token=page_token,
+                total_count_mode=total_count_mode,
             )
         )
 
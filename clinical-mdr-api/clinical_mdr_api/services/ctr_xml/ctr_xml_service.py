@@ -1,11 +1,17 @@
 from datetime import datetime, timezone
 from functools import cached_property
+from io import StringIO
+from threading import Lock
+from typing import Iterator
 
 # pylint: disable=wrong-import-order # disagreement between isort and pylint
 import ctrxml
 from xsdata.formats.dataclass.serializers import XmlSerializer
 from xsdata.formats.dataclass.serializers.config import SerializerConfig
+from xsdata.formats.dataclass.serializers.mixins import XmlWriterEvent
+from xsdata.formats.dataclass.serializers.writers.native import XmlEventWriter
 from xsdata.models.datatype import XmlDateTime
+from xsdata.utils.namespaces import clean_prefixes
 
 from clinical_mdr_api.domains._utils import get_iso_lang_data
 from clinical_mdr_api.domains.study_definition_aggregates.study_metadata import (
@@ -36,8 +42,14 @@ from clinical_mdr_api.services.controlled_terminologies.ct_codelist_attributes i
 from clinical_mdr_api.services.projects.project import ProjectService
 from clinical_mdr_api.services.studies.study import StudyService
 from clinical_mdr_api.services.studies.study_visit import StudyVisitService
+from common.cache import cache_registry
 from common.exceptions import BusinessLogicException
 
+# Generated CTR ODM documents of specific study versions, keyed by (study_uid, study_value_version).
+# Documents can run into megabytes, only the few most recently requested ones are kept.
+cache_store_ctr_odm = cache_registry.register_ttl_cache("study.ctr_odm", maxsize=16)
+lock_store_ctr_odm = Lock()
+
 
 def iso639_shortest(code: str) -> str:
     """Convert a language code to the shortest ISO 639 code, suitable value for xml:lang attribute"""
@@ -47,7 +59,10 @@ def iso639_shortest(code: str) -> str:
 class CTRXMLService:
     """Assemble and visualize Study Protocol Flowchart data"""
 
-    serializer = XmlSerializer(config=SerializerConfig(indent="  "))
+    # the native writer writes the output as it goes, unlike the lxml one picked by default, see `_iter_serialized`
+    serializer = XmlSerializer(
+        config=SerializerConfig(indent="  "), writer=XmlEventWriter
+    )
 
     namespaces = {
         None: "http://www.cdisc.org/ns/odm/v1.3",
@@ -56,17 +71,92 @@ class CTRXMLService:
         "sdm": "http://www.cdisc.org/ns/studydesign/v1.0",
     }
 
-    def get_ctr_odm(self, study_uid: str):
-        odm_builder = ODMBuilder(study_uid)
-        odm = odm_builder.get_odm()
-        return self.serializer.render(odm, ns_map=self.namespaces)
+    STREAM_CHUNK_SIZE = 64 * 1024
+
+    def get_ctr_odm(self, study_uid: str, study_value_version: str | None = None):
+        """
+        Returns the CTR ODM XML document of a study.
+
+        Documents of a specific study version (locked or released) are generated once and cached,
+        the document of the latest version of the study is generated on every call, unless the study is locked.
+        """
+        if study_value_version is None:
+            # the latest version of a locked study is its latest locked version, cached under that version
+            study_value_version = StudyService.get_locked_study_value_version(study_uid)
+
+        if study_value_version is None:
+            odm = ODMBuilder(study_uid).get_odm()
+            return self.serializer.render(odm, ns_map=self.namespaces)
+
+        cache_key = (study_uid, study_value_version)
+        with lock_store_ctr_odm:
+            document = cache_store_ctr_odm.get(cache_key)
+
+        if document is None:
+            odm = ODMBuilder(study_uid, study_value_version).get_odm()
+            document = self.serializer.render(odm, ns_map=self.namespaces)
+            with lock_store_ctr_odm:
+                cache_store_ctr_odm[cache_key] = document
+
+        return document
+
+    def iter_ctr_odm(
+        self, study_uid: str, study_value_version: str | None = None
+    ) -> Iterator[bytes]:
+        """
+        Returns the CTR ODM XML document of a study in UTF-8 encoded chunks of about `STREAM_CHUNK_SIZE` bytes.
+
+        The document of the latest version of a draft study is serialized while streamed, it is never held in memory as a whole.
+        The data of the document is fetched before returning, so that errors are raised before the response starts.
+        """
+        if study_value_version is None:
+            study_value_version = StudyService.get_locked_study_value_version(study_uid)
+
+        if study_value_version is not None:
+            document = self.get_ctr_odm(study_uid, study_value_version)
+            return (
+                document[start : start + self.STREAM_CHUNK_SIZE].encode("utf-8")
+                for start in range(0, len(document), self.STREAM_CHUNK_SIZE)
+            )
+
+        odm = ODMBuilder(study_uid).get_odm()
+        return self._iter_serialized(odm)
+
+    def _iter_serialized(self, odm: ctrxml.Odm) -> Iterator[bytes]:
+        # Feeds the writer of the serializer event by event, like `XmlSerializer.write` does,
+        # yielding its output whenever a chunk is complete
+        output = StringIO()
+        writer = self.serializer.writer(
+            config=self.serializer.config,
+            output=output,
+            ns_map=clean_prefixes(self.namespaces),
+        )
+        handlers = {
+            XmlWriterEvent.START: writer.start_tag,
+            XmlWriterEvent.END: writer.end_tag,
+            XmlWriterEvent.ATTR: writer.add_attribute,
+            XmlWriterEvent.DATA: writer.set_data,
+        }
+
+        writer.start_document()
+        for name, *args in self.serializer.generate(odm):
+            handlers[name](*args)
+            if output.tell() >= self.STREAM_CHUNK_SIZE:
+                yield output.getvalue().encode("utf-8")
+                output.seek(0)
+                output.truncate()
+        writer.end_document()
+
+        yield output.getvalue().encode("utf-8")
 
 
 class ODMBuilder:
     study_uid: str
+    study_value_version: str | None
 
-    def __init__(self, study_uid: str):
+    def __init__(self, study_uid: str, study_value_version: str | None = None):
         self.study_uid = study_uid
+        self.study_value_version = study_value_version
 
     @cached_property
     def project(self) -> Project:
@@ -87,7 +177,9 @@ class ODMBuilder:
             StudyComponentEnum.STUDY_INTERVENTION,
         ]
         study = StudyService().get_by_uid(
-            uid=self.study_uid, include_sections=include_sections
+            uid=self.study_uid,
+            include_sections=include_sections,
+            study_value_version=self.study_value_version,
         )
         BusinessLogicException.raise_if(
             study.current_metadata is None, msg="Missing study metadata"
@@ -96,7 +188,9 @@ class ODMBuilder:
 
     @cached_property
     def study_visits(self) -> list[StudyVisit]:
-        result = StudyVisitService.get_all_visits(self.study_uid)
+        result = StudyVisitService.get_all_visits(
+            self.study_uid, study_value_version=self.study_value_version
+        )
         return result.items
 
     @property
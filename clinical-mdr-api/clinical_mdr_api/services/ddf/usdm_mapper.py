@@ -1,10 +1,12 @@
 import re
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
 from itertools import chain
-from typing import Any, Callable
+from typing import Any, Callable, Iterable
 
 from neomodel import db
+from opencensus.common.runtime_context import RuntimeContext
 from usdm_info import __model_version__ as usdm_package_version
 from usdm_model import Activity as USDMActivity
 from usdm_model import AliasCode as USDMAliasCode
@@ -60,6 +62,26 @@ DDF_TIMING_TYPE_BEFORE = "C201357"
 DDF_TIMING_TYPE_FIXED = "C201358"
 DDF_TIME_RELATIVE_TO_FROM_START_TO_START = "C201355"
 
+# Codes of the DDF CT package used by the mapping regardless of the study data
+DDF_CT_PACKAGE_CODES = (
+    DDF_STUDY_ARM_DATA_ORIGIN_TYPE_GENERATED_WITHIN_STUDY,
+    DDF_STUDY_POPULATION_DURATION_UNIT_DAYS,
+    DDF_STUDY_POPULATION_DURATION_UNIT_WEEKS,
+    DDF_STUDY_POPULATION_DURATION_UNIT_MONTHS,
+    DDF_STUDY_POPULATION_DURATION_UNIT_YEARS,
+    DDF_STUDY_POPULATION_ENROLLMENT_NUMBER_UNIT,
+    DDF_STUDY_PROTOCOL_STATUS_DRAFT,
+    DDF_STUDY_PROTOCOL_STATUS_FINAL,
+    DDF_STUDY_POPULATION_SEX_BOTH,
+    DDF_STUDY_POPULATION_SEX_FEMALE,
+    DDF_STUDY_POPULATION_SEX_MALE,
+    DDF_STUDY_OFFICIAL_TITLE,
+    DDF_TIMING_TYPE_AFTER,
+    DDF_TIMING_TYPE_BEFORE,
+    DDF_TIMING_TYPE_FIXED,
+    DDF_TIME_RELATIVE_TO_FROM_START_TO_START,
+)
+
 
 def get_ddf_timing_iso_duration_value(time_value: int, time_unit_name: str) -> str:
     timing_value = "P"
@@ -130,6 +152,174 @@ class USDMMapper:
         self._get_osb_activity_schedules = get_osb_activity_schedules
         self._id_manager = IdManager()
 
+        # study components fetched at once by `map`, see `_fetch_osb_study_components`
+        self._osb_study_components: dict[str, list] | None = None
+        # (library name, decode) of the CT package and dictionary terms by code, None for unknown codes
+        self._ct_package_terms: dict[str, tuple[str, str] | None] = {}
+        self._dictionary_terms: dict[str, tuple[str, str] | None] = {}
+
+    def _get_osb_study_component_fetchers(
+        self, study_value_version: str | None = None
+    ) -> dict[str, Callable[[str], list]]:
+        return {
+            "design_cells": lambda study_uid: self._get_osb_study_design_cells(
+                study_uid, study_value_version=study_value_version
+            ),
+            "arms": lambda study_uid: self._get_osb_study_arms(
+                study_uid, study_value_version=study_value_version
+            ).items,
+            "epochs": lambda study_uid: self._get_osb_study_epochs(
+                study_uid, study_value_version=study_value_version
+            ).items,
+            "elements": lambda study_uid: self._get_osb_study_elements(
+                study_uid, study_value_version=study_value_version
+            ).items,
+            "endpoints": lambda study_uid: self._get_osb_study_endpoints(
+                study_uid, no_brackets=True, study_value_version=study_value_version
+            ).items,
+            "visits": lambda study_uid: self._get_osb_study_visits(
+                study_uid, study_value_version=study_value_version
+            ).items,
+            "activities": lambda study_uid: self._get_osb_study_activities(
+                study_uid, study_value_version=study_value_version
+            ).items,
+            "activity_schedules": lambda study_uid: self._get_osb_activity_schedules(
+                study_uid, study_value_version=study_value_version
+            ),
+        }
+
+    def _fetch_osb_study_components(
+        self, study_uid: str, study_value_version: str | None = None
+    ) -> dict[str, list]:
+        """Fetches all the study components mapped to USDM in parallel"""
+
+        with ThreadPoolExecutor() as executor:
+            futures = {
+                component: executor.submit(
+                    RuntimeContext.with_current_context(fetcher), study_uid
+                )
+                for component, fetcher in self._get_osb_study_component_fetchers(
+                    study_value_version
+                ).items()
+            }
+        return {component: future.result() for component, future in futures.items()}
+
+    def _get_osb_study_component(self, component: str, study_uid: str) -> list:
+        """Returns a study component fetched by `map`, or fetches it when mapping parts of the study on their own"""
+
+        if self._osb_study_components is not None:
+            return self._osb_study_components[component]
+        return self._get_osb_study_component_fetchers()[component](study_uid)
+
+    def _resolve_usdm_codes(
+        self,
+        ct_package_concept_ids: Iterable[str] = (),
+        dictionary_term_uids: Iterable[str] = (),
+    ):
+        """Looks up the given CT package and dictionary codes at once, keeping them for the `get_*_as_usdm_code` methods"""
+
+        ct_package_concept_ids = list(
+            set(ct_package_concept_ids) - self._ct_package_terms.keys()
+        )
+        dictionary_term_uids = list(
+            set(dictionary_term_uids) - self._dictionary_terms.keys()
+        )
+        if not ct_package_concept_ids and not dictionary_term_uids:
+            return
+
+        query = """
+            CALL {
+                UNWIND $concept_ids AS code
+                MATCH (l:Library)-[:CONTAINS_TERM]->(cttr:CTTermRoot)-[:HAS_ATTRIBUTES_ROOT]->()-[:LATEST]->(cttav)
+                WHERE cttr.uid STARTS WITH code
+                RETURN "ct" AS kind, code, l.name AS library_name, cttav.preferred_term AS decode
+                UNION
+                UNWIND $term_uids AS code
+                MATCH (l:Library)-[:CONTAINS_DICTIONARY_TERM]->(dtr:DictionaryTermRoot)-[:LATEST]->(dtv)
+                WHERE dtr.uid STARTS WITH code
+                RETURN "dictionary" AS kind, code, l.name AS library_name, dtv.name AS decode
+            }
+            RETURN kind, code, library_name, decode
+        """
+        result, _ = db.cypher_query(
+            query,
+            {
+                "concept_ids": ct_package_concept_ids,
+                "term_uids": dictionary_term_uids,
+            },
+        )
+
+        self._ct_package_terms.update(dict.fromkeys(ct_package_concept_ids))
+        self._dictionary_terms.update(dict.fromkeys(dictionary_term_uids))
+        for kind, code, library_name, decode in result:
+            terms = self._ct_package_terms if kind == "ct" else self._dictionary_terms
+            if terms[code] is None:
+                terms[code] = (library_name, decode)
+
+    def _resolve_study_usdm_codes(self, study: OSBStudy):
+        """Looks up all the codes the mapping of the study needs at once"""
+
+        osb_current_metadata = getattr(study, "current_metadata", None)
+        osb_study_design = getattr(
+            osb_current_metadata, "high_level_study_design", None
+        )
+        osb_study_intervention = getattr(
+            osb_current_metadata, "study_intervention", None
+        )
+        osb_study_population = getattr(osb_current_metadata, "study_population", None)
+
+        ct_terms = [
+            getattr(osb_study_intervention, "intervention_model_code", None),
+            getattr(osb_study_intervention, "control_type_code", None),
+            getattr(osb_study_intervention, "trial_blinding_schema_code", None),
+            getattr(osb_study_intervention, "intervention_type_code", None),
+            *(getattr(osb_study_intervention, "trial_intent_types_codes", None) or []),
+        ]
+        ct_terms.extend(
+            sa.arm_type for sa in self._get_osb_study_component("arms", study.uid)
+        )
+        ct_terms.extend(
+            se.epoch_type_ctterm
+            for se in self._get_osb_study_component("epochs", study.uid)
+        )
+        for se in self._get_osb_study_component("endpoints", study.uid):
+            ct_terms.append(se.endpoint_level)
+            if se.study_objective is not None:
+                ct_terms.append(se.study_objective.objective_level)
+
+        ct_package_concept_ids = [
+            *DDF_CT_PACKAGE_CODES,
+            *(term.term_uid for term in ct_terms if term),
+        ]
+        for sv in self._get_osb_study_component("visits", study.uid):
+            ct_package_concept_ids.extend(
+                (sv.visit_type_uid, sv.visit_contact_mode_uid)
+            )
+        for code in (
+            getattr(osb_study_design, "trial_phase_code", None),
+            getattr(osb_study_design, "study_type_code", None),
+        ):
+            if code:
+                ct_package_concept_ids.append(
+                    extract_c_code_from_simple_term(code.term_uid)
+                )
+
+        self._resolve_usdm_codes(
+            ct_package_concept_ids=(
+                concept_id
+                for concept_id in ct_package_concept_ids
+                if concept_id is not None
+            ),
+            dictionary_term_uids=(
+                term.term_uid
+                for term in getattr(
+                    osb_study_population, "therapeutic_area_codes", None
+                )
+                or []
+                if term and term.term_uid is not None
+            ),
+        )
+
     def get_void_usdm_code(self):
         return USDMCode(
             id=self._id_manager.get_id(USDMCode.__name__, "VOID_CODE"),
@@ -143,27 +333,17 @@ class USDMMapper:
     def get_ct_package_term_as_usdm_code(self, concept_id: str | None) -> USDMCode:
         if concept_id is None:
             return self.get_void_usdm_code()
-        query = """
-            MATCH (l:Library)-[:CONTAINS_TERM]->(cttr:CTTermRoot)-[:HAS_ATTRIBUTES_ROOT]->()-[:LATEST]->(cttav)
-            WHERE cttr.uid STARTS WITH $concept_id
-            RETURN l, cttav
-        """
-        result, _ = db.cypher_query(
-            query,
-            {
-                "concept_id": concept_id,
-            },
-        )
-        if len(result) == 0:
+        if concept_id not in self._ct_package_terms:
+            self._resolve_usdm_codes(ct_package_concept_ids=[concept_id])
+        if (term := self._ct_package_terms[concept_id]) is None:
             return self.get_void_usdm_code()
-        library = result[0][0]
-        ct_term_attributes_value = result[0][1]
+        library_name, preferred_term = term
         code = USDMCode(
             id=self._id_manager.get_id(USDMCode.__name__, concept_id),
             code=concept_id,
-            codeSystem=library["name"],
+            codeSystem=library_name,
             codeSystemVersion=str(date.today()),
-            decode=ct_term_attributes_value["preferred_term"],
+            decode=preferred_term,
             instanceType="Code",
         )
         return code
@@ -239,32 +419,34 @@ class USDMMapper:
     def get_dictionary_term_as_usdm_code(self, term_uid: str) -> USDMCode:
         if term_uid is None:
             return self.get_void_usdm_code()
-        query = """
-            MATCH (l:Library)-[:CONTAINS_DICTIONARY_TERM]->(dtr:DictionaryTermRoot)-[:LATEST]->(dtv)
-            WHERE dtr.uid STARTS WITH $term_uid
-            RETURN l, dtv
-        """
-        result, _ = db.cypher_query(
-            query,
-            {
-                "term_uid": term_uid,
-            },
-        )
-        if len(result) == 0:
+        if term_uid not in self._dictionary_terms:
+            self._resolve_usdm_codes(dictionary_term_uids=[term_uid])
+        if (term := self._dictionary_terms[term_uid]) is None:
             return self.get_void_usdm_code()
-        library = result[0][0]
-        ct_term_attributes_value = result[0][1]
+        library_name, name = term
         code = USDMCode(
             id=self._id_manager.get_id(USDMCode.__name__, term_uid),
             code=term_uid,
-            codeSystem=library["name"],
+            codeSystem=library_name,
             codeSystemVersion=str(date.today()),
-            decode=ct_term_attributes_value["name"],
+            decode=name,
             instanceType="Code",
         )
         return code
 
-    def map(self, study: OSBStudy) -> dict[str, Any]:
+    def map(
+        self, study: OSBStudy, study_value_version: str | None = None
+    ) -> dict[str, Any]:
+        self._osb_study_components = self._fetch_osb_study_components(
+            study.uid, study_value_version
+        )
+        try:
+            self._resolve_study_usdm_codes(study)
+            return self._map(study)
+        finally:
+            self._osb_study_components = None
+
+    def _map(self, study: OSBStudy) -> dict[str, Any]:
         usdm_study = USDMStudy(name=self._get_study_name(study), instanceType="Study")
         usdm_study.id = uuid.uuid4()
         usdm_study.label = self._get_study_label(study)
@@ -334,7 +516,7 @@ class USDMMapper:
         return self.get_void_usdm_code()
 
     def _get_study_arms(self, study: OSBStudy):
-        osb_study_arms = self._get_osb_study_arms(study.uid).items
+        osb_study_arms = self._get_osb_study_component("arms", study.uid)
         return [
             StudyArm(
                 id=self._id_manager.get_id(StudyArm.__name__, sa.arm_uid),
@@ -355,7 +537,7 @@ class USDMMapper:
         ]
 
     def _get_study_cells(self, study: OSBStudy):
-        osb_design_cells = self._get_osb_study_design_cells(study.uid)
+        osb_design_cells = self._get_osb_study_component("design_cells", study.uid)
         return [
             USDMStudyCell(
                 id=self._id_manager.get_id(USDMStudyCell.__name__, dc.design_cell_uid),
@@ -447,7 +629,7 @@ class USDMMapper:
         return [ddf_study_design]
 
     def _get_study_activities(self, study: OSBStudy):
-        osb_study_activities = self._get_osb_study_activities(study.uid).items
+        osb_study_activities = self._get_osb_study_component("activities", study.uid)
         return [
             USDMActivity(
                 id=self._id_manager.get_id(USDMActivity.__name__, a.study_activity_uid),
@@ -480,7 +662,7 @@ class USDMMapper:
         ]
 
     def _get_study_elements(self, study: OSBStudy):
-        osb_study_elements = self._get_osb_study_elements(study.uid).items
+        osb_study_elements = self._get_osb_study_component("elements", study.uid)
         ddf_study_elements = []
         for osb_se in osb_study_elements:
             ddf_se_id = self._id_manager.get_id(
@@ -497,7 +679,7 @@ class USDMMapper:
         return ddf_study_elements
 
     def _get_study_epochs(self, study: OSBStudy):
-        osb_study_epochs = self._get_osb_study_epochs(study.uid).items
+        osb_study_epochs = self._get_osb_study_component("epochs", study.uid)
 
         # Since order is not mandatory in StudyEpoch, add next and previous IDs only
         # if order is available for every epoch
@@ -685,9 +867,7 @@ class USDMMapper:
         return None
 
     def _get_study_objectives(self, study: OSBStudy):
-        osb_study_endpoints = self._get_osb_study_endpoints(
-            study.uid, no_brackets=True
-        ).items
+        osb_study_endpoints = self._get_osb_study_component("endpoints", study.uid)
         return [
             USDMObjective(
                 id=self._id_manager.get_id(
@@ -932,8 +1112,10 @@ class USDMMapper:
         return ddf_study_definition_document
 
     def _get_study_schedule_timelines(self, study):
-        osb_study_activity_schedules = self._get_osb_activity_schedules(study.uid)
-        osb_study_visits = self._get_osb_study_visits(study.uid).items
+        osb_study_activity_schedules = self._get_osb_study_component(
+            "activity_schedules", study.uid
+        )
+        osb_study_visits = self._get_osb_study_component("visits", study.uid)
 
         # Create main timeline
         usdm_timeline_id = self._id_manager.get_id(USDMScheduleTimeline.__name__)
@@ -1090,7 +1272,7 @@ class USDMMapper:
         )
 
     def _get_study_encounters(self, study: OSBStudy):
-        osb_study_visits = self._get_osb_study_visits(study.uid).items
+        osb_study_visits = self._get_osb_study_component("visits", study.uid)
         ordered_osb_study_visits = sorted(
             osb_study_visits, key=lambda sv: sv.visit_number, reverse=False
         )
@@ -1,8 +1,12 @@
+from threading import Lock
 from typing import Any
 
+from fastapi.encoders import jsonable_encoder
+
 from clinical_mdr_api.domains.study_definition_aggregates.study_metadata import (
     StudyComponentEnum,
 )
+from clinical_mdr_api.models.utils import PrettyJSONResponse
 from clinical_mdr_api.services.ddf.usdm_mapper import USDMMapper
 from clinical_mdr_api.services.studies.study import StudyService
 from clinical_mdr_api.services.studies.study_activity_schedule import (
@@ -23,6 +27,11 @@ from clinical_mdr_api.services.studies.study_endpoint_selection import (
 )
 from clinical_mdr_api.services.studies.study_epoch import StudyEpochService
 from clinical_mdr_api.services.studies.study_visit import StudyVisitService
+from common.cache import cache_registry
+
+# Rendered USDM JSON documents of specific study versions, keyed by (study_uid, study_value_version)
+cache_store_usdm = cache_registry.register_ttl_cache("study.usdm", maxsize=16)
+lock_store_usdm = Lock()
 
 
 class USDMService:
@@ -40,9 +49,12 @@ class USDMService:
             get_osb_activity_schedules=StudyActivityScheduleService().get_all_schedules,
         )
 
-    def get_by_uid(self, uid: str) -> dict[str, Any]:
+    def get_by_uid(
+        self, uid: str, study_value_version: str | None = None
+    ) -> dict[str, Any]:
         osb_study = StudyService().get_by_uid(
             uid,
+            study_value_version=study_value_version,
             include_sections=[
                 StudyComponentEnum.IDENTIFICATION_METADATA,
                 StudyComponentEnum.REGISTRY_IDENTIFIERS,
@@ -54,5 +66,34 @@ class USDMService:
             ],
         )
 
-        usdm_wrapped_study = self._usdm_mapper.map(osb_study)
+        usdm_wrapped_study = self._usdm_mapper.map(
+            osb_study, study_value_version=study_value_version
+        )
         return usdm_wrapped_study
+
+    def get_rendered_by_uid(
+        self, uid: str, study_value_version: str | None = None
+    ) -> bytes:
+        """
+        Returns the USDM JSON document of a study, rendered like `PrettyJSONResponse` does.
+
+        Documents of a specific study version (locked or released) are rendered once and cached,
+        the document of the latest version of the study is rendered on every call.
+        """
+        if study_value_version is None:
+            return self._render(self.get_by_uid(uid))
+
+        cache_key = (uid, study_value_version)
+        with lock_store_usdm:
+            document = cache_store_usdm.get(cache_key)
+
+        if document is None:
+            document = self._render(self.get_by_uid(uid, study_value_version))
+            with lock_store_usdm:
+                cache_store_usdm[cache_key] = document
+
+        return document
+
+    @staticmethod
+    def _render(usdm_wrapped_study: dict[str, Any]) -> bytes:
+        return PrettyJSONResponse(jsonable_encoder(usdm_wrapped_study)).body
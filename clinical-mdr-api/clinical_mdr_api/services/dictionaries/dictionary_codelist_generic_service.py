@@ -83,6 +83,8 @@ class DictionaryCodelistGenericService:
         sort_by: dict[str, bool] | None = None,
         page_number: int = 1,
         page_size: int = 0,
+        page_token: str | None = None,
+        total_count_mode: str | None = None,
         filter_by: dict[str, dict[str, Any]] | None = None,
         filter_operator: FilterOperator = FilterOperator.AND,
         total_count: bool = False,
@@ -98,6 +100,8 @@ class DictionaryCodelistGenericService:
             filter_operator=filter_operator,
             page_number=page_number,
             page_size=page_size,
+            page_token=page_token,
+            total_count_mode=total_count_mode,
             total_count=total_count,
         )
 
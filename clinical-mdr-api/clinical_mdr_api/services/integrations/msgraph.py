@@ -7,11 +7,11 @@ from typing import Any, Mapping
 
 from asyncache import cached
 from authlib.integrations.starlette_client import StarletteOAuth2App
-from cachetools import TTLCache
 from opencensus.trace import execution_context
 
 from clinical_mdr_api.models.integrations.msgraph import GraphGroup, GraphUser
 from common.auth.dependencies import oauth
+from common.cache import cache_registry
 from common.config import settings
 from common.exceptions import BusinessLogicException, ValidationException
 
@@ -147,7 +147,12 @@ class MsGraphClientService:
         return results
 
     @serialize
-    @cached(TTLCache(maxsize=1, ttl=CACHE_TIMEOUT_SEC), lock=Lock())
+    @cached(
+        cache_registry.register_ttl_cache(
+            "msgraph.group_direct_member_users", maxsize=1, ttl=CACHE_TIMEOUT_SEC
+        ),
+        lock=Lock(),
+    )
     async def fetch_all_group_direct_member_users(self) -> list[GraphUser]:
         """
         Fetches user members of all groups matching the configured query.
@@ -21,6 +21,12 @@ from clinical_mdr_api.services._utils import (
 
 
 class ListingsService:
+    # MetaData items of the legacy datasets, built once as metadata.json is static
+    metadata_items: dict[str, list[MetaData]] = {
+        name: list(map(MetaData.from_query, columns))
+        for name, columns in QueryService.metadata_index.items()
+    }
+
     def __init__(self):
         self._query_service = QueryService()
 
@@ -31,6 +37,8 @@ class ListingsService:
         sort_by: dict[str, bool] | None = None,
         page_number: int = 1,
         page_size: int = 0,
+        page_token: str | None = None,
+        total_count_mode: str | None = None,
         filter_by: dict[str, dict[str, Any]] | None = None,
         filter_operator: FilterOperator = FilterOperator.AND,
         total_count: bool = False,
@@ -43,12 +51,13 @@ class ListingsService:
             total_count=total_count,
             page_number=page_number,
             page_size=page_size,
+            page_token=page_token,
+            total_count_mode=total_count_mode,
         )
         data.items = list(map(TopicCdDef.from_query, data.items))
 
         return data
 
-    @db.transaction
     def list_metadata(
         self,
         dataset_name: str | None = None,
@@ -59,8 +68,11 @@ class ListingsService:
         filter_operator: FilterOperator = FilterOperator.AND,
         total_count: bool = False,
     ) -> GenericFilteringReturn[MetaData]:
-        data = self._query_service.get_metadata(dataset_name=dataset_name)
-        result = list(map(MetaData.from_query, data))
+        result = [
+            item
+            for name in self._query_service.get_metadata_datasets(dataset_name)
+            for item in self.metadata_items[name]
+        ]
 
         return service_level_generic_filtering(
             items=result,
@@ -80,6 +92,8 @@ class ListingsService:
         sort_by: dict[str, bool] | None = None,
         page_number: int = 1,
         page_size: int = 0,
+        page_token: str | None = None,
+        total_count_mode: str | None = None,
         filter_by: dict[str, dict[str, Any]] | None = None,
         filter_operator: FilterOperator = FilterOperator.AND,
         total_count: bool = False,
@@ -93,6 +107,8 @@ class ListingsService:
             total_count=total_count,
             page_number=page_number,
             page_size=page_size,
+            page_token=page_token,
+            total_count_mode=total_count_mode,
         )
         data.items = list(map(CDISCCTVer.from_query, data.items))
 
@@ -106,6 +122,8 @@ class ListingsService:
         sort_by: dict[str, bool] | None = None,
         page_number: int = 1,
         page_size: int = 0,
+        page_token: str | None = None,
+        total_count_mode: str | None = None,
         filter_by: dict[str, dict[str, Any]] | None = None,
         filter_operator: FilterOperator = FilterOperator.AND,
         total_count: bool = False,
@@ -119,6 +137,8 @@ class ListingsService:
             total_count=total_count,
             page_number=page_number,
             page_size=page_size,
+            page_token=page_token,
+            total_count_mode=total_count_mode,
         )
         data.items = list(map(CDISCCTPkg.from_query, data.items))
 
@@ -133,6 +153,8 @@ class ListingsService:
         sort_by: dict[str, bool] | None = None,
         page_number: int = 1,
         page_size: int = 0,
+        page_token: str | None = None,
+        total_count_mode: str | None = None,
         filter_by: dict[str, dict[str, Any]] | None = None,
         filter_operator: FilterOperator = FilterOperator.AND,
         total_count: bool = False,
@@ -147,6 +169,8 @@ class ListingsService:
             total_count=total_count,
             page_number=page_number,
             page_size=page_size,
+            page_token=page_token,
+            total_count_mode=total_count_mode,
         )
 
         data.items = list(map(CDISCCTList.from_query, data.items))
@@ -162,6 +186,8 @@ class ListingsService:
         sort_by: dict[str, bool] | None = None,
         page_number: int = 1,
         page_size: int = 0,
+        page_token: str | None = None,
+        total_count_mode: str | None = None,
         filter_by: dict[str, dict[str, Any]] | None = None,
         filter_operator: FilterOperator = FilterOperator.AND,
         total_count: bool = False,
@@ -176,6 +202,8 @@ class ListingsService:
             total_count=total_count,
             page_number=page_number,
             page_size=page_size,
+            page_token=page_token,
+            total_count_mode=total_count_mode,
         )
         data.items = list(map(CDISCCTVal.from_query, data.items))
 
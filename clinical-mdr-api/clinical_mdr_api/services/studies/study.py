@@ -2100,6 +2100,14 @@ class StudyService:
 
             raise NotFoundException("Study", study_uid)
 
+    @staticmethod
+    def get_locked_study_value_version(study_uid: str) -> str | None:
+        """
+        Returns the version of the study with the given study_uid if the study is locked, None otherwise.
+        The latest value of a locked study is the value of that version.
+        """
+        return StudyDefinitionRepositoryImpl.get_locked_study_value_version(study_uid)
+
     def _check_if_unit_definition_exists(self, unit_definition_uid: str):
         NotFoundException.raise_if_not(
             self._repos.unit_definition_repository.final_concept_exists(
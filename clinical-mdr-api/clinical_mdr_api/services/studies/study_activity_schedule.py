@@ -1,4 +1,5 @@
 import datetime
+from typing import Sequence
 
 from fastapi import status
 from neomodel import db
@@ -20,6 +21,7 @@ from clinical_mdr_api.models.study_selections.study_selection import (
     StudyActivityScheduleBatchOutput,
     StudyActivityScheduleCreateInput,
     StudyActivityScheduleHistory,
+    StudySoAEditBatchInput,
 )
 from clinical_mdr_api.services._meta_repository import MetaRepository
 from clinical_mdr_api.services._utils import ensure_transaction
@@ -197,34 +199,123 @@ class StudyActivityScheduleService(StudySelectionMixin):
         study_uid: str,
         operations: list[StudyActivityScheduleBatchInput],
     ) -> list[StudyActivityScheduleBatchOutput]:
-        results = []
+        return self.apply_batch_operations(study_uid, operations)
+
+    def apply_batch_operations(
+        self,
+        study_uid: str,
+        operations: Sequence[StudyActivityScheduleBatchInput | StudySoAEditBatchInput],
+    ) -> list[StudyActivityScheduleBatchOutput]:
+        """
+        Creates and deletes the schedules of a batch of operations in bulk.
+
+        The study activities, study visits and schedules of the study are loaded once,
+        every operation is validated against them in order, as if the previous operations were already applied,
+        then all the valid operations are written at once.
+        The results are in the order of the operations, failed operations don't prevent the other ones from being applied.
+        """
+        repository = self._repos.study_activity_schedule_repository
+        state = repository.get_schedule_state(study_uid)
+        scheduled = set(state.schedules.values())
+        created: list[StudyActivityScheduleVO] = []
+        deleted: list[StudyActivityScheduleVO] = []
+        results: list[
+            StudyActivityScheduleVO | int | exceptions.MDRApiBaseException
+        ] = []
         for operation in operations:
-            item = None
             try:
                 if operation.method == "POST":
-                    if isinstance(operation.content, StudyActivityScheduleCreateInput):
-                        item = self.create(study_uid, operation.content)
-                        response_code = status.HTTP_201_CREATED
-                    else:
+                    if not isinstance(
+                        operation.content, StudyActivityScheduleCreateInput
+                    ):
                         raise exceptions.ValidationException(
                             msg="POST operation requires StudyActivityScheduleCreateInput as request payload."
                         )
-
+                    schedule_vo = self._from_input_values(study_uid, operation.content)
+                    schedule = (
+                        schedule_vo.study_activity_uid,
+                        schedule_vo.study_visit_uid,
+                    )
+                    exceptions.BusinessLogicException.raise_if(
+                        schedule in scheduled,
+                        msg=f"There already exist a schedule for the same Activity and Visit in the Study with UID '{study_uid}'",
+                    )
+                    exceptions.NotFoundException.raise_if(
+                        schedule_vo.study_activity_uid
+                        not in state.study_activity_instance_uids,
+                        "Study Activity",
+                        schedule_vo.study_activity_uid,
+                    )
+                    exceptions.NotFoundException.raise_if(
+                        schedule_vo.study_visit_uid not in state.study_visit_uids,
+                        "Study Visit",
+                        schedule_vo.study_visit_uid,
+                    )
+                    schedule_vo.study_activity_instance_uid = (
+                        state.study_activity_instance_uids[
+                            schedule_vo.study_activity_uid
+                        ]
+                    )
+                    scheduled.add(schedule)
+                    created.append(schedule_vo)
+                    results.append(schedule_vo)
                 elif operation.method == "DELETE":
-                    self.delete(study_uid, operation.content.uid)
-                    response_code = status.HTTP_204_NO_CONTENT
+                    schedule_uid = operation.content.uid
+                    exceptions.NotFoundException.raise_if(
+                        schedule_uid not in state.schedules,
+                        "Study Activity Schedule",
+                        schedule_uid,
+                    )
+                    study_activity_uid, study_visit_uid = state.schedules[schedule_uid]
+                    exceptions.NotFoundException.raise_if(
+                        study_activity_uid not in state.study_activity_instance_uids,
+                        "Study Activity",
+                        study_activity_uid,
+                    )
+                    exceptions.NotFoundException.raise_if(
+                        study_visit_uid not in state.study_visit_uids,
+                        "Study Visit",
+                        study_visit_uid,
+                    )
+                    del state.schedules[schedule_uid]
+                    scheduled.discard((study_activity_uid, study_visit_uid))
+                    deleted.append(
+                        StudyActivityScheduleVO(
+                            uid=schedule_uid,
+                            study_uid=study_uid,
+                            study_activity_uid=study_activity_uid,
+                            study_activity_instance_uid=None,
+                            study_visit_uid=study_visit_uid,
+                            author_id=self.author,
+                            start_date=datetime.datetime.now(datetime.timezone.utc),
+                        )
+                    )
+                    results.append(status.HTTP_204_NO_CONTENT)
                 else:
                     raise exceptions.MethodNotAllowedException(method=operation.method)
-                results.append(
+            except exceptions.MDRApiBaseException as error:
+                results.append(error)
+
+        repository.save_batch(study_uid, created, deleted, self.author)
+
+        outputs = []
+        for result in results:
+            if isinstance(result, StudyActivityScheduleVO):
+                outputs.append(
                     StudyActivityScheduleBatchOutput(
-                        response_code=response_code, content=item
+                        response_code=status.HTTP_201_CREATED,
+                        content=StudyActivitySchedule.from_vo(result),
                     )
                 )
-            except exceptions.MDRApiBaseException as error:
-                results.append(
+            elif isinstance(result, exceptions.MDRApiBaseException):
+                outputs.append(
                     StudyActivityScheduleBatchOutput.model_construct(
-                        response_code=error.status_code,
-                        content=BatchErrorResponse(message=str(error)),
+                        response_code=result.status_code,
+                        content=BatchErrorResponse(message=str(result)),
                     )
                 )
-        return results
+            else:
+                outputs.append(
+                    StudyActivityScheduleBatchOutput(response_code=result, content=None)
+                )
+        return outputs
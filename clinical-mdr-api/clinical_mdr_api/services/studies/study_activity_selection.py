@@ -1,6 +1,7 @@
 import dataclasses
 from collections import defaultdict
 from datetime import datetime
+from itertools import groupby
 from typing import Callable, Mapping, Sequence
 
 from fastapi import status
@@ -48,7 +49,6 @@ from clinical_mdr_api.models.error import BatchErrorResponse
 from clinical_mdr_api.models.study_selections.study_selection import (
     DetailedSoAHistory,
     StudyActivityReplaceActivityInput,
-    StudyActivityScheduleCreateInput,
     StudyActivitySyncLatestVersionInput,
     StudySelectionActivity,
     StudySelectionActivityBatchInput,
@@ -1680,6 +1680,9 @@ class StudyActivitySelectionService(
         study_uid: str,
         operations: list[StudySelectionActivityBatchInput],
     ) -> list[StudySelectionActivityBatchOutput]:
+        # Study activity operations are applied one by one, unlike schedule and design cell operations:
+        # each one also creates, reorders or deletes the study activity group, subgroup, SoA group
+        # and instance selections and may update the library activity, all in their own aggregates.
         results = []
         for operation in operations:
             item = None
@@ -1729,21 +1732,34 @@ class StudyActivitySelectionService(
     ) -> list[StudySoAEditBatchOutput]:
         study_activity_schedules_service = StudyActivityScheduleService()
         results = []
-        for operation in operations:
-            item = None
-            try:
-                if (
-                    operation.method == "PATCH"
-                    and operation.object == SoAItemType.STUDY_ACTIVITY.value
-                ):
-                    item = self.patch_selection(
-                        study_uid,
-                        operation.content.study_activity_uid,
-                        operation.content.content,
+        for is_schedule_operation, grouped_operations in groupby(
+            operations,
+            key=lambda operation: operation.object
+            == SoAItemType.STUDY_ACTIVITY_SCHEDULE.value,
+        ):
+            # Consecutive schedule operations are applied in bulk
+            if is_schedule_operation:
+                results.extend(
+                    StudySoAEditBatchOutput.model_construct(
+                        response_code=result.response_code, content=result.content
                     )
-                    response_code = status.HTTP_200_OK
-                elif operation.method == "POST":
-                    if operation.object == SoAItemType.STUDY_ACTIVITY.value:
+                    for result in study_activity_schedules_service.apply_batch_operations(
+                        study_uid, list(grouped_operations)
+                    )
+                )
+                continue
+            # Study activity operations are applied one by one, see `handle_batch_operations`
+            for operation in grouped_operations:
+                item = None
+                try:
+                    if operation.method == "PATCH":
+                        item = self.patch_selection(
+                            study_uid,
+                            operation.content.study_activity_uid,
+                            operation.content.content,
+                        )
+                        response_code = status.HTTP_200_OK
+                    elif operation.method == "POST":
                         if isinstance(
                             operation.content, StudySelectionActivityCreateInput
                         ):
@@ -1752,41 +1768,26 @@ class StudyActivitySelectionService(
                             raise ValidationException(
                                 msg="POST operation requires StudySelectionActivityCreateInput as request payload."
                             )
-                    elif operation.object == SoAItemType.STUDY_ACTIVITY_SCHEDULE.value:
-                        if isinstance(
-                            operation.content, StudyActivityScheduleCreateInput
-                        ):
-                            item = study_activity_schedules_service.create(
-                                study_uid, operation.content
-                            )
-                        else:
-                            raise ValidationException(
-                                msg="POST operation requires StudyActivityScheduleCreateInput as request payload."
-                            )
-
-                    response_code = status.HTTP_201_CREATED
-                elif operation.method == "DELETE":
-                    if operation.object == SoAItemType.STUDY_ACTIVITY.value:
+                        response_code = status.HTTP_201_CREATED
+                    elif operation.method == "DELETE":
                         self.delete_selection(
                             study_uid, operation.content.study_activity_uid
                         )
-                    elif operation.object == SoAItemType.STUDY_ACTIVITY_SCHEDULE.value:
-                        item = study_activity_schedules_service.delete(
-                            study_uid, operation.content.uid
+                        response_code = status.HTTP_204_NO_CONTENT
+                    else:
+                        raise MethodNotAllowedException(method=operation.method)
+                    results.append(
+                        StudySoAEditBatchOutput(
+                            response_code=response_code, content=item
+                        )
+                    )
+                except MDRApiBaseException as error:
+                    results.append(
+                        StudySoAEditBatchOutput.model_construct(
+                            response_code=error.status_code,
+                            content=BatchErrorResponse(message=str(error)),
                         )
-                    response_code = status.HTTP_204_NO_CONTENT
-                else:
-                    raise MethodNotAllowedException(method=operation.method)
-                results.append(
-                    StudySoAEditBatchOutput(response_code=response_code, content=item)
-                )
-            except MDRApiBaseException as error:
-                results.append(
-                    StudySoAEditBatchOutput.model_construct(
-                        response_code=error.status_code,
-                        content=BatchErrorResponse(message=str(error)),
                     )
-                )
         return results
 
     @db.transaction
@@ -705,57 +705,117 @@ class StudyArmSelectionService(StudySelectionMixin):
         study_uid: str,
         operations: list[StudySelectionArmBatchInput],
     ) -> list[StudySelectionArmBatchOutput]:
+        repos = self._repos
         results = []
         try:
+            # Load aggregate once, all operations are applied to it and saved together
+            selection_aggregate: StudySelectionArmAR = (
+                repos.study_arm_repository.find_by_study(
+                    study_uid=study_uid, for_update=True
+                )
+            )
+            applied_operations: list[tuple[int, str]] = []
             for operation in operations:
-                item: (
-                    StudySelectionArm | StudySelectionArmWithConnectedBranchArms | None
-                ) = None
                 if operation.method == "PATCH":
                     if isinstance(operation.content, StudySelectionArmBatchUpdateInput):
-                        item = self.patch_selection(
-                            study_uid=study_uid,
-                            study_selection_uid=operation.content.arm_uid,
-                            selection_update_input=operation.content,
-                            validate=False,
+                        current_vo, _ = (
+                            selection_aggregate.get_specific_object_selection(
+                                study_selection_uid=operation.content.arm_uid
+                            )
+                        )
+                        updated_selection = self._patch_prepare_new_study_arm(
+                            request_study_arm=operation.content,
+                            current_study_arm=current_vo,
+                        )
+                        if updated_selection != current_vo:
+                            selection_aggregate.update_selection(
+                                updated_study_arm_selection=updated_selection,
+                                ct_term_exists_callback=repos.ct_term_name_repository.term_specific_exists_by_uid,
+                                arm_exists_callback_by=repos.study_arm_repository.arm_exists_by,
+                                validate=False,
+                            )
+                        applied_operations.append(
+                            (status.HTTP_200_OK, current_vo.study_selection_uid)
                         )
-                        response_code = status.HTTP_200_OK
                     else:
                         raise exceptions.ValidationException(
                             msg="POST operation requires StudySelectionArmBatchUpdateInput as request payload."
                         )
                 elif operation.method == "POST":
                     if isinstance(operation.content, StudySelectionArmCreateInput):
-                        item = self.make_selection(
+                        new_selection = StudySelectionArmVO.from_input_values(
                             study_uid=study_uid,
-                            selection_create_input=operation.content,
+                            author_id=self.author,
+                            name=operation.content.name,
+                            short_name=operation.content.short_name,
+                            code=operation.content.code,
+                            description=operation.content.description,
+                            randomization_group=operation.content.randomization_group,
+                            number_of_subjects=operation.content.number_of_subjects,
+                            arm_type_uid=operation.content.arm_type_uid,
+                            merge_branch_for_this_arm_for_sdtm_adam=operation.content.merge_branch_for_this_arm_for_sdtm_adam,
+                            generate_uid_callback=repos.study_arm_repository.generate_uid,
+                        )
+                        selection_aggregate.add_arm_selection(
+                            new_selection,
+                            repos.ct_term_name_repository.term_specific_exists_by_uid,
+                            arm_exists_callback_by=repos.study_arm_repository.arm_exists_by,
                             validate=False,
                         )
-                        response_code = status.HTTP_201_CREATED
+                        applied_operations.append(
+                            (status.HTTP_201_CREATED, new_selection.study_selection_uid)
+                        )
                     else:
                         raise exceptions.ValidationException(
                             msg="POST operation requires StudySelectionArmCreateInput as request payload."
                         )
                 else:
                     raise exceptions.MethodNotAllowedException(method=operation.method)
+
+            # sync with DB and save all the updates at once
+            repos.study_arm_repository.save(selection_aggregate, self.author)
+
+            # For batch operations we need to perform validation/uniqueness checks after all requests are handled
+            modified_study_arms = {uid for _, uid in applied_operations}
+            for study_arm_vo in selection_aggregate.study_arms_selection:
+                if study_arm_vo.study_selection_uid in modified_study_arms:
+                    study_arm_vo.validate(
+                        repos.ct_term_name_repository.term_specific_exists_by_uid,
+                        arm_exists_callback_by=repos.study_arm_repository.arm_exists_by,
+                    )
+
+            terms_at_specific_datetime = self._extract_study_standards_effective_date(
+                study_uid=study_uid
+            )
+            for response_code, study_selection_uid in applied_operations:
+                selection_vo, order = selection_aggregate.get_specific_object_selection(
+                    study_selection_uid
+                )
+                item: StudySelectionArm | StudySelectionArmWithConnectedBranchArms
+                if response_code == status.HTTP_201_CREATED:
+                    # StudyArm without connected BranchArms not make sense that has BranchArms yet
+                    item = StudySelectionArm.from_study_selection_arm_ar_and_order(
+                        study_uid=study_uid,
+                        selection=selection_vo,
+                        order=order,
+                        find_codelist_term_arm_type=repos.ct_codelist_name_repository.get_codelist_term_by_uid_and_submval,
+                        terms_at_specific_datetime=terms_at_specific_datetime,
+                    )
+                else:
+                    item = StudySelectionArmWithConnectedBranchArms.from_study_selection_arm_ar__order__connected_branch_arms(
+                        study_uid=study_uid,
+                        selection=selection_vo,
+                        order=order,
+                        find_codelist_term_arm_type=repos.ct_codelist_name_repository.get_codelist_term_by_uid_and_submval,
+                        find_multiple_connected_branch_arm=self._find_branch_arms_connected_to_arm_uid,
+                        terms_at_specific_datetime=terms_at_specific_datetime,
+                    )
                 results.append(
                     StudySelectionArmBatchOutput(
                         response_code=response_code,
                         content=item,
                     )
                 )
-
-            # For batch operations we need to perform validation/uniqueness checks after all requests are handled
-            study_arm_ar: StudySelectionArmAR = (
-                self._repos.study_arm_repository.find_by_study(study_uid=study_uid)
-            )
-            modified_study_arms = {study_arm.content.arm_uid for study_arm in results}
-            for study_arm_vo in study_arm_ar.study_arms_selection:
-                if study_arm_vo.study_selection_uid in modified_study_arms:
-                    study_arm_vo.validate(
-                        self._repos.ct_term_name_repository.term_specific_exists_by_uid,
-                        arm_exists_callback_by=self._repos.study_arm_repository.arm_exists_by,
-                    )
         except exceptions.MDRApiBaseException as error:
             results.append(
                 StudySelectionArmBatchOutput.model_construct(
@@ -764,4 +824,6 @@ class StudyArmSelectionService(StudySelectionMixin):
                 )
             )
             raise error
+        finally:
+            repos.close()
         return results
@@ -1,3 +1,4 @@
+from copy import copy
 from datetime import datetime, timezone
 
 from fastapi import status
@@ -175,40 +176,90 @@ class StudyDesignCellService(StudySelectionMixin):
             start_date=datetime.now(timezone.utc),
         )
 
-    @ensure_transaction(db)
-    def create(
-        self, study_uid: str, design_cell_input: StudyDesignCellCreateInput
-    ) -> StudyDesignCell:
-        # all_design_cells: list[StudyDesignCellVO]
-        all_design_cells = (
-            self._repos.study_design_cell_repository.find_all_design_cells_by_study(
-                study_uid
-            )
+    def _find_design_cell(
+        self,
+        study_uid: str,
+        design_cell_uid: str,
+        design_cells: list[StudyDesignCellVO],
+    ) -> StudyDesignCellVO:
+        for design_cell in design_cells:
+            if design_cell.uid == design_cell_uid:
+                return design_cell
+        raise exceptions.ValidationException(
+            msg=f"The StudyDesignCell with UID '{design_cell_uid}' could not be found in the Study with UID '{study_uid}'."
         )
 
+    def _create_design_cell(
+        self,
+        study_uid: str,
+        design_cell_input: StudyDesignCellCreateInput,
+        design_cells: list[StudyDesignCellVO],
+        saved_orders: dict[str, int],
+    ) -> StudyDesignCellVO:
+        """
+        Creates a design cell and shifts the order of the following ones in `design_cells`.
+
+        :param design_cells: StudyDesignCellVOs of the study, by order, the created one is inserted into it
+        :param saved_orders: orders of the design cells in the database, by uid
+        """
         # created_design_cell: StudyDesignVO, from the input
         created_design_cell = self._from_input_values(study_uid, design_cell_input)
 
         # if the order want an specific order
         if design_cell_input.order:
             exceptions.BusinessLogicException.raise_if(
-                len(all_design_cells) + 1 < created_design_cell.order,
+                len(design_cells) + 1 < created_design_cell.order,
                 msg="Order is too big.",
             )
-            # shift one order more to fit the modified
-            for design_cell in all_design_cells[created_design_cell.order - 1 :]:
-                design_cell.order += 1
-                self._repos.study_design_cell_repository.save(
-                    design_cell, self.author, create=False
-                )
         # if not just add one to the order
         else:
-            created_design_cell.order = len(all_design_cells) + 1
+            created_design_cell.order = len(design_cells) + 1
 
         # created_item: StudyDesignCellVO
         created_item = self._repos.study_design_cell_repository.save(
             created_design_cell, self.author, create=True
         )
+        saved_orders[created_item.uid] = created_item.order
+
+        # shift one order more to fit the created, the new orders are saved by `_save_reordered_design_cells`
+        for design_cell in design_cells[created_item.order - 1 :]:
+            design_cell.order += 1
+        design_cells.insert(created_item.order - 1, created_item)
+        return created_item
+
+    def _save_reordered_design_cells(
+        self,
+        study_uid: str,
+        design_cells: list[StudyDesignCellVO],
+        saved_orders: dict[str, int],
+    ):
+        self._repos.study_design_cell_repository.save_reordered_design_cells(
+            study_uid,
+            [
+                design_cell
+                for design_cell in design_cells
+                if design_cell.order != saved_orders[design_cell.uid]
+            ],
+            self.author,
+        )
+
+    @ensure_transaction(db)
+    def create(
+        self, study_uid: str, design_cell_input: StudyDesignCellCreateInput
+    ) -> StudyDesignCell:
+        # all_design_cells: list[StudyDesignCellVO]
+        all_design_cells = (
+            self._repos.study_design_cell_repository.find_all_design_cells_by_study(
+                study_uid
+            )
+        )
+        saved_orders = {
+            design_cell.uid: design_cell.order for design_cell in all_design_cells
+        }
+        created_item = self._create_design_cell(
+            study_uid, design_cell_input, all_design_cells, saved_orders
+        )
+        self._save_reordered_design_cells(study_uid, all_design_cells, saved_orders)
 
         # return json response model
         return StudyDesignCell.from_vo(created_item)
@@ -227,14 +278,11 @@ class StudyDesignCellService(StudySelectionMixin):
             order=study_design_cell_edit_input.order,  # type: ignore[arg-type]
         )
 
-    @ensure_transaction(db)
-    def patch(
-        self, study_uid: str, design_cell_update_input: StudyDesignCellEditInput
-    ) -> StudyDesignCell:
-        # study_design_cell: StudyDesignCellVO
-        study_design_cell = self._repos.study_design_cell_repository.find_by_uid(
-            study_uid=study_uid, uid=design_cell_update_input.study_design_cell_uid
-        )
+    def _patch_design_cell(
+        self,
+        study_design_cell: StudyDesignCellVO,
+        design_cell_update_input: StudyDesignCellEditInput,
+    ) -> StudyDesignCellVO:
         if design_cell_update_input.study_branch_arm_uid is not None:
             design_cell_update_input.study_arm_uid = None
         elif design_cell_update_input.study_arm_uid is not None:
@@ -246,36 +294,65 @@ class StudyDesignCellService(StudySelectionMixin):
             reference_base_model=StudyDesignCell.from_vo(study_design_cell),
         )
 
+        # edit a copy, the given design cell is kept as it is if the update fails
+        study_design_cell = copy(study_design_cell)
         self._edit_study_design_cell_vo(
             study_design_cell_to_edit=study_design_cell,
             study_design_cell_edit_input=design_cell_update_input,
         )
         # updated_item: StudyDesignCellVO
-        updated_item = self._repos.study_design_cell_repository.save(
+        return self._repos.study_design_cell_repository.save(
             study_design_cell, self.author, create=False
         )
-        # return json response model
-        return StudyDesignCell.from_vo(updated_item)
 
     @ensure_transaction(db)
-    def delete(self, study_uid: str, design_cell_uid: str):
+    def patch(
+        self, study_uid: str, design_cell_update_input: StudyDesignCellEditInput
+    ) -> StudyDesignCell:
+        # study_design_cell: StudyDesignCellVO
         study_design_cell = self._repos.study_design_cell_repository.find_by_uid(
-            study_uid=study_uid, uid=design_cell_uid
+            study_uid=study_uid, uid=design_cell_update_input.study_design_cell_uid
+        )
+        updated_item = self._patch_design_cell(
+            study_design_cell, design_cell_update_input
+        )
+        # return json response model
+        return StudyDesignCell.from_vo(updated_item)
+
+    def _delete_design_cell(
+        self,
+        study_uid: str,
+        design_cell_uid: str,
+        design_cells: list[StudyDesignCellVO],
+    ):
+        """
+        Deletes a design cell and shifts the order of the following ones in `design_cells`.
+
+        :param design_cells: StudyDesignCellVOs of the study, by order, the deleted one is removed from it
+        """
+        study_design_cell = self._find_design_cell(
+            study_uid, design_cell_uid, design_cells
         )
         self._repos.study_design_cell_repository.delete(
             study_uid, design_cell_uid, self.author
         )
+        # shift one order less to fit the deleted, the new orders are saved by `_save_reordered_design_cells`
+        design_cells.remove(study_design_cell)
+        for design_cell in design_cells[study_design_cell.order - 1 :]:
+            design_cell.order -= 1
+
+    @ensure_transaction(db)
+    def delete(self, study_uid: str, design_cell_uid: str):
         all_design_cells = (
             self._repos.study_design_cell_repository.find_all_design_cells_by_study(
                 study_uid
             )
         )
-        # shift one order more to fit the modified
-        for design_cell in all_design_cells[study_design_cell.order - 1 :]:
-            design_cell.order -= 1
-            self._repos.study_design_cell_repository.save(
-                design_cell, author_id=self.author, create=False
-            )
+        saved_orders = {
+            design_cell.uid: design_cell.order for design_cell in all_design_cells
+        }
+        self._delete_design_cell(study_uid, design_cell_uid, all_design_cells)
+        self._save_reordered_design_cells(study_uid, all_design_cells, saved_orders)
 
     def _transform_each_history_to_response_model(
         self, study_selection_history: StudyDesignCellHistory, study_uid: str
@@ -360,13 +437,30 @@ class StudyDesignCellService(StudySelectionMixin):
     def handle_batch_operations(
         self, study_uid: str, operations: list[StudyDesignCellBatchInput]
     ) -> list[StudyDesignCellBatchOutput]:
+        # The design cells are loaded once, the operations shift their order in memory
+        # and the new orders are saved together after all operations
+        all_design_cells = (
+            self._repos.study_design_cell_repository.find_all_design_cells_by_study(
+                study_uid
+            )
+        )
+        saved_orders = {
+            design_cell.uid: design_cell.order for design_cell in all_design_cells
+        }
         results = []
         for operation in operations:
             item = None
             try:
                 if operation.method == "POST":
                     if isinstance(operation.content, StudyDesignCellCreateInput):
-                        item = self.create(study_uid, operation.content)
+                        item = StudyDesignCell.from_vo(
+                            self._create_design_cell(
+                                study_uid,
+                                operation.content,
+                                all_design_cells,
+                                saved_orders,
+                            )
+                        )
                         response_code = status.HTTP_201_CREATED
                     else:
                         raise exceptions.ValidationException(
@@ -374,14 +468,29 @@ class StudyDesignCellService(StudySelectionMixin):
                         )
                 elif operation.method == "PATCH":
                     if isinstance(operation.content, StudyDesignCellEditInput):
-                        item = self.patch(study_uid, operation.content)
+                        study_design_cell = self._find_design_cell(
+                            study_uid,
+                            operation.content.study_design_cell_uid,
+                            all_design_cells,
+                        )
+                        updated_item = self._patch_design_cell(
+                            study_design_cell, operation.content
+                        )
+                        saved_orders[updated_item.uid] = updated_item.order
+                        all_design_cells[all_design_cells.index(study_design_cell)] = (
+                            updated_item
+                        )
+                        all_design_cells.sort(key=lambda design_cell: design_cell.order)
+                        item = StudyDesignCell.from_vo(updated_item)
                         response_code = status.HTTP_200_OK
                     else:
                         raise exceptions.ValidationException(
                             msg="PATCH operation requires StudyDesignCellEditInput as request payload."
                         )
                 elif operation.method == "DELETE":
-                    self.delete(study_uid, operation.content.uid)
+                    self._delete_design_cell(
+                        study_uid, operation.content.uid, all_design_cells
+                    )
                     response_code = status.HTTP_204_NO_CONTENT
                 else:
                     raise exceptions.MethodNotAllowedException(method=operation.method)
@@ -397,4 +506,5 @@ class StudyDesignCellService(StudySelectionMixin):
                         content=BatchErrorResponse(message=str(error)),
                     )
                 )
+        self._save_reordered_design_cells(study_uid, all_design_cells, saved_orders)
         return results
@@ -2,13 +2,17 @@ import logging
 from collections import defaultdict
 from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, Iterable, Mapping, Sequence, TypeVar
+from typing import TYPE_CHECKING, Any, Iterable, Mapping, Sequence, TypeVar
 
 from docx.enum.style import WD_STYLE_TYPE
 from neomodel import db
 from opencensus.common.runtime_context import RuntimeContext
-from openpyxl.workbook import Workbook
 
+from clinical_mdr_api.domain_repositories._utils.helpers import (
+    cache_store_soa_tables,
+    get_soa_tables_stamp,
+    lock_store_soa_tables,
+)
 from clinical_mdr_api.domain_repositories.study_selections.study_soa_repository import (
     SoALayout,
     StudySoARepository,
@@ -78,6 +82,9 @@ from common.exceptions import BusinessLogicException, NotFoundException
 from common.telemetry import trace_calls
 from common.utils import VisitClass
 
+if TYPE_CHECKING:
+    from openpyxl.workbook import Workbook
+
 NUM_OPERATIONAL_CODE_COLS = 2
 SOA_CHECK_MARK = "X"
 
@@ -577,7 +584,7 @@ class StudyFlowchartService:
         time_unit: str | None = None,
         force_build: bool = False,
     ) -> TableWithFootnotes:
-        """Returns internal TableWithFootnotes representation of SoA, either from snapshot or freshly built"""
+        """Returns internal TableWithFootnotes representation of SoA, either from snapshot, from cache or freshly built"""
 
         if study_value_version and layout == SoALayout.PROTOCOL and not force_build:
             # Return protocol SoA from snapshot for a locked study version
@@ -589,6 +596,26 @@ class StudyFlowchartService:
             )
 
         else:
+            # the stamp is read before the SoA content, tables of locked versions don't change
+            soa_tables_stamp = (
+                get_soa_tables_stamp(study_uid) if study_value_version is None else None
+            )
+            cache_key = (
+                study_uid,
+                study_value_version,
+                layout,
+                time_unit,
+                soa_tables_stamp,
+            )
+
+            if not force_build:
+                with lock_store_soa_tables:
+                    table = cache_store_soa_tables.get(cache_key)
+
+                if table is not None:
+                    # callers alter the returned table, so the cached one is never handed out
+                    return table.model_copy(deep=True)
+
             # Build SoA (of the latest draft version or detailed and operational SoA of locked versions too)
             table = self.build_flowchart_table(
                 study_uid=study_uid,
@@ -604,6 +631,9 @@ class StudyFlowchartService:
                 # remove hidden rows
                 self.remove_hidden_rows(table)
 
+            with lock_store_soa_tables:
+                cache_store_soa_tables[cache_key] = table.model_copy(deep=True)
+
         return table
 
     @trace_calls
@@ -852,7 +882,7 @@ class StudyFlowchartService:
         study_value_version: str | None,
         layout: SoALayout,
         time_unit: str | None,
-    ) -> Workbook:
+    ) -> "Workbook":
         # build internal representation of flowchart
         table = self.get_flowchart_table(
             study_uid=study_uid,
@@ -873,7 +903,7 @@ class StudyFlowchartService:
         study_uid: str,
         study_value_version: str | None,
         time_unit: str | None,
-    ) -> Workbook:
+    ) -> "Workbook":
         # build internal representation of flowchart
         table = self.get_operational_spreadsheet(
             study_uid=study_uid,
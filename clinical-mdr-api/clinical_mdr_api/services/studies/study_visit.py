@@ -1023,15 +1023,31 @@ class StudyVisitService(StudySelectionMixin):
     ):
         """
         Fixes the visit number if some visit was added in between of others or some of the visits were removed, edited.
+        All the derived properties are assigned first, then the visits are saved in a single write.
         :param ordered_visits:
         :param start_index_to_synchronize:
         :return:
         """
-        for visit in ordered_visits[start_index_to_synchronize:]:
+        visits_to_synchronize = [
+            visit
+            for visit in ordered_visits[start_index_to_synchronize:]
             # Manually defined visits have explicitly specified order properties
-            if visit.visit_class != VisitClass.MANUALLY_DEFINED_VISIT:
+            if visit.visit_class != VisitClass.MANUALLY_DEFINED_VISIT
+        ]
+        if not visits_to_synchronize:
+            return
+        visit_names: dict[str, TextValue] = {}
+        for visit in visits_to_synchronize:
+            visit_name = visit.derive_visit_name()
+            if visit_name not in visit_names:
                 self.assign_props_derived_from_visit_number(study_visit=visit)
-                self.repo.save(visit)
+                visit_names[visit_name] = visit.visit_name_sc
+            else:
+                visit.visit_name_sc = visit_names[visit_name]
+        self.repo.save_renumbered_visits(
+            study_uid=visits_to_synchronize[0].study_uid,
+            visits=visits_to_synchronize,
+        )
 
     def assign_props_derived_from_visit_number(self, study_visit: StudyVisitVO):
         """
@@ -1,12 +1,14 @@
 from codecs import iterdecode
 from csv import DictReader
-from xml.dom.minicompat import NodeList
-from xml.dom.minidom import Document
+from typing import Iterator
 
 from fastapi import UploadFile
+from lxml import etree
 
 from common.exceptions import BusinessLogicException
 
+XML_NAMESPACE = "http://www.w3.org/XML/1998/namespace"
+
 MANDATORY_MAPPER_FIELDS = {
     "type",
     "parent",
@@ -18,14 +20,14 @@ MANDATORY_MAPPER_FIELDS = {
 }
 
 
-def map_xml(xml_document: Document, mapper: UploadFile | None):
+def map_xml(root: etree._Element, mapper: UploadFile | None):
     """
     Transform XML Elements and Attributes according to provided CSV mapping rules.
     - Rename XML Elements and XML Attributes.
     - Create XML Alias Element based on XML Attributes.
 
     Args:
-        xml_document (Document): The XML document to modify.
+        root (etree._Element): The root element of the XML document to modify.
         mapper (UploadFile | None): The CSV file containing the mapping rules.
 
     Returns:
@@ -53,7 +55,7 @@ def map_xml(xml_document: Document, mapper: UploadFile | None):
 
         if mapping["type"] == "attribute":
             _map_attributes(
-                xml_document,
+                root,
                 mapping["from_name"],
                 mapping["to_name"],
                 parent,
@@ -61,7 +63,7 @@ def map_xml(xml_document: Document, mapper: UploadFile | None):
             )
         elif mapping["type"] == "element":
             _map_elements(
-                xml_document,
+                root,
                 mapping["from_name"],
                 mapping["to_name"],
                 parent,
@@ -70,30 +72,70 @@ def map_xml(xml_document: Document, mapper: UploadFile | None):
             )
 
 
-def _get_elements(xml_document: Document, name: str, parent: str):
+def _qualified_name(element: etree._Element, name: str):
+    """
+    Resolves a prefixed name, like `osb:version`, against the namespaces in scope of the given element.
+
+    Args:
+        element (etree._Element): The element in which scope the name is resolved.
+        name (str): The name to resolve.
+
+    Returns:
+        str: The name in `{namespace}local` notation, or the name itself if it has no prefix.
+
+    Raises:
+        BusinessLogicException: If the prefix of the name is not declared.
+    """
+    if ":" not in name:
+        return name
+
+    prefix, local_name = name.split(":", 1)
+    namespace = XML_NAMESPACE if prefix == "xml" else element.nsmap.get(prefix)
+    BusinessLogicException.raise_if_not(
+        namespace, msg=f"Namespace prefix '{prefix}' of '{name}' is not declared."
+    )
+    return f"{{{namespace}}}{local_name}"
+
+
+def _prefixed_name(element: etree._Element):
+    qname = etree.QName(element)
+    return f"{element.prefix}:{qname.localname}" if element.prefix else qname.localname
+
+
+def _get_elements(root: etree._Element, name: str, parent: str) -> Iterator:
     """
     Gets all elements with the given name that are children of the specified parent element in the XML document.
 
     Args:
-        xml_document (Document): The XML document to search.
-        name (str): The name of the elements to search for.
-        parent (str): The name of the parent element to search under.
+        root (etree._Element): The root element of the XML document to search.
+        name (str): The prefixed name of the elements to search for, `*` matches all elements.
+        parent (str): The prefixed name of the parent element to search under, `*` matches the whole document.
 
     Returns:
-        NodeList[Element]: A list of matching elements.
+        Iterator[etree._Element]: The matching elements.
     """
     if parent == "*":
-        return xml_document.getElementsByTagName(name)
-
-    elements: NodeList = NodeList()
-    parent_elements = xml_document.getElementsByTagName(parent)
-    for parent_element in parent_elements:
-        elements += parent_element.getElementsByTagName(name)
-    return elements
+        candidates = root.iter(etree.Element)
+    else:
+        candidates = (
+            element
+            for parent_element in _get_elements(root, parent, "*")
+            for element in parent_element.iterdescendants(etree.Element)
+        )
+
+    # materialized, as the elements are modified while they are iterated by the callers,
+    # and deduplicated, as nested parent elements have descendants in common
+    return iter(
+        dict.fromkeys(
+            element
+            for element in candidates
+            if name == "*" or _prefixed_name(element) == name
+        )
+    )
 
 
 def _map_elements(
-    xml_document: Document,
+    root: etree._Element,
     from_name: str,
     to_name: str,
     parent: str,
@@ -104,7 +146,7 @@ def _map_elements(
     Maps elements in the XML document from one name to another based on the given rules.
 
     Args:
-        xml_document (Document): The XML document to modify.
+        root (etree._Element): The root element of the XML document to modify.
         from_name (str): The name of the elements to map.
         to_name (str): The name to map the elements to.
         parent (str): The name of the parent element to search under.
@@ -114,24 +156,17 @@ def _map_elements(
     Returns:
         None
     """
-    elements = _get_elements(xml_document, from_name, parent)
-
-    for element in elements:
-        if from_alias and alias_context == element.getAttribute("Context"):
-            element.parentNode.setAttribute(
-                element.getAttribute("Context"), element.getAttribute("Name")
-            )
-            element.parentNode.removeChild(element)
+    for element in _get_elements(root, from_name, parent):
+        if from_alias and alias_context == element.get("Context", ""):
+            parent_element = element.getparent()
+            parent_element.set(element.get("Context", ""), element.get("Name", ""))
+            parent_element.remove(element)
         else:
-            element.tagName = to_name
-            element.nodeName = to_name
-            if ":" in to_name:
-                prefix, _ = to_name.split(":")
-                element.prefix = prefix
+            element.tag = _qualified_name(element, to_name)
 
 
 def _map_attributes(
-    xml_document: Document,
+    root: etree._Element,
     from_name: str,
     to_name: str,
     parent: str,
@@ -141,7 +176,7 @@ def _map_attributes(
     Maps attributes in the XML document from one name to another based on the given rules.
 
     Args:
-        xml_document (Document): The XML document to modify.
+        root (etree._Element): The root element of the XML document to modify.
         from_name (str): The name of the attribute to map.
         to_name (str): The name to map the attribute to.
         parent (str): The name of the parent element to search under.
@@ -150,19 +185,19 @@ def _map_attributes(
     Returns:
         None
     """
-    elements = xml_document.getElementsByTagName(parent)
+    for element in _get_elements(root, parent, "*"):
+        prefix = from_name.split(":", 1)[0] if ":" in from_name else None
+        if prefix and prefix != "xml" and prefix not in element.nsmap:
+            continue
 
-    for element in elements:
-        element_attribute_value = element.getAttribute(from_name)
+        from_attribute = _qualified_name(element, from_name)
+        element_attribute_value = element.get(from_attribute)
         if element_attribute_value and to_alias:
-            alias_element = xml_document.createElement("Alias")
-            alias_element.setAttribute("Name", element_attribute_value)
-            alias_element.setAttribute("Context", from_name)
-            element.appendChild(alias_element)
+            etree.SubElement(
+                element,
+                "Alias",
+                {"Name": element_attribute_value, "Context": from_name},
+            )
         elif element_attribute_value:
-            element.removeAttribute(from_name)
-            if ":" in to_name:
-                prefix, _ = to_name.split(":")
-                element.setAttributeNS(prefix, to_name, element_attribute_value)
-            else:
-                element.setAttribute(to_name, element_attribute_value)
+            del element.attrib[from_attribute]
+            element.set(_qualified_name(element, to_name), element_attribute_value)
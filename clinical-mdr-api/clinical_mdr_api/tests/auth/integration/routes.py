@@ -1749,6 +1749,9 @@ ALL_ROUTES_METHODS_ROLES = (
     ("/clinical-programmes/{clinical_programme_uid}", "DELETE", {"Library.Write"}),
     ("/admin/caches", "GET", {"Admin.Read"}),
     ("/admin/caches", "DELETE", {"Admin.Write"}),
+    ("/admin/caches/stats", "GET", {"Admin.Read"}),
+    ("/admin/metrics", "GET", {"Admin.Read"}),
+    ("/admin/metrics", "DELETE", {"Admin.Write"}),
     ("/admin/users", "GET", {"Admin.Read"}),
     ("/admin/users/{user_id}", "PATCH", {"Admin.Write"}),
     ("/brands", "GET", {"Library.Read"}),
@@ -0,0 +1,210 @@
+"""
+Benchmark of the end-to-end CTR ODM XML generation of a large mock study.
+
+Run with `pipenv run benchmark`, it is not part of the unit test suite.
+"""
+
+import logging
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import ctrxml
+import pytest
+
+from clinical_mdr_api.services.ctr_xml import ctr_xml_service
+from clinical_mdr_api.services.ctr_xml.ctr_xml_service import (
+    CTRXMLService,
+    ODMBuilder,
+    cache_store_ctr_odm,
+)
+
+log = logging.getLogger(__name__)
+
+VISITS = 200
+FORMS = 100
+ITEM_GROUPS_PER_FORM = 10
+ITEMS_PER_ITEM_GROUP = 10
+CODELISTS = 500
+
+
+def _descriptions(name: str) -> list[SimpleNamespace]:
+    return [SimpleNamespace(description=f"{name} description", language="eng")]
+
+
+def _aliases(name: str) -> list[SimpleNamespace]:
+    return [SimpleNamespace(name=f"{name} alias", context="CTR")]
+
+
+def _mock_study_data() -> dict:
+    study_metadata = SimpleNamespace(
+        identification_metadata=SimpleNamespace(study_id="CDISC DEV-0"),
+        version_metadata=SimpleNamespace(
+            study_status="LOCKED",
+            version_number=1,
+            version_timestamp=datetime(2024, 1, 1, tzinfo=timezone.utc),
+            version_description="Benchmark",
+        ),
+        study_description=SimpleNamespace(
+            study_title="Benchmark study title",
+            study_short_title="Benchmark study",
+        ),
+    )
+    study_visits = [
+        SimpleNamespace(
+            uid=f"StudyVisit_{visit:06}",
+            visit_name=f"Visit {visit}",
+            visit_type=SimpleNamespace(sponsor_preferred_name="Treatment"),
+            study_epoch=SimpleNamespace(sponsor_preferred_name="Treatment 1"),
+        )
+        for visit in range(VISITS)
+    ]
+    odm_items = [
+        SimpleNamespace(
+            uid=f"OdmItem_{item:06}",
+            oid=f"I.{item}",
+            name=f"Item {item}",
+            datatype=ctrxml.DataType.TEXT,
+            length=200,
+            significant_digits=None,
+            origin="Collected",
+            comment=None,
+            codelist=SimpleNamespace(uid=f"C{item % CODELISTS}"),
+            aliases=_aliases(f"Item {item}"),
+        )
+        for item in range(FORMS * ITEM_GROUPS_PER_FORM * ITEMS_PER_ITEM_GROUP)
+    ]
+    odm_item_groups = [
+        SimpleNamespace(
+            uid=f"OdmItemGroup_{item_group:06}",
+            oid=f"IG.{item_group}",
+            name=f"Item group {item_group}",
+            repeating="No",
+            is_reference_data="No",
+            origin="Collected",
+            purpose="Tabulation",
+            comment=None,
+            descriptions=_descriptions(f"Item group {item_group}"),
+            items=[
+                SimpleNamespace(
+                    oid=item.oid,
+                    order_number=order,
+                    mandatory="Yes",
+                    role=None,
+                    role_codelist_oid=None,
+                )
+                for order, item in enumerate(
+                    odm_items[
+                        item_group
+                        * ITEMS_PER_ITEM_GROUP : (item_group + 1)
+                        * ITEMS_PER_ITEM_GROUP
+                    ]
+                )
+            ],
+            aliases=_aliases(f"Item group {item_group}"),
+        )
+        for item_group in range(FORMS * ITEM_GROUPS_PER_FORM)
+    ]
+    odm_forms = [
+        SimpleNamespace(
+            oid=f"F.{form}",
+            name=f"Form {form}",
+            repeating="No",
+            descriptions=_descriptions(f"Form {form}"),
+            item_groups=[
+                SimpleNamespace(
+                    uid=item_group.uid,
+                    oid=item_group.oid,
+                    order_number=order,
+                    mandatory="Yes",
+                    collection_exception_condition_oid=None,
+                )
+                for order, item_group in enumerate(
+                    odm_item_groups[
+                        form * ITEM_GROUPS_PER_FORM : (form + 1) * ITEM_GROUPS_PER_FORM
+                    ]
+                )
+            ],
+            aliases=_aliases(f"Form {form}"),
+        )
+        for form in range(FORMS)
+    ]
+    ct_codelist_attributes = [
+        SimpleNamespace(codelist_uid=f"C{codelist}", name=f"Codelist {codelist}")
+        for codelist in range(CODELISTS)
+    ]
+    return {
+        "study_metadata": study_metadata,
+        "study_visits": study_visits,
+        "odm_forms": odm_forms,
+        "odm_item_groups": odm_item_groups,
+        "odm_items": odm_items,
+        "ct_codelist_attributes": ct_codelist_attributes,
+    }
+
+
+@pytest.fixture
+def mock_study(monkeypatch):
+    data = _mock_study_data()
+
+    class MockODMBuilder(ODMBuilder):
+        def __init__(self, study_uid: str, study_value_version: str | None = None):
+            super().__init__(study_uid, study_value_version)
+            # takes the place of the cached properties fetching data through the services
+            self.__dict__.update(data)
+
+    monkeypatch.setattr(ctr_xml_service, "ODMBuilder", MockODMBuilder)
+    cache_store_ctr_odm.clear()
+    yield MockODMBuilder
+    cache_store_ctr_odm.clear()
+
+
+def test_ctr_odm_generation_of_locked_version(mock_study):
+    service = CTRXMLService()
+
+    start = time.perf_counter()
+    document = service.get_ctr_odm("Study_000001", "1.0")
+    uncached_duration = time.perf_counter() - start
+
+    start = time.perf_counter()
+    cached_document = service.get_ctr_odm("Study_000001", "1.0")
+    cached_duration = time.perf_counter() - start
+
+    log.info(
+        "CTR ODM of %.1f MB: %.0f ms generated, %.3f ms cached",
+        len(document) / 1e6,
+        uncached_duration * 1e3,
+        cached_duration * 1e3,
+    )
+
+    assert cached_document is document
+
+
+def test_ctr_odm_streaming_of_latest_version(mock_study):
+    service = CTRXMLService()
+    odm = mock_study("Study_000001").get_odm()
+
+    start = time.perf_counter()
+    document = service.serializer.render(odm, ns_map=service.namespaces)
+    render_duration = time.perf_counter() - start
+
+    start = time.perf_counter()
+    first_chunk = None
+    chunks = []
+    for chunk in service._iter_serialized(odm):
+        if first_chunk is None:
+            first_chunk = time.perf_counter() - start
+        chunks.append(chunk)
+    stream_duration = time.perf_counter() - start
+
+    log.info(
+        "CTR ODM of %.1f MB: %.0f ms rendered, %.0f ms streamed in %i chunks, first chunk after %.1f ms",
+        len(document) / 1e6,
+        render_duration * 1e3,
+        stream_duration * 1e3,
+        len(chunks),
+        first_chunk * 1e3,
+    )
+
+    assert b"".join(chunks).decode("utf-8") == document
+    assert max(len(chunk) for chunk in chunks[:-1]) < 2 * service.STREAM_CHUNK_SIZE
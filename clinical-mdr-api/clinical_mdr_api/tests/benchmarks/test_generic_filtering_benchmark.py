@@ -0,0 +1,213 @@
+"""
+Benchmark of the in-memory filtering and sorting of the study selections of a large study.
+
+Run with `pipenv run benchmark`, it is not part of the unit test suite.
+"""
+
+import logging
+import time
+from datetime import datetime, timezone
+
+from clinical_mdr_api.models.utils import BaseModel
+from clinical_mdr_api.services._utils import (
+    extract_nested_key_type,
+    extract_nested_key_value,
+    filter_aggregated_items,
+    service_level_generic_filtering,
+)
+
+log = logging.getLogger(__name__)
+
+ACTIVITIES = 5000
+SOA_GROUPS = 10
+ACTIVITY_GROUPS = 50
+ACTIVITY_SUBGROUPS = 200
+
+WILDCARD_FILTER = {"*": {"v": ["subgroup 17"], "op": "co"}}
+SORT_BY = {
+    "study_soa_group.order": True,
+    "study_activity_group.order": True,
+    "activity.name": True,
+}
+
+
+class ActivityGrouping(BaseModel):
+    activity_group_uid: str
+    activity_group_name: str
+    activity_subgroup_uid: str
+    activity_subgroup_name: str
+
+
+class Activity(BaseModel):
+    uid: str
+    name: str
+    name_sentence_case: str
+    nci_concept_id: str | None = None
+    library_name: str
+    is_data_collected: bool
+    activity_groupings: list[ActivityGrouping] = []
+    status: str
+    version: str
+
+
+class StudySoAGroup(BaseModel):
+    study_soa_group_uid: str
+    soa_group_term_uid: str
+    soa_group_term_name: str
+    order: int
+
+
+class StudyActivityGroup(BaseModel):
+    study_activity_group_uid: str
+    activity_group_uid: str
+    activity_group_name: str
+    order: int
+
+
+class StudyActivitySubGroup(BaseModel):
+    study_activity_subgroup_uid: str
+    activity_subgroup_uid: str
+    activity_subgroup_name: str
+    order: int
+
+
+class StudySelectionActivity(BaseModel):
+    study_uid: str
+    study_activity_uid: str
+    order: int
+    show_activity_in_protocol_flowchart: bool
+    study_soa_group: StudySoAGroup
+    study_activity_group: StudyActivityGroup | None = None
+    study_activity_subgroup: StudyActivitySubGroup | None = None
+    activity: Activity
+    start_date: datetime
+    author_username: str
+
+    @property
+    def uid(self):
+        return self.study_activity_uid
+
+
+def _mock_study_activities() -> list[StudySelectionActivity]:
+    activities = []
+    for index in range(ACTIVITIES):
+        soa_group = index % SOA_GROUPS
+        group = index % ACTIVITY_GROUPS
+        subgroup = index % ACTIVITY_SUBGROUPS
+        activities.append(
+            StudySelectionActivity(
+                study_uid="Study_000001",
+                study_activity_uid=f"StudyActivity_{index:06}",
+                order=index + 1,
+                show_activity_in_protocol_flowchart=index % 3 == 0,
+                study_soa_group=StudySoAGroup(
+                    study_soa_group_uid=f"StudySoAGroup_{soa_group:06}",
+                    soa_group_term_uid=f"CTTerm_{soa_group:06}",
+                    soa_group_term_name=f"SoA group {soa_group}",
+                    order=SOA_GROUPS - soa_group,
+                ),
+                study_activity_group=StudyActivityGroup(
+                    study_activity_group_uid=f"StudyActivityGroup_{group:06}",
+                    activity_group_uid=f"ActivityGroup_{group:06}",
+                    activity_group_name=f"Activity group {group}",
+                    order=group,
+                ),
+                study_activity_subgroup=StudyActivitySubGroup(
+                    study_activity_subgroup_uid=f"StudyActivitySubGroup_{subgroup:06}",
+                    activity_subgroup_uid=f"ActivitySubGroup_{subgroup:06}",
+                    activity_subgroup_name=f"Activity subgroup {subgroup}",
+                    order=subgroup,
+                ),
+                activity=Activity(
+                    uid=f"Activity_{index:06}",
+                    name=f"Activity {ACTIVITIES - index}",
+                    name_sentence_case=f"activity {ACTIVITIES - index}",
+                    nci_concept_id=f"C{index}" if index % 2 else None,
+                    library_name="Sponsor",
+                    is_data_collected=index % 2 == 0,
+                    activity_groupings=[
+                        ActivityGrouping(
+                            activity_group_uid=f"ActivityGroup_{group:06}",
+                            activity_group_name=f"Activity group {group}",
+                            activity_subgroup_uid=f"ActivitySubGroup_{subgroup:06}",
+                            activity_subgroup_name=f"Activity subgroup {subgroup}",
+                        )
+                    ],
+                    status="Final",
+                    version="1.0",
+                ),
+                start_date=datetime(2024, 1, 1, tzinfo=timezone.utc),
+                author_username="someone@example.com",
+            )
+        )
+    return activities
+
+
+def _reference_filtering(items, filter_by, sort_by):
+    """Filtering and sorting item by item, resolving every key and operator for each item"""
+
+    filtered_items = [
+        item
+        for item in items
+        if all(
+            filter_aggregated_items(item, key, element["v"], element["op"])
+            for key, element in filter_by.items()
+        )
+    ]
+    filtered_items.sort(
+        key=lambda x: [
+            (
+                elm
+                if (elm := extract_nested_key_value(x, sort_key)) is not None
+                else (
+                    "-1"
+                    if issubclass(extract_nested_key_type(x, sort_key), str)
+                    else -1
+                )
+            )
+            for sort_key in sort_by
+        ],
+        reverse=not next(iter(sort_by.values())),
+    )
+    return filtered_items
+
+
+def test_wildcard_search_with_three_key_sort():
+    activities = _mock_study_activities()
+
+    start = time.perf_counter()
+    expected = _reference_filtering(activities, WILDCARD_FILTER, SORT_BY)
+    reference_duration = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = service_level_generic_filtering(
+        activities, filter_by=WILDCARD_FILTER, sort_by=SORT_BY, total_count=True
+    )
+    compiled_duration = time.perf_counter() - start
+
+    log.info(
+        "Wildcard search and 3-key sort of %i study activities, %i matches: %.0f ms item by item, %.0f ms compiled",
+        ACTIVITIES,
+        result.total,
+        reference_duration * 1e3,
+        compiled_duration * 1e3,
+    )
+
+    assert result.total == len(expected) > 0
+    assert result.items == expected
+
+
+def test_mixed_order_sort():
+    activities = _mock_study_activities()
+    sort_by = {"study_soa_group.order": False, "activity.name": True}
+
+    start = time.perf_counter()
+    result = service_level_generic_filtering(activities, sort_by=sort_by)
+    duration = time.perf_counter() - start
+
+    log.info(
+        "Mixed order sort of %i study activities: %.0f ms", ACTIVITIES, duration * 1e3
+    )
+
+    keys = [(-item.study_soa_group.order, item.activity.name) for item in result.items]
+    assert keys == sorted(keys)
@@ -0,0 +1,98 @@
+"""
+Micro-benchmark of the Python side query construction of a wildcard search listing.
+
+Run with `pipenv run benchmark`, it is not part of the unit test suite.
+"""
+
+import logging
+import timeit
+
+from clinical_mdr_api.models.concepts.activities.activity import (
+    ActivityForStudyActivity,
+)
+from clinical_mdr_api.repositories._utils import (
+    CypherQueryBuilder,
+    FilterDict,
+    cache_store_filter_clause,
+    cache_store_sort_expressions,
+    get_wildcard_field_sources,
+    get_wildcard_filter,
+)
+
+log = logging.getLogger(__name__)
+
+ITERATIONS = 2000
+
+
+def _build_wildcard_query() -> CypherQueryBuilder:
+    return CypherQueryBuilder(
+        match_clause="MATCH (concept_root:ActivityRoot)",
+        alias_clause="concept_root.uid AS uid",
+        filter_by=FilterDict.model_validate(
+            {"elements": {"*": {"v": ["paracetamol"]}, "status": {"v": ["Final"]}}}
+        ),
+        sort_by={"name": True, "start_date": False},
+        page_number=1,
+        page_size=10,
+        return_model=ActivityForStudyActivity,
+    )
+
+
+def _clear_caches() -> None:
+    cache_store_filter_clause.clear()
+    cache_store_sort_expressions.clear()
+    get_wildcard_field_sources.cache_clear()
+
+
+def _report(name: str, uncached: float, cached: float) -> None:
+    log.info(
+        "%s: %.1f us uncached, %.1f us cached, %.1fx faster",
+        name,
+        uncached / ITERATIONS * 1e6,
+        cached / ITERATIONS * 1e6,
+        uncached / cached,
+    )
+
+
+def test_cypher_query_builder_wildcard_filter():
+    def uncached():
+        _clear_caches()
+        _build_wildcard_query()
+
+    uncached_duration = timeit.timeit(uncached, number=ITERATIONS)
+    cached_duration = timeit.timeit(_build_wildcard_query, number=ITERATIONS)
+    _report("CypherQueryBuilder wildcard", uncached_duration, cached_duration)
+
+    _clear_caches()
+    uncached_query = _build_wildcard_query()
+    cached_query = _build_wildcard_query()
+    assert cached_query.full_query == uncached_query.full_query
+    assert cached_query.parameters == uncached_query.parameters
+
+
+def test_neomodel_wildcard_filter():
+    filter_elem = FilterDict.model_validate(
+        {"elements": {"*": {"v": ["paracetamol"]}}}
+    ).elements["*"]
+
+    def uncached():
+        _clear_caches()
+        get_wildcard_filter(filter_elem=filter_elem, model=ActivityForStudyActivity)
+
+    uncached_duration = timeit.timeit(uncached, number=ITERATIONS)
+    cached_duration = timeit.timeit(
+        lambda: get_wildcard_filter(
+            filter_elem=filter_elem, model=ActivityForStudyActivity
+        ),
+        number=ITERATIONS,
+    )
+    _report("neomodel wildcard Q filter", uncached_duration, cached_duration)
+
+    _clear_caches()
+    uncached_filter = get_wildcard_filter(
+        filter_elem=filter_elem, model=ActivityForStudyActivity
+    )
+    cached_filter = get_wildcard_filter(
+        filter_elem=filter_elem, model=ActivityForStudyActivity
+    )
+    assert repr(cached_filter) == repr(uncached_filter)
@@ -65,7 +65,10 @@ def test_import_odm_xml(api_client):
 
     res = response.json()
 
-    assert_with_key_exclusion(import_output1, res, ["start_date"])
+    assert_with_key_exclusion(import_output1, res, ["start_date", "import_statistics"])
+    assert res["import_statistics"]["items"]["count"] == len(res["items"])
+    assert res["import_statistics"]["forms"]["count"] == len(res["forms"])
+    assert res["import_statistics"]["lookups"]["count"] > 0
 
 
 def test_import_odm_vendor_with_csv_mapper(api_client):
@@ -91,7 +94,7 @@ def test_import_odm_vendor_with_csv_mapper(api_client):
 
     res = response.json()
 
-    assert_with_key_exclusion(import_output2, res, ["start_date"])
+    assert_with_key_exclusion(import_output2, res, ["start_date", "import_statistics"])
 
 
 def test_import_clinspark_odm_xml(api_client):
@@ -105,7 +108,9 @@ def test_import_clinspark_odm_xml(api_client):
 
     res = response.json()
 
-    assert_with_key_exclusion(clinspark_output, res, ["start_date"])
+    assert_with_key_exclusion(
+        clinspark_output, res, ["start_date", "import_statistics"]
+    )
 
 
 def test_throw_exception_if_file_is_not_xml(api_client):
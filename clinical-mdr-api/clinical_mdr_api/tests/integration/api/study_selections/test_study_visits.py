@@ -18,12 +18,14 @@ from fastapi.testclient import TestClient
 from neomodel import db
 
 from clinical_mdr_api import main
+from clinical_mdr_api.domains.study_selections.study_selection_base import SoAItemType
 from clinical_mdr_api.models.clinical_programmes.clinical_programme import (
     ClinicalProgramme,
 )
 from clinical_mdr_api.models.controlled_terminologies.ct_term_name import CTTermName
 from clinical_mdr_api.models.projects.project import Project
 from clinical_mdr_api.models.study_selections.study import Study
+from clinical_mdr_api.models.study_selections.study_selection import ReferencedItem
 from clinical_mdr_api.tests.integration.utils.api import (
     inject_and_clear_db,
     inject_base_data,
@@ -2268,6 +2270,150 @@ def test_editing_special_visit(api_client):
     assert special_visit_after_update["show_visit"] is False
 
 
+def test_inserting_early_visit_keeps_relationships_of_renumbered_visits(api_client):
+    _study = TestUtils.create_study(project_number=project.project_number)
+    study_epoch = create_study_epoch("EpochSubType_0001", study_uid=_study.uid)
+
+    def create_visit(time_value: int) -> dict[str, Any]:
+        datadict = visits_basic_data.copy()
+        datadict.update(
+            {
+                "study_epoch_uid": study_epoch.uid,
+                "visit_type_uid": "VisitType_0001",
+                "show_visit": True,
+                "time_reference_uid": "VisitSubType_0005",
+                "time_value": time_value,
+                "time_unit_uid": DAYUID,
+                "visit_class": "SINGLE_VISIT",
+                "visit_subclass": "SINGLE_VISIT",
+                "is_global_anchor_visit": False,
+            }
+        )
+        response = api_client.post(
+            f"/studies/{_study.uid}/study-visits",
+            json=datadict,
+        )
+        assert_response_status_code(response, 201)
+        return response.json()
+
+    visits = [create_visit(10), create_visit(20)]
+    assert [visit["visit_name"] for visit in visits] == ["Visit 1", "Visit 2"]
+
+    # Schedule a study activity in both visits and add a footnote to the second visit
+    activity_group = TestUtils.create_activity_group(name="Renumbering group")
+    activity_subgroup = TestUtils.create_activity_subgroup(
+        name="Renumbering subgroup", activity_groups=[activity_group.uid]
+    )
+    activity = TestUtils.create_activity(
+        name="Renumbering activity",
+        activity_subgroups=[activity_subgroup.uid],
+        activity_groups=[activity_group.uid],
+        library_name="Sponsor",
+    )
+    flowchart_group_codelist = TestUtils.create_ct_codelist(
+        sponsor_preferred_name="Renumbering Flowchart Group",
+        extensible=True,
+        approve=True,
+        submission_value="FLWCRTGRP",
+    )
+    flowchart_group = TestUtils.create_ct_term(
+        sponsor_preferred_name="Renumbering Subject Information",
+        codelist_uid=flowchart_group_codelist.codelist_uid,
+    )
+    study_activity = TestUtils.create_study_activity(
+        study_uid=_study.uid,
+        soa_group_term_uid=flowchart_group.term_uid,
+        activity_uid=activity.uid,
+        activity_subgroup_uid=activity_subgroup.uid,
+        activity_group_uid=activity_group.uid,
+    )
+    schedules = {
+        TestUtils.create_study_activity_schedule(
+            study_uid=_study.uid,
+            study_visit_uid=visit["uid"],
+            study_activity_uid=study_activity.study_activity_uid,
+        ).study_activity_schedule_uid: visit["uid"]
+        for visit in visits
+    }
+    footnote_type_codelist = TestUtils.create_ct_codelist(
+        name="Renumbering Footnote Type",
+        submission_value="FTNTTP",
+        extensible=True,
+        approve=True,
+    )
+    footnote_template = TestUtils.create_footnote_template(
+        name="Renumbering footnote",
+        study_uid=None,
+        type_uid=TestUtils.create_ct_term(
+            sponsor_preferred_name="Renumbering Schedule of Activities",
+            codelist_uid=footnote_type_codelist.codelist_uid,
+        ).term_uid,
+        library_name="Sponsor",
+    )
+    soa_footnote = TestUtils.create_study_soa_footnote(
+        study_uid=_study.uid,
+        footnote_template_uid=footnote_template.uid,
+        referenced_items=[
+            ReferencedItem(item_uid=visits[1]["uid"], item_type=SoAItemType.STUDY_VISIT)
+        ],
+    )
+
+    # Insert a visit before all the others
+    early_visit = create_visit(5)
+    assert early_visit["visit_name"] == "Visit 1"
+
+    # The later visits are renumbered
+    kept_fields = [
+        "study_epoch_uid",
+        "visit_type_uid",
+        "visit_contact_mode_uid",
+        "time_reference_uid",
+        "time_value",
+        "time_unit_uid",
+        "visit_window_unit_uid",
+        "epoch_allocation_uid",
+        "visit_class",
+        "visit_subclass",
+    ]
+    for index, visit in enumerate(visits, start=2):
+        response = api_client.get(f"/studies/{_study.uid}/study-visits/{visit['uid']}")
+        assert_response_status_code(response, 200)
+        res = response.json()
+        assert res["visit_name"] == f"Visit {index}"
+        assert res["visit_number"] == float(index)
+        assert res["visit_short_name"] == f"V{index}"
+        # The relationships copied to the renumbered version are kept
+        assert {field: res[field] for field in kept_fields} == {
+            field: visit[field] for field in kept_fields
+        }
+
+        # The renumbering is audited as an edit of the visit
+        response = api_client.get(
+            f"/studies/{_study.uid}/study-visits/{visit['uid']}/audit-trail/",
+        )
+        assert_response_status_code(response, 200)
+        res = response.json()
+        assert [entry["change_type"] for entry in res] == ["Edit", "Create"]
+        assert res[0]["visit_name"] == f"Visit {index}"
+        assert res[1]["visit_name"] == f"Visit {index - 1}"
+
+    # The schedules still point to the renumbered visits
+    response = api_client.get(f"/studies/{_study.uid}/study-activity-schedules")
+    assert_response_status_code(response, 200)
+    assert {
+        schedule["study_activity_schedule_uid"]: schedule["study_visit_uid"]
+        for schedule in response.json()
+    } == schedules
+
+    # The footnote still references the renumbered visit
+    response = api_client.get(
+        f"/studies/{_study.uid}/study-soa-footnotes/{soa_footnote.uid}"
+    )
+    assert_response_status_code(response, 200)
+    res = response.json()
+    assert [item["item_uid"] for item in res["referenced_items"]] == [visits[1]["uid"]]
+
+
 @pytest.mark.parametrize(
     ("study_uid", "study_value_version"),
     [
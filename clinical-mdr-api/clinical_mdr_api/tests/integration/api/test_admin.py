@@ -3,6 +3,9 @@ Tests for /admin/* endpoints
 """
 
 import logging
+import os
+import subprocess
+import sys
 
 import pytest
 from fastapi.testclient import TestClient
@@ -24,6 +27,17 @@ from clinical_mdr_api.tests.utils.checks import assert_response_status_code
 
 log = logging.getLogger(__name__)
 
+# The middlewares are set up when the app is imported, so the app without tracing runs in a separate process
+METRICS_WITHOUT_TRACING_SCRIPT = """
+from fastapi.testclient import TestClient
+from clinical_mdr_api.main import app
+api_client = TestClient(app)
+api_client.get("/clinical-programmes/ClinicalProgramme_000001")
+response = api_client.get("/admin/metrics")
+assert response.status_code == 200, response.status_code
+print(response.text)
+"""
+
 
 @pytest.fixture(scope="module")
 def api_client(test_data):
@@ -113,3 +127,24 @@ def test_patch_user(api_client):
         if item["user_id"] == user_id:
             assert item["username"] == new_username
             break
+
+
+def test_get_metrics_without_tracing(test_data):
+    """Test GET /admin/metrics with tracing disabled"""
+    result = subprocess.run(
+        [sys.executable, "-c", METRICS_WITHOUT_TRACING_SCRIPT],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "TRACING_ENABLED": "false"},
+    )
+
+    labels = '{method="GET",route="/clinical-programmes/{clinical_programme_uid}"}'
+    metrics = dict(
+        line.rsplit(" ", 1)
+        for line in result.stdout.splitlines()
+        if line.startswith("osb_request_")
+    )
+    assert metrics[f"osb_request_duration_seconds_count{labels}"] == "1"
+    # Cypher queries are counted without tracing, too
+    assert float(metrics[f"osb_request_cypher_queries_sum{labels}"]) > 0
@@ -849,6 +849,106 @@ class TestStudyDefinitionRepository(unittest.TestCase):
             with self.subTest():
                 assert_dataclasses_equal(db_studies[test_study.uid], test_study)
 
+    def _create_study(self) -> StudyDefinitionAR:
+        with db.transaction:
+            repository = StudyDefinitionRepositoryImpl(current_function_name())
+            created_study = create_random_study(
+                repository.generate_uid,
+                new_id_metadata_fixed_values={
+                    "project_number": self.created_project.project_number
+                },
+                is_study_after_create=True,
+                author_id=current_function_name(),
+            )
+            repository.save(created_study)
+            repository.close()
+        return created_study
+
+    @staticmethod
+    def _find_all_by_uid() -> dict[str, StudyDefinitionAR]:
+        with db.transaction:
+            repository = StudyDefinitionRepositoryImpl(current_function_name())
+            all_studies_in_db = repository.find_all(
+                page_number=1, page_size=sys.maxsize
+            ).items
+            repository.close()
+        return {_study.uid: _study for _study in all_studies_in_db}
+
+    @staticmethod
+    def _count_study_summaries(study_uid: str) -> tuple[int, int]:
+        rs = db.cypher_query(
+            """
+            OPTIONAL MATCH (:StudyRoot {uid: $uid})-[:HAS_SUMMARY]->(ss:StudySummary)
+            OPTIONAL MATCH (ss)-[:HAS_METADATA {kind: 'current'}]->(metadata:StudySummaryMetadata)
+            RETURN count(DISTINCT ss), count(metadata)
+            """,
+            {"uid": study_uid},
+        )
+        return rs[0][0][0], rs[0][0][1]
+
+    def test__find_all__after_save__lists_saved_metadata(self):
+        # given
+        created_study = self._create_study()
+
+        # when
+        with db.transaction:
+            repository = StudyDefinitionRepositoryImpl(current_function_name())
+            amended_study = repository.find_by_uid(created_study.uid, for_update=True)
+            make_random_study_metadata_edit(
+                amended_study,
+                new_id_metadata_fixed_values={
+                    "project_number": self.created_project.project_number,
+                    "study_number": created_study.current_metadata.id_metadata.study_number,
+                },
+                author_id=current_function_name(),
+            )
+            repository.save(amended_study)
+            repository.close()
+
+        # then
+        assert_dataclasses_equal(
+            self._find_all_by_uid()[created_study.uid], amended_study
+        )
+        assert self._count_study_summaries(created_study.uid) == (1, 1)
+
+    def test__refresh_study_summary__repeated__no_duplicates(self):
+        # given
+        created_study = self._create_study()
+
+        # when
+        for _ in range(3):
+            with db.transaction:
+                repository = StudyDefinitionRepositoryImpl(current_function_name())
+                # pylint: disable=protected-access
+                repository._refresh_study_summary(created_study.uid)
+                repository.close()
+
+        # then
+        assert self._count_study_summaries(created_study.uid) == (1, 1)
+        assert_dataclasses_equal(
+            self._find_all_by_uid()[created_study.uid], created_study
+        )
+
+    def test__find_all__without_summary__lists_live_data(self):
+        # given
+        created_study = self._create_study()
+
+        # when
+        db.cypher_query(
+            """
+            MATCH (:StudyRoot {uid: $uid})-[:HAS_SUMMARY]->(ss:StudySummary)
+            OPTIONAL MATCH (ss)-[:HAS_METADATA]->(metadata:StudySummaryMetadata)
+            DETACH DELETE ss, metadata
+            """,
+            {"uid": created_study.uid},
+        )
+
+        # then
+        assert self._count_study_summaries(created_study.uid) == (0, 0)
+        assert_dataclasses_equal(
+            self._find_all_by_uid()[created_study.uid], created_study
+        )
+
     def test__find_by_id__find_for_update_without_transaction__failure(self):
         # given
         uid = "some-uid"
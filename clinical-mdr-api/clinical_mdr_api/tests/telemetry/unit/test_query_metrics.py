@@ -0,0 +1,103 @@
+import pytest
+
+from common.telemetry.query_metrics import (
+    UNMATCHED_ROUTE,
+    Histogram,
+    QueryMetricsAggregator,
+    normalize_params,
+    normalize_query,
+)
+
+
+def test_histogram_cumulative_counts():
+    histogram = Histogram((1, 5, 10))
+    for value in (0, 1, 3, 7, 100):
+        histogram.observe(value)
+
+    assert histogram.cumulative_counts() == [
+        ("1", 2),
+        ("5", 3),
+        ("10", 4),
+        ("+Inf", 5),
+    ]
+    assert histogram.sum == 111
+    assert histogram.count == 5
+
+
+def test_normalize_query_and_params():
+    assert (
+        normalize_query("MATCH (n)\n    WHERE n.uid = $uid\n  RETURN n ")
+        == "MATCH (n) WHERE n.uid = $uid RETURN n"
+    )
+    assert normalize_params(
+        {"uid": "StudyRoot_000001", "uids": ["a", "b"], "limit": 10, "props": {}}
+    ) == {"uid": "str", "uids": "list[2]", "limit": "int", "props": "dict[0]"}
+    assert normalize_params(None) == {}
+
+
+def test_slowest_queries_are_kept():
+    aggregator = QueryMetricsAggregator(slow_query_log_size=3)
+    for duration in (0.5, 0.1, 2.0, 0.3, 1.0, 0.2):
+        aggregator.record_query(
+            f"RETURN {duration}", {"uid": "x"}, duration, "/studies/{study_uid}"
+        )
+
+    assert [query.duration for query in aggregator.get_slow_queries()] == [
+        2.0,
+        1.0,
+        0.5,
+    ]
+    assert not aggregator.is_slow_query(0.4)
+    assert aggregator.is_slow_query(0.6)
+
+
+def test_slow_query_log_can_be_disabled():
+    aggregator = QueryMetricsAggregator(slow_query_log_size=0)
+    aggregator.record_query("RETURN 1", None, 10.0, None)
+
+    assert not aggregator.is_slow_query(10.0)
+    assert not aggregator.get_slow_queries()
+
+
+@pytest.fixture(name="aggregator")
+def fixture_aggregator():
+    aggregator = QueryMetricsAggregator(slow_query_log_size=2)
+    aggregator.record_request("GET", "/studies/{study_uid}", 200, 0.2, 7, 0.25)
+    aggregator.record_request("GET", "/studies/{study_uid}", 500, 1.5, 30, 1.25)
+    aggregator.record_request("GET", None, 404, 0.001, 0, 0)
+    aggregator.record_query(
+        'MATCH (n {name: "a\\b"})\nRETURN n',
+        {"uid": "x"},
+        1.1,
+        "/studies/{study_uid}",
+    )
+    return aggregator
+
+
+def test_to_prometheus(aggregator):
+    output = aggregator.to_prometheus().splitlines()
+    labels = 'method="GET",route="/studies/{study_uid}"'
+    unmatched_labels = f'method="GET",route="{UNMATCHED_ROUTE}"'
+
+    assert "# TYPE osb_request_duration_seconds histogram" in output
+    assert f'osb_request_duration_seconds_bucket{{{labels},le="0.25"}} 1' in output
+    assert f'osb_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in output
+    assert f"osb_request_duration_seconds_count{{{labels}}} 2" in output
+    assert f"osb_request_duration_seconds_count{{{unmatched_labels}}} 1" in output
+    assert f'osb_request_cypher_queries_bucket{{{labels},le="10"}} 1' in output
+    assert f'osb_request_cypher_queries_bucket{{{labels},le="50"}} 2' in output
+    assert f"osb_request_cypher_queries_sum{{{labels}}} 37" in output
+    assert f"osb_request_cypher_duration_seconds_total{{{labels}}} 1.5" in output
+    assert f"osb_request_errors_total{{{labels}}} 1" in output
+    assert f"osb_request_errors_total{{{unmatched_labels}}} 0" in output
+    assert (
+        'osb_cypher_slow_query_duration_seconds{rank="1",route="/studies/{study_uid}",'
+        'query="MATCH (n {name: \\"a\\\\b\\"}) RETURN n",params="uid: str"} 1.1'
+    ) in output
+
+
+def test_reset(aggregator):
+    aggregator.reset()
+
+    assert not aggregator.get_slow_queries()
+    assert "osb_request_duration_seconds_count" not in aggregator.to_prometheus()
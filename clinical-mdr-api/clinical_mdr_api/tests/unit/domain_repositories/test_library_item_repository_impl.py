@@ -0,0 +1,98 @@
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from clinical_mdr_api.domain_repositories.library_item_repository import (
+    RETRIEVED_READ_ONLY_MARK,
+    LibraryItemRepositoryImplBase,
+)
+from clinical_mdr_api.domain_repositories.models.biomedical_concepts import (
+    ActivityInstanceClassRoot,
+    ActivityInstanceClassValue,
+)
+from clinical_mdr_api.domains.versioned_object_aggregate import LibraryItemStatus
+
+
+class ActivityInstanceClassRepository(LibraryItemRepositoryImplBase):
+    root_class = ActivityInstanceClassRoot
+    value_class = ActivityInstanceClassValue
+
+    def _create_aggregate_root_instance_from_version_root_relationship_and_value(
+        self, **kwargs
+    ):
+        return SimpleNamespace(**kwargs)
+
+    def _maintain_parameters(self, versioned_object, root, value):
+        pass
+
+
+def version_rel(version: str, start: int, end: int | None = None):
+    return SimpleNamespace(
+        version=version,
+        start_date=datetime(2024, 1, start),
+        end_date=datetime(2024, 1, end) if end else None,
+    )
+
+
+@patch("neomodel.db.cypher_query")
+def test_find_all_loads_all_items_in_a_single_query(mock_cypher_query):
+    latest = version_rel("1.0", 2)
+    mock_cypher_query.return_value = (
+        [
+            (
+                "root1",
+                "library",
+                "value1",
+                [version_rel("0.1", 1, 2), latest, version_rel("0.2", 1, 2)],
+                0,
+            ),
+            ("root2", None, "value2", [version_rel("0.1", 3)], 0),
+        ],
+        None,
+    )
+
+    items = ActivityInstanceClassRepository().find_all(library_name="Sponsor")
+
+    mock_cypher_query.assert_called_once()
+    query = mock_cypher_query.call_args.args[0]
+    assert "(root:ActivityInstanceClassRoot)-[:LATEST]->(value)" in query
+    assert "(library:Library)-[:CONTAINS]->(root)" in query
+    assert "[version_rel:HAS_VERSION]" in query
+    assert "ORDER BY root.uid DESC" in query
+    assert mock_cypher_query.call_args.kwargs["params"] == {"library_name": "Sponsor"}
+
+    assert [item.root for item in items] == ["root1", "root2"]
+    assert [item.library for item in items] == ["library", None]
+    assert items[0].relationship is latest
+    assert items[1].relationship.version == "0.1"
+    assert all(item.study_count == 0 for item in items)
+    assert all(
+        item.repository_closure_data is RETRIEVED_READ_ONLY_MARK for item in items
+    )
+
+
+@patch("neomodel.db.cypher_query", return_value=([], None))
+def test_find_all_by_status_follows_latest_status_relationship(mock_cypher_query):
+    ActivityInstanceClassRepository().find_all(status=LibraryItemStatus.RETIRED)
+
+    query = mock_cypher_query.call_args.args[0]
+    assert "(root:ActivityInstanceClassRoot)-[:LATEST_RETIRED]->(value)" in query
+    assert "ORDER BY" not in query
+
+
+@patch.object(ActivityInstanceClassRepository, "_get_study_count", return_value=3)
+@patch("neomodel.db.cypher_query")
+def test_find_all_falls_back_to_study_count_per_item(
+    mock_cypher_query, mock_get_study_count
+):
+    # The value class has no study selection relationship to count in the query
+    mock_cypher_query.return_value = (
+        [("root", "library", "value", [version_rel("1.0", 1)], 0)],
+        None,
+    )
+
+    items = ActivityInstanceClassRepository().find_all(return_study_count=True)
+
+    assert "StudySelection" not in mock_cypher_query.call_args.args[0]
+    mock_get_study_count.assert_called_once_with("value")
+    assert items[0].study_count == 3
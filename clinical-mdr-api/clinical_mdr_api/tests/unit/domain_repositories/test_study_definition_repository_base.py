@@ -141,6 +141,10 @@ class StudyDefinitionRepositoryFake(StudyDefinitionRepository):
     ) -> bool:
         return True
 
+    @staticmethod
+    def get_locked_study_value_version(study_uid: str) -> str | None:
+        return None
+
     def get_preferred_time_unit(
         self,
         study_uid: str,
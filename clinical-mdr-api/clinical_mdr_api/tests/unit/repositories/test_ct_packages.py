@@ -0,0 +1,141 @@
+import gzip
+import json
+import unittest
+from unittest import mock
+
+from neo4j.time import DateTime
+
+from clinical_mdr_api.repositories import ct_packages
+
+OLD_PACKAGE = "SDTM CT 2024-03-29"
+NEW_PACKAGE = "SDTM CT 2024-06-28"
+
+STORED_CHANGES = {
+    "new_codelists": [],
+    "deleted_codelists": [],
+    "updated_codelists": [
+        {"uid": "C1", "change_date": "2024-06-28T00:00:00.000000000+00:00"}
+    ],
+    "new_terms": [
+        {
+            "uid": "T1",
+            "change_date": "2024-06-28T00:00:00.000000000+00:00",
+            "codelists": ["C1"],
+        }
+    ],
+    "deleted_terms": [],
+    "updated_terms": [],
+}
+
+
+def codelist(uid, name, change_date):
+    return {
+        "uid": uid,
+        "value_node": {
+            "name": name,
+            "preferred_term": name,
+            "synonyms": None,
+            "definition": name,
+            "extensible": False,
+            "submission_value": name.upper(),
+        },
+        "change_date": change_date,
+    }
+
+
+def term(uid, name, codelists, change_date):
+    return {
+        "uid": uid,
+        "value_node": {"preferred_term": name, "synonyms": [name], "definition": name},
+        "codelists": codelists,
+        "change_date": change_date,
+    }
+
+
+class TestStoredCtPackagesChanges(unittest.TestCase):
+    @mock.patch.object(ct_packages.db, "cypher_query")
+    def test_stored_changes_are_returned(self, cypher_query):
+        cypher_query.return_value = (
+            [[gzip.compress(json.dumps(STORED_CHANGES).encode("utf-8"))]],
+            ["changes.changes"],
+        )
+
+        output = ct_packages.get_stored_ct_packages_changes(OLD_PACKAGE, NEW_PACKAGE)
+
+        cypher_query.assert_called_once_with(
+            ct_packages.STORED_CHANGES_QUERY,
+            {
+                "old_package_name": OLD_PACKAGE,
+                "new_package_name": NEW_PACKAGE,
+                "changes_format": ct_packages.CT_PACKAGES_CHANGES_FORMAT,
+            },
+        )
+        # the change dates are deserialized
+        change_date = output["updated_codelists"][0]["change_date"]
+        self.assertIsInstance(change_date, DateTime)
+        self.assertEqual(
+            change_date.iso_format(),
+            STORED_CHANGES["updated_codelists"][0]["change_date"],
+        )
+        self.assertEqual(output["new_terms"][0]["codelists"], ["C1"])
+        self.assertEqual(output.keys(), STORED_CHANGES.keys())
+
+    @mock.patch.object(ct_packages.db, "cypher_query", return_value=([], []))
+    def test_changes_stored_in_another_format_are_ignored(self, cypher_query):
+        # the format is matched by the query, changes in another format aren't returned
+        self.assertIsNone(
+            ct_packages.get_stored_ct_packages_changes(OLD_PACKAGE, NEW_PACKAGE)
+        )
+        self.assertIn(
+            "changes.format = $changes_format", cypher_query.call_args.args[0]
+        )
+
+    @mock.patch.object(ct_packages.db, "cypher_query")
+    @mock.patch.object(ct_packages, "get_stored_ct_packages_changes")
+    def test_stored_changes_are_not_recomputed(self, get_stored, cypher_query):
+        get_stored.return_value = {"new_terms": []}
+
+        output = ct_packages.get_ct_packages_changes.__wrapped__(
+            OLD_PACKAGE, NEW_PACKAGE
+        )
+
+        self.assertEqual(output, {"new_terms": []})
+        cypher_query.assert_not_called()
+
+    @mock.patch.object(ct_packages.db, "cypher_query")
+    @mock.patch.object(ct_packages, "get_stored_ct_packages_changes", return_value=None)
+    def test_changes_are_computed_without_stored_changes(self, _, cypher_query):
+        old_date = DateTime(2024, 3, 29)
+        new_date = DateTime(2024, 6, 28)
+        packages = {
+            (ct_packages.PACKAGE_CODELISTS_DATA_RETRIEVAL, OLD_PACKAGE): {
+                "C1": codelist("C1", "one", old_date),
+                "C2": codelist("C2", "two", old_date),
+            },
+            (ct_packages.PACKAGE_CODELISTS_DATA_RETRIEVAL, NEW_PACKAGE): {
+                "C1": codelist("C1", "one", old_date),
+                "C3": codelist("C3", "three", new_date),
+            },
+            (ct_packages.PACKAGE_TERMS_DATA_RETRIEVAL, OLD_PACKAGE): {
+                "T1": term("T1", "one", ["C1"], old_date),
+            },
+            (ct_packages.PACKAGE_TERMS_DATA_RETRIEVAL, NEW_PACKAGE): {
+                "T1": term("T1", "uno", ["C1"], new_date),
+            },
+        }
+        cypher_query.side_effect = lambda query, params: (
+            [[packages[query, params["package_name"]]]],
+            ["items_map"],
+        )
+
+        output = ct_packages.get_ct_packages_changes.__wrapped__(
+            OLD_PACKAGE, NEW_PACKAGE
+        )
+
+        self.assertEqual([cl["uid"] for cl in output["new_codelists"]], ["C3"])
+        self.assertEqual([cl["uid"] for cl in output["deleted_codelists"]], ["C2"])
+        self.assertEqual([t["uid"] for t in output["updated_terms"]], ["T1"])
+        # the codelist of an updated term is updated as well
+        self.assertEqual([cl["uid"] for cl in output["updated_codelists"]], ["C1"])
+        self.assertEqual(output["new_terms"], [])
+        self.assertEqual(output["deleted_terms"], [])
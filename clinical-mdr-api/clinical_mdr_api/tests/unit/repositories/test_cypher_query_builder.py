@@ -0,0 +1,449 @@
+import unittest
+from unittest import mock
+
+from neo4j.time import DateTime
+from starlette_context import request_cycle_context
+
+from clinical_mdr_api.repositories._utils import (
+    CypherQueryBuilder,
+    FilterDict,
+    cache_store_filter_clause,
+    cache_store_total_count,
+    get_headers_cache,
+    sb_clear_cache,
+)
+from clinical_mdr_api.utils.pagination import (
+    TotalCountMode,
+    decode_page_token,
+    encode_page_token,
+    sort_signature,
+)
+from common.exceptions import ValidationException
+
+MATCH_CLAUSE = "MATCH (n:Node)"
+ALIAS_CLAUSE = "n.uid AS uid, n.name AS name, n.start_date AS start_date"
+
+
+class TestCypherQueryBuilderKeysetPagination(unittest.TestCase):
+    def test_offset_pagination_by_default(self):
+        query = CypherQueryBuilder(
+            match_clause=MATCH_CLAUSE,
+            alias_clause=ALIAS_CLAUSE,
+            page_number=3,
+            page_size=10,
+            sort_by={"name": True},
+        )
+
+        assert (
+            query.pagination_clause == "SKIP $page_number * $page_size LIMIT $page_size"
+        )
+        assert query.parameters == {"page_number": 2, "page_size": 10}
+        assert query.cursor_clause == ""
+        assert "_page_cursor" not in query.full_query
+
+    def test_page_token_is_not_taken_from_request_context(self):
+        with request_cycle_context({"page_token": "", "next_page_token": None}):
+            query = CypherQueryBuilder(
+                match_clause=MATCH_CLAUSE,
+                alias_clause=ALIAS_CLAUSE,
+                page_number=3,
+                page_size=10,
+            )
+
+        assert not query.is_keyset_pagination
+        assert "SKIP" in query.full_query
+
+    def test_first_page(self):
+        query = CypherQueryBuilder(
+            match_clause=MATCH_CLAUSE,
+            alias_clause=ALIAS_CLAUSE,
+            page_number=3,
+            page_size=10,
+            sort_by={"name": False},
+            page_token="",
+        )
+
+        assert query.pagination_clause == "LIMIT $page_size"
+        assert query.parameters == {"page_size": 10}
+        assert query.sort_clause == "ORDER BY name DESC,uid ASC"
+        assert query.cursor_clause == ""
+        assert "RETURN *, [name, uid] AS _page_cursor" in query.full_query
+        assert "SKIP" not in query.full_query
+
+    def test_next_page(self):
+        signature = sort_signature(["name False", "uid True"])
+        token = encode_page_token(["Aspirin", "Concept_000042"], signature=signature)
+
+        query = CypherQueryBuilder(
+            match_clause=MATCH_CLAUSE,
+            alias_clause=ALIAS_CLAUSE,
+            page_size=10,
+            sort_by={"name": False},
+            page_token=token,
+        )
+
+        assert query.cursor_clause == (
+            "WITH * WHERE (name < $cursor_0) OR (name = $cursor_0 AND (uid > $cursor_1 OR uid IS NULL))"
+        )
+        assert query.parameters == {
+            "cursor_0": "Aspirin",
+            "cursor_1": "Concept_000042",
+            "page_size": 10,
+        }
+        # The count query isn't limited to the rows after the cursor
+        assert "cursor" not in query.count_query
+
+    def test_null_and_datetime_cursor_values(self):
+        signature = sort_signature(["start_date True", "name True", "uid True"])
+        token = encode_page_token(
+            [DateTime(2024, 1, 31, 12, 0, 0), None, "Concept_000042"],
+            signature=signature,
+        )
+
+        query = CypherQueryBuilder(
+            match_clause=MATCH_CLAUSE,
+            alias_clause=ALIAS_CLAUSE,
+            page_size=10,
+            sort_by={"start_date": True, "name": True},
+            page_token=token,
+        )
+
+        assert query.cursor_clause == (
+            "WITH * WHERE ((start_date > datetime($cursor_0) OR start_date IS NULL))"
+            " OR (start_date = datetime($cursor_0) AND name IS NULL AND (uid > $cursor_2 OR uid IS NULL))"
+        )
+        assert query.parameters["cursor_0"].startswith("2024-01-31T12:00:00")
+        assert query.parameters["cursor_1"] is None
+
+    def test_composite_tie_breaker_is_never_null(self):
+        query = CypherQueryBuilder(
+            match_clause=MATCH_CLAUSE,
+            alias_clause=ALIAS_CLAUSE,
+            page_size=10,
+            sort_by={"name": True},
+            page_token="",
+            cursor_tie_breaker=["uid", "start_date"],
+        )
+
+        tie_breaker = (
+            "coalesce(toString(uid), '') + '|' + coalesce(toString(start_date), '')"
+        )
+        assert query.sort_clause == f"ORDER BY name ASC,{tie_breaker} ASC"
+        assert f"[name, {tie_breaker}] AS _page_cursor" in query.full_query
+
+    def test_token_from_other_sorting_is_rejected(self):
+        token = encode_page_token(
+            ["Aspirin", "Concept_000042"],
+            signature=sort_signature(["name True", "uid True"]),
+        )
+
+        with self.assertRaises(ValidationException):
+            CypherQueryBuilder(
+                match_clause=MATCH_CLAUSE,
+                alias_clause=ALIAS_CLAUSE,
+                page_size=10,
+                sort_by={"name": False},
+                page_token=token,
+            )
+
+    def test_malformed_token_is_rejected(self):
+        with self.assertRaises(ValidationException):
+            decode_page_token("not a token", signature="x")
+
+    def test_execute_returns_next_page_token(self):
+        query = CypherQueryBuilder(
+            match_clause=MATCH_CLAUSE,
+            alias_clause=ALIAS_CLAUSE,
+            page_size=2,
+            sort_by={"name": True},
+            page_token="",
+        )
+        rows = [
+            ["Concept_000001", "A", ["A", "Concept_000001"]],
+            ["Concept_000002", "B", ["B", "Concept_000002"]],
+        ]
+
+        with mock.patch(
+            "clinical_mdr_api.repositories._utils.db.cypher_query",
+            return_value=(rows, ["uid", "name", "_page_cursor"]),
+        ):
+            result_array, attributes_names = query.execute()
+
+        assert attributes_names == ["uid", "name"]
+        assert result_array == [["Concept_000001", "A"], ["Concept_000002", "B"]]
+        assert decode_page_token(
+            query.next_page_token, signature=query.cursor_signature
+        ) == [("B", None), ("Concept_000002", None)]
+
+    def test_execute_last_page_has_no_next_page_token(self):
+        query = CypherQueryBuilder(
+            match_clause=MATCH_CLAUSE,
+            alias_clause=ALIAS_CLAUSE,
+            page_size=2,
+            page_token="",
+        )
+
+        with mock.patch(
+            "clinical_mdr_api.repositories._utils.db.cypher_query",
+            return_value=(
+                [["Concept_000001", ["Concept_000001"]]],
+                ["uid", "_page_cursor"],
+            ),
+        ):
+            result_array, _ = query.execute()
+
+        assert result_array == [["Concept_000001"]]
+        assert query.next_page_token is None
+
+
+class TestCypherQueryBuilderTotalCount(unittest.TestCase):
+    def setUp(self):
+        cache_store_total_count.clear()
+
+    def test_no_count_query_without_total_count(self):
+        query = CypherQueryBuilder(match_clause=MATCH_CLAUSE, alias_clause=ALIAS_CLAUSE)
+
+        with mock.patch(
+            "clinical_mdr_api.repositories._utils.db.cypher_query"
+        ) as cypher_query:
+            assert query.execute_count() == 0
+        cypher_query.assert_not_called()
+
+    def test_union_counts_are_summed(self):
+        query = CypherQueryBuilder(
+            match_clause=MATCH_CLAUSE,
+            alias_clause=ALIAS_CLAUSE,
+            union_match_clause="MATCH (n:OtherNode)",
+            total_count=True,
+        )
+
+        assert "UNION ALL" in query.count_query
+        with mock.patch(
+            "clinical_mdr_api.repositories._utils.db.cypher_query",
+            return_value=([[3], [3]], ["total_count"]),
+        ):
+            assert query.execute_count() == 6
+
+    def test_cached_count_ignores_pagination(self):
+        def build_query(page_number: int) -> CypherQueryBuilder:
+            return CypherQueryBuilder(
+                match_clause=MATCH_CLAUSE,
+                alias_clause=ALIAS_CLAUSE,
+                page_number=page_number,
+                page_size=10,
+                total_count=True,
+                total_count_mode=TotalCountMode.CACHED,
+            )
+
+        with mock.patch(
+            "clinical_mdr_api.repositories._utils.db.cypher_query",
+            return_value=([[42]], ["total_count"]),
+        ) as cypher_query:
+            assert build_query(page_number=1).execute_count() == 42
+            assert build_query(page_number=2).execute_count() == 42
+        cypher_query.assert_called_once()
+
+    def test_inline_count(self):
+        query = CypherQueryBuilder(
+            match_clause=MATCH_CLAUSE,
+            alias_clause=ALIAS_CLAUSE,
+            page_size=2,
+            total_count=True,
+            total_count_mode=TotalCountMode.INLINE,
+        )
+
+        with mock.patch(
+            "clinical_mdr_api.repositories._utils.db.cypher_query",
+            return_value=(
+                [["A", 5, "Concept_000001"], ["B", 5, "Concept_000002"]],
+                ["name", "total_count", "uid"],
+            ),
+        ) as cypher_query:
+            result_array, attributes_names = query.execute()
+            assert query.execute_count() == 5
+
+        cypher_query.assert_called_once()
+        assert cypher_query.call_args.kwargs["query"].startswith(
+            f"CALL {{ {query.count_query} }}"
+        )
+        assert attributes_names == ["name", "uid"]
+        assert result_array == [["A", "Concept_000001"], ["B", "Concept_000002"]]
+
+    def test_inline_count_query(self):
+        query = CypherQueryBuilder(
+            match_clause=MATCH_CLAUSE,
+            alias_clause=ALIAS_CLAUSE,
+            page_size=2,
+            total_count=True,
+            total_count_mode="inline",
+        )
+
+        with mock.patch(
+            "clinical_mdr_api.repositories._utils.db.cypher_query",
+            return_value=([], ["total_count"]),
+        ) as cypher_query:
+            query.execute()
+
+        assert cypher_query.call_args.kwargs["query"] == (
+            f"CALL {{ {query.count_query} }} "
+            "WITH sum(total_count) AS total_count "
+            f"CALL {{ {query.full_query} }} "
+            "RETURN *"
+        )
+
+    def test_total_count_mode_is_validated_only_with_total_count(self):
+        query = CypherQueryBuilder(
+            match_clause=MATCH_CLAUSE,
+            alias_clause=ALIAS_CLAUSE,
+            total_count_mode="unknown",
+        )
+        assert query.total_count_mode == TotalCountMode.EXACT
+
+        with self.assertRaises(ValidationException):
+            CypherQueryBuilder(
+                match_clause=MATCH_CLAUSE,
+                alias_clause=ALIAS_CLAUSE,
+                total_count=True,
+                total_count_mode="unknown",
+            )
+
+    def test_total_count_mode_is_not_taken_from_request_context(self):
+        with request_cycle_context({"total_count_mode": "estimated"}):
+            query = CypherQueryBuilder(
+                match_clause=MATCH_CLAUSE,
+                alias_clause=ALIAS_CLAUSE,
+                total_count=True,
+            )
+
+        assert query.total_count_mode == TotalCountMode.EXACT
+
+    def test_estimated_count(self):
+        query = CypherQueryBuilder(
+            match_clause=MATCH_CLAUSE,
+            alias_clause=ALIAS_CLAUSE,
+            total_count=True,
+            total_count_mode=TotalCountMode.ESTIMATED,
+        )
+        session = mock.MagicMock()
+        session.__enter__.return_value.run.return_value.consume.return_value.plan = {
+            "operatorType": "ProduceResults",
+            "args": {"EstimatedRows": 1234.6},
+        }
+
+        with mock.patch("clinical_mdr_api.repositories._utils.db") as db:
+            db.driver.session.return_value = session
+            assert query.execute_count() == 1235
+        db.cypher_query.assert_not_called()
+        assert session.__enter__.return_value.run.call_args.args[0].startswith(
+            "EXPLAIN MATCH (n:Node)"
+        )
+
+
+class TestCypherQueryBuilderCompiledFilters(unittest.TestCase):
+    def setUp(self):
+        cache_store_filter_clause.clear()
+
+    def build_query(self, filter_by: dict) -> CypherQueryBuilder:
+        return CypherQueryBuilder(
+            match_clause=MATCH_CLAUSE,
+            alias_clause=ALIAS_CLAUSE,
+            filter_by=FilterDict.model_validate({"elements": filter_by}),
+            wildcard_properties_list=["uid", "name"],
+        )
+
+    def test_same_shape_reuses_clause_with_new_values(self):
+        first = self.build_query({"name": {"v": ["Aspirin"], "op": "co"}})
+        second = self.build_query({"name": {"v": ["Ibuprofen"], "op": "co"}})
+
+        assert len(cache_store_filter_clause) == 1
+        assert first.filter_clause == second.filter_clause
+        assert second.filter_clause == "WHERE toLower(toString(name)) CONTAINS $name_0"
+        assert first.parameters == {"name_0": "aspirin"}
+        assert second.parameters == {"name_0": "ibuprofen"}
+
+    def test_wildcard_values_are_lowercased(self):
+        self.build_query({"*": {"v": ["Aspirin"]}})
+        query = self.build_query({"*": {"v": ["IBUPROFEN"]}})
+
+        assert len(cache_store_filter_clause) == 1
+        assert query.filter_clause == (
+            "WHERE (toLower(uid) CONTAINS $wildcard_0 OR toLower(name) CONTAINS $wildcard_0)"
+        )
+        assert query.parameters == {"wildcard_0": "ibuprofen"}
+
+    def test_between_values_are_sorted(self):
+        query = self.build_query({"name": {"v": ["b", "a"], "op": "bw"}})
+
+        assert query.filter_clause == "WHERE $name_0<=name<=$name_1"
+        assert query.parameters == {"name_0": "a", "name_1": "b"}
+
+    def test_value_types_are_part_of_the_shape(self):
+        text = self.build_query({"start_date": {"v": ["text"]}})
+        date = self.build_query({"start_date": {"v": ["2024-01-31"]}})
+
+        assert len(cache_store_filter_clause) == 2
+        assert "datetime(" not in text.filter_clause
+        assert "datetime($start_date_0)" in date.filter_clause
+        assert date.parameters == {"start_date_0": "2024-01-31"}
+
+
+class TestCypherQueryBuilderHeadersCache(unittest.TestCase):
+    class Root:
+        pass
+
+    class Repository:
+        @property
+        def cache_store_headers(self):
+            return get_headers_cache(TestCypherQueryBuilderHeadersCache.Root)
+
+        @sb_clear_cache(caches=["cache_store_headers"])
+        def save(self):
+            pass
+
+    def setUp(self):
+        get_headers_cache(self.Root).clear()
+
+    def get_headers(self, search_string: str) -> list:
+        query = CypherQueryBuilder(
+            match_clause=MATCH_CLAUSE,
+            alias_clause=ALIAS_CLAUSE,
+            filter_by=FilterDict.model_validate(
+                {"elements": {"name": {"v": [search_string], "op": "co"}}}
+            ),
+        )
+        result_array, _ = query.execute_header_query(
+            header_alias="name",
+            page_size=10,
+            cache=self.Repository().cache_store_headers,
+        )
+        return result_array
+
+    def test_headers_are_cached_until_root_type_is_written(self):
+        with mock.patch(
+            "clinical_mdr_api.repositories._utils.db.cypher_query",
+            return_value=([[["Aspirin"]]], ["values"]),
+        ) as cypher_query:
+            assert self.get_headers("asp") == [[["Aspirin"]]]
+            assert self.get_headers("asp") == [[["Aspirin"]]]
+            assert cypher_query.call_count == 1
+
+            # Another search string is another entry
+            self.get_headers("ibu")
+            assert cypher_query.call_count == 2
+
+            self.Repository().save()
+            self.get_headers("asp")
+            assert cypher_query.call_count == 3
+
+    def test_header_query_leaves_full_query_unchanged(self):
+        query = CypherQueryBuilder(match_clause=MATCH_CLAUSE, alias_clause=ALIAS_CLAUSE)
+        full_query = query.full_query
+
+        with mock.patch(
+            "clinical_mdr_api.repositories._utils.db.cypher_query",
+            return_value=([[["Aspirin"]]], ["values"]),
+        ) as cypher_query:
+            query.execute_header_query(header_alias="name", page_size=10)
+
+        assert query.full_query == full_query
+        assert cypher_query.call_args.kwargs["query"] != full_query
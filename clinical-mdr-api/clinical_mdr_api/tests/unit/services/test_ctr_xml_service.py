@@ -0,0 +1,83 @@
+import unittest
+from unittest import mock
+
+from parameterized import parameterized
+
+from clinical_mdr_api.services.ctr_xml import ctr_xml_service
+from clinical_mdr_api.services.ctr_xml.ctr_xml_service import (
+    CTRXMLService,
+    cache_store_ctr_odm,
+)
+
+
+class TestCTRXMLServiceCache(unittest.TestCase):
+    def setUp(self):
+        cache_store_ctr_odm.clear()
+        self.addCleanup(cache_store_ctr_odm.clear)
+
+        odm_builder = mock.patch.object(ctr_xml_service, "ODMBuilder")
+        self.odm_builder = odm_builder.start()
+        self.addCleanup(odm_builder.stop)
+
+        render = mock.patch.object(
+            CTRXMLService.serializer,
+            "render",
+            side_effect=lambda odm, ns_map: f"<ODM>{len(self.odm_builder.mock_calls)}</ODM>",
+        )
+        render.start()
+        self.addCleanup(render.stop)
+
+    def _patch_locked_version(self, version: str | None):
+        return mock.patch.object(
+            ctr_xml_service.StudyService,
+            "get_locked_study_value_version",
+            return_value=version,
+        )
+
+    def test_latest_version_of_locked_study_is_cached_as_its_locked_version(self):
+        service = CTRXMLService()
+        with self._patch_locked_version("2") as get_locked_study_value_version:
+            document = service.get_ctr_odm("Study_000001")
+            self.assertEqual(service.get_ctr_odm("Study_000001"), document)
+
+        get_locked_study_value_version.assert_called_with("Study_000001")
+        self.odm_builder.assert_called_once_with("Study_000001", "2")
+        self.assertIs(cache_store_ctr_odm[("Study_000001", "2")], document)
+        # the same document is returned for the explicitly requested version
+        self.assertIs(service.get_ctr_odm("Study_000001", "2"), document)
+        self.assertEqual(self.odm_builder.call_count, 1)
+
+    @parameterized.expand([("get_ctr_odm",), ("iter_ctr_odm",)])
+    def test_latest_version_of_draft_study_is_not_cached(self, method):
+        service = CTRXMLService()
+        with self._patch_locked_version(None), mock.patch.object(
+            CTRXMLService, "_iter_serialized", return_value=iter([b"<ODM/>"])
+        ):
+            getattr(service, method)("Study_000001")
+            getattr(service, method)("Study_000001")
+
+        self.assertEqual(
+            self.odm_builder.call_args_list, [mock.call("Study_000001")] * 2
+        )
+        self.assertEqual(len(cache_store_ctr_odm), 0)
+
+    def test_locked_study_is_streamed_from_the_cache(self):
+        service = CTRXMLService()
+        with self._patch_locked_version("2"):
+            chunks = list(service.iter_ctr_odm("Study_000001"))
+
+        self.assertEqual(
+            b"".join(chunks).decode("utf-8"),
+            cache_store_ctr_odm[("Study_000001", "2")],
+        )
+
+    def test_specific_version_is_not_resolved(self):
+        service = CTRXMLService()
+        with self._patch_locked_version("2") as get_locked_study_value_version:
+            service.get_ctr_odm("Study_000001", "1")
+
+        get_locked_study_value_version.assert_not_called()
+        self.odm_builder.assert_called_once_with("Study_000001", "1")
+
+    def test_cache_is_bounded(self):
+        self.assertLessEqual(cache_store_ctr_odm.maxsize, 16)
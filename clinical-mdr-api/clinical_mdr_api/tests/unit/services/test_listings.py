@@ -0,0 +1,48 @@
+import json
+import os
+
+import pytest
+
+from clinical_mdr_api.listings.query_service import METADATA_FILE
+from clinical_mdr_api.services.listings.listings import ListingsService
+
+
+def load_metadata():
+    with open(METADATA_FILE, "r", encoding="UTF-8") as metadata:
+        return json.load(metadata)
+
+
+def test_metadata_file_is_located_independently_of_working_directory():
+    assert os.path.isabs(METADATA_FILE)
+    assert os.path.isfile(METADATA_FILE)
+
+
+@pytest.mark.parametrize(
+    "dataset_name",
+    [None, "", "topic_cd_def", "CDISC_CT_VAL, topic_cd_def", "cdisc_ct_ver,unknown"],
+)
+def test_list_metadata(dataset_name):
+    requested = (
+        dataset_name.replace(" ", "").lower().split(",") if dataset_name else None
+    )
+    expected = [
+        column
+        for column in load_metadata()
+        if requested is None or column["dataset_name"] in requested
+    ]
+
+    result = ListingsService().list_metadata(
+        dataset_name=dataset_name, total_count=True
+    )
+
+    assert result.total == len(expected)
+    assert [item.model_dump() for item in result.items] == expected
+
+
+def test_list_metadata_sorting_does_not_alter_index():
+    service = ListingsService()
+    before = [item.name for item in service.list_metadata().items]
+
+    service.list_metadata(sort_by={"name": False})
+
+    assert [item.name for item in service.list_metadata().items] == before
@@ -0,0 +1,176 @@
+import unittest
+from io import BytesIO
+from unittest import mock
+
+from lxml import etree
+from parameterized import parameterized
+
+from clinical_mdr_api.domains.concepts.odms.odm_xml_definition import (
+    Attribute,
+    Element,
+    TranslatedText,
+)
+from clinical_mdr_api.services.concepts.odms.odm_xml_exporter import (
+    OdmXmlExporterService,
+)
+from common.exceptions import BusinessLogicException
+
+
+class ODM:
+    def __init__(self, **kwargs):
+        for key, val in kwargs.items():
+            setattr(self, key, val)
+
+
+class Study(ODM):
+    pass
+
+
+class BasicDefinitions(ODM):
+    pass
+
+
+class FormDef(ODM):
+    pass
+
+
+def create_odm(**study_attributes):
+    return ODM(
+        odm_ns=Attribute("xmlns:odm", "http://www.cdisc.org/ns/odm/v1.3"),
+        osb_ns=Attribute("xmlns:osb", "http://openstudybuilder.org"),
+        file_oid=Attribute("FileOID", 1_700_000_000_000),
+        study=Study(
+            oid=Attribute("OID", 'Study "A" <1> & 2\n\tline'),
+            descriptions=[
+                TranslatedText(
+                    'Text & <b>markup</b> "quoted"\nnew line',
+                    Attribute("xml:lang", "en"),
+                ),
+                TranslatedText("", Attribute("xml:lang", "da")),
+            ],
+            vendor_elements=[
+                Element(
+                    "osb:element",
+                    _string="inner text",
+                    version=Attribute("osb:version", "1.0"),
+                ),
+                Element("osb:mixed", _string="text", child=BasicDefinitions()),
+            ],
+            codelists=[],
+            basic_definitions=BasicDefinitions(),
+            form_def=FormDef(
+                oid=Attribute("OID", "F.1"),
+                instruction=Attribute("osb:instruction", "instruction"),
+            ),
+            **study_attributes,
+        ),
+    )
+
+
+def create_exporter(
+    odm: ODM | None = None, stylesheet: str | None = None, mapper_file=None
+) -> OdmXmlExporterService:
+    # the constructor extracts the ODM data from the database
+    exporter = object.__new__(OdmXmlExporterService)
+    exporter.odm = odm or create_odm()
+    exporter.pdf = False
+    exporter.stylesheet = stylesheet
+    exporter.mapper_file = mapper_file
+    return exporter
+
+
+def canonicalize(xml: bytes) -> str:
+    return etree.canonicalize(xml.decode("utf-8"), strip_text=True)
+
+
+class TestOdmXmlExporter(unittest.TestCase):
+    @parameterized.expand([(None,), ("sdtm",)])
+    def test_streamed_odm_document_matches_the_odm_tree(self, stylesheet):
+        exporter = create_exporter(stylesheet=stylesheet)
+
+        document = exporter.get_odm_document()
+
+        tree = etree.ElementTree(exporter._build_odm_tree())
+        self.assertEqual(canonicalize(document), canonicalize(etree.tostring(tree)))
+        self.assertTrue(document.startswith(b'<?xml version="1.0" encoding="utf-8"?>'))
+        self.assertEqual(
+            f'<?xml-stylesheet type="text/xsl" href="{stylesheet}"?>'.encode()
+            in document,
+            stylesheet is not None,
+        )
+
+    def test_odm_document_is_pretty_printed(self):
+        document = create_exporter().get_odm_document().decode("utf-8")
+
+        self.assertIn(
+            "\n\t<Study"
+            ' OID="Study &quot;A&quot; &lt;1&gt; &amp; 2&#10;&#9;line">\n'
+            '\t\t<TranslatedText xml:lang="en">Text &amp; &lt;b&gt;markup&lt;/b&gt;'
+            ' "quoted"\nnew line</TranslatedText>\n'
+            '\t\t<TranslatedText xml:lang="da"></TranslatedText>\n'
+            '\t\t<osb:element osb:version="1.0">inner text</osb:element>\n',
+            document,
+        )
+        self.assertIn(
+            '\t\t<BasicDefinitions/>\n\t\t<FormDef OID="F.1"'
+            ' osb:instruction="instruction"></FormDef>\n\t</Study>\n</ODM>\n',
+            document,
+        )
+
+    def test_odm_document_is_streamed_in_chunks(self):
+        exporter = create_exporter()
+        exporter.STREAM_CHUNK_SIZE = 100
+
+        chunks = list(exporter.iter_odm_document())
+
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(b"".join(chunks), exporter.get_odm_document())
+
+    @parameterized.expand(
+        [
+            ("undeclared prefix", {"vendor": Element("sdtm:element", _string="x")}),
+            ("invalid name", {"vendor": Element("osb:in valid", _string="x")}),
+            ("invalid character", {"name": Attribute("Name", "bell \x07")}),
+        ]
+    )
+    def test_invalid_odm_document_fails_before_streaming(self, _, study_attributes):
+        exporter = create_exporter(create_odm(**study_attributes))
+
+        with mock.patch.object(
+            OdmXmlExporterService, "_iter_odm_xml_chunks"
+        ) as iter_odm_xml_chunks:
+            with self.assertRaises(BusinessLogicException):
+                exporter.iter_odm_document()
+
+        iter_odm_xml_chunks.assert_not_called()
+
+    def test_mapper_file_is_applied_on_the_odm_tree(self):
+        mapper_file = mock.Mock(
+            content_type="text/csv",
+            file=BytesIO(
+                b"type,parent,from_name,to_name,to_alias,from_alias,alias_context\n"
+                b"attribute,,osb:instruction,CompletionInstructions,,,\n"
+                b"attribute,FormDef,CompletionInstructions,,true,,\n"
+                b"attribute,Study,OID,osb:oid,,,\n"
+                b"element,,osb:element,VendorElement,,,\n"
+                b"element,Study,BasicDefinitions,osb:BasicDefinitions,,,\n"
+            ),
+        )
+        exporter = create_exporter(mapper_file=mapper_file)
+
+        root = etree.fromstring(exporter.get_odm_document())
+
+        osb = "{http://openstudybuilder.org}"
+        study = root.find("Study")
+        form_def = study.find("FormDef")
+        self.assertEqual(
+            form_def.attrib, {"OID": "F.1", "CompletionInstructions": "instruction"}
+        )
+        self.assertEqual(
+            form_def.find("Alias").attrib,
+            {"Name": "instruction", "Context": "CompletionInstructions"},
+        )
+        self.assertEqual(study.attrib, {f"{osb}oid": 'Study "A" <1> & 2\n\tline'})
+        self.assertEqual(study.find("VendorElement").text, "inner text")
+        self.assertEqual(len(list(study.iter(f"{osb}BasicDefinitions"))), 2)
+        self.assertIsNone(study.find(".//BasicDefinitions"))
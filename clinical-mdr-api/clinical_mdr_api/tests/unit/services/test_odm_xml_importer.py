@@ -0,0 +1,173 @@
+import unittest
+from unittest import mock
+from xml.dom import minidom
+
+from parameterized import parameterized
+
+from clinical_mdr_api.services.concepts.odms.odm_xml_importer import (
+    OdmXmlImporterService,
+)
+
+ODM_XML = """<?xml version="1.0" encoding="utf-8"?>
+<ODM xmlns:osb="url1" xmlns:prefix="url2" ODMVersion="1.3.2" FileType="Snapshot" FileOID="OID.1" Granularity="All">
+    <Study OID="S.1">
+        <MetaDataVersion OID="MDV.0.1" Name="MDV.0.1">
+            <FormDef OID="F.1" Name="form" Repeating="No" prefix:nameOne="1" prefix:unknown="2" osb:instruction="3">
+                <prefix:NameTwo prefix:nameThree="4">value</prefix:NameTwo>
+                <osb:DomainColor>red</osb:DomainColor>
+                <prefix:Unknown>value</prefix:Unknown>
+            </FormDef>
+        </MetaDataVersion>
+    </Study>
+</ODM>"""
+
+
+def _vendor_element(uid: str, prefix: str, name: str):
+    vendor_element = mock.Mock(uid=uid, vendor_namespace=mock.Mock(prefix=prefix))
+    # the name of a mock can't be given to its constructor
+    vendor_element.configure_mock(name=name)
+    return vendor_element
+
+
+def _vendor_attribute(
+    uid: str,
+    name: str,
+    prefix: str | None = None,
+    vendor_element_uid: str | None = None,
+    value_regex: str | None = None,
+):
+    vendor_attribute = mock.Mock(
+        uid=uid,
+        vendor_namespace=mock.Mock(prefix=prefix) if prefix else None,
+        vendor_element=(
+            mock.Mock(uid=vendor_element_uid) if vendor_element_uid else None
+        ),
+        value_regex=value_regex,
+    )
+    vendor_attribute.configure_mock(name=name)
+    return vendor_attribute
+
+
+class TestOdmXmlImporterLookups(unittest.TestCase):
+    def setUp(self):
+        # the constructor creates the services, which need the database
+        self.service = OdmXmlImporterService.__new__(OdmXmlImporterService)
+        self.service.xml_document = minidom.parseString(ODM_XML)
+        self.service._set_def_elements()
+        self.service.db_vendor_elements = [
+            _vendor_element("OdmVendorElement_000001", "prefix", "NameTwo"),
+            _vendor_element("OdmVendorElement_000002", "osb", "NameTwo"),
+        ]
+        self.service.db_vendor_attributes = [
+            _vendor_attribute(
+                "OdmVendorAttribute_000001",
+                "nameOne",
+                prefix="prefix",
+                value_regex="^\\d$",
+            ),
+            _vendor_attribute("OdmVendorAttribute_000002", "nameOne", prefix="osb"),
+            _vendor_attribute(
+                "OdmVendorAttribute_000003",
+                "nameThree",
+                vendor_element_uid="OdmVendorElement_000001",
+            ),
+        ]
+        self.service._index_vendors()
+
+    def test_vendors_are_indexed_by_prefix_and_name(self):
+        self.assertEqual(
+            self.service.vendor_element_uids_by,
+            {
+                ("prefix", "NameTwo"): "OdmVendorElement_000001",
+                ("osb", "NameTwo"): "OdmVendorElement_000002",
+            },
+        )
+        self.assertEqual(
+            self.service.vendor_attribute_uids_by,
+            {
+                ("prefix", "nameOne"): "OdmVendorAttribute_000001",
+                ("osb", "nameOne"): "OdmVendorAttribute_000002",
+            },
+        )
+        # vendor element attributes are indexed by the prefix of their vendor element
+        self.assertEqual(
+            self.service.vendor_element_attribute_uids_by,
+            {("prefix", "nameThree"): "OdmVendorAttribute_000003"},
+        )
+        self.assertEqual(
+            self.service.vendor_attribute_regexes_by_uid,
+            {
+                "OdmVendorAttribute_000001": "^\\d$",
+                "OdmVendorAttribute_000002": None,
+                "OdmVendorAttribute_000003": None,
+            },
+        )
+
+    def test_vendor_lookups_of_the_form_def(self):
+        form_def = self.service.form_defs[0]
+
+        vendor_attributes = {
+            attribute.localName: self.service._vendor_attribute_exists(
+                attribute.prefix, attribute.localName
+            )
+            for attribute in form_def.attributes.values()
+            if attribute.prefix
+        }
+        self.assertEqual(
+            vendor_attributes, {"nameOne": True, "unknown": False, "instruction": True}
+        )
+
+        vendor_elements = {
+            element.localName: self.service.vendor_element_exists(
+                element.prefix, element.localName
+            )
+            for element in form_def.childNodes
+            if isinstance(element, minidom.Element)
+        }
+        self.assertEqual(
+            vendor_elements, {"NameTwo": True, "DomainColor": True, "Unknown": False}
+        )
+
+        (vendor_element,) = form_def.getElementsByTagName("prefix:NameTwo")
+        (element_attribute,) = vendor_element.attributes.values()
+        self.assertTrue(
+            self.service._vendor_element_attribute_exists(
+                element_attribute.prefix, element_attribute.localName
+            )
+        )
+
+    @parameterized.expand(
+        [
+            # attributes of a vendor namespace are not vendor element attributes, and the other way around
+            ("_vendor_element_attribute_exists", "prefix", "nameOne"),
+            ("_vendor_attribute_exists", "prefix", "nameThree"),
+            ("_vendor_attribute_exists", "other", "nameOne"),
+            ("vendor_element_exists", "other", "NameTwo"),
+        ]
+    )
+    def test_vendor_lookups_match_prefix_and_name(self, lookup, prefix, name):
+        self.assertFalse(getattr(self.service, lookup)(prefix, name))
+
+    def test_new_vendors_are_found_once_reindexed(self):
+        self.assertFalse(self.service.vendor_element_exists("prefix", "NameFour"))
+
+        self.service.db_vendor_elements.append(
+            _vendor_element("OdmVendorElement_000003", "prefix", "NameFour")
+        )
+        self.service._index_vendors()
+
+        self.assertTrue(self.service.vendor_element_exists("prefix", "NameFour"))
+
+    def test_lookup_counts_are_added_to_import_statistics(self):
+        self.service.import_statistics = {}
+
+        self.service._timed(
+            "lookups", lambda: None, lambda: len(self.service.db_vendor_elements)
+        )
+        self.service._timed(
+            "lookups", lambda: None, lambda: len(self.service.db_vendor_attributes)
+        )
+        self.service._timed("forms", lambda: None, len(self.service.form_defs))
+
+        self.assertEqual(self.service.import_statistics["lookups"][0], 5)
+        self.assertEqual(self.service.import_statistics["forms"][0], 1)
@@ -0,0 +1,128 @@
+import unittest
+from unittest import mock
+
+from clinical_mdr_api.domain_repositories.study_selections.study_activity_schedule_repository import (
+    StudyActivityScheduleRepository,
+    StudyScheduleState,
+)
+from clinical_mdr_api.models.study_selections.study_selection import (
+    StudyActivitySchedule,
+    StudyActivityScheduleBatchInput,
+)
+from clinical_mdr_api.services.studies.study_activity_schedule import (
+    StudyActivityScheduleService,
+)
+
+STUDY_UID = "Study_000001"
+
+
+def _create(study_activity_uid: str, study_visit_uid: str):
+    return StudyActivityScheduleBatchInput(
+        method="POST",
+        content={
+            "study_activity_uid": study_activity_uid,
+            "study_visit_uid": study_visit_uid,
+        },
+    )
+
+
+def _delete(uid: str):
+    return StudyActivityScheduleBatchInput(method="DELETE", content={"uid": uid})
+
+
+def _assign_uids(_study_uid, created, _deleted, _author_id):
+    for index, schedule in enumerate(created, start=100):
+        schedule.uid = f"StudyActivitySchedule_{index:06}"
+
+
+class TestStudyActivityScheduleBatchOperations(unittest.TestCase):
+    def setUp(self):
+        self.repository = mock.Mock(spec=StudyActivityScheduleRepository)
+        self.repository.get_schedule_state.return_value = StudyScheduleState(
+            study_activity_instance_uids={
+                "StudyActivity_000001": "StudyActivityInstance_000001",
+                "StudyActivity_000002": None,
+            },
+            study_visit_uids={"StudyVisit_000001", "StudyVisit_000002"},
+            schedules={
+                "StudyActivitySchedule_000001": (
+                    "StudyActivity_000001",
+                    "StudyVisit_000001",
+                ),
+            },
+        )
+        self.repository.save_batch.side_effect = _assign_uids
+
+        self.service = StudyActivityScheduleService()
+        self.service._repos = mock.Mock(
+            study_activity_schedule_repository=self.repository
+        )
+
+    def test_batch_operations_are_validated_in_order_and_saved_at_once(self):
+        results = self.service.apply_batch_operations(
+            STUDY_UID,
+            [
+                _create("StudyActivity_000001", "StudyVisit_000002"),
+                # already scheduled
+                _create("StudyActivity_000001", "StudyVisit_000001"),
+                _delete("StudyActivitySchedule_000001"),
+                # scheduled again after the deletion
+                _create("StudyActivity_000001", "StudyVisit_000001"),
+                # scheduled earlier in the same batch
+                _create("StudyActivity_000001", "StudyVisit_000002"),
+                _create("StudyActivity_000003", "StudyVisit_000001"),
+                _create("StudyActivity_000002", "StudyVisit_000003"),
+                _delete("StudyActivitySchedule_000001"),
+                StudyActivityScheduleBatchInput(
+                    method="PATCH", content={"uid": "StudyActivitySchedule_000001"}
+                ),
+            ],
+        )
+
+        self.assertEqual(
+            [result.response_code for result in results],
+            [201, 400, 204, 201, 400, 404, 404, 404, 405],
+        )
+        self.repository.get_schedule_state.assert_called_once_with(STUDY_UID)
+        self.repository.save_batch.assert_called_once()
+        study_uid, created, deleted, author_id = (
+            self.repository.save_batch.call_args.args
+        )
+        self.assertEqual(study_uid, STUDY_UID)
+        self.assertEqual(
+            [(s.study_activity_uid, s.study_visit_uid) for s in created],
+            [
+                ("StudyActivity_000001", "StudyVisit_000002"),
+                ("StudyActivity_000001", "StudyVisit_000001"),
+            ],
+        )
+        self.assertEqual([s.uid for s in deleted], ["StudyActivitySchedule_000001"])
+        self.assertEqual(author_id, self.service.author)
+
+        self.assertIsInstance(results[0].content, StudyActivitySchedule)
+        self.assertEqual(
+            results[0].content.study_activity_schedule_uid,
+            "StudyActivitySchedule_000100",
+        )
+        self.assertEqual(
+            results[0].content.study_activity_instance_uid,
+            "StudyActivityInstance_000001",
+        )
+        self.assertEqual(
+            results[3].content.study_activity_schedule_uid,
+            "StudyActivitySchedule_000101",
+        )
+        self.assertEqual(
+            results[5].content.message,
+            "Study Activity with UID 'StudyActivity_000003' doesn't exist.",
+        )
+
+    def test_failed_operations_are_not_saved(self):
+        results = self.service.apply_batch_operations(
+            STUDY_UID, [_create("StudyActivity_000001", "StudyVisit_000001")]
+        )
+
+        self.assertEqual([result.response_code for result in results], [400])
+        self.repository.save_batch.assert_called_once_with(
+            STUDY_UID, [], [], self.service.author
+        )
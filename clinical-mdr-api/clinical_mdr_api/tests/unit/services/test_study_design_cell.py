@@ -0,0 +1,151 @@
+import unittest
+from dataclasses import replace
+from datetime import datetime, timezone
+from unittest import mock
+
+from clinical_mdr_api.domain_repositories.study_selections.study_design_cell_repository import (
+    StudyDesignCellRepository,
+)
+from clinical_mdr_api.domains.study_selections.study_design_cell import (
+    StudyDesignCellVO,
+)
+from clinical_mdr_api.models.study_selections.study_selection import (
+    StudyDesignCellBatchInput,
+)
+from clinical_mdr_api.services.studies.study_design_cell import StudyDesignCellService
+from clinical_mdr_api.services.user_info import UserInfoService
+
+STUDY_UID = "Study_000001"
+
+
+def _design_cell(uid: str, order: int) -> StudyDesignCellVO:
+    return StudyDesignCellVO(
+        uid=uid,
+        study_uid=STUDY_UID,
+        study_arm_uid="StudyArm_000001",
+        study_epoch_uid=f"StudyEpoch_{order:06}",
+        study_element_uid="StudyElement_000001",
+        transition_rule=None,
+        order=order,
+        start_date=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        author_id="author",
+    )
+
+
+def _save(design_cell_vo: StudyDesignCellVO, _author_id: str, create: bool = False):
+    if create:
+        return replace(design_cell_vo, uid=f"StudyDesignCell_{design_cell_vo.order}00")
+    return replace(design_cell_vo)
+
+
+def _create(order: int | None = None):
+    return StudyDesignCellBatchInput(
+        method="POST",
+        content={
+            "study_arm_uid": "StudyArm_000002",
+            "study_epoch_uid": "StudyEpoch_000001",
+            "study_element_uid": "StudyElement_000001",
+            "order": order,
+        },
+    )
+
+
+def _delete(uid: str):
+    return StudyDesignCellBatchInput(method="DELETE", content={"uid": uid})
+
+
+class TestStudyDesignCellBatchOperations(unittest.TestCase):
+    def setUp(self):
+        self.repository = mock.Mock(spec=StudyDesignCellRepository)
+        self.repository.find_all_design_cells_by_study.return_value = [
+            _design_cell("StudyDesignCell_000001", 1),
+            _design_cell("StudyDesignCell_000002", 2),
+            _design_cell("StudyDesignCell_000003", 3),
+        ]
+        self.repository.save.side_effect = _save
+
+        self.service = StudyDesignCellService()
+        self.service._repos = mock.Mock(study_design_cell_repository=self.repository)
+
+        get_author_username = mock.patch.object(
+            UserInfoService, "get_author_username_from_id", return_value="author"
+        )
+        get_author_username.start()
+        self.addCleanup(get_author_username.stop)
+
+    def _handle_batch_operations(self, operations):
+        # without the database transaction opened around the service method
+        return StudyDesignCellService.handle_batch_operations.__wrapped__(
+            self.service, STUDY_UID, operations
+        )
+
+    def _reordered(self):
+        self.repository.save_reordered_design_cells.assert_called_once()
+        study_uid, design_cells, author_id = (
+            self.repository.save_reordered_design_cells.call_args.args
+        )
+        self.assertEqual(study_uid, STUDY_UID)
+        self.assertEqual(author_id, self.service.author)
+        return [(design_cell.uid, design_cell.order) for design_cell in design_cells]
+
+    def test_design_cells_are_reordered_once_after_all_operations(self):
+        results = self._handle_batch_operations(
+            [
+                _create(order=1),
+                _delete("StudyDesignCell_000002"),
+                _delete("StudyDesignCell_000009"),
+                _create(),
+                _create(order=9),
+            ],
+        )
+
+        self.assertEqual(
+            [result.response_code for result in results], [201, 204, 422, 201, 400]
+        )
+        self.repository.find_all_design_cells_by_study.assert_called_once_with(
+            STUDY_UID
+        )
+        self.assertEqual(
+            [call.kwargs for call in self.repository.save.call_args_list],
+            [{"create": True}, {"create": True}],
+        )
+        self.assertEqual(
+            [call.args[0].order for call in self.repository.save.call_args_list],
+            [1, 4],
+        )
+        self.repository.delete.assert_called_once_with(
+            STUDY_UID, "StudyDesignCell_000002", self.service.author
+        )
+        # the design cells shifted by the first creation and back by the deletion keep their order
+        self.assertEqual(self._reordered(), [("StudyDesignCell_000001", 2)])
+        self.assertEqual(results[0].content.order, 1)
+        self.assertEqual(results[3].content.order, 4)
+
+    def test_patched_design_cell_is_saved_with_its_shifted_order(self):
+        results = self._handle_batch_operations(
+            [
+                _create(order=1),
+                StudyDesignCellBatchInput(
+                    method="PATCH",
+                    content={
+                        "study_design_cell_uid": "StudyDesignCell_000002",
+                        "transition_rule": "rule",
+                    },
+                ),
+            ],
+        )
+
+        self.assertEqual([result.response_code for result in results], [201, 200])
+        patched = self.repository.save.call_args_list[1]
+        self.assertEqual(patched.kwargs, {"create": False})
+        self.assertEqual(patched.args[0].order, 3)
+        self.assertEqual(patched.args[0].transition_rule, "rule")
+        self.assertEqual(
+            self._reordered(),
+            [("StudyDesignCell_000001", 2), ("StudyDesignCell_000003", 4)],
+        )
+
+    def test_design_cells_are_not_reordered_when_appended(self):
+        self._handle_batch_operations([_create()])
+
+        self.assertEqual(self._reordered(), [])
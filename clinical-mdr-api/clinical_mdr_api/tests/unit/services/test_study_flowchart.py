@@ -8,6 +8,8 @@ import pytest
 from docx.table import Table
 from pydantic import BaseModel
 
+from clinical_mdr_api.domain_repositories._utils import helpers
+from clinical_mdr_api.domain_repositories._utils.helpers import clear_soa_tables_cache
 from clinical_mdr_api.domain_repositories.study_selections.study_soa_repository import (
     SoALayout,
 )
@@ -693,6 +695,69 @@ def test_build_flowchart_table(mock_study_flowchart_service):
     assert table.dict() == DETAILED_SOA_TABLE.model_dump()
 
 
+def test_get_flowchart_table_cached(mock_study_flowchart_service, monkeypatch):
+    builds = []
+    build_flowchart_table = mock_study_flowchart_service.build_flowchart_table
+
+    def counting_build_flowchart_table(*args, **kwargs):
+        builds.append(kwargs)
+        return build_flowchart_table(*args, **kwargs)
+
+    monkeypatch.setattr(
+        mock_study_flowchart_service,
+        "build_flowchart_table",
+        counting_build_flowchart_table,
+    )
+
+    # soa_tables_stamp of the StudyRoot node, as written and read by the helpers
+    stamps = {}
+
+    def cypher_query(query, params):
+        if "SET sr.soa_tables_stamp" in query:
+            stamps[params["uid"]] = f"stamp-{len(stamps) + 1}"
+            return [], []
+        return [[stamps.get(params["uid"])]], ["sr.soa_tables_stamp"]
+
+    monkeypatch.setattr(helpers.db, "cypher_query", cypher_query)
+    clear_soa_tables_cache("Study_000001")
+
+    params = {
+        "study_uid": "Study_000001",
+        "study_value_version": None,
+        "layout": SoALayout.DETAILED,
+        "time_unit": "day",
+    }
+
+    table = mock_study_flowchart_service.get_flowchart_table(**params)
+    # altering the returned table must not alter the cached one
+    table.rows.clear()
+
+    cached_table = mock_study_flowchart_service.get_flowchart_table(**params)
+    assert len(builds) == 1
+    assert cached_table.model_dump() == DETAILED_SOA_TABLE.model_dump()
+
+    # other layouts and time units are cached separately
+    mock_study_flowchart_service.get_flowchart_table(**(params | {"time_unit": "week"}))
+    assert len(builds) == 2
+
+    # forced build doesn't use the cache
+    mock_study_flowchart_service.get_flowchart_table(**params, force_build=True)
+    assert len(builds) == 3
+
+    # any change of the SoA content drops the cached tables of the study
+    clear_soa_tables_cache("Study_000001")
+    mock_study_flowchart_service.get_flowchart_table(**params)
+    assert len(builds) == 4
+
+    # a change committed by another process isn't dropped from this cache,
+    # but the new stamp of the study doesn't match the cached table
+    stamps["Study_000001"] = "stamp-of-other-process"
+    mock_study_flowchart_service.get_flowchart_table(**params)
+    assert len(builds) == 5
+    mock_study_flowchart_service.get_flowchart_table(**params)
+    assert len(builds) == 5
+
+
 @pytest.mark.parametrize(
     ("propagate_refs", "soa", "expected_soa"),
     [
@@ -0,0 +1,95 @@
+import unittest
+from unittest import mock
+
+from neomodel import OUTGOING
+
+from clinical_mdr_api.domain_repositories.models.study_visit import StudyVisit
+from clinical_mdr_api.domain_repositories.study_selections.study_visit_repository import (
+    StudyVisitRepository,
+)
+from clinical_mdr_api.domains.study_selections.study_visit import TextValue
+from clinical_mdr_api.services.studies.study_visit import StudyVisitService
+from common.utils import VisitClass
+
+STUDY_UID = "Study_000001"
+
+
+def _visit(uid: str, name: str, visit_class: VisitClass = VisitClass.SINGLE_VISIT):
+    visit = mock.Mock(
+        uid=uid, visit_class=visit_class, study_uid=STUDY_UID, visit_name_sc=None
+    )
+    visit.derive_visit_name.return_value = name
+    return visit
+
+
+class TestStudyVisitRenumbering(unittest.TestCase):
+    def setUp(self):
+        # the constructor reads the study standard version from the database
+        self.service = StudyVisitService.__new__(StudyVisitService)
+        self.service.repo = mock.Mock(spec=StudyVisitRepository)
+
+        create_visit_name = mock.patch.object(
+            StudyVisitService,
+            "_create_visit_name_simple_concept",
+            autospec=True,
+            side_effect=lambda _self, visit_name: TextValue(
+                uid=f"VisitName_{visit_name}", name=visit_name
+            ),
+        )
+        self.create_visit_name = create_visit_name.start()
+        self.addCleanup(create_visit_name.stop)
+
+    def _created_visit_names(self):
+        return [
+            call.kwargs["visit_name"] for call in self.create_visit_name.call_args_list
+        ]
+
+    def test_visit_numbers_are_synchronized_in_a_single_save(self):
+        visits = [
+            _visit("StudyVisit_000001", "Visit 1"),
+            _visit("StudyVisit_000002", "Visit 2"),
+            _visit("StudyVisit_000003", "Manual", VisitClass.MANUALLY_DEFINED_VISIT),
+            _visit("StudyVisit_000004", "Visit 3"),
+            # same name as the previous visit, like visits of an unscheduled visit group
+            _visit("StudyVisit_000005", "Visit 3"),
+        ]
+
+        self.service.synchronize_visit_numbers(visits, start_index_to_synchronize=1)
+
+        self.assertEqual(self._created_visit_names(), ["Visit 2", "Visit 3"])
+        self.service.repo.save_renumbered_visits.assert_called_once_with(
+            study_uid=STUDY_UID, visits=[visits[1], visits[3], visits[4]]
+        )
+        self.assertIsNone(visits[0].visit_name_sc)
+        self.assertIsNone(visits[2].visit_name_sc)
+        self.assertIs(visits[3].visit_name_sc, visits[4].visit_name_sc)
+        self.assertEqual(visits[4].visit_name_sc.name, "Visit 3")
+
+    def test_nothing_saved_when_only_manually_defined_visits_follow(self):
+        visits = [
+            _visit("StudyVisit_000001", "Visit 1"),
+            _visit("StudyVisit_000002", "Manual", VisitClass.MANUALLY_DEFINED_VISIT),
+        ]
+
+        self.service.synchronize_visit_numbers(visits, start_index_to_synchronize=1)
+
+        self.create_visit_name.assert_not_called()
+        self.service.repo.save_renumbered_visits.assert_not_called()
+
+
+class TestStudyVisitRepositoryRenumbering(unittest.TestCase):
+    def test_renumbered_visits_keep_all_outgoing_relationships_of_the_model(self):
+        outgoing_relationships = {
+            relationship.definition["relation_type"]
+            for _, relationship in StudyVisit.__all_relationships__
+            if relationship.definition["direction"] == OUTGOING
+        }
+
+        # the visit name is replaced, the schedules are copied by a query of their own
+        self.assertEqual(
+            set(StudyVisitRepository.RENUMBERING_COPIED_RELATIONSHIPS),
+            outgoing_relationships - {"HAS_VISIT_NAME", "STUDY_VISIT_HAS_SCHEDULE"},
+        )
+        self.assertIn(
+            "HAS_VISIT_TYPE", StudyVisitRepository.RENUMBERING_COPIED_RELATIONSHIPS
+        )
@@ -0,0 +1,102 @@
+import unittest
+from unittest import mock
+
+from clinical_mdr_api.services.ddf import usdm_mapper
+from clinical_mdr_api.services.ddf.usdm_mapper import USDMMapper
+
+STUDY_UID = "Study_000001"
+
+
+def _fetcher(result, items: bool = True):
+    return mock.Mock(return_value=mock.Mock(items=result) if items else result)
+
+
+def _cypher_query(_query, params):
+    rows = [
+        ["ct", code, "CDISC", f"term {code}"]
+        for code in params["concept_ids"]
+        if code.startswith("C")
+    ]
+    rows.extend(
+        ["dictionary", term_uid, "SNOMED", f"dictionary term {term_uid}"]
+        for term_uid in params["term_uids"]
+    )
+    return rows, None
+
+
+class TestUSDMMapper(unittest.TestCase):
+    def setUp(self):
+        self.fetchers = {
+            "get_osb_study_design_cells": _fetcher(["design cell"], items=False),
+            "get_osb_study_arms": _fetcher(["arm"]),
+            "get_osb_study_epochs": _fetcher(["epoch"]),
+            "get_osb_study_elements": _fetcher(["element"]),
+            "get_osb_study_endpoints": _fetcher(["endpoint"]),
+            "get_osb_study_visits": _fetcher(["visit"]),
+            "get_osb_study_activities": _fetcher(["activity"]),
+            "get_osb_activity_schedules": _fetcher(["schedule"], items=False),
+        }
+        self.mapper = USDMMapper(**self.fetchers)
+
+    def test_study_components_are_fetched_at_once(self):
+        components = self.mapper._fetch_osb_study_components(STUDY_UID, "1.0")
+
+        self.assertEqual(
+            components,
+            {
+                "design_cells": ["design cell"],
+                "arms": ["arm"],
+                "epochs": ["epoch"],
+                "elements": ["element"],
+                "endpoints": ["endpoint"],
+                "visits": ["visit"],
+                "activities": ["activity"],
+                "activity_schedules": ["schedule"],
+            },
+        )
+        self.fetchers["get_osb_study_endpoints"].assert_called_once_with(
+            STUDY_UID, no_brackets=True, study_value_version="1.0"
+        )
+        for fetcher in self.fetchers.values():
+            self.assertEqual(fetcher.call_args.kwargs["study_value_version"], "1.0")
+
+        self.mapper._osb_study_components = components
+        self.assertEqual(
+            self.mapper._get_osb_study_component("visits", STUDY_UID), ["visit"]
+        )
+        self.fetchers["get_osb_study_visits"].assert_called_once()
+
+    @mock.patch.object(usdm_mapper.db, "cypher_query", side_effect=_cypher_query)
+    def test_codes_are_resolved_in_one_query(self, cypher_query):
+        self.mapper._resolve_usdm_codes(
+            ct_package_concept_ids=["C1", "C2", "X1", "C1"],
+            dictionary_term_uids=["DictionaryTerm_000001"],
+        )
+
+        self.assertEqual(
+            self.mapper.get_ct_package_term_as_usdm_code("C1").decode, "term C1"
+        )
+        self.assertEqual(
+            self.mapper.get_ct_package_term_as_usdm_code("C2").codeSystem, "CDISC"
+        )
+        self.assertEqual(self.mapper.get_ct_package_term_as_usdm_code("X1").code, "")
+        self.assertEqual(
+            self.mapper.get_dictionary_term_as_usdm_code(
+                "DictionaryTerm_000001"
+            ).decode,
+            "dictionary term DictionaryTerm_000001",
+        )
+        cypher_query.assert_called_once()
+
+        # codes missed by the batched lookup are still looked up, once
+        self.assertEqual(
+            self.mapper.get_ct_package_term_as_usdm_code("C3").decode, "term C3"
+        )
+        self.assertEqual(
+            self.mapper.get_ct_package_term_as_usdm_code("C3").decode, "term C3"
+        )
+        self.mapper._resolve_usdm_codes(ct_package_concept_ids=["C1", "C3"])
+        self.assertEqual(
+            [call.args[1] for call in cypher_query.call_args_list[1:]],
+            [{"concept_ids": ["C3"], "term_uids": []}],
+        )
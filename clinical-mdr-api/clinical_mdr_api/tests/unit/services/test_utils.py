@@ -170,6 +170,28 @@ class TestServiceUtils(unittest.TestCase):
         assert out.items == expected
         assert out.total == len(expected)
 
+    @parameterized.expand(
+        [
+            ({"k2": True, "k1": True}, ["b.1", "b.2", "a.1", "a.2"]),
+            ({"k2": False, "k1": False}, ["a.2", "a.1", "b.2", "b.1"]),
+            ({"k2": True, "k1": False}, ["b.2", "b.1", "a.2", "a.1"]),
+            ({"k2": False, "k1": True}, ["a.1", "a.2", "b.1", "b.2"]),
+        ]
+    )
+    def test_service_level_generic_filtering_sorts_by_keys_in_order(
+        self, sort_by, expected
+    ):
+        items = [
+            BaseTestObject(k1="a.1", k2="y"),
+            BaseTestObject(k1="b.2", k2="x"),
+            BaseTestObject(k1="a.2", k2="y"),
+            BaseTestObject(k1="b.1", k2="x"),
+        ]
+
+        out = _utils.service_level_generic_filtering(items, sort_by=sort_by)
+
+        assert [item.k1 for item in out.items] == expected
+
     @parameterized.expand(
         [
             (
@@ -0,0 +1,22 @@
+import json
+import subprocess
+import sys
+
+from clinical_mdr_api.utils.lazy_imports import DEFERRED_PACKAGES
+
+IMPORTED_PACKAGES_SCRIPT = f"""
+import json, sys
+import clinical_mdr_api.main
+print(json.dumps(sorted(set({list(DEFERRED_PACKAGES)!r}) & set(sys.modules))))
+"""
+
+
+def test_deferred_packages_are_not_imported_at_startup():
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORTED_PACKAGES_SCRIPT],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert json.loads(result.stdout.splitlines()[-1]) == []
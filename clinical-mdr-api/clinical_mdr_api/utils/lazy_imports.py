@@ -0,0 +1,46 @@
+"""
+Deferred import of heavy, rarely used subsystems.
+
+CTR XML, ODM XML import/export, USDM mapping and XLSX/PDF rendering depend on packages that are slow to import
+(generated `ctrxml` and `usdm_model` bindings, `xsdata`, `openpyxl`, `weasyprint`).
+The routers and services using them import these modules inside the functions using them,
+so that API startup doesn't pay for them and they are imported on first use instead.
+In the same way, the validators and serializers of the API models are built on first use (pydantic `defer_build`).
+
+With the `LAZY_IMPORTS` setting turned off, `import_deferred_modules()` imports them at startup
+and the models are built at import time, trading a slower start for no delay on the first request using them.
+
+`profile_imports.py` reports the deferred packages that are imported at startup anyway.
+"""
+
+import importlib
+import logging
+import time
+
+log = logging.getLogger(__name__)
+
+DEFERRED_MODULES = (
+    "clinical_mdr_api.services.ctr_xml.ctr_xml_service",
+    "clinical_mdr_api.services.concepts.odms.odm_xml_exporter",
+    "clinical_mdr_api.services.concepts.odms.odm_xml_importer",
+    "clinical_mdr_api.services.concepts.odms.odm_clinspark_import",
+    "clinical_mdr_api.services.ddf.usdm_service",
+    "openpyxl",
+    "weasyprint",
+)
+
+# Third-party packages only imported through the deferred modules
+DEFERRED_PACKAGES = ("ctrxml", "usdm_model", "openpyxl", "weasyprint")
+
+
+def import_deferred_modules() -> None:
+    """Imports all the deferred modules, logging the time taken"""
+
+    started = time.perf_counter()
+    for module in DEFERRED_MODULES:
+        importlib.import_module(module)
+    log.info(
+        "Imported %i deferred modules in %.0f ms",
+        len(DEFERRED_MODULES),
+        (time.perf_counter() - started) * 1000,
+    )
@@ -0,0 +1,198 @@
+"""Pagination helpers for listings built with `CypherQueryBuilder`.
+
+Cursor pagination is an opt-in alternative to `SKIP/LIMIT` pagination.
+The client sends a `page_token` query parameter (an empty value requests the first page),
+and receives the token of the next page in the `X-Next-Page-Token` response header.
+The token is opaque to the client: it holds the sort-key values and the tie-breaker uid of the last returned row.
+
+The way the total count is computed can be chosen with the `total_count_mode` query parameter, see `TotalCountMode`.
+Whether the returned total is exact or estimated is told by the `X-Total-Count-Accuracy` response header.
+"""
+
+import base64
+import binascii
+import hashlib
+import json
+from enum import Enum
+from typing import Any
+
+from neo4j.time import Date, DateTime
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection, Request
+from starlette.responses import Response
+from starlette.types import Message
+from starlette_context import context
+from starlette_context.plugins import Plugin
+
+from common.exceptions import ValidationException
+
+NEXT_PAGE_TOKEN_HEADER_NAME = "X-Next-Page-Token"
+TOTAL_COUNT_ACCURACY_HEADER_NAME = "X-Total-Count-Accuracy"
+
+_NEXT_PAGE_TOKEN_CONTEXT_KEY = "next_page_token"
+_TOTAL_COUNT_ACCURACY_CONTEXT_KEY = "total_count_accuracy"
+
+
+class TotalCountMode(Enum):
+    """
+    How the total count of a listing is computed, when `total_count` is requested.
+
+    * exact - a separate count query (default)
+    * cached - a separate count query, whose result is reused for a short time by identical listings
+    * estimated - the row estimate of the query planner, no rows are counted
+    * inline - counted in the same round trip as the page query
+    """
+
+    EXACT = "exact"
+    CACHED = "cached"
+    ESTIMATED = "estimated"
+    INLINE = "inline"
+
+
+# Typed values that can't be represented in JSON are stored as [type tag, iso string]
+_DATETIME_TAG = "datetime"
+_DATE_TAG = "date"
+
+
+def sort_signature(sort_expressions: list[str]) -> str:
+    """Short fingerprint of the ORDER BY expressions a page token was created for."""
+
+    return hashlib.sha1(
+        "|".join(sort_expressions).encode("utf-8"), usedforsecurity=False
+    ).hexdigest()[:12]
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, DateTime):
+        return [_DATETIME_TAG, value.iso_format()]
+    if isinstance(value, Date):
+        return [_DATE_TAG, value.iso_format()]
+    if hasattr(value, "isoformat"):
+        return [_DATETIME_TAG, value.isoformat()]
+    return value
+
+
+def encode_page_token(values: list[Any], signature: str) -> str:
+    """
+    Encodes the cursor position (the sort-key values of the last returned row) into an opaque token.
+
+    Args:
+        values (list[Any]): Sort-key values of the last row, tie-breaker last.
+        signature (str): Fingerprint of the sort expressions, see `sort_signature`.
+
+    Returns:
+        str: URL-safe page token.
+    """
+    payload = json.dumps(
+        {"s": signature, "v": [_encode_value(value) for value in values]},
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_page_token(token: str, signature: str) -> list[tuple[Any, str | None]]:
+    """
+    Decodes a page token created by `encode_page_token`.
+
+    Args:
+        token (str): The page token received from the client.
+        signature (str): Fingerprint of the sort expressions of the current query.
+
+    Returns:
+        list[tuple[Any, str | None]]: Cursor values, each paired with its Cypher type tag
+        (`datetime`, `date`) or None for plain values.
+
+    Raises:
+        ValidationException: If the token is malformed or was created for a different sort order.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+        token_signature = payload["s"]
+        values = payload["v"]
+    except (ValueError, KeyError, TypeError, binascii.Error) as exc:
+        raise ValidationException(msg=f"Invalid page token: '{token}'") from exc
+
+    ValidationException.raise_if(
+        token_signature != signature or not isinstance(values, list),
+        msg="Page token doesn't match the requested sorting, request the first page again.",
+    )
+
+    return [
+        (
+            (value[1], value[0])
+            if isinstance(value, list)
+            and len(value) == 2
+            and value[0] in (_DATETIME_TAG, _DATE_TAG)
+            else (value, None)
+        )
+        for value in values
+    ]
+
+
+def set_next_page_token(token: str | None) -> None:
+    """Stores the next page token in the request context, to be returned as a response header."""
+
+    if context.exists():
+        context[_NEXT_PAGE_TOKEN_CONTEXT_KEY] = token
+
+
+def parse_total_count_mode(mode: TotalCountMode | str | None) -> TotalCountMode:
+    """Parses the `total_count_mode` query parameter, `exact` if not specified."""
+
+    if not mode:
+        return TotalCountMode.EXACT
+
+    try:
+        return TotalCountMode(mode)
+    except ValueError as exc:
+        raise ValidationException(
+            msg=f"Unsupported total count mode: '{mode}', expected one of {[m.value for m in TotalCountMode]}."
+        ) from exc
+
+
+def set_total_count_accuracy(estimated: bool) -> None:
+    """Stores whether the total count is exact or estimated in the request context, to be returned as a response header."""
+
+    if context.exists():
+        context[_TOTAL_COUNT_ACCURACY_CONTEXT_KEY] = (
+            "estimated" if estimated else "exact"
+        )
+
+
+def _append_header(arg: Response | Message, name: str, value: str) -> None:
+    if isinstance(arg, Response):
+        arg.headers[name] = value
+    elif arg["type"] == "http.response.start":
+        MutableHeaders(scope=arg).append(name, value)
+
+
+class PageTokenPlugin(Plugin):
+    """
+    Request context plugin that returns the next page token in the `X-Next-Page-Token` response header.
+    The requested `page_token` is declared by the endpoints themselves and passed down to `CypherQueryBuilder`.
+    """
+
+    key = _NEXT_PAGE_TOKEN_CONTEXT_KEY
+
+    async def process_request(self, request: Request | HTTPConnection) -> None:
+        return None
+
+    async def enrich_response(self, arg: Response | Message) -> None:
+        if token := context.get(_NEXT_PAGE_TOKEN_CONTEXT_KEY):
+            _append_header(arg, NEXT_PAGE_TOKEN_HEADER_NAME, token)
+
+
+class TotalCountModePlugin(Plugin):
+    """
+    Request context plugin that returns the accuracy of the total count in the `X-Total-Count-Accuracy` response header.
+    The requested `total_count_mode` is declared by the endpoints themselves and passed down to `CypherQueryBuilder`.
+    """
+
+    key = _TOTAL_COUNT_ACCURACY_CONTEXT_KEY
+
+    async def process_request(self, request: Request | HTTPConnection) -> None:
+        return None
+
+    async def enrich_response(self, arg: Response | Message) -> None:
+        if accuracy := context.get(_TOTAL_COUNT_ACCURACY_CONTEXT_KEY):
+            _append_header(arg, TOTAL_COUNT_ACCURACY_HEADER_NAME, accuracy)
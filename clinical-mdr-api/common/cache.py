@@ -0,0 +1,314 @@
+"""
+Registry of named in-memory caches.
+
+Caches are `cachetools` caches, usable with `cachetools.cached` as before,
+that count their hits, misses, evictions and expirations.
+
+Size and TTL of each cache can be overridden by name with the `CACHE_MAX_SIZES` and `CACHE_TTLS` settings,
+JSON objects like `{"library_item.item_by_uid": 5000}`.
+
+Invalidations (`invalidate()`) are published to the other worker processes through an `InvalidationChannel`.
+By default there is no channel and invalidations only apply to the current process.
+Setting `CACHE_INVALIDATION_DIR` to a directory shared by the workers enables `FileInvalidationChannel`,
+another channel (a message broker for example) can be set with `CacheRegistry.set_invalidation_channel()`.
+"""
+
+import abc
+import logging
+import os
+import re
+import time
+from threading import Lock
+from typing import Any
+
+from cachetools import Cache, LRUCache, TTLCache
+
+from common.config import settings
+
+log = logging.getLogger(__name__)
+
+_UNSAFE_FILENAME_CHARS_RE = re.compile(r"[^\w.-]")
+
+
+class InvalidationChannel(abc.ABC):
+    """Cross-process invalidation of caches, by cache name"""
+
+    @abc.abstractmethod
+    def publish(self, name: str) -> None:
+        """Tells the other processes that the named cache was invalidated"""
+
+    @abc.abstractmethod
+    def poll(self, name: str) -> bool:
+        """Tells whether the named cache was invalidated by another process since the previous poll"""
+
+
+class FileInvalidationChannel(InvalidationChannel):
+    """
+    Invalidations are signalled by touching a file per cache in a directory shared by the worker processes.
+
+    The file of a cache is checked at most once every `poll_interval` seconds,
+    on cache lookup, so an invalidation may take that long to reach the other processes.
+    """
+
+    def __init__(self, directory: str, poll_interval: float = 1):
+        self.directory = directory
+        self.poll_interval = poll_interval
+        self._last_seen: dict[str, int | None] = {}
+        self._next_poll: dict[str, float] = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, _UNSAFE_FILENAME_CHARS_RE.sub("_", name))
+
+    def _mtime(self, name: str) -> int | None:
+        try:
+            return os.stat(self._path(name)).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def publish(self, name: str) -> None:
+        path = self._path(name)
+        # our own invalidation was already applied, noted before touching the file
+        # so that an invalidation published by another process right after isn't missed
+        mtime = time.time_ns()
+        self._last_seen[name] = mtime
+        try:
+            with open(path, "a", encoding="utf-8"):
+                os.utime(path, ns=(mtime, mtime))
+        except OSError as exc:
+            log.warning("Failed to publish invalidation of cache '%s': %s", name, exc)
+
+    def poll(self, name: str) -> bool:
+        now = time.monotonic()
+        if now < self._next_poll.get(name, 0):
+            return False
+        self._next_poll[name] = now + self.poll_interval
+
+        # the first poll of a cache only takes note of the current state
+        mtime = self._mtime(name)
+        invalidated = name in self._last_seen and mtime != self._last_seen[name]
+        self._last_seen[name] = mtime
+        return invalidated
+
+
+class InstrumentedCacheMixin:
+    """Counts hits, misses, evictions and expirations of a `cachetools` cache, and applies remote invalidations"""
+
+    def __init__(self, name: str, registry: "CacheRegistry", *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.name = name
+        self.registry = registry
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        # set while the cache reads its own items (pop, clear), which aren't lookups
+        self._internal = False
+
+    def __getitem__(self, key):
+        if self._internal:
+            return super().__getitem__(key)
+
+        if self.registry.poll(self.name):
+            log.info("Clear cache '%s' invalidated by another process", self.name)
+            self.clear()
+
+        try:
+            value = super().__getitem__(key)
+        except KeyError:
+            self.misses += 1
+            raise
+        self.hits += 1
+        return value
+
+    def get(self, key, default=None):
+        # unlike `Cache.get`, goes through `self[key]` also when missing to count the miss
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def pop(self, *args, **kwargs):
+        internal, self._internal = self._internal, True
+        try:
+            return super().pop(*args, **kwargs)
+        finally:
+            self._internal = internal
+
+    def popitem(self):
+        # evicted unless the whole cache is being cleared
+        evicted = not self._internal
+        item = super().popitem()
+        if evicted:
+            self.evictions += 1
+        return item
+
+    def clear(self):
+        internal, self._internal = self._internal, True
+        try:
+            super().clear()
+        finally:
+            self._internal = internal
+
+    def invalidate(self) -> None:
+        """Clears the cache in this process and in the other processes"""
+
+        self.clear()
+        self.publish_invalidation()
+
+    def publish_invalidation(self) -> None:
+        """Clears the cache in the other processes only, when this process invalidated some of its keys"""
+
+        self.registry.publish(self.name)
+
+    def reset_stats(self) -> None:
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "name": self.name,
+            "maxsize": self.maxsize,
+            "ttl": getattr(self, "ttl", None),
+            "size": self.currsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else None,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class InstrumentedTTLCache(InstrumentedCacheMixin, TTLCache):
+    def expire(self, *args, **kwargs):
+        expired = super().expire(*args, **kwargs)
+        self.expirations += len(expired)
+        return expired
+
+
+class InstrumentedLRUCache(InstrumentedCacheMixin, LRUCache):
+    pass
+
+
+class CacheRegistry:
+    """Named caches of the application, see module docstring"""
+
+    def __init__(self, channel: InvalidationChannel | None = None):
+        self._caches: dict[str, InstrumentedCacheMixin] = {}
+        self._lock = Lock()
+        self._channel = channel
+
+    def set_invalidation_channel(self, channel: InvalidationChannel | None) -> None:
+        self._channel = channel
+
+    def register_ttl_cache(
+        self, name: str, maxsize: int | None = None, ttl: float | None = None
+    ) -> InstrumentedTTLCache:
+        """
+        Returns the named TTL cache, created on first call.
+
+        Args:
+            name (str): Unique name of the cache, dot-separated by convention (`<area>.<cache>`).
+            maxsize (int | None): Default maximum number of items, `cache_max_size` if not given.
+            ttl (float | None): Default time-to-live of items in seconds, `cache_ttl` if not given.
+
+        Returns:
+            InstrumentedTTLCache: The cache, with size and TTL overridden by `cache_max_sizes` and `cache_ttls` settings.
+        """
+        with self._lock:
+            if (cache := self._caches.get(name)) is None:
+                cache = self._caches[name] = InstrumentedTTLCache(
+                    name,
+                    self,
+                    maxsize=settings.cache_max_sizes.get(
+                        name, maxsize or settings.cache_max_size
+                    ),
+                    ttl=settings.cache_ttls.get(name, ttl or settings.cache_ttl),
+                )
+            return cache
+
+    def register_lru_cache(
+        self, name: str, maxsize: int | None = None
+    ) -> InstrumentedLRUCache:
+        """Returns the named LRU cache (items don't expire), created on first call, see `register_ttl_cache`"""
+
+        with self._lock:
+            if (cache := self._caches.get(name)) is None:
+                cache = self._caches[name] = InstrumentedLRUCache(
+                    name,
+                    self,
+                    maxsize=settings.cache_max_sizes.get(
+                        name, maxsize or settings.cache_max_size
+                    ),
+                )
+            return cache
+
+    def get(self, name: str) -> InstrumentedCacheMixin | None:
+        return self._caches.get(name)
+
+    def caches(self) -> list[InstrumentedCacheMixin]:
+        with self._lock:
+            return sorted(self._caches.values(), key=lambda cache: cache.name)
+
+    def stats(self) -> list[dict[str, Any]]:
+        return [cache.stats() for cache in self.caches()]
+
+    def invalidate_all(self) -> None:
+        for cache in self.caches():
+            cache.invalidate()
+
+    def reset_stats(self) -> None:
+        for cache in self.caches():
+            cache.reset_stats()
+
+    def publish(self, name: str) -> None:
+        if self._channel is not None:
+            self._channel.publish(name)
+
+    def poll(self, name: str) -> bool:
+        return self._channel is not None and self._channel.poll(name)
+
+    def to_prometheus(self) -> str:
+        """Renders the cache counters in Prometheus text exposition format"""
+
+        metrics = (
+            ("osb_cache_hits_total", "counter", "Cache lookups that found an item", "hits"),
+            ("osb_cache_misses_total", "counter", "Cache lookups that found no item", "misses"),
+            ("osb_cache_evictions_total", "counter", "Items evicted from a full cache", "evictions"),
+            ("osb_cache_expirations_total", "counter", "Items expired by TTL", "expirations"),
+            ("osb_cache_size", "gauge", "Number of items in cache", "size"),
+            ("osb_cache_max_size", "gauge", "Maximum number of items in cache", "maxsize"),
+        )  # fmt: skip
+
+        stats = self.stats()
+        lines = []
+        for metric, metric_type, description, stat in metrics:
+            lines.append(f"# HELP {metric} {description}")
+            lines.append(f"# TYPE {metric} {metric_type}")
+            for cache_stats in stats:
+                lines.append(
+                    f'{metric}{{cache="{cache_stats["name"]}"}} {cache_stats[stat]}'
+                )
+
+        return "\n".join(lines) + "\n"
+
+
+def invalidate_cache(cache: Cache) -> None:
+    """Invalidates a cache in all processes if registered, otherwise only clears it"""
+
+    if isinstance(cache, InstrumentedCacheMixin):
+        cache.invalidate()
+    else:
+        cache.clear()
+
+
+cache_registry = CacheRegistry(
+    channel=(
+        FileInvalidationChannel(
+            settings.cache_invalidation_dir,
+            poll_interval=settings.cache_invalidation_poll_interval,
+        )
+        if settings.cache_invalidation_dir
+        else None
+    )
+)
@@ -71,6 +71,12 @@ class Settings(BaseSettings):
     # Cache Configuration
     cache_max_size: int = 1000
     cache_ttl: int = 3600
+    # overrides of the above by cache name, see `common.cache`
+    cache_max_sizes: dict[str, int] = {}
+    cache_ttls: dict[str, int] = {}
+    # directory shared by the worker processes to signal cache invalidations to each other
+    cache_invalidation_dir: str | None = None
+    cache_invalidation_poll_interval: float = 1
 
     # Security & CORS
     allow_origin_regex: str | None = None
@@ -95,9 +101,15 @@ class Settings(BaseSettings):
     default_filter_operator: str = "and"
     max_page_size: int = 1000
     page_size_100: int = 100
+    total_count_cache_ttl: int = 30
 
     # Performance
     slow_query_duration: int = 1
+    slow_query_log_size: int = 50
+    lazy_imports: bool = Field(
+        default=True,
+        description="Whether to import heavy, rarely used subsystems on first use instead of at startup, see `clinical_mdr_api.utils.lazy_imports`",
+    )
 
     # Tracing & Monitoring
     uvicorn_log_config: str = ""
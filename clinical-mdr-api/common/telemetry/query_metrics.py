@@ -0,0 +1,271 @@
+"""In-process aggregation of per-route request and Cypher query metrics, exposed in Prometheus text format"""
+
+import heapq
+import itertools
+import re
+import time
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any, Mapping
+
+from common.config import settings
+
+# Route label of requests that didn't match any route, to keep the number of label values bounded
+UNMATCHED_ROUTE = "<unmatched>"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def get_route_path(scope: Mapping[str, Any]) -> str | None:
+    """Gets the path template of the route matched by a request, None if routing didn't match any route (yet)"""
+
+    if route := scope.get("route"):
+        return getattr(route, "path", None)
+
+    return None
+
+
+class Histogram:
+    """Prometheus style histogram with fixed upper bounds of buckets"""
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last one is the +Inf bucket
+        self.sum: float = 0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative_counts(self) -> list[tuple[str, int]]:
+        """Returns (le, cumulative count) pairs of all buckets, +Inf included"""
+
+        bounds = [_format_number(bucket) for bucket in self.buckets] + ["+Inf"]
+        return list(zip(bounds, itertools.accumulate(self.counts)))
+
+
+@dataclass
+class RouteMetrics:
+    latency: Histogram = field(default_factory=lambda: Histogram(LATENCY_BUCKETS))
+    cypher_count: Histogram = field(
+        default_factory=lambda: Histogram(QUERY_COUNT_BUCKETS)
+    )
+    cypher_times: float = 0
+    errors: int = 0
+
+
+@dataclass(order=True)
+class SlowQuery:
+    duration: float
+    seq: int
+    query: str = field(compare=False)
+    params: dict[str, str] = field(compare=False)
+    route: str = field(compare=False)
+    timestamp: float = field(compare=False)
+
+
+def normalize_query(query: str) -> str:
+    """Collapses whitespace of a Cypher query and truncates it to `trace_query_max_len`"""
+
+    return _WHITESPACE_RE.sub(" ", query).strip()[: settings.trace_query_max_len]
+
+
+def normalize_params(params: Mapping[str, Any] | None) -> dict[str, str]:
+    """
+    Replaces query parameter values with their type (and length of collections),
+    so that similar queries look alike and no data is kept.
+    """
+
+    def describe(value: Any) -> str:
+        if isinstance(value, (list, tuple, set)):
+            return f"{type(value).__name__}[{len(value)}]"
+        if isinstance(value, dict):
+            return f"dict[{len(value)}]"
+        return type(value).__name__
+
+    return {key: describe(value) for key, value in (params or {}).items()}
+
+
+class QueryMetricsAggregator:
+    """
+    Keeps per-route histograms of request latency and number of Cypher queries,
+    and the N slowest Cypher queries executed since start (or last reset).
+    """
+
+    def __init__(self, slow_query_log_size: int):
+        self.slow_query_log_size = slow_query_log_size
+        self._lock = Lock()
+        self._routes: dict[tuple[str, str], RouteMetrics] = {}
+        self._slow_queries: list[SlowQuery] = []  # min-heap by duration
+        self._seq = itertools.count()
+
+    def record_request(
+        self,
+        method: str,
+        route: str | None,
+        status_code: int,
+        duration: float,
+        cypher_count: int,
+        cypher_times: float,
+    ) -> None:
+        key = (method, route or UNMATCHED_ROUTE)
+
+        with self._lock:
+            if (metrics := self._routes.get(key)) is None:
+                metrics = self._routes[key] = RouteMetrics()
+
+            metrics.latency.observe(duration)
+            metrics.cypher_count.observe(cypher_count)
+            metrics.cypher_times += cypher_times
+            if status_code >= 500:
+                metrics.errors += 1
+
+    def is_slow_query(self, duration: float) -> bool:
+        """Tells whether a query of the given duration would make it to the slowest queries, without locking"""
+
+        slow_queries = self._slow_queries
+        try:
+            return (
+                len(slow_queries) < self.slow_query_log_size
+                or duration > slow_queries[0].duration
+            )
+        except IndexError:
+            return self.slow_query_log_size > 0
+
+    def record_query(
+        self,
+        query: str,
+        params: Mapping[str, Any] | None,
+        duration: float,
+        route: str | None,
+    ) -> None:
+        if not self.is_slow_query(duration):
+            return
+
+        slow_query = SlowQuery(
+            duration=duration,
+            seq=next(self._seq),
+            query=normalize_query(query),
+            params=normalize_params(params),
+            route=route or UNMATCHED_ROUTE,
+            timestamp=time.time(),
+        )
+
+        with self._lock:
+            if len(self._slow_queries) < self.slow_query_log_size:
+                heapq.heappush(self._slow_queries, slow_query)
+            elif duration > self._slow_queries[0].duration:
+                heapq.heapreplace(self._slow_queries, slow_query)
+
+    def get_slow_queries(self) -> list[SlowQuery]:
+        """Returns the slowest queries, slowest first"""
+
+        with self._lock:
+            return sorted(self._slow_queries, reverse=True)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+            self._slow_queries.clear()
+
+    def to_prometheus(self) -> str:
+        """Renders all metrics in Prometheus text exposition format"""
+
+        with self._lock:
+            routes = sorted(self._routes.items())
+            slow_queries = sorted(self._slow_queries, reverse=True)
+
+            lines = []
+            _add_histogram(
+                lines,
+                "osb_request_duration_seconds",
+                "Request latency by route",
+                [(key, metrics.latency) for key, metrics in routes],
+            )
+            _add_histogram(
+                lines,
+                "osb_request_cypher_queries",
+                "Number of Cypher queries executed per request by route",
+                [(key, metrics.cypher_count) for key, metrics in routes],
+            )
+
+            lines.append(
+                "# HELP osb_request_cypher_duration_seconds_total Cumulative walltime of Cypher queries by route"
+            )
+            lines.append("# TYPE osb_request_cypher_duration_seconds_total counter")
+            for key, metrics in routes:
+                lines.append(
+                    f"osb_request_cypher_duration_seconds_total{{{_route_labels(key)}}} {_format_number(metrics.cypher_times)}"
+                )
+
+            lines.append(
+                "# HELP osb_request_errors_total Number of requests by route that failed with a server error"
+            )
+            lines.append("# TYPE osb_request_errors_total counter")
+            for key, metrics in routes:
+                lines.append(
+                    f"osb_request_errors_total{{{_route_labels(key)}}} {metrics.errors}"
+                )
+
+        lines.append(
+            "# HELP osb_cypher_slow_query_duration_seconds Walltime of the slowest Cypher queries, rank 1 is the slowest"
+        )
+        lines.append("# TYPE osb_cypher_slow_query_duration_seconds gauge")
+        for rank, slow_query in enumerate(slow_queries, start=1):
+            labels = ",".join(
+                [
+                    f'rank="{rank}"',
+                    f'route="{_escape_label(slow_query.route)}"',
+                    f'query="{_escape_label(slow_query.query)}"',
+                    f'params="{_escape_label(_format_params(slow_query.params))}"',
+                ]
+            )
+            lines.append(
+                f"osb_cypher_slow_query_duration_seconds{{{labels}}} {_format_number(slow_query.duration)}"
+            )
+
+        return "\n".join(lines) + "\n"
+
+
+def _add_histogram(
+    lines: list[str],
+    name: str,
+    description: str,
+    histograms: list[tuple[tuple[str, str], Histogram]],
+) -> None:
+    lines.append(f"# HELP {name} {description}")
+    lines.append(f"# TYPE {name} histogram")
+    for key, histogram in histograms:
+        labels = _route_labels(key)
+        for le, count in histogram.cumulative_counts():
+            lines.append(f'{name}_bucket{{{labels},le="{le}"}} {count}')
+        lines.append(f"{name}_sum{{{labels}}} {_format_number(histogram.sum)}")
+        lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+
+def _route_labels(key: tuple[str, str]) -> str:
+    method, route = key
+    return f'method="{_escape_label(method)}",route="{_escape_label(route)}"'
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_params(params: dict[str, str]) -> str:
+    return ", ".join(f"{key}: {value}" for key, value in params.items())
+
+
+def _format_number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+query_metrics = QueryMetricsAggregator(slow_query_log_size=settings.slow_query_log_size)
@@ -10,11 +10,12 @@ import opencensus.trace
 from pydantic import BaseModel, Field
 from starlette.datastructures import MutableHeaders
 from starlette.responses import Response
-from starlette.types import Message
+from starlette.types import Message, Scope
 from starlette_context import context
 
 from common.config import settings
 from common.telemetry import trace_block
+from common.telemetry.query_metrics import get_route_path, query_metrics
 
 log = logging.getLogger(__name__)
 
@@ -49,11 +50,12 @@ class RequestMetrics(BaseModel):
     )
 
 
-def init_request_metrics():
+def init_request_metrics(scope: Scope | None = None):
     """Initialize request metrics object in request context"""
 
     if context.exists():
         context["request_metrics"] = RequestMetrics()  # type: ignore[call-arg]
+        context["request_scope"] = scope
 
 
 def include_request_metrics(span: opencensus.trace.Span):
@@ -73,6 +75,15 @@ def get_request_metrics() -> RequestMetrics | None:
     return None
 
 
+def get_request_route() -> str | None:
+    """Gets the path template of the route matched by the current request"""
+
+    if context.exists() and (scope := context.get("request_scope")):
+        return get_route_path(scope)
+
+    return None
+
+
 def add_request_metrics_header(
     response: Response | Message,
     expose_header: bool = False,
@@ -128,6 +139,10 @@ def cypher_tracing(query: str, params: Mapping):
                 metrics.cypher_slowest_query = query[: settings.trace_query_max_len]
                 # metrics.cypher_slowest_query_params = params
 
+        # keep the slowest queries of all requests in the slow query log
+        if query_metrics.is_slow_query(delta_time):
+            query_metrics.record_query(query, params, delta_time, get_request_route())
+
 
 def patch_neomodel_database():
     """Monkey-patch neomodel.core.db singleton to trace Cypher queries"""
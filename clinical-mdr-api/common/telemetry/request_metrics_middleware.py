@@ -0,0 +1,66 @@
+import logging
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from common.config import settings
+from common.telemetry.query_metrics import get_route_path, query_metrics
+from common.telemetry.request_metrics import (
+    add_request_metrics_header,
+    get_request_metrics,
+    init_request_metrics,
+)
+
+log = logging.getLogger(__name__)
+
+
+class RequestMetricsMiddleware:
+    """
+    Collects the Cypher query metrics of each request, and adds the request to the per-route aggregates
+    of `query_metrics`, whether tracing is enabled or not.
+
+    Must come after the context middleware, and before `TracingMiddleware` that reports the request metrics in the span.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+        log.info("Initializing RequestMetricsMiddleware")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        init_request_metrics(scope)
+        start_time = time.time()
+        status_code = 500
+
+        async def _send(message: Message) -> None:
+            nonlocal status_code
+
+            if message["type"] == "http.response.start":
+                status_code = message.get("status", 0)
+                if settings.tracing_metrics_header:
+                    add_request_metrics_header(message)
+
+            await send(message)
+
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            self.record_query_metrics(scope, status_code, time.time() - start_time)
+
+    @staticmethod
+    def record_query_metrics(scope: Scope, status_code: int, duration: float) -> None:
+        """Adds the request and its Cypher query metrics to the per-route aggregates"""
+
+        metrics = get_request_metrics()
+        query_metrics.record_request(
+            method=scope.get("method", ""),
+            route=get_route_path(scope),
+            status_code=status_code,
+            duration=duration,
+            cypher_count=metrics.cypher_count if metrics else 0,
+            cypher_times=metrics.cypher_times if metrics else 0,
+        )
@@ -20,11 +20,7 @@ from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from starlette_context import context
 
 from common.config import settings
-from common.telemetry.request_metrics import (
-    add_request_metrics_header,
-    include_request_metrics,
-    init_request_metrics,
-)
+from common.telemetry.request_metrics import include_request_metrics
 
 TRACE_RESPONSE_HEADER_NAME = "traceresponse"
 
@@ -113,8 +109,6 @@ class TracingMiddleware:
             propagator=self.propagator,
         )
 
-        init_request_metrics()
-
         request_body = None
         request_body_size = 0
 
@@ -141,8 +135,6 @@ class TracingMiddleware:
         async def _send(message: Message) -> None:
             if message["type"] == "http.response.start":
                 self.add_traceresponse_header(message)
-                if settings.tracing_metrics_header:
-                    add_request_metrics_header(message)
                 self.log_access(scope, message)
                 self.add_attributes_form_request_body(
                     request_size=request_body_size,
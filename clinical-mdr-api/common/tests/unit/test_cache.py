@@ -0,0 +1,126 @@
+from unittest.mock import patch
+
+from cachetools import cached
+
+from common.cache import CacheRegistry, FileInvalidationChannel, invalidate_cache
+
+
+def test_register_returns_same_cache_by_name():
+    registry = CacheRegistry()
+    cache = registry.register_ttl_cache("test.items", maxsize=10, ttl=60)
+
+    assert registry.register_ttl_cache("test.items") is cache
+    assert registry.get("test.items") is cache
+    assert (cache.maxsize, cache.ttl) == (10, 60)
+
+
+def test_size_and_ttl_overridden_by_settings():
+    registry = CacheRegistry()
+    with (
+        patch("common.cache.settings.cache_max_sizes", {"test.items": 5}),
+        patch("common.cache.settings.cache_ttls", {"test.items": 7}),
+    ):
+        cache = registry.register_ttl_cache("test.items", maxsize=10, ttl=60)
+
+    assert (cache.maxsize, cache.ttl) == (5, 7)
+
+
+def test_counters():
+    registry = CacheRegistry()
+    cache = registry.register_lru_cache("test.lru", maxsize=2)
+    calls = []
+
+    @cached(cache=cache)
+    def square(value):
+        calls.append(value)
+        return value * value
+
+    for value in (1, 2, 1, 3, 1, 2):
+        square(value)
+    assert cache.get("missing") is None
+
+    assert calls == [1, 2, 3, 2]
+    stats = cache.stats()
+    assert stats["size"] == 2
+    assert stats["hits"] == 2
+    assert stats["misses"] == 5
+    assert stats["evictions"] == 2
+
+    cache.clear()
+    assert cache.evictions == 2
+    assert cache.currsize == 0
+
+    cache.reset_stats()
+    assert (cache.hits, cache.misses, cache.evictions) == (0, 0, 0)
+
+
+def test_expirations():
+    registry = CacheRegistry()
+    cache = registry.register_ttl_cache("test.ttl", maxsize=10, ttl=1)
+    now = cache.timer()
+    cache["a"] = 1
+    cache["b"] = 2
+
+    cache.expire(now + 2)
+
+    assert cache.expirations == 2
+    assert cache.evictions == 0
+    assert "a" not in cache
+
+
+def test_to_prometheus():
+    registry = CacheRegistry()
+    cache = registry.register_ttl_cache("test.items", maxsize=10)
+    cache["a"] = 1
+    assert cache["a"] == 1
+
+    output = registry.to_prometheus().splitlines()
+
+    assert "# TYPE osb_cache_hits_total counter" in output
+    assert 'osb_cache_hits_total{cache="test.items"} 1' in output
+    assert 'osb_cache_misses_total{cache="test.items"} 0' in output
+    assert 'osb_cache_size{cache="test.items"} 1' in output
+    assert 'osb_cache_max_size{cache="test.items"} 10' in output
+
+
+def test_invalidation_across_registries(tmp_path):
+    # two registries sharing a directory, as two worker processes would
+    registry_1 = CacheRegistry(FileInvalidationChannel(str(tmp_path), poll_interval=0))
+    registry_2 = CacheRegistry(FileInvalidationChannel(str(tmp_path), poll_interval=0))
+    cache_1 = registry_1.register_ttl_cache("test.items")
+    cache_2 = registry_2.register_ttl_cache("test.items")
+    cache_1["a"] = cache_2["a"] = 1
+    assert cache_2.get("a") == 1
+
+    invalidate_cache(cache_1)
+    cache_1["a"] = 2
+
+    # invalidation is applied on next lookup of the other process, but not in the publishing one
+    assert cache_2.get("a") is None
+    assert cache_1.get("a") == 2
+
+    cache_2["a"] = 3
+    assert cache_2.get("a") == 3
+
+
+def test_publish_invalidation_without_channel():
+    registry = CacheRegistry()
+    cache = registry.register_ttl_cache("test.items")
+    cache["a"] = 1
+
+    cache.invalidate()
+
+    assert cache.currsize == 0
+
+
+def test_invalidation_published_right_after_own_is_not_missed(tmp_path):
+    channel_1 = FileInvalidationChannel(str(tmp_path), poll_interval=0)
+    channel_2 = FileInvalidationChannel(str(tmp_path), poll_interval=0)
+    assert not channel_1.poll("test.items")
+
+    channel_1.publish("test.items")
+    assert not channel_1.poll("test.items")
+
+    channel_1.publish("test.items")
+    channel_2.publish("test.items")
+    assert channel_1.poll("test.items")
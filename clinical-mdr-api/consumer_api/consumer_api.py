@@ -9,6 +9,7 @@ from common.config import settings
 from common.database import configure_database
 from common.logger import default_logging_config, log_exception
 from common.telemetry.request_metrics import patch_neomodel_database
+from common.telemetry.request_metrics_middleware import RequestMetricsMiddleware
 from common.telemetry.tracing_middleware import TracingMiddleware
 
 default_logging_config()
@@ -66,6 +67,10 @@ if settings.gzip_response_min_size:
 # Context middleware - must come before TracingMiddleware
 middlewares.append(Middleware(RawContextMiddleware))
 
+# Request and Cypher query metrics, collected whether tracing is enabled or not
+middlewares.append(Middleware(RequestMetricsMiddleware))
+patch_neomodel_database()
+
 # Tracing middleware
 if settings.tracing_enabled:
 
@@ -101,8 +106,6 @@ if settings.tracing_enabled:
         )
     )
 
-    patch_neomodel_database()
-
 
 # Convert all uncaught exceptions to response before returning to TracingMiddleware
 middlewares.append(Middleware(ExceptionTracebackMiddleware))
@@ -57,6 +57,65 @@ class StudyVersionSimple(BaseModel):
         )
 
 
+class StudyItems(BaseModel, Generic[T]):
+    """
+    Items of one study in a batch response
+    """
+
+    study_uid: Annotated[str, Field(description="Study UID")]
+    study_id: Annotated[
+        str | None, Field(description="Study ID", json_schema_extra={"nullable": True})
+    ] = None
+    study_version: Annotated[
+        StudyVersionSimple, Field(description="Study version information")
+    ]
+    items: Annotated[list[T], Field(description="List of items")]
+
+
+class StudyBatchResponse(BaseModel, Generic[T]):
+    """
+    Batch response model, items of the latest versions of multiple studies
+    """
+
+    studies: Annotated[
+        list[StudyItems[T]],
+        Field(description="Studies in the order they were requested"),
+    ]
+    not_found: Annotated[
+        list[str],
+        Field(description="Requested study UIDs and IDs that don't exist"),
+    ]
+
+    @classmethod
+    def from_input(
+        cls,
+        study_versions: list[dict[str, Any]],
+        items_by_study_uid: dict[str, list[T]],
+        not_found: list[str],
+    ) -> Self:
+        return cls(
+            studies=[
+                {
+                    "study_uid": study_version["study_uid"],
+                    "study_id": study_version.get("study_id", None),
+                    "study_version": StudyVersionSimple.from_input(
+                        version_status=study_version.get("version_status", None),
+                        version_number=study_version.get("version_number", None),
+                        version_started_at=convert_to_datetime(
+                            study_version["version_started_at"]
+                        ),
+                        version_ended_at=convert_to_datetime(
+                            study_version.get("version_ended_at", None)
+                        ),
+                    ),
+                    "items": items_by_study_uid.get(study_version["study_uid"], []),
+                }
+                for study_version in study_versions
+            ],
+            not_found=not_found,
+        )
+
+
 class PaginatedResponse(BaseModel, Generic[T]):
     """
     Paginated response model
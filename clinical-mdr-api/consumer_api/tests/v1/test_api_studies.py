@@ -1072,6 +1072,58 @@ def test_get_study_operational_soa_all(api_client, page_size):
     )
 
 
+def test_get_studies_batch_study_visits(api_client):
+    response = api_client.post(
+        f"{BASE_URL}/studies/batch/study-visits",
+        json={"study_uids": [studies[0].uid, "Study_999999", studies[1].uid]},
+    )
+    assert_response_status_code(response, 200)
+    res = response.json()
+
+    assert res["not_found"] == ["Study_999999"]
+    assert [study["study_uid"] for study in res["studies"]] == [
+        studies[0].uid,
+        studies[1].uid,
+    ]
+    assert {item["uid"] for item in res["studies"][0]["items"]} == {
+        study_visit.uid for study_visit in study_visits
+    }
+    for item in res["studies"][0]["items"]:
+        TestUtils.assert_response_shape_ok(
+            item, STUDY_VISIT_FIELDS_ALL, STUDY_VISIT_FIELDS_NOT_NULL
+        )
+    assert res["studies"][1]["items"] == []
+
+
+def test_get_studies_batch_by_study_id(api_client):
+    study_id = studies[0].current_metadata.identification_metadata.study_id
+    response = api_client.post(
+        f"{BASE_URL}/studies/batch/study-activities",
+        json={"study_uids": [studies[0].uid], "study_ids": [study_id.lower()]},
+    )
+    assert_response_status_code(response, 200)
+    res = response.json()
+
+    # Same study requested by UID and by ID is returned once
+    assert res["not_found"] == []
+    assert len(res["studies"]) == 1
+    assert res["studies"][0]["study_id"] == study_id
+    assert len(res["studies"][0]["items"]) == len(study_activities)
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {},
+        {"study_uids": [], "study_ids": []},
+        {"study_uids": [f"Study_{idx:06}" for idx in range(101)]},
+    ],
+)
+def test_get_studies_batch_invalid_input(api_client, payload):
+    response = api_client.post(f"{BASE_URL}/studies/batch/study-visits", json=payload)
+    assert_response_status_code(response, 422)
+
+
 def test_get_papillons_soa(api_client):
 
     project = studies[0].current_metadata.identification_metadata.project_number
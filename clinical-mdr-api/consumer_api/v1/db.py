@@ -12,6 +12,14 @@ from consumer_api.shared.common import (
 )
 from consumer_api.v1 import models
 
+# Study ID as shown to consumers, for example `NN1234-5678` or `NN1234-5678-MAD`
+STUDY_ID_EXPRESSION = """
+    CASE study_value.subpart_id
+        WHEN IS NULL THEN COALESCE(study_value.study_id_prefix, '') + "-" + COALESCE(study_value.study_number, '')
+        ELSE COALESCE(study_value.study_id_prefix, '') + "-" + COALESCE(study_value.study_number, '') + "-" + study_value.subpart_id
+    END
+    """
+
 
 def get_base_query_for_study_root_and_value(study_version_number: str | None) -> str:
     if study_version_number:
@@ -27,6 +35,21 @@ def get_base_query_for_study_root_and_value(study_version_number: str | None) ->
     """
 
 
+def get_base_query_for_study_roots_and_values() -> str:
+    """Batch variant of `get_base_query_for_study_root_and_value`, for the latest versions of `$study_uids`"""
+
+    return """
+    UNWIND $study_uids AS requested_study_uid
+    CALL {
+        WITH requested_study_uid
+        MATCH (study_root:StudyRoot {uid: requested_study_uid})-[:LATEST]->(study_value:StudyValue)
+        MATCH (study_root)-[hv:HAS_VERSION]->(study_value)
+        RETURN study_root, study_value, hv ORDER BY hv.end_date DESC LIMIT 1
+    }
+    WITH study_root, study_value, hv
+    """
+
+
 def get_base_query_for_study_root_and_value_with_study_id(
     study_version_number: str | None, subpart: str | None
 ) -> str:
@@ -164,20 +187,7 @@ def get_study_version(
     return res[0]
 
 
-def get_study_visits(
-    study_uid: str,
-    sort_by: models.SortByStudyVisits = models.SortByStudyVisits.UID,
-    sort_order: models.SortOrder = models.SortOrder.ASC,
-    page_size: int = 10,
-    page_number: int = 1,
-    study_version_number: str | None = None,
-) -> list[dict[Any, Any]]:
-    validate_page_number_and_page_size(page_number, page_size)
-
-    params = {"study_uid": study_uid, "study_version_number": study_version_number}
-    base_query = get_base_query_for_study_root_and_value(study_version_number)
-
-    base_query += """
+STUDY_VISITS_QUERY = """
         MATCH (study_value)-[:HAS_STUDY_VISIT]-(study_visit:StudyVisit)
         OPTIONAL MATCH (study_visit)-[:HAS_VISIT_NAME]->(:VisitNameRoot)-[:LATEST]->(visit_name_value:VisitNameValue)
         OPTIONAL MATCH (study_visit)-[:HAS_VISIT_TYPE]->(:CTTermContext)-[:HAS_SELECTED_TERM]->(visit_type_ct_term_root:CTTermRoot)-[:HAS_NAME_ROOT]->(:CTTermNameRoot)-[:LATEST]->(visit_type_ct_term_name_value:CTTermNameValue)
@@ -216,6 +226,22 @@ def get_study_visits(
         RETURN *
         """
 
+
+def get_study_visits(
+    study_uid: str,
+    sort_by: models.SortByStudyVisits = models.SortByStudyVisits.UID,
+    sort_order: models.SortOrder = models.SortOrder.ASC,
+    page_size: int = 10,
+    page_number: int = 1,
+    study_version_number: str | None = None,
+) -> list[dict[Any, Any]]:
+    validate_page_number_and_page_size(page_number, page_size)
+
+    params = {"study_uid": study_uid, "study_version_number": study_version_number}
+    base_query = get_base_query_for_study_root_and_value(study_version_number)
+
+    base_query += STUDY_VISITS_QUERY
+
     full_query = " ".join(
         [
             base_query,
@@ -234,20 +260,7 @@ def get_study_visits(
     return query(full_query, params)
 
 
-def get_study_activities(
-    study_uid: str,
-    sort_by: models.SortByStudyActivities = models.SortByStudyActivities.UID,
-    sort_order: models.SortOrder = models.SortOrder.ASC,
-    page_size: int = 10,
-    page_number: int = 1,
-    study_version_number: str | None = None,
-) -> list[dict[Any, Any]]:
-    validate_page_number_and_page_size(page_number, page_size)
-
-    params = {"study_uid": study_uid, "study_version_number": study_version_number}
-    base_query = get_base_query_for_study_root_and_value(study_version_number)
-
-    base_query += """
+STUDY_ACTIVITIES_QUERY = """
         WITH study_root, study_value, hv
         MATCH (study_value)-[:HAS_STUDY_ACTIVITY]->(sa:StudyActivity)-[:HAS_SELECTED_ACTIVITY]->(av:ActivityValue)<-[:HAS_VERSION]-(ar:ActivityRoot)
         MATCH (sa)-[:STUDY_ACTIVITY_HAS_STUDY_SOA_GROUP]->(soa_group:StudySoAGroup)-[:HAS_FLOWCHART_GROUP]->(:CTTermContext)-[:HAS_SELECTED_TERM]->(soa_group_term:CTTermRoot)-[:HAS_NAME_ROOT]->(:CTTermNameRoot)-[:LATEST]->(soa_group_term_value:CTTermNameValue)
@@ -300,19 +313,10 @@ def get_study_activities(
             coalesce(av.is_data_collected, False) AS is_data_collected
         """
 
-    full_query = " ".join(
-        [
-            base_query,
-            db_sort_clause(sort_by.value, sort_order.value),
-            db_pagination_clause(page_size, page_number),
-        ]
-    )
-    return query(full_query, params)
-
 
-def get_study_activity_instances(
+def get_study_activities(
     study_uid: str,
-    sort_by: models.SortByStudyActivityInstances = models.SortByStudyActivityInstances.UID,
+    sort_by: models.SortByStudyActivities = models.SortByStudyActivities.UID,
     sort_order: models.SortOrder = models.SortOrder.ASC,
     page_size: int = 10,
     page_number: int = 1,
@@ -323,7 +327,19 @@ def get_study_activity_instances(
     params = {"study_uid": study_uid, "study_version_number": study_version_number}
     base_query = get_base_query_for_study_root_and_value(study_version_number)
 
-    base_query += """
+    base_query += STUDY_ACTIVITIES_QUERY
+
+    full_query = " ".join(
+        [
+            base_query,
+            db_sort_clause(sort_by.value, sort_order.value),
+            db_pagination_clause(page_size, page_number),
+        ]
+    )
+    return query(full_query, params)
+
+
+STUDY_ACTIVITY_INSTANCES_QUERY = """
         MATCH (study_value)-[:HAS_STUDY_ACTIVITY_INSTANCE]->(sa:StudyActivityInstance)
             <-[:STUDY_ACTIVITY_HAS_STUDY_ACTIVITY_INSTANCE]-(study_activity:StudyActivity)<-[:HAS_STUDY_ACTIVITY]-(study_value)
 
@@ -389,19 +405,10 @@ def get_study_activity_instances(
                 }]) AS study_soa_group
         """
 
-    full_query = " ".join(
-        [
-            base_query,
-            db_sort_clause(sort_by.value, sort_order.value),
-            db_pagination_clause(page_size, page_number),
-        ]
-    )
-    return query(full_query, params)
-
 
-def get_study_detailed_soa(
+def get_study_activity_instances(
     study_uid: str,
-    sort_by: models.SortByStudyDetailedSoA = models.SortByStudyDetailedSoA.ACTIVITY_NAME,
+    sort_by: models.SortByStudyActivityInstances = models.SortByStudyActivityInstances.UID,
     sort_order: models.SortOrder = models.SortOrder.ASC,
     page_size: int = 10,
     page_number: int = 1,
@@ -412,7 +419,19 @@ def get_study_detailed_soa(
     params = {"study_uid": study_uid, "study_version_number": study_version_number}
     base_query = get_base_query_for_study_root_and_value(study_version_number)
 
-    base_query += """
+    base_query += STUDY_ACTIVITY_INSTANCES_QUERY
+
+    full_query = " ".join(
+        [
+            base_query,
+            db_sort_clause(sort_by.value, sort_order.value),
+            db_pagination_clause(page_size, page_number),
+        ]
+    )
+    return query(full_query, params)
+
+
+STUDY_DETAILED_SOA_QUERY = """
         MATCH (study_activity_schedule:StudyActivitySchedule)<-[:HAS_STUDY_ACTIVITY_SCHEDULE]-(study_value)
         MATCH (study_activity_schedule)<-[:STUDY_VISIT_HAS_SCHEDULE]-(study_visit:StudyVisit)<-[:HAS_STUDY_VISIT]-(study_value)
         MATCH (study_visit)<-[:STUDY_EPOCH_HAS_STUDY_VISIT]-(study_epoch:StudyEpoch)<-[:HAS_STUDY_EPOCH]-(study_value)
@@ -449,19 +468,10 @@ def get_study_detailed_soa(
             coalesce(activity.is_data_collected, False) AS is_data_collected
         """
 
-    full_query = " ".join(
-        [
-            base_query,
-            db_sort_clause(sort_by.value, sort_order.value),
-            db_pagination_clause(page_size, page_number),
-        ]
-    )
-    return query(full_query, params)
 
-
-def get_study_operational_soa(
+def get_study_detailed_soa(
     study_uid: str,
-    sort_by: models.SortByStudyOperationalSoA = models.SortByStudyOperationalSoA.ACTIVITY_NAME,
+    sort_by: models.SortByStudyDetailedSoA = models.SortByStudyDetailedSoA.ACTIVITY_NAME,
     sort_order: models.SortOrder = models.SortOrder.ASC,
     page_size: int = 10,
     page_number: int = 1,
@@ -472,7 +482,19 @@ def get_study_operational_soa(
     params = {"study_uid": study_uid, "study_version_number": study_version_number}
     base_query = get_base_query_for_study_root_and_value(study_version_number)
 
-    base_query += """
+    base_query += STUDY_DETAILED_SOA_QUERY
+
+    full_query = " ".join(
+        [
+            base_query,
+            db_sort_clause(sort_by.value, sort_order.value),
+            db_pagination_clause(page_size, page_number),
+        ]
+    )
+    return query(full_query, params)
+
+
+STUDY_OPERATIONAL_SOA_QUERY = """
         MATCH (study_activity_schedule:StudyActivitySchedule)<-[:HAS_STUDY_ACTIVITY_SCHEDULE]-(study_value)
         MATCH (study_activity_schedule)<-[:STUDY_VISIT_HAS_SCHEDULE]-(study_visit:StudyVisit)<-[:HAS_STUDY_VISIT]-(study_value)
         MATCH (study_visit)<-[:STUDY_EPOCH_HAS_STUDY_VISIT]-(study_epoch:StudyEpoch)<-[:HAS_STUDY_EPOCH]-(study_value)
@@ -518,6 +540,22 @@ def get_study_operational_soa(
             activity_group.uid AS activity_group_uid,
             term_name_value.name as soa_group_name
     """
+
+
+def get_study_operational_soa(
+    study_uid: str,
+    sort_by: models.SortByStudyOperationalSoA = models.SortByStudyOperationalSoA.ACTIVITY_NAME,
+    sort_order: models.SortOrder = models.SortOrder.ASC,
+    page_size: int = 10,
+    page_number: int = 1,
+    study_version_number: str | None = None,
+) -> list[dict[Any, Any]]:
+    validate_page_number_and_page_size(page_number, page_size)
+
+    params = {"study_uid": study_uid, "study_version_number": study_version_number}
+    base_query = get_base_query_for_study_root_and_value(study_version_number)
+
+    base_query += STUDY_OPERATIONAL_SOA_QUERY
     full_query = " ".join(
         [
             base_query,
@@ -528,6 +566,139 @@ def get_study_operational_soa(
     return query(full_query, params)
 
 
+def get_latest_study_versions(
+    study_uids: list[str], study_ids: list[str]
+) -> list[dict[str, Any]]:
+    """
+    Resolves the latest versions of multiple studies, identified by uid or by id, in one query.
+    Studies that don't exist are left out of the result.
+    """
+    params = {
+        "study_uids": study_uids,
+        "study_ids": [study_id.strip().upper() for study_id in study_ids],
+    }
+
+    subqueries = []
+    if study_uids:
+        subqueries.append(
+            """
+            UNWIND $study_uids AS requested_study_uid
+            MATCH (study_root:StudyRoot {uid: requested_study_uid})-[:LATEST]->(study_value:StudyValue)
+            RETURN study_root, study_value
+            """
+        )
+    if study_ids:
+        subqueries.append(
+            f"""
+            MATCH (study_root:StudyRoot)-[:LATEST]->(study_value:StudyValue)
+            WHERE toUpper({STUDY_ID_EXPRESSION}) IN $study_ids
+            RETURN study_root, study_value
+            """
+        )
+
+    full_query = f"""
+        CALL {{
+            {"UNION".join(subqueries)}
+        }}
+        CALL {{
+            WITH study_root, study_value
+            MATCH (study_root)-[hv:HAS_VERSION]->(study_value)
+            RETURN hv ORDER BY hv.end_date DESC LIMIT 1
+        }}
+        RETURN  study_root.uid AS study_uid,
+                {STUDY_ID_EXPRESSION} AS study_id,
+                hv.version AS version_number,
+                hv.status AS version_status,
+                hv.start_date AS version_started_at,
+                hv.end_date AS version_ended_at,
+                hv.change_description AS version_description,
+                hv.author_id AS version_author_id
+        """
+
+    return query(full_query, params)
+
+
+def get_studies_items(
+    study_uids: list[str], items_query: str, sort_clause: str
+) -> list[dict[Any, Any]]:
+    """
+    Runs one of the per-study item queries (`STUDY_VISITS_QUERY`, ...) for the latest versions of multiple studies at once.
+    Items aren't paginated, each item holds the `study_uid` it belongs to.
+    """
+    full_query = " ".join(
+        [get_base_query_for_study_roots_and_values(), items_query, sort_clause]
+    )
+    return query(full_query, {"study_uids": study_uids})
+
+
+def get_studies_visits(
+    study_uids: list[str],
+    sort_by: models.SortByStudyVisits = models.SortByStudyVisits.UNIQUE_VISIT_NUMBER,
+    sort_order: models.SortOrder = models.SortOrder.ASC,
+) -> list[dict[Any, Any]]:
+    return get_studies_items(
+        study_uids,
+        STUDY_VISITS_QUERY,
+        db_sort_clause(
+            sort_by.value,
+            sort_order.value,
+            sort_by_type=(
+                SortByType.NUMBER
+                if sort_by == models.SortByStudyVisits.UNIQUE_VISIT_NUMBER
+                else SortByType.STRING
+            ),
+        ),
+    )
+
+
+def get_studies_activities(
+    study_uids: list[str],
+    sort_by: models.SortByStudyActivities = models.SortByStudyActivities.UID,
+    sort_order: models.SortOrder = models.SortOrder.ASC,
+) -> list[dict[Any, Any]]:
+    return get_studies_items(
+        study_uids,
+        STUDY_ACTIVITIES_QUERY,
+        db_sort_clause(sort_by.value, sort_order.value),
+    )
+
+
+def get_studies_activity_instances(
+    study_uids: list[str],
+    sort_by: models.SortByStudyActivityInstances = models.SortByStudyActivityInstances.UID,
+    sort_order: models.SortOrder = models.SortOrder.ASC,
+) -> list[dict[Any, Any]]:
+    return get_studies_items(
+        study_uids,
+        STUDY_ACTIVITY_INSTANCES_QUERY,
+        db_sort_clause(sort_by.value, sort_order.value),
+    )
+
+
+def get_studies_detailed_soa(
+    study_uids: list[str],
+    sort_by: models.SortByStudyDetailedSoA = models.SortByStudyDetailedSoA.ACTIVITY_NAME,
+    sort_order: models.SortOrder = models.SortOrder.ASC,
+) -> list[dict[Any, Any]]:
+    return get_studies_items(
+        study_uids,
+        STUDY_DETAILED_SOA_QUERY,
+        db_sort_clause(sort_by.value, sort_order.value),
+    )
+
+
+def get_studies_operational_soa(
+    study_uids: list[str],
+    sort_by: models.SortByStudyOperationalSoA = models.SortByStudyOperationalSoA.ACTIVITY_NAME,
+    sort_order: models.SortOrder = models.SortOrder.ASC,
+) -> list[dict[Any, Any]]:
+    return get_studies_items(
+        study_uids,
+        STUDY_OPERATIONAL_SOA_QUERY,
+        db_sort_clause(sort_by.value, sort_order.value),
+    )
+
+
 def get_library_activities(
     sort_by: models.SortByLibraryItem = models.SortByLibraryItem.NAME,
     sort_order: models.SortOrder = models.SortOrder.ASC,
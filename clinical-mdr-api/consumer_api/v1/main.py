@@ -1,24 +1,28 @@
 # RESTful API endpoints used by consumers that want to extract data from StudyBuilder
 # pylint: disable=invalid-name
 # pylint: disable=redefined-builtin
-from typing import Annotated
+from typing import Annotated, Any, Callable, Iterable, TypeVar
 
-from fastapi import APIRouter, Path, Query, Request
+from fastapi import APIRouter, Body, Path, Query, Request
 
 from common.auth import rbac
 from common.auth.dependencies import security
 from common.config import settings
+from common.exceptions import ValidationException
 from common.models.error import ErrorResponse
 from common.utils import BaseTimelineAR
 from consumer_api.shared.responses import (
     PaginatedResponse,
     PaginatedResponseWithStudyVersion,
+    StudyBatchResponse,
 )
 from consumer_api.v1 import db as DB
 from consumer_api.v1 import models
 
 router = APIRouter()
 
+T = TypeVar("T")
+
 
 # GET endpoint to retrieve a list of studies
 @router.get(
@@ -407,6 +411,274 @@ def get_study_operational_soa(
     )
 
 
+def _resolve_studies(
+    batch_input: models.StudyBatchInput,
+) -> tuple[list[dict[str, Any]], list[str]]:
+    """Returns the latest versions of the requested studies in request order, and the UIDs/IDs not found"""
+
+    study_uids = list(dict.fromkeys(batch_input.study_uids))
+    study_ids = list(dict.fromkeys(batch_input.study_ids))
+    ValidationException.raise_if(
+        not study_uids and not study_ids,
+        msg="At least one study UID or ID must be provided.",
+    )
+    ValidationException.raise_if(
+        len(study_uids) + len(study_ids) > models.MAX_STUDIES_PER_BATCH,
+        msg=f"At most {models.MAX_STUDIES_PER_BATCH} studies can be requested at once.",
+    )
+
+    study_versions = DB.get_latest_study_versions(
+        study_uids=study_uids, study_ids=study_ids
+    )
+    by_uid = {version["study_uid"]: version for version in study_versions}
+    by_id = {version["study_id"].upper(): version for version in study_versions}
+
+    resolved: dict[str, dict[str, Any]] = {}
+    not_found = []
+    for study_uid in study_uids:
+        if (version := by_uid.get(study_uid)) is not None:
+            resolved.setdefault(study_uid, version)
+        else:
+            not_found.append(study_uid)
+    for study_id in study_ids:
+        if (version := by_id.get(study_id.strip().upper())) is not None:
+            resolved.setdefault(version["study_uid"], version)
+        else:
+            not_found.append(study_id)
+
+    return list(resolved.values()), not_found
+
+
+def _get_studies_items(
+    batch_input: models.StudyBatchInput,
+    get_items: Callable[[list[str]], list[dict[Any, Any]]],
+    from_input: Callable[[dict[Any, Any]], T],
+) -> tuple[list[dict[str, Any]], dict[str, list[T]], list[str]]:
+    """Resolves the requested studies, then fetches the items of all of them in a single query"""
+
+    study_versions, not_found = _resolve_studies(batch_input)
+
+    items_by_study_uid: dict[str, list[T]] = {}
+    if study_versions:
+        items: Iterable[Any] = get_items(
+            [version["study_uid"] for version in study_versions]
+        )
+        for item in items:
+            items_by_study_uid.setdefault(item["study_uid"], []).append(
+                from_input(item)
+            )
+
+    return study_versions, items_by_study_uid, not_found
+
+
+# POST endpoint to retrieve the visits of multiple studies
+@router.post(
+    "/studies/batch/study-visits",
+    tags=["[V1] Studies"],
+    dependencies=[security, rbac.STUDY_READ],
+    status_code=200,
+    responses={
+        400: {
+            "model": ErrorResponse,
+            "description": "Invalid request",
+        },
+    },
+)
+def get_studies_visits(
+    batch_input: Annotated[models.StudyBatchInput, Body()],
+    sort_by: models.SortByStudyVisits = models.SortByStudyVisits.UNIQUE_VISIT_NUMBER,
+    sort_order: models.SortOrder = models.SortOrder.ASC,
+) -> StudyBatchResponse[models.StudyVisit]:
+    """
+    Returns the visits of multiple studies, sorted by the specified sort criteria and order.
+
+    Up to 100 studies can be requested at once, by UID and/or by ID.
+    Items of the latest version of each study are returned unpaginated, grouped by study.
+    Requested studies that don't exist are listed in `not_found`.
+    """
+
+    study_versions, items_by_study_uid, not_found = _get_studies_items(
+        batch_input,
+        lambda study_uids: DB.get_studies_visits(
+            study_uids=study_uids, sort_by=sort_by, sort_order=sort_order
+        ),
+        models.StudyVisit.from_input,
+    )
+    # Generate timeline to assign visit_order for all study visits of each study
+    for study_uid, items in items_by_study_uid.items():
+        BaseTimelineAR(study_uid=study_uid, _visits=items)._generate_timeline()
+
+    return StudyBatchResponse.from_input(
+        study_versions=study_versions,
+        items_by_study_uid=items_by_study_uid,
+        not_found=not_found,
+    )
+
+
+# POST endpoint to retrieve the activities of multiple studies
+@router.post(
+    "/studies/batch/study-activities",
+    tags=["[V1] Studies"],
+    dependencies=[security, rbac.STUDY_READ],
+    status_code=200,
+    responses={
+        400: {
+            "model": ErrorResponse,
+            "description": "Invalid request",
+        },
+    },
+)
+def get_studies_activities(
+    batch_input: Annotated[models.StudyBatchInput, Body()],
+    sort_by: models.SortByStudyActivities = models.SortByStudyActivities.UID,
+    sort_order: models.SortOrder = models.SortOrder.ASC,
+) -> StudyBatchResponse[models.StudyActivity]:
+    """
+    Returns the activities of multiple studies, sorted by the specified sort criteria and order.
+
+    Up to 100 studies can be requested at once, by UID and/or by ID.
+    Items of the latest version of each study are returned unpaginated, grouped by study.
+    Requested studies that don't exist are listed in `not_found`.
+    """
+
+    study_versions, items_by_study_uid, not_found = _get_studies_items(
+        batch_input,
+        lambda study_uids: DB.get_studies_activities(
+            study_uids=study_uids, sort_by=sort_by, sort_order=sort_order
+        ),
+        models.StudyActivity.from_input,
+    )
+
+    return StudyBatchResponse.from_input(
+        study_versions=study_versions,
+        items_by_study_uid=items_by_study_uid,
+        not_found=not_found,
+    )
+
+
+# POST endpoint to retrieve the activity instances of multiple studies
+@router.post(
+    "/studies/batch/study-activity-instances",
+    tags=["[V1] Studies"],
+    dependencies=[security, rbac.STUDY_READ],
+    status_code=200,
+    responses={
+        400: {
+            "model": ErrorResponse,
+            "description": "Invalid request",
+        },
+    },
+)
+def get_studies_activity_instances(
+    batch_input: Annotated[models.StudyBatchInput, Body()],
+    sort_by: models.SortByStudyActivityInstances = models.SortByStudyActivityInstances.UID,
+    sort_order: models.SortOrder = models.SortOrder.ASC,
+) -> StudyBatchResponse[models.StudyActivityInstance]:
+    """
+    Returns the activity instances of multiple studies, sorted by the specified sort criteria and order.
+
+    Up to 100 studies can be requested at once, by UID and/or by ID.
+    Items of the latest version of each study are returned unpaginated, grouped by study.
+    Requested studies that don't exist are listed in `not_found`.
+    """
+
+    study_versions, items_by_study_uid, not_found = _get_studies_items(
+        batch_input,
+        lambda study_uids: DB.get_studies_activity_instances(
+            study_uids=study_uids, sort_by=sort_by, sort_order=sort_order
+        ),
+        models.StudyActivityInstance.from_input,
+    )
+
+    return StudyBatchResponse.from_input(
+        study_versions=study_versions,
+        items_by_study_uid=items_by_study_uid,
+        not_found=not_found,
+    )
+
+
+# POST endpoint to retrieve the detailed soa of multiple studies
+@router.post(
+    "/studies/batch/detailed-soa",
+    tags=["[V1] Studies"],
+    dependencies=[security, rbac.STUDY_READ],
+    status_code=200,
+    responses={
+        400: {
+            "model": ErrorResponse,
+            "description": "Invalid request",
+        },
+    },
+)
+def get_studies_detailed_soa(
+    batch_input: Annotated[models.StudyBatchInput, Body()],
+    sort_by: models.SortByStudyDetailedSoA = models.SortByStudyDetailedSoA.ACTIVITY_NAME,
+    sort_order: models.SortOrder = models.SortOrder.ASC,
+) -> StudyBatchResponse[models.StudyDetailedSoA]:
+    """
+    Returns the detailed SoA items of multiple studies, sorted by the specified sort criteria and order.
+
+    Up to 100 studies can be requested at once, by UID and/or by ID.
+    Items of the latest version of each study are returned unpaginated, grouped by study.
+    Requested studies that don't exist are listed in `not_found`.
+    """
+
+    study_versions, items_by_study_uid, not_found = _get_studies_items(
+        batch_input,
+        lambda study_uids: DB.get_studies_detailed_soa(
+            study_uids=study_uids, sort_by=sort_by, sort_order=sort_order
+        ),
+        models.StudyDetailedSoA.from_input,
+    )
+
+    return StudyBatchResponse.from_input(
+        study_versions=study_versions,
+        items_by_study_uid=items_by_study_uid,
+        not_found=not_found,
+    )
+
+
+# POST endpoint to retrieve the operational soa of multiple studies
+@router.post(
+    "/studies/batch/operational-soa",
+    tags=["[V1] Studies"],
+    dependencies=[security, rbac.STUDY_READ],
+    status_code=200,
+    responses={
+        400: {
+            "model": ErrorResponse,
+            "description": "Invalid request",
+        },
+    },
+)
+def get_studies_operational_soa(
+    batch_input: Annotated[models.StudyBatchInput, Body()],
+    sort_by: models.SortByStudyOperationalSoA = models.SortByStudyOperationalSoA.ACTIVITY_NAME,
+    sort_order: models.SortOrder = models.SortOrder.ASC,
+) -> StudyBatchResponse[models.StudyOperationalSoA]:
+    """
+    Returns the operational SoA items of multiple studies, sorted by the specified sort criteria and order.
+
+    Up to 100 studies can be requested at once, by UID and/or by ID.
+    Items of the latest version of each study are returned unpaginated, grouped by study.
+    Requested studies that don't exist are listed in `not_found`.
+    """
+
+    study_versions, items_by_study_uid, not_found = _get_studies_items(
+        batch_input,
+        lambda study_uids: DB.get_studies_operational_soa(
+            study_uids=study_uids, sort_by=sort_by, sort_order=sort_order
+        ),
+        models.StudyOperationalSoA.from_input,
+    )
+
+    return StudyBatchResponse.from_input(
+        study_versions=study_versions,
+        items_by_study_uid=items_by_study_uid,
+        not_found=not_found,
+    )
+
+
 # GET endpoint to retrieve a library of activities
 @router.get(
     "/library/activities",
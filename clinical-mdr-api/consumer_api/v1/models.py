@@ -109,6 +109,23 @@ class Study(BaseModel):
         )
 
 
+# Maximum number of studies requested at once from the batch endpoints
+MAX_STUDIES_PER_BATCH = 100
+
+
+class StudyBatchInput(BaseModel):
+    study_uids: Annotated[
+        list[str],
+        Field(description="Study UIDs, for example `Study_000001`"),
+    ] = []
+    study_ids: Annotated[
+        list[str],
+        Field(
+            description="Study IDs (case-insensitive exact match), for example `NN1234-5678`"
+        ),
+    ] = []
+
+
 class SortByStudyVisits(Enum):
     UID = "uid"
     NAME = "visit_name"
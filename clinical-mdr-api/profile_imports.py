@@ -0,0 +1,147 @@
+"""
+Import-time profile of the API startup.
+
+Imports `clinical_mdr_api.main` in a fresh interpreter with `python -X importtime`,
+and reports the import time per package, per `clinical_mdr_api` subpackage, and of the slowest modules.
+
+    python profile_imports.py [--output reports/import_profile.json] [--max-total-ms 5000]
+
+The JSON report is meant to be archived by the CI to track the startup time over time.
+Exits with status 1 when a deferred package (see `clinical_mdr_api.utils.lazy_imports`) is imported at startup,
+or when the total import time exceeds `--max-total-ms`.
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+from clinical_mdr_api.utils.lazy_imports import DEFERRED_PACKAGES
+
+IMPORT_TIME_RE = re.compile(
+    r"^import time:\s+(?P<self>\d+) \|\s+(?P<cumulative>\d+) \|(?P<indent>\s*)(?P<module>\S+)$"
+)
+
+
+def run_importtime(module: str) -> str:
+    """Imports the module in a subprocess and returns the `-X importtime` output"""
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr)
+        raise RuntimeError(f"Failed to import {module}")
+    return result.stderr
+
+
+def parse_importtime(output: str) -> list[dict]:
+    """Parses `-X importtime` output into a list of modules with their self and cumulative times in microseconds"""
+
+    modules = []
+    for line in output.splitlines():
+        if match := IMPORT_TIME_RE.match(line):
+            modules.append(
+                {
+                    "module": match["module"],
+                    "self_us": int(match["self"]),
+                    "cumulative_us": int(match["cumulative"]),
+                    "depth": len(match["indent"]) // 2,
+                }
+            )
+    return modules
+
+
+def group_by_package(modules: list[dict], prefix: str = "", depth: int = 1) -> dict:
+    """Sums the self times of the modules by package, the first `depth` parts of their dotted names"""
+
+    totals: dict[str, int] = defaultdict(int)
+    for module in modules:
+        if not module["module"].startswith(prefix):
+            continue
+        totals[".".join(module["module"].split(".")[:depth])] += module["self_us"]
+    return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+
+def build_report(modules: list[dict], top: int = 30) -> dict:
+    imported = {module["module"] for module in modules}
+    return {
+        "total_ms": round(sum(module["self_us"] for module in modules) / 1000, 1),
+        "modules": len(modules),
+        "packages_ms": {
+            package: round(duration / 1000, 1)
+            for package, duration in group_by_package(modules).items()
+        },
+        "clinical_mdr_api_ms": {
+            package: round(duration / 1000, 1)
+            for package, duration in group_by_package(
+                modules, prefix="clinical_mdr_api.", depth=2
+            ).items()
+        },
+        "slowest_modules_ms": {
+            module["module"]: round(module["self_us"] / 1000, 1)
+            for module in sorted(modules, key=lambda m: m["self_us"], reverse=True)[
+                :top
+            ]
+        },
+        "deferred_packages_imported": sorted(
+            package for package in DEFERRED_PACKAGES if package in imported
+        ),
+    }
+
+
+def print_report(report: dict, top: int = 15):
+    print(
+        f"Total import time: {report['total_ms']:.0f} ms, {report['modules']} modules"
+    )
+    for title, key in (
+        ("Packages", "packages_ms"),
+        ("clinical_mdr_api subpackages", "clinical_mdr_api_ms"),
+        ("Slowest modules", "slowest_modules_ms"),
+    ):
+        print(f"\n{title}:")
+        for name, duration in list(report[key].items())[:top]:
+            print(f"  {duration:>9.1f} ms  {name}")
+    if report["deferred_packages_imported"]:
+        print(
+            "\nDeferred packages imported at startup: "
+            + ", ".join(report["deferred_packages_imported"])
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--module", default="clinical_mdr_api.main")
+    parser.add_argument("--output", help="Path of the JSON report to write")
+    parser.add_argument(
+        "--max-total-ms",
+        type=float,
+        help="Fail when the total import time exceeds this duration",
+    )
+    args = parser.parse_args()
+
+    report = build_report(parse_importtime(run_importtime(args.module)))
+    print_report(report)
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    failed = bool(report["deferred_packages_imported"])
+    if args.max_total_ms is not None and report["total_ms"] > args.max_total_ms:
+        print(
+            f"\nTotal import time {report['total_ms']:.0f} ms exceeds {args.max_total_ms:.0f} ms"
+        )
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
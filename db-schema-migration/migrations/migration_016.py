@@ -1,10 +1,16 @@
 """Schema migrations for CT migration"""
 
 import os
+from functools import partial
 
 from neo4j import SummaryCounters
 
 from migrations.common import migrate_ct_config_values, migrate_indexes_and_constraints
+from migrations.utils.runner import (
+    MigrationStep,
+    run_batched_query,
+    run_migration_steps,
+)
 from migrations.utils.utils import (
     get_db_connection,
     get_db_driver,
@@ -25,14 +31,42 @@ NON_CT_LABELS_SELECTION = (
 
 def main():
     logger.info("Running migration on DB '%s'", os.environ["DATABASE_NAME"])
-    remove_odm_data(DB_DRIVER, logger)
-    correct_activity_item_ct_mapping(DB_DRIVER, logger)
-    migrate_test_name_code(DB_DRIVER, logger)
-    migrate_ct(DB_DRIVER, logger)
-
-    ### Common migrations
-    migrate_indexes_and_constraints(DB_CONNECTION, logger)
-    migrate_ct_config_values(DB_CONNECTION, logger)
+    run_migration_steps(
+        DB_DRIVER,
+        MIGRATION_DESC,
+        [
+            MigrationStep(
+                "remove_odm_data", partial(remove_odm_data, DB_DRIVER, logger)
+            ),
+            MigrationStep(
+                "correct_activity_item_ct_mapping",
+                partial(correct_activity_item_ct_mapping, DB_DRIVER, logger),
+            ),
+            MigrationStep(
+                "migrate_test_name_code",
+                partial(migrate_test_name_code, DB_DRIVER, logger),
+            ),
+            MigrationStep("migrate_ct", partial(migrate_ct, DB_DRIVER, logger)),
+            MigrationStep(
+                "remove_study_summaries",
+                partial(remove_study_summaries, DB_DRIVER, logger),
+            ),
+            MigrationStep(
+                "migrate_study_summaries",
+                partial(migrate_study_summaries, DB_DRIVER, logger),
+            ),
+            ### Common migrations
+            MigrationStep(
+                "migrate_indexes_and_constraints",
+                partial(migrate_indexes_and_constraints, DB_CONNECTION, logger),
+            ),
+            MigrationStep(
+                "migrate_ct_config_values",
+                partial(migrate_ct_config_values, DB_CONNECTION, logger),
+            ),
+        ],
+        logger,
+    )
 
 
 def remove_odm_data(db_driver, log):
@@ -1310,6 +1344,194 @@ def migrate_cdisc_epoch_terms(db_driver, log):
     return contains_updates
 
 
+def remove_study_summaries(db_driver, log):
+    """
+    Remove the StudySummary projections built before their uid was unique,
+    they are rebuilt by migrate_study_summaries.
+    """
+
+    log.info("Removing StudySummary and StudySummaryMetadata nodes")
+    result = run_batched_query(
+        db_driver,
+        log,
+        "Remove StudySummary nodes",
+        """
+        MATCH (ss:StudySummary)
+        WITH ss LIMIT $batch_size
+        WITH ss, [(ss)-[:HAS_METADATA]->(metadata:StudySummaryMetadata) | metadata] AS metadata
+        FOREACH (node IN metadata | DETACH DELETE node)
+        DETACH DELETE ss
+        RETURN count(*) AS count
+        """,
+        count_query="MATCH (ss:StudySummary) RETURN count(ss) AS count",
+    )
+    return result.contains_updates
+
+
+def migrate_study_summaries(db_driver, log):
+    """
+    Build the StudySummary projection, from which studies are listed, of the studies that don't have one.
+    The query follows the API, where the projection is rebuilt on each save of a study:
+    the snapshot alias clause and STUDY_SUMMARY_WRITE_CLAUSE of StudyDefinitionRepositoryImpl.
+    """
+
+    log.info("Building StudySummary nodes")
+    result = run_batched_query(
+        db_driver,
+        log,
+        "Build StudySummary nodes",
+        """
+        MATCH (sr:StudyRoot)-[:LATEST]->(sv:StudyValue)
+        WHERE NOT EXISTS((sr)-[:HAS_SUMMARY]->(:StudySummary))
+        WITH sr, sv LIMIT $batch_size
+        WITH
+        sr, sv,
+        head([(sr)-[ll:LATEST_LOCKED]->() | ll]) AS llr,
+        head([(sr)-[lr:LATEST_RELEASED]->(lrn) | {lrr:lr, svr: lrn}]) AS released,
+        head([(sr)-[ld:LATEST_DRAFT]->(sdr) | {ldr:ld, sdr: sdr}]) AS draft,
+        head([(sr)-[hv:HAS_VERSION {status: 'LOCKED'}]->(hvn) | {has_version:hv, svlh:hvn}]) AS locked,
+        head([(sv)<-[:HAS_STUDY_SUBPART]-(:StudyValue)<-[:LATEST]-(parent:StudyRoot) | parent.uid]) AS study_parent_part_uid,
+        [(sv)-[:HAS_STUDY_SUBPART]->(:StudyValue)<-[:LATEST]-(sub:StudyRoot)
+         | sub.uid] AS study_subpart_uids,
+        exists((sr)-[:LATEST_LOCKED]->()) AS has_latest_locked,
+        exists((sr)-[:LATEST_DRAFT]->()) AS has_latest_draft,
+        exists((sr)-[:LATEST_RELEASED]->()) AS has_latest_released,
+        exists((sv)-[:HAS_STUDY_FOOTNOTE]->()) AS has_study_footnote,
+        exists((sv)-[:HAS_STUDY_OBJECTIVE]->()) AS has_study_objective,
+        exists((sv)-[:HAS_STUDY_ENDPOINT]->()) AS has_study_endpoint,
+        exists((sv)-[:HAS_STUDY_CRITERIA]->()) AS has_study_criteria,
+        exists((sv)-[:HAS_STUDY_ACTIVITY]->()) AS has_study_activity,
+        exists((sv)-[:HAS_STUDY_ACTIVITY_INSTRUCTION]->()) AS has_study_activity_instruction
+        WITH sr,
+        sv,
+        study_parent_part_uid,
+        study_subpart_uids,
+        llr,
+        released,
+        draft,
+        locked,
+        has_latest_locked,
+        has_latest_draft,
+        has_latest_released,
+        has_study_footnote,
+        has_study_objective,
+        has_study_endpoint,
+        has_study_criteria,
+        has_study_activity,
+        has_study_activity_instruction,
+        locked.svlh AS svlh,
+        locked.has_version AS has_version,
+        released.lrr AS lrr,
+        released.svr AS svr,
+        draft.ldr AS ldr,
+        draft.sdr AS sdr
+        ORDER BY has_version.end_date ASC
+        WITH *,
+            sr.uid as uid,
+            CASE WHEN ldr.end_date IS NULL THEN 'DRAFT' ELSE 'LOCKED' END as study_status,
+            {
+                study_id: sv.study_id,
+                study_number: sv.study_number,
+                subpart_id: sv.subpart_id,
+                study_acronym: sv.study_acronym,
+                study_subpart_acronym: sv.study_subpart_acronym,
+                study_id_prefix: sv.study_id_prefix,
+                description: sv.description,
+                project_number: head([(sv)-[:HAS_PROJECT]->(:StudyProjectField)<-[:HAS_FIELD]-(p:Project) | p.project_number]),
+                study_title: head([(sv)-[:HAS_TEXT_FIELD]->(t:StudyTextField) WHERE t.field_name = "study_title" | t.value]),
+                study_short_title: head([(sv)-[:HAS_TEXT_FIELD]->(st:StudyTextField) WHERE st.field_name = "study_short_title" | st.value]),
+                version_timestamp: CASE WHEN ldr.end_date IS NULL THEN ldr.start_date ELSE llr.start_date END,
+                version_number: CASE WHEN ldr.end_date IS NULL THEN ldr.version ELSE llr.version END,
+                version_author_id: CASE WHEN ldr.end_date IS NULL THEN ldr.author_id ELSE llr.author_id END
+            } AS current_metadata,
+            CASE WHEN has_latest_locked THEN
+            {
+                locked_metadata_array: [
+                    locked_version IN collect({
+                        study_id: svlh.study_id,
+                        study_number: svlh.study_number,
+                        subpart_id: svlh.subpart_id,
+                        study_acronym: svlh.study_acronym,
+                        study_subpart_acronym: svlh.study_subpart_acronym,
+                        study_id_prefix: svlh.study_id_prefix,
+                        description: svlh.description,
+                        project_number: head([(svlh)-[:HAS_PROJECT]->(:StudyProjectField)<-[:HAS_FIELD]-(p:Project) | p.project_number]),
+                        study_title: head([(svlh)-[:HAS_TEXT_FIELD]->(t:StudyTextField) WHERE t.field_name = "study_title" | t.value]),
+                        study_short_title: head([(svlh)-[:HAS_TEXT_FIELD]->(st:StudyTextField) WHERE st.field_name = "study_short_title" | st.value]),
+                        version_timestamp: has_version.start_date,
+                        version_number: has_version.version,
+                        version_author_id: has_version.author_id
+                    })
+                ]
+            }  END AS locked_metadata_versions,
+            CASE WHEN has_latest_released AND lrr.end_date IS NULL THEN
+            {
+                study_id: svr.study_id,
+                study_number: svr.study_number,
+                subpart_id: svr.subpart_id,
+                study_acronym: svr.study_acronym,
+                study_subpart_acronym: svr.study_subpart_acronym,
+                study_id_prefix: svr.study_id_prefix,
+                description: svr.description,
+                project_number: head([(svr)-[:HAS_PROJECT]->(:StudyProjectField)<-[:HAS_FIELD]-(p:Project) | p.project_number]),
+                study_title: head([(svr)-[:HAS_TEXT_FIELD]->(t:StudyTextField) WHERE t.field_name = "study_title" | t.value]),
+                study_short_title: head([(svr)-[:HAS_TEXT_FIELD]->(st:StudyTextField) WHERE st.field_name = "study_short_title" | st.value]),
+                version_timestamp: lrr.start_date,
+                version_number: lrr.version_number,
+                version_author_id: lrr.author_id
+            }  END AS released_metadata,
+            CASE WHEN has_latest_draft THEN
+            {
+                study_id: sdr.study_id,
+                study_number: sdr.study_number,
+                subpart_id: sdr.subpart_id,
+                study_acronym: sdr.study_acronym,
+                study_subpart_acronym: sdr.study_subpart_acronym,
+                study_id_prefix: sdr.study_id_prefix,
+                description: sdr.description,
+                project_number: head([(sdr)-[:HAS_PROJECT]->(:StudyProjectField)<-[:HAS_FIELD]-(p:Project) | p.project_number]),
+                study_title: head([(sdr)-[:HAS_TEXT_FIELD]->(t:StudyTextField) WHERE t.field_name = "study_title" | t.value]),
+                study_short_title: head([(sdr)-[:HAS_TEXT_FIELD]->(st:StudyTextField) WHERE st.field_name = "study_short_title" | st.value]),
+                version_timestamp: ldr.start_date,
+                version_number: ldr.version_number,
+                version_author_id: ldr.author_id
+            }  END AS draft_metadata,
+            has_study_footnote,
+            has_study_objective,
+            has_study_endpoint,
+            has_study_criteria,
+            has_study_activity,
+            has_study_activity_instruction
+        MERGE (ss:StudySummary {uid: uid})
+        MERGE (sr)-[:HAS_SUMMARY]->(ss)
+        SET ss.study_status = study_status, ss.refreshed_at = datetime()
+        WITH *
+        CALL {
+            WITH ss
+            MATCH (ss)-[:HAS_METADATA]->(previous:StudySummaryMetadata)
+            DETACH DELETE previous
+        }
+        FOREACH (metadata IN [metadata IN [current_metadata] WHERE metadata IS NOT NULL] |
+            CREATE (ss)-[:HAS_METADATA {kind: 'current'}]->(node:StudySummaryMetadata) SET node = metadata)
+        FOREACH (metadata IN [metadata IN [released_metadata] WHERE metadata IS NOT NULL] |
+            CREATE (ss)-[:HAS_METADATA {kind: 'released'}]->(node:StudySummaryMetadata) SET node = metadata)
+        FOREACH (metadata IN [metadata IN [draft_metadata] WHERE metadata IS NOT NULL] |
+            CREATE (ss)-[:HAS_METADATA {kind: 'draft'}]->(node:StudySummaryMetadata) SET node = metadata)
+        WITH ss, coalesce(locked_metadata_versions.locked_metadata_array, []) AS locked_metadata_array
+        FOREACH (position IN range(0, size(locked_metadata_array) - 1) |
+            CREATE (ss)-[:HAS_METADATA {kind: 'locked', position: position}]->(node:StudySummaryMetadata)
+            SET node = locked_metadata_array[position])
+        RETURN count(*) AS count
+        """,
+        count_query="""
+        MATCH (sr:StudyRoot)-[:LATEST]->(:StudyValue)
+        WHERE NOT EXISTS((sr)-[:HAS_SUMMARY]->(:StudySummary))
+        RETURN count(sr) AS count
+        """,
+    )
+    return result.contains_updates
+
+
 def cleanup(db_driver, log):
     """
     Cleanup the database by removing any leftover relationships or properties.
@@ -1319,19 +1541,24 @@ def cleanup(db_driver, log):
     """
 
     log.info("Cleaning up the database - Removing HAS_TERM relationships")
-    _, summary = run_cypher_query(
+    result = run_batched_query(
         db_driver,
+        log,
+        "Remove HAS_TERM relationships",
         """
         MATCH (cl:CTCodelistRoot)-[ht:HAS_TERM]->(us:CTTermRoot)
         WHERE EXISTS((cl)-->(:CTCodelistTerm)-->(us))
-        CALL {
-            WITH ht
-            DELETE ht
-        } IN TRANSACTIONS OF 1000 ROWS
+        WITH ht LIMIT $batch_size
+        DELETE ht
+        RETURN count(*) AS count
+        """,
+        count_query="""
+        MATCH (cl:CTCodelistRoot)-[ht:HAS_TERM]->(us:CTTermRoot)
+        WHERE EXISTS((cl)-->(:CTCodelistTerm)-->(us))
+        RETURN count(ht) AS count
         """,
     )
-    print_counters_table(summary.counters)
-    contains_updates = summary.counters.contains_updates
+    contains_updates = result.contains_updates
 
     log.info("Cleaning up the database - Removing code_submission_value property")
     _, summary = run_cypher_query(
@@ -0,0 +1,259 @@
+"""
+Execution of migrations as named steps, with checkpoints and batched queries.
+
+A migration is described as a list of `MigrationStep`, run by `run_migration_steps`.
+Each completed step is recorded as a checkpoint in the database,
+so that a rerun after a failure skips the steps that already completed.
+The checkpoints are removed once all the steps of the migration completed.
+
+Large updates can be run with `run_batched_query` instead of `CALL { ... } IN TRANSACTIONS OF n ROWS`,
+the batch size then adapts to the time taken by each batch, and progress and throughput are logged.
+"""
+
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable
+
+import neo4j
+import neo4j.exceptions
+
+from migrations.utils.utils import run_cypher_query
+
+CHECKPOINT_LABEL = "MigrationCheckpoint"
+
+# Number of steps run in parallel, for steps declaring their dependencies
+MIGRATION_WORKERS = int(os.environ.get("MIGRATION_WORKERS", "1"))
+
+# Initial number of rows per batch of `run_batched_query`
+MIGRATION_BATCH_SIZE = int(os.environ.get("MIGRATION_BATCH_SIZE", "1000"))
+MIN_BATCH_SIZE = 10
+MAX_BATCH_SIZE = 100000
+# The batch size is doubled when a batch takes less than half of this duration in seconds,
+# and halved when it takes more than twice this duration
+TARGET_BATCH_SECONDS = float(os.environ.get("MIGRATION_TARGET_BATCH_SECONDS", "2"))
+
+
+@dataclass(frozen=True)
+class MigrationStep:
+    """
+    Named step of a migration.
+
+    `func` is called without arguments.
+    When `depends_on` is None, the step runs after all the steps listed before it.
+    Otherwise it only waits for the listed steps, and may run in parallel with other steps.
+    """
+
+    name: str
+    func: Callable[[], Any]
+    depends_on: tuple[str, ...] | None = None
+
+
+# ---------- Checkpoints ----------
+def get_completed_steps(db_driver: neo4j.Driver, migration: str) -> set[str]:
+    records, _ = run_cypher_query(
+        db_driver,
+        f"MATCH (c:{CHECKPOINT_LABEL} {{migration: $migration}}) RETURN c.step AS step",
+        {"migration": migration},
+    )
+    return {record["step"] for record in records}
+
+
+def mark_step_completed(
+    db_driver: neo4j.Driver, migration: str, step: str, duration: float
+):
+    run_cypher_query(
+        db_driver,
+        f"""
+        MERGE (c:{CHECKPOINT_LABEL} {{migration: $migration, step: $step}})
+        SET c.completed_at = datetime(), c.duration = $duration
+        """,
+        {"migration": migration, "step": step, "duration": duration},
+    )
+
+
+def clear_checkpoints(db_driver: neo4j.Driver, migration: str):
+    run_cypher_query(
+        db_driver,
+        f"MATCH (c:{CHECKPOINT_LABEL} {{migration: $migration}}) DELETE c",
+        {"migration": migration},
+    )
+
+
+# ---------- Steps ----------
+def _get_dependencies(steps: list[MigrationStep]) -> dict[str, set[str]]:
+    dependencies = {}
+    for index, step in enumerate(steps):
+        if step.name in dependencies:
+            raise ValueError(f"Duplicate migration step '{step.name}'")
+        if step.depends_on is None:
+            dependencies[step.name] = {previous.name for previous in steps[:index]}
+        else:
+            unknown = set(step.depends_on) - set(dependencies)
+            if unknown:
+                raise ValueError(
+                    f"Migration step '{step.name}' depends on unknown or later steps: {sorted(unknown)}"
+                )
+            dependencies[step.name] = set(step.depends_on)
+    return dependencies
+
+
+def run_migration_steps(
+    db_driver: neo4j.Driver,
+    migration: str,
+    steps: list[MigrationStep],
+    log,
+    workers: int = MIGRATION_WORKERS,
+) -> dict[str, Any]:
+    """
+    Runs the steps of a migration that didn't complete in a previous run,
+    and returns the results of the steps run, by step name.
+    With more than one worker, steps whose dependencies completed run in parallel.
+    """
+
+    dependencies = _get_dependencies(steps)
+    completed = get_completed_steps(db_driver, migration)
+    if completed:
+        log.info(
+            "Resuming migration '%s', skipping completed steps: %s",
+            migration,
+            ", ".join(sorted(completed)),
+        )
+
+    started = time.monotonic()
+    results = {}
+
+    def run_step(step: MigrationStep):
+        log.info("Migration step '%s' started", step.name)
+        step_started = time.monotonic()
+        result = step.func()
+        duration = time.monotonic() - step_started
+        mark_step_completed(db_driver, migration, step.name, duration)
+        log.info("Migration step '%s' completed in %.1f s", step.name, duration)
+        return result
+
+    pending = [step for step in steps if step.name not in completed]
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        running = {}
+        while pending or running:
+            for step in [
+                step for step in pending if dependencies[step.name] <= completed
+            ]:
+                if len(running) >= max(workers, 1):
+                    break
+                pending.remove(step)
+                running[executor.submit(run_step, step)] = step
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                step = running.pop(future)
+                try:
+                    results[step.name] = future.result()
+                except Exception:
+                    log.error(
+                        "Migration step '%s' failed, rerun the migration to resume from this step",
+                        step.name,
+                    )
+                    # let the other running steps complete, to checkpoint them
+                    wait(running)
+                    raise
+                completed.add(step.name)
+
+    clear_checkpoints(db_driver, migration)
+    log.info(
+        "Migration '%s' completed in %.1f s", migration, time.monotonic() - started
+    )
+    return results
+
+
+# ---------- Batched queries ----------
+@dataclass
+class BatchedQueryResult:
+    rows: int = 0
+    batches: int = 0
+    contains_updates: bool = False
+
+
+def run_batched_query(
+    db_driver: neo4j.Driver,
+    log,
+    name: str,
+    query: str,
+    params: dict | None = None,
+    count_query: str | None = None,
+    batch_size: int = MIGRATION_BATCH_SIZE,
+) -> BatchedQueryResult:
+    """
+    Runs `query` repeatedly, one transaction per batch, until it processes no more rows.
+
+    The query must process at most `$batch_size` rows that weren't processed yet,
+    typically by matching only unmigrated data with `LIMIT $batch_size`,
+    and return the number of processed rows as `count`.
+    `count_query`, returning the total number of rows to process as `count`, enables progress percentages.
+
+    The batch size adapts to keep batches around TARGET_BATCH_SECONDS,
+    and is halved when a batch fails with a transient error (like running out of transaction memory).
+    """
+
+    total = None
+    if count_query:
+        records, _ = run_cypher_query(db_driver, count_query, params)
+        total = records[0]["count"]
+        log.info("%s: %i rows to process", name, total)
+
+    result = BatchedQueryResult()
+    started = time.monotonic()
+    while True:
+        batch_started = time.monotonic()
+        try:
+            records, summary = run_cypher_query(
+                db_driver, query, {**(params or {}), "batch_size": batch_size}
+            )
+        except neo4j.exceptions.TransientError as exc:
+            if batch_size <= MIN_BATCH_SIZE:
+                raise
+            batch_size = max(batch_size // 2, MIN_BATCH_SIZE)
+            log.warning(
+                "%s: batch failed (%s), retrying with batch size %i",
+                name,
+                exc.code,
+                batch_size,
+            )
+            continue
+        batch_duration = time.monotonic() - batch_started
+
+        rows = records[0]["count"] if records else 0
+        if rows == 0:
+            break
+        result.rows += rows
+        result.batches += 1
+        result.contains_updates = (
+            result.contains_updates or summary.counters.contains_updates
+        )
+
+        elapsed = time.monotonic() - started
+        progress = f" ({100 * result.rows / total:.1f}%)" if total else ""
+        log.info(
+            "%s: %i rows done%s, %.0f rows/s, last batch of %i rows in %.2f s",
+            name,
+            result.rows,
+            progress,
+            result.rows / elapsed if elapsed > 0 else 0,
+            rows,
+            batch_duration,
+        )
+
+        if batch_duration < TARGET_BATCH_SECONDS / 2:
+            batch_size = min(batch_size * 2, MAX_BATCH_SIZE)
+        elif batch_duration > TARGET_BATCH_SECONDS * 2:
+            batch_size = max(batch_size // 2, MIN_BATCH_SIZE)
+
+    log.info(
+        "%s: %i rows processed in %i batches, %.1f s",
+        name,
+        result.rows,
+        result.batches,
+        time.monotonic() - started,
+    )
+    return result
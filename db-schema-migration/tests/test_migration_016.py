@@ -145,6 +145,40 @@ def test_migrate_ct(migration):
 def test_repeat_migrate_ct(migration):
     assert not migration_016.migrate_ct(DB_DRIVER, logger)
 
+def test_migrate_study_summaries(migration):
+    logger.info("Check that all studies have a single StudySummary")
+
+    records, _ = run_cypher_query(
+        DB_DRIVER,
+        """
+        MATCH (sr:StudyRoot)-[:LATEST]->(:StudyValue)
+        WHERE COUNT { (sr)-[:HAS_SUMMARY]->(:StudySummary) } <> 1
+            OR NOT EXISTS((sr)-[:HAS_SUMMARY]->(:StudySummary)-[:HAS_METADATA {kind: 'current'}]->(:StudySummaryMetadata))
+        RETURN count(sr) AS count
+        """,
+    )
+    assert (
+        records[0]["count"] == 0
+    ), f"""Found {records[0]["count"]} studies without a single StudySummary with current metadata."""
+
+    records, _ = run_cypher_query(
+        DB_DRIVER,
+        """
+        MATCH (ss:StudySummary)
+        WITH ss.uid AS uid, count(ss) AS count
+        WHERE count > 1
+        RETURN count(uid) AS count
+        """,
+    )
+    assert (
+        records[0]["count"] == 0
+    ), f"""Found {records[0]["count"]} duplicated StudySummary uids."""
+
+
+@pytest.mark.order(after="test_migrate_study_summaries")
+def test_repeat_migrate_study_summaries(migration):
+    assert not migration_016.migrate_study_summaries(DB_DRIVER, logger)
+
 def test_migrate_ct_with_test_data(migration):
 
     logger.info("CT migration, check that API returns the expected replies for migrated test data")
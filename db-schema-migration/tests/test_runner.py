@@ -0,0 +1,138 @@
+import logging
+import threading
+import time
+
+import neo4j.exceptions
+import pytest
+
+from migrations.utils import runner
+from migrations.utils.runner import MigrationStep
+
+logger = logging.getLogger("test_runner")
+
+
+class FakeCheckpoints:
+    """Stands in for `run_cypher_query`, keeping checkpoints in memory"""
+
+    def __init__(self, completed=()):
+        self.completed = set(completed)
+
+    def __call__(self, _driver, query, params=None):
+        if "MERGE (c:MigrationCheckpoint" in query:
+            self.completed.add(params["step"])
+        elif "DELETE c" in query:
+            self.completed.clear()
+        return [{"step": step} for step in sorted(self.completed)], None
+
+
+@pytest.fixture
+def checkpoints(monkeypatch):
+    fake = FakeCheckpoints()
+    monkeypatch.setattr(runner, "run_cypher_query", fake)
+    return fake
+
+
+def test_run_migration_steps_in_order(checkpoints):
+    calls = []
+    steps = [
+        MigrationStep(name, lambda name=name: calls.append(name) or name)
+        for name in ["first", "second", "third"]
+    ]
+
+    results = runner.run_migration_steps(None, "test", steps, logger)
+
+    assert calls == ["first", "second", "third"]
+    assert results == {"first": "first", "second": "second", "third": "third"}
+    assert not checkpoints.completed
+
+
+def test_run_migration_steps_resumes_after_failure(checkpoints):
+    calls = []
+
+    def fail():
+        raise RuntimeError("failed")
+
+    steps = [
+        MigrationStep("first", lambda: calls.append("first")),
+        MigrationStep("second", fail),
+        MigrationStep("third", lambda: calls.append("third")),
+    ]
+    with pytest.raises(RuntimeError):
+        runner.run_migration_steps(None, "test", steps, logger)
+    assert calls == ["first"]
+    assert checkpoints.completed == {"first"}
+
+    steps[1] = MigrationStep("second", lambda: calls.append("second"))
+    runner.run_migration_steps(None, "test", steps, logger)
+
+    assert calls == ["first", "second", "third"]
+    assert not checkpoints.completed
+
+
+def test_run_migration_steps_in_parallel(checkpoints):
+    running = set()
+    overlaps = []
+    lock = threading.Lock()
+
+    def step(name):
+        with lock:
+            if running:
+                overlaps.append(name)
+            running.add(name)
+        time.sleep(0.05)
+        with lock:
+            running.remove(name)
+
+    steps = [
+        MigrationStep("setup", lambda: step("setup")),
+        MigrationStep("left", lambda: step("left"), depends_on=("setup",)),
+        MigrationStep("right", lambda: step("right"), depends_on=("setup",)),
+        MigrationStep("finish", lambda: step("finish")),
+    ]
+
+    runner.run_migration_steps(None, "test", steps, logger, workers=2)
+
+    assert overlaps in (["left"], ["right"])
+
+
+def test_run_migration_steps_rejects_unknown_dependencies(checkpoints):
+    steps = [
+        MigrationStep("first", lambda: None, depends_on=("second",)),
+        MigrationStep("second", lambda: None),
+    ]
+
+    with pytest.raises(ValueError):
+        runner.run_migration_steps(None, "test", steps, logger)
+
+
+class FakeSummary:
+    class counters:  # pylint: disable=invalid-name
+        contains_updates = True
+
+
+def test_run_batched_query_until_no_rows_left(monkeypatch):
+    remaining = [2500]
+    batch_sizes = []
+
+    def fake_run_cypher_query(_driver, query, params=None):
+        if "total" in query:
+            return [{"count": 2500}], FakeSummary
+        batch_sizes.append(params["batch_size"])
+        if params["batch_size"] > 1000:
+            raise neo4j.exceptions.TransientError("out of memory")
+        rows = min(remaining[0], params["batch_size"])
+        remaining[0] -= rows
+        return [{"count": rows}], FakeSummary
+
+    monkeypatch.setattr(runner, "run_cypher_query", fake_run_cypher_query)
+
+    result = runner.run_batched_query(
+        None, logger, "test", "batch", count_query="total", batch_size=500
+    )
+
+    assert result.rows == 2500
+    assert result.contains_updates
+    # fast batches grow the batch size, failing ones shrink it
+    assert batch_sizes[:3] == [500, 1000, 2000]
+    assert batch_sizes[3] == 1000
+    assert remaining == [0]
@@ -1,5 +1,7 @@
 import logging
 import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from os import environ
 
@@ -54,6 +56,10 @@ if not NEO4J_STAGING_DATABASE:
 
 BATCH_SIZE = 1000
 
+# Number of codelists or terms merged per transaction, and number of transactions run in parallel
+IMPORT_BATCH_SIZE = int(environ.get("CDISC_IMPORT_BATCH_SIZE", "200"))
+IMPORT_WORKERS = int(environ.get("CDISC_IMPORT_WORKERS", "4"))
+
 
 def get_logger():
     loglevel = environ.get("LOG_LEVEL", "INFO")
@@ -103,6 +109,44 @@ def run_single_query_auto(session, query, parameters=None):
     return data
 
 
+def run_in_batches(driver, stage, items, work, batch_size, workers, *args):
+    """
+    Runs `work(tx, batch, *args)` in a write transaction for each batch of `batch_size` items,
+    with up to `workers` batches in parallel, each on its own session.
+    Transient errors (deadlocks between parallel batches for instance) are retried by the driver.
+    Returns the results of `work` in batch order, and logs the throughput of the stage.
+    """
+    batches = [items[i : i + batch_size] for i in range(0, len(items), batch_size)]
+    LOGGER.info(
+        "%s: %d items in %d batches of %d, %d workers",
+        stage,
+        len(items),
+        len(batches),
+        batch_size,
+        workers,
+    )
+
+    def run_batch(batch):
+        with driver.session() as session:
+            return session.execute_write(work, batch, *args)
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(run_batch, batches))
+    log_throughput(stage, len(items), time.monotonic() - started)
+    return results
+
+
+def log_throughput(stage, count, duration):
+    LOGGER.info(
+        "%s: %d items in %.1f s (%.1f items/s)",
+        stage,
+        count,
+        duration,
+        count / duration if duration > 0 else 0,
+    )
+
+
 def print_stats(stats):
     if stats is None:
         print("No changes were made.")
@@ -116,6 +160,27 @@ def print_stats(stats):
     print("Names unchanged: ", stats["names_unchanged"])
 
 
+def new_stats():
+    return {
+        "attrs_updated": 0,
+        "attrs_created": 0,
+        "attrs_unchanged": 0,
+        "names_updated": 0,
+        "names_created": 0,
+        "names_unchanged": 0,
+    }
+
+
+def add_stats(total, stats):
+    if stats is None:
+        return total
+    if total is None:
+        total = new_stats()
+    for key, value in stats.items():
+        total[key] += value
+    return total
+
+
 # Create indexes in the SB database
 def create_indexes(session, sideload_data: bool = False):
     suffix = SIDELOAD_SUFFIX if sideload_data else ""
@@ -269,12 +334,14 @@ def link_code_name_codelist_pairs(session, codelists, sideload_data: bool = Fals
     run_single_query(session, query, parameters={"codelist_pairs": codelists_to_link})
 
 
-def merge_codelist_versions(session, codelist, stats=None, sideload_data: bool = False):
+def merge_codelist_versions(tx, codelists, sideload_data: bool = False):
+    """Merges the name and attribute versions of a batch of codelists, returns the stats of the batch"""
     suffix = SIDELOAD_SUFFIX if sideload_data else ""
     existing_query = f"""
-        MATCH (clar:CTCodelistAttributesRoot{suffix})<-[:HAS_ATTRIBUTES_ROOT]-(clr:CTCodelistRoot{suffix} {{uid: $codelist.vcl.conceptId}})
+        UNWIND $codelist_uids AS codelist_uid
+        MATCH (clar:CTCodelistAttributesRoot{suffix})<-[:HAS_ATTRIBUTES_ROOT]-(clr:CTCodelistRoot{suffix} {{uid: codelist_uid}})
             -[:HAS_NAME_ROOT]->(clnr:CTCodelistNameRoot{suffix})
-        WITH clr, clar, clnr, 
+        WITH codelist_uid, clr, clar, clnr,
             COLLECT {{ 
                 MATCH (clar)-[hv:HAS_VERSION]-(clav:CTCodelistAttributesValue{suffix})<-[:CONTAINS_ATTRIBUTES]-(ctpcl)
                 WITH clav, hv, collect(ctpcl.uid) as pcl_uids ORDER BY hv.start_date 
@@ -287,289 +354,227 @@ def merge_codelist_versions(session, codelist, stats=None, sideload_data: bool =
                 WITH clnv{{.*, start_date: hv.start_date, end_date: hv.end_date, version: hv.version}} AS row
                 RETURN row
             }} AS nvs
-        RETURN *
+        RETURN codelist_uid, avs, nvs
     """
 
     create_attrs_query = f"""
-    MATCH (clar:CTCodelistAttributesRoot{suffix})<-[:HAS_ATTRIBUTES_ROOT]-(clr:CTCodelistRoot{suffix} {{uid: $codelist_uid}})
-    WITH clr, clar
-    CREATE (clar)-[:HAS_VERSION {{start_date: datetime($attr.start_date), end_date: datetime($attr.end_date), version: $attr.version, status: "Final", user_initials: $user_initials}}]->(clav:CTCodelistAttributesValue{suffix} {{name: $attr.value.name, preferred_term: $attr.value.preferred_term, submission_value: $attr.value.submission_value, definition: $attr.value.definition, concept_id: $attr.value.concept_id, extensible: $attr.value.extensible, synonyms: $attr.value.synonyms}})
-    WITH clar, clav
-    MATCH (ctpcl:CTPackageCodelist{suffix}) WHERE ctpcl.uid IN $attr.package_codelist_uids
-    MERGE (clav)<-[:CONTAINS_ATTRIBUTES]-(ctpcl)
-    WITH clar, clav
+    UNWIND $rows AS row
     CALL {{
-        WITH clar, clav
-        WITH clar, clav WHERE $attr.end_date IS NULL
-        MERGE (clar)-[:LATEST]->(clav)
-        MERGE (clar)-[:LATEST_FINAL]->(clav)
-        RETURN NULL as dummy
+        WITH row
+        MATCH (clar:CTCodelistAttributesRoot{suffix})<-[:HAS_ATTRIBUTES_ROOT]-(clr:CTCodelistRoot{suffix} {{uid: row.uid}})
+        WITH row, clr, clar
+        CREATE (clar)-[:HAS_VERSION {{start_date: datetime(row.item.start_date), end_date: datetime(row.item.end_date), version: row.item.version, status: "Final", user_initials: $user_initials}}]->(clav:CTCodelistAttributesValue{suffix} {{name: row.item.value.name, preferred_term: row.item.value.preferred_term, submission_value: row.item.value.submission_value, definition: row.item.value.definition, concept_id: row.item.value.concept_id, extensible: row.item.value.extensible, synonyms: row.item.value.synonyms}})
+        WITH row, clar, clav
+        MATCH (ctpcl:CTPackageCodelist{suffix}) WHERE ctpcl.uid IN row.item.package_codelist_uids
+        MERGE (clav)<-[:CONTAINS_ATTRIBUTES]-(ctpcl)
+        WITH row, clar, clav
+        CALL {{
+            WITH row, clar, clav
+            WITH row, clar, clav WHERE row.item.end_date IS NULL
+            MERGE (clar)-[:LATEST]->(clav)
+            MERGE (clar)-[:LATEST_FINAL]->(clav)
+            RETURN NULL as dummy
+        }}
+        RETURN count(*) AS merged
     }}
-    RETURN NULL as dummy
+    RETURN sum(merged) AS merged
     """
 
     update_attr_end_date_query = f"""
-    MATCH (clar:CTCodelistAttributesRoot{suffix})<-[:HAS_ATTRIBUTES_ROOT]-(clr:CTCodelistRoot{suffix} {{uid: $codelist_uid}})-[:HAS_VERSION {{start_date: datetime($attr.start_date), version: $attr.version}}]->(clav:CTCodelistAttributesValue{suffix})
-    SET clav.end_date = datetime($attr.end_date)
-    WITH clar, clav
+    UNWIND $rows AS row
     CALL {{
-        WITH clar, clav
-        WITH clar, clav WHERE $attr.end_date IS NOT NULL
-        MATCH (clar)-[l:LATEST]->(clav)
-        DELETE l
-        WITH clar, clav
-        MATCH (clar)-[lf:LATEST_FINAL]->(clav)
-        DELETE lf
-        RETURN NULL as dummy
+        WITH row
+        MATCH (clar:CTCodelistAttributesRoot{suffix})<-[:HAS_ATTRIBUTES_ROOT]-(clr:CTCodelistRoot{suffix} {{uid: row.uid}})-[:HAS_VERSION {{start_date: datetime(row.item.start_date), version: row.item.version}}]->(clav:CTCodelistAttributesValue{suffix})
+        SET clav.end_date = datetime(row.item.end_date)
+        WITH row, clar, clav
+        CALL {{
+            WITH row, clar, clav
+            WITH row, clar, clav WHERE row.item.end_date IS NOT NULL
+            MATCH (clar)-[l:LATEST]->(clav)
+            DELETE l
+            WITH clar, clav
+            MATCH (clar)-[lf:LATEST_FINAL]->(clav)
+            DELETE lf
+            RETURN NULL as dummy
+        }}
+        RETURN count(*) AS merged
     }}
-    RETURN NULL as dummy
+    RETURN sum(merged) AS merged
     """
 
     create_name_query = f"""
-    MATCH (clnr:CTCodelistNameRoot{suffix})<-[:HAS_NAME_ROOT]-(clr:CTCodelistRoot{suffix} {{uid: $codelist_uid}})
-    WITH clnr
-    CREATE (clnr)-[:HAS_VERSION {{start_date: datetime($name.start_date), end_date: datetime($name.end_date), version: $name.version, status: "Final", user_initials: $user_initials}}]->(clnv:CTCodelistNameValue{suffix} {{name: $name.value.name, name_sentence_case: $name.value.name_sentence_case}})
-    WITH clnr, clnv
+    UNWIND $rows AS row
     CALL {{
-        WITH clnr, clnv
-        WITH clnr, clnv WHERE $name.end_date IS NULL
-        MERGE (clnr)-[:LATEST]->(clnv)
-        MERGE (clnr)-[:LATEST_FINAL]->(clnv)
-        RETURN NULL as dummy
+        WITH row
+        MATCH (clnr:CTCodelistNameRoot{suffix})<-[:HAS_NAME_ROOT]-(clr:CTCodelistRoot{suffix} {{uid: row.uid}})
+        WITH row, clnr
+        CREATE (clnr)-[:HAS_VERSION {{start_date: datetime(row.item.start_date), end_date: datetime(row.item.end_date), version: row.item.version, status: "Final", user_initials: $user_initials}}]->(clnv:CTCodelistNameValue{suffix} {{name: row.item.value.name, name_sentence_case: row.item.value.name_sentence_case}})
+        WITH row, clnr, clnv
+        CALL {{
+            WITH row, clnr, clnv
+            WITH row, clnr, clnv WHERE row.item.end_date IS NULL
+            MERGE (clnr)-[:LATEST]->(clnv)
+            MERGE (clnr)-[:LATEST_FINAL]->(clnv)
+            RETURN NULL as dummy
+        }}
+        RETURN count(*) AS merged
     }}
-    RETURN NULL as dummy
+    RETURN sum(merged) AS merged
     """
 
     update_name_end_date_query = f"""
-    MATCH (clnr:CTCodelistNameRoot{suffix})<-[:HAS_NAME_ROOT]-(clr:CTCodelistRoot{suffix} {{uid: $codelist_uid}})-[:HAS_VERSION {{start_date: datetime($name.start_date), version: $name.version}}]->(clnv:CTCodelistNameValue{suffix})
-    SET clnv.end_date = datetime($name.end_date)
-    WITH clnr, clnv
+    UNWIND $rows AS row
     CALL {{
-        WITH clnr, clnv
-        WITH clnr, clnv WHERE $name.end_date IS NOT NULL
-        MATCH (clnr)-[l:LATEST]->(clnv)
-        DELETE l
-        WITH clnr, clnv
-        MATCH (clnr)-[lf:LATEST_FINAL]->(clnv)
-        DELETE lf
-        RETURN NULL as dummy
+        WITH row
+        MATCH (clnr:CTCodelistNameRoot{suffix})<-[:HAS_NAME_ROOT]-(clr:CTCodelistRoot{suffix} {{uid: row.uid}})-[:HAS_VERSION {{start_date: datetime(row.item.start_date), version: row.item.version}}]->(clnv:CTCodelistNameValue{suffix})
+        SET clnv.end_date = datetime(row.item.end_date)
+        WITH row, clnr, clnv
+        CALL {{
+            WITH row, clnr, clnv
+            WITH row, clnr, clnv WHERE row.item.end_date IS NOT NULL
+            MATCH (clnr)-[l:LATEST]->(clnv)
+            DELETE l
+            WITH clnr, clnv
+            MATCH (clnr)-[lf:LATEST_FINAL]->(clnv)
+            DELETE lf
+            RETURN NULL as dummy
+        }}
+        RETURN count(*) AS merged
     }}
-    RETURN NULL as dummy
+    RETURN sum(merged) AS merged
     """
 
-    if stats is None:
-        stats = {
-            "attrs_updated": 0,
-            "attrs_created": 0,
-            "attrs_unchanged": 0,
-            "names_updated": 0,
-            "names_created": 0,
-            "names_unchanged": 0,
-        }
+    stats = new_stats()
     # <-[:CONTAINS_ATTRIBUTES]-(ctpcl:CTPackageCodelist)-[:CONTAINS_CODELIST]-(ctp:CTPackage)
-    existing_versions = run_single_query(
-        session, existing_query, parameters={"codelist": codelist}
-    )
-    names_to_merge, attrs_to_merge = extract_cl_names_and_attributes(codelist)
-    for attr in attrs_to_merge:
-        build_ct_package_codelist_uids(codelist, attr)
-        # neo4j doesn't like sets, convert to a list
-        attr["value"]["synonyms"] = list(attr["value"]["synonyms"])
-
-        if len(existing_versions) > 0 and len(existing_versions[0]["avs"]) > 0:
-            # There were already some versions of these attributes before the import started.
-            # We need to make sure to update these to match the new data.
-            start_date = datetime.fromisoformat(attr["start_date"]).replace(
-                tzinfo=timezone.utc
-            )
-            end_date = (
-                datetime.fromisoformat(attr.get("end_date")).replace(
-                    tzinfo=timezone.utc
-                )
-                if attr.get("end_date") is not None
-                else None
-            )
-            matching = find_item_with_matching_start_date(
-                start_date, existing_versions[0]["avs"]
-            )
-            if matching is not None:
-                if matching["end_date"] == end_date:
-                    # The version we are adding already exists, and the start and end dates are the same, so we are done
-                    stats["attrs_unchanged"] += 1
-                else:
-                    # a version with the same start date but different end date exists.
-                    # this means that this term has been updated in the standards data, and we need to retire the term also in the SB db.
-                    # Update the end date, and if the end date is not null (should normally be the case here), remove any LATEST and LATEST_FINAL relationships
-                    LOGGER.debug("attr, update end date! %s", matching)
-                    run_single_query(
-                        session,
-                        update_attr_end_date_query,
-                        parameters={
-                            "codelist_uid": codelist["vcl"]["conceptId"],
-                            "attr": attr,
-                        },
-                    )
-                    stats["attrs_updated"] += 1
-                # check if the properties are the same, if not warn. Or just update them?
-                # check if linked catalogues are the same, add any that are missing
-            else:
-                # a version with the same start date does not exist, this means we are adding a new version.
-                # Find the previous version and retire it, and remove any LATEST and LATEST_FINAL relationships.
-                # This will most of the time be handled by the previous block, but if we are importing a subset of packages
-                # this might not have been done yet.
-                LOGGER.debug(
-                    "attr find the previous version and update end date, then create the new version"
-                )
-                existing_active = find_item_active_at_date(
-                    start_date, existing_versions[0]["avs"]
-                )
-                if existing_active is not None:
-                    LOGGER.debug("Retire this attr: %s", existing_active)
-                    run_single_query(
-                        session,
-                        update_attr_end_date_query,
-                        parameters={
-                            "codelist_uid": existing_active["concept_id"],
-                            "attr": existing_active,
-                        },
-                    )
-                    stats["attrs_updated"] += 1
-                # and remove any LATEST and LATEST_FINAL relationships from it
-                # run_single_query(session, retire_previous_name_query, parameters={"codelist": codelist, "name": name})
-                run_single_query(
-                    session,
-                    create_attrs_query,
-                    parameters={
-                        "codelist_uid": codelist["vcl"]["conceptId"],
-                        "attr": attr,
-                        "user_initials": IMPORT_USERNAME,
-                    },
-                )
-                stats["attrs_created"] += 1
-        else:
-            LOGGER.debug("attr not found, just create the new version")
-            run_single_query(
-                session,
-                create_attrs_query,
-                parameters={
-                    "codelist_uid": codelist["vcl"]["conceptId"],
-                    "attr": attr,
-                    "user_initials": IMPORT_USERNAME,
-                },
-            )
-            stats["attrs_created"] += 1
-            # raise ValueError("stop")
+    existing_versions = {}
+    for record in tx.run(
+        existing_query,
+        codelist_uids=[codelist["vcl"]["conceptId"] for codelist in codelists],
+    ).data():
+        existing_versions.setdefault(record["codelist_uid"], record)
+
+    attrs_to_retire, attrs_to_create, names_to_retire, names_to_create = [], [], [], []
+    for codelist in codelists:
+        codelist_uid = codelist["vcl"]["conceptId"]
+        existing = existing_versions.get(codelist_uid, {"avs": [], "nvs": []})
+        names_to_merge, attrs_to_merge = extract_cl_names_and_attributes(codelist)
+        for attr in attrs_to_merge:
+            build_ct_package_codelist_uids(codelist, attr)
+            # neo4j doesn't like sets, convert to a list
+            attr["value"]["synonyms"] = list(attr["value"]["synonyms"])
+
+        to_retire, to_create = plan_version_merge(
+            codelist_uid, attrs_to_merge, existing["avs"], stats, "attrs"
+        )
+        attrs_to_retire.extend(to_retire)
+        attrs_to_create.extend(to_create)
+        to_retire, to_create = plan_version_merge(
+            codelist_uid, names_to_merge, existing["nvs"], stats, "names"
+        )
+        names_to_retire.extend(to_retire)
+        names_to_create.extend(to_create)
+
+    # Retire the versions that existed before the import, then create the new ones
+    run_query(tx, update_attr_end_date_query, {"rows": attrs_to_retire}).consume()
+    run_query(tx, update_name_end_date_query, {"rows": names_to_retire}).consume()
+    run_query(
+        tx,
+        create_attrs_query,
+        {"rows": attrs_to_create, "user_initials": IMPORT_USERNAME},
+    ).consume()
+    run_query(
+        tx,
+        create_name_query,
+        {"rows": names_to_create, "user_initials": IMPORT_USERNAME},
+    ).consume()
+
+    return stats
+
+
+def build_ct_package_codelist_uids(codelist, attr):
+    uids = [
+        package_name.replace(" ", "__") + "_" + codelist["vcl"]["conceptId"]
+        for package_name in attr["catalogues"]
+    ]
+    del attr["catalogues"]
+    attr["package_codelist_uids"] = uids
+
+
+def find_item_with_matching_start_date(start_date, items):
+    for item in items:
+        if item["start_date"] == start_date:
+            return item
+    LOGGER.debug("not found!, %s, %s", start_date, items)
+    return None
+
 
-    for name in names_to_merge:
-        if len(existing_versions) > 0 and len(existing_versions[0]["nvs"]) > 0:
-            # There were already some versions of this name before the import started.
+def find_item_active_at_date(start_date, items):
+    for item in items:
+        if item["start_date"] < start_date and item["end_date"] is None:
+            return item
+    return None
+
+
+def plan_version_merge(uid, new_versions, existing_versions, stats, kind):
+    """
+    Compares the versions of the names or attributes (kind) of a codelist or term built from the staging data
+    with the versions that existed in the SB db before the import started.
+    Returns the rows of the versions to retire (update end date) and the rows of the versions to create,
+    and updates the stats counters.
+    """
+    to_retire = []
+    to_create = []
+    for version in new_versions:
+        if len(existing_versions) > 0:
+            # There were already some versions before the import started.
             # We need to make sure to update these to match the new data.
-            start_date = datetime.fromisoformat(name["start_date"]).replace(
+            start_date = datetime.fromisoformat(version["start_date"]).replace(
                 tzinfo=timezone.utc
             )
             end_date = (
-                datetime.fromisoformat(name.get("end_date")).replace(
+                datetime.fromisoformat(version.get("end_date")).replace(
                     tzinfo=timezone.utc
                 )
-                if name.get("end_date") is not None
+                if version.get("end_date") is not None
                 else None
             )
-            matching = find_item_with_matching_start_date(
-                start_date, existing_versions[0]["nvs"]
-            )
+            matching = find_item_with_matching_start_date(start_date, existing_versions)
             if matching is not None:
                 if matching["end_date"] == end_date:
                     # The version we are adding already exists, and the start and end dates are the same, so we are done
-                    stats["names_unchanged"] += 1
+                    stats[f"{kind}_unchanged"] += 1
                 else:
                     # a version with the same start date but different end date exists.
-                    # this means that this term has been updated in the standards data, and we need to retire the term also in the SB db.
+                    # this means that this item has been updated in the standards data, and we need to retire it also in the SB db.
                     # Update the end date, and if the end date is not null (should normally be the case here), remove any LATEST and LATEST_FINAL relationships
-                    LOGGER.debug("name, update end date: %s", matching)
-                    run_single_query(
-                        session,
-                        update_name_end_date_query,
-                        parameters={
-                            "codelist_uid": codelist["vcl"]["conceptId"],
-                            "name": name,
-                        },
-                    )
-                    stats["names_updated"] += 1
+                    LOGGER.debug("%s, update end date: %s", kind, matching)
+                    to_retire.append({"uid": uid, "item": version})
+                    stats[f"{kind}_updated"] += 1
                 # check if the properties are the same, if not warn. Or just update them?
+                # check if linked catalogues are the same, add any that are missing
             else:
                 # a version with the same start date does not exist, this means we are adding a new version.
                 # Find the previous version and retire it, and remove any LATEST and LATEST_FINAL relationships.
                 # This will most of the time be handled by the previous block, but if we are importing a subset of packages
                 # this might not have been done yet.
                 LOGGER.debug(
-                    "name find the previous version and update end date, then create the new version"
-                )
-                existing_active = find_item_active_at_date(
-                    start_date, existing_versions[0]["nvs"]
+                    "%s find the previous version and update end date, then create the new version",
+                    kind,
                 )
+                existing_active = find_item_active_at_date(start_date, existing_versions)
                 if existing_active is not None:
-                    LOGGER.debug("Retire this name: %s", existing_active)
-                    run_single_query(
-                        session,
-                        update_name_end_date_query,
-                        parameters={
-                            "codelist_uid": existing_active["concept_id"],
-                            "name": existing_active,
-                        },
-                    )
-                    stats["names_updated"] += 1
-                # and remove any LATEST and LATEST_FINAL relationships from it
-                # run_single_query(session, retire_previous_name_query, parameters={"codelist": codelist, "name": name})
-                run_single_query(
-                    session,
-                    create_name_query,
-                    parameters={
-                        "codelist_uid": codelist["vcl"]["conceptId"],
-                        "name": name,
-                        "user_initials": IMPORT_USERNAME,
-                    },
-                )
-                stats["names_created"] += 1
+                    LOGGER.debug("Retire this %s: %s", kind, existing_active)
+                    to_retire.append({"uid": uid, "item": existing_active})
+                    stats[f"{kind}_updated"] += 1
+                to_create.append({"uid": uid, "item": version})
+                stats[f"{kind}_created"] += 1
         else:
             # There are no existing versions yet, just create the new versions
-            LOGGER.debug("name not found, just create the new version")
-            run_single_query(
-                session,
-                create_name_query,
-                parameters={
-                    "codelist_uid": codelist["vcl"]["conceptId"],
-                    "name": name,
-                    "user_initials": IMPORT_USERNAME,
-                },
-            )
-            stats["names_created"] += 1
-            # raise ValueError("stop")
+            LOGGER.debug("%s not found, just create the new version", kind)
+            to_create.append({"uid": uid, "item": version})
+            stats[f"{kind}_created"] += 1
 
-    return stats
-
-
-def build_ct_package_codelist_uids(codelist, attr):
-    uids = [
-        package_name.replace(" ", "__") + "_" + codelist["vcl"]["conceptId"]
-        for package_name in attr["catalogues"]
-    ]
-    del attr["catalogues"]
-    attr["package_codelist_uids"] = uids
-
-
-def find_item_with_matching_start_date(start_date, items):
-    for item in items:
-        if item["start_date"] == start_date:
-            return item
-    LOGGER.debug("not found!, %s, %s", start_date, items)
-    return None
-
-
-def find_item_active_at_date(start_date, items):
-    for item in items:
-        if item["start_date"] < start_date and item["end_date"] is None:
-            return item
-    return None
+    return to_retire, to_create
 
 
 def increment_version(new_version, existing_versions):
@@ -664,17 +669,33 @@ def make_clean_package_names(codelists):
                 vcat["uid"] = vcat["name"].replace(" ", "__")
 
 
-def merge_codelists(staging_db_driver, sb_db_driver, sideload_data: bool = False):
+def merge_codelists(
+    staging_db_driver,
+    sb_db_driver,
+    sideload_data: bool = False,
+    batch_size: int = IMPORT_BATCH_SIZE,
+    workers: int = IMPORT_WORKERS,
+):
     with staging_db_driver.session() as staging_session, sb_db_driver.session() as sb_session:
         # Codelists
         codelists = fetch_versioned_codelists(staging_session)
         make_clean_package_names(codelists)
+        started = time.monotonic()
         merge_codelist_roots(sb_session, codelists, sideload_data)
         link_code_name_codelist_pairs(sb_session, codelists, sideload_data)
-        stats = None
-        for codelist in codelists:
-            stats = merge_codelist_versions(sb_session, codelist, stats, sideload_data)
-        print_stats(stats)
+        log_throughput("Merge codelist roots", len(codelists), time.monotonic() - started)
+    stats = None
+    for batch_stats in run_in_batches(
+        sb_db_driver,
+        "Merge codelist versions",
+        codelists,
+        merge_codelist_versions,
+        batch_size,
+        workers,
+        sideload_data,
+    ):
+        stats = add_stats(stats, batch_stats)
+    print_stats(stats)
 
 
 ###### Terms
@@ -723,11 +744,13 @@ def make_clean_term_package_names(terms):
                 pack["catalogue"] = pack["catalogue"].replace(" ", "__")
 
 
-def merge_term_versions(session, term, stats=None, sideload_data: bool = False):
+def merge_term_versions(tx, terms, sideload_data: bool = False):
+    """Merges the name and attribute versions of a batch of terms, returns the stats of the batch"""
     suffix = SIDELOAD_SUFFIX if sideload_data else ""
     existing_query = f"""
-        MATCH (tar:CTTermAttributesRoot{suffix})<-[:HAS_ATTRIBUTES_ROOT]-(tr:CTTermRoot{suffix} {{uid: $term.term.conceptId}})-[:HAS_NAME_ROOT]->(tnr:CTTermNameRoot{suffix})
-        WITH tr, tar, tnr, 
+        UNWIND $term_uids AS term_uid
+        MATCH (tar:CTTermAttributesRoot{suffix})<-[:HAS_ATTRIBUTES_ROOT]-(tr:CTTermRoot{suffix} {{uid: term_uid}})-[:HAS_NAME_ROOT]->(tnr:CTTermNameRoot{suffix})
+        WITH term_uid, tr, tar, tnr,
             COLLECT {{ 
                 MATCH (tar)-[hv:HAS_VERSION]-(tav:CTTermAttributesValue{suffix})<-[:CONTAINS_ATTRIBUTES]-(ctpt)
                 WITH tav, hv, collect(ctpt.uid) as pt_uids ORDER BY hv.start_date 
@@ -740,261 +763,139 @@ def merge_term_versions(session, term, stats=None, sideload_data: bool = False):
                 WITH tnv{{.*, start_date: hv.start_date, end_date: hv.end_date, version: hv.version}} AS row
                 RETURN row
             }} AS nvs
-        RETURN *
+        RETURN term_uid, avs, nvs
     """
 
     create_attrs_query = f"""
-    MATCH (tar:CTTermAttributesRoot{suffix})<-[:HAS_ATTRIBUTES_ROOT]-(tr:CTTermRoot{suffix} {{uid: $term_uid}})
-    WITH tr, tar
-    CREATE (tar)-[:HAS_VERSION {{start_date: datetime($attr.start_date), end_date: datetime($attr.end_date), version: $attr.version, status: "Final", user_initials: $user_initials}}]->(tav:CTTermAttributesValue{suffix} {{preferred_term: $attr.value.preferred_term, definition: $attr.value.definition, concept_id: $attr.value.concept_id, synonyms: $attr.value.synonyms}})
-    WITH tar, tav
-    MATCH (ctpt:CTPackageTerm{suffix}) WHERE ctpt.uid IN $attr.package_term_uids
-    MERGE (tav)<-[:CONTAINS_ATTRIBUTES]-(ctpt)
-    WITH tar, tav
+    UNWIND $rows AS row
     CALL {{
-        WITH tar, tav
-        WITH tar, tav WHERE $attr.end_date IS NULL
-        MERGE (tar)-[:LATEST]->(tav)
-        MERGE (tar)-[:LATEST_FINAL]->(tav)
-        RETURN NULL as dummy
+        WITH row
+        MATCH (tar:CTTermAttributesRoot{suffix})<-[:HAS_ATTRIBUTES_ROOT]-(tr:CTTermRoot{suffix} {{uid: row.uid}})
+        WITH row, tr, tar
+        CREATE (tar)-[:HAS_VERSION {{start_date: datetime(row.item.start_date), end_date: datetime(row.item.end_date), version: row.item.version, status: "Final", user_initials: $user_initials}}]->(tav:CTTermAttributesValue{suffix} {{preferred_term: row.item.value.preferred_term, definition: row.item.value.definition, concept_id: row.item.value.concept_id, synonyms: row.item.value.synonyms}})
+        WITH row, tar, tav
+        MATCH (ctpt:CTPackageTerm{suffix}) WHERE ctpt.uid IN row.item.package_term_uids
+        MERGE (tav)<-[:CONTAINS_ATTRIBUTES]-(ctpt)
+        WITH row, tar, tav
+        CALL {{
+            WITH row, tar, tav
+            WITH row, tar, tav WHERE row.item.end_date IS NULL
+            MERGE (tar)-[:LATEST]->(tav)
+            MERGE (tar)-[:LATEST_FINAL]->(tav)
+            RETURN NULL as dummy
+        }}
+        RETURN count(*) AS merged
     }}
-    RETURN NULL as dummy
+    RETURN sum(merged) AS merged
     """
 
     update_attr_end_date_query = f"""
-    MATCH (tar:CTTermAttributesRoot{suffix})<-[:HAS_ATTRIBUTES_ROOT]-(tr:CTTermRoot{suffix} {{uid: $term_uid}})-[:HAS_VERSION {{start_date: datetime($attr.start_date), version: $attr.version}}]->(tav:CTTermAttributesValue{suffix})
-    SET tav.end_date = datetime($attr.end_date)
-    WITH tar, tav
+    UNWIND $rows AS row
     CALL {{
-        WITH tar, tav
-        WITH tar, tav WHERE $attr.end_date IS NOT NULL
-        MATCH (tar)-[l:LATEST]->(tav)
-        DELETE l
-        WITH tar, tav
-        MATCH (tar)-[lf:LATEST_FINAL]->(tav)
-        DELETE lf
-        RETURN NULL as dummy
+        WITH row
+        MATCH (tar:CTTermAttributesRoot{suffix})<-[:HAS_ATTRIBUTES_ROOT]-(tr:CTTermRoot{suffix} {{uid: row.uid}})-[:HAS_VERSION {{start_date: datetime(row.item.start_date), version: row.item.version}}]->(tav:CTTermAttributesValue{suffix})
+        SET tav.end_date = datetime(row.item.end_date)
+        WITH row, tar, tav
+        CALL {{
+            WITH row, tar, tav
+            WITH row, tar, tav WHERE row.item.end_date IS NOT NULL
+            MATCH (tar)-[l:LATEST]->(tav)
+            DELETE l
+            WITH tar, tav
+            MATCH (tar)-[lf:LATEST_FINAL]->(tav)
+            DELETE lf
+            RETURN NULL as dummy
+        }}
+        RETURN count(*) AS merged
     }}
-    RETURN NULL as dummy
+    RETURN sum(merged) AS merged
     """
 
     create_name_query = f"""
-    MATCH (tnr:CTTermNameRoot{suffix})<-[:HAS_NAME_ROOT]-(tr:CTTermRoot{suffix} {{uid: $term_uid}})
-    WITH tnr
-    CREATE (tnr)-[:HAS_VERSION {{start_date: datetime($name.start_date), end_date: datetime($name.end_date), version: $name.version, status: "Final", user_initials: $user_initials}}]->(tnv:CTTermNameValue{suffix} {{name: $name.value.name, name_sentence_case: $name.value.name_sentence_case}})
-    WITH tnr, tnv
+    UNWIND $rows AS row
     CALL {{
-        WITH tnr, tnv
-        WITH tnr, tnv WHERE $name.end_date IS NULL
-        MERGE (tnr)-[:LATEST]->(tnv)
-        MERGE (tnr)-[:LATEST_FINAL]->(tnv)
-        RETURN NULL as dummy
+        WITH row
+        MATCH (tnr:CTTermNameRoot{suffix})<-[:HAS_NAME_ROOT]-(tr:CTTermRoot{suffix} {{uid: row.uid}})
+        WITH row, tnr
+        CREATE (tnr)-[:HAS_VERSION {{start_date: datetime(row.item.start_date), end_date: datetime(row.item.end_date), version: row.item.version, status: "Final", user_initials: $user_initials}}]->(tnv:CTTermNameValue{suffix} {{name: row.item.value.name, name_sentence_case: row.item.value.name_sentence_case}})
+        WITH row, tnr, tnv
+        CALL {{
+            WITH row, tnr, tnv
+            WITH row, tnr, tnv WHERE row.item.end_date IS NULL
+            MERGE (tnr)-[:LATEST]->(tnv)
+            MERGE (tnr)-[:LATEST_FINAL]->(tnv)
+            RETURN NULL as dummy
+        }}
+        RETURN count(*) AS merged
     }}
-    RETURN NULL as dummy
+    RETURN sum(merged) AS merged
     """
 
     update_name_end_date_query = f"""
-    MATCH (tnr:CTTermNameRoot{suffix})<-[:HAS_NAME_ROOT]-(tr:CTTermRoot{suffix} {{uid: $term_uid}})-[:HAS_VERSION {{start_date: datetime($name.start_date), version: $name.version}}]->(tnv:CTTermNameValue{suffix})
-    SET tnv.end_date = datetime($name.end_date)
-    WITH tnr, tnv
+    UNWIND $rows AS row
     CALL {{
-        WITH tnr, tnv
-        WITH tnr, tnv WHERE $name.end_date IS NOT NULL
-        MATCH (tnr)-[l:LATEST]->(tnv)
-        DELETE l
-        WITH tnr, tnv
-        MATCH (tnr)-[lf:LATEST_FINAL]->(tnv)
-        DELETE lf
-        RETURN NULL as dummy
+        WITH row
+        MATCH (tnr:CTTermNameRoot{suffix})<-[:HAS_NAME_ROOT]-(tr:CTTermRoot{suffix} {{uid: row.uid}})-[:HAS_VERSION {{start_date: datetime(row.item.start_date), version: row.item.version}}]->(tnv:CTTermNameValue{suffix})
+        SET tnv.end_date = datetime(row.item.end_date)
+        WITH row, tnr, tnv
+        CALL {{
+            WITH row, tnr, tnv
+            WITH row, tnr, tnv WHERE row.item.end_date IS NOT NULL
+            MATCH (tnr)-[l:LATEST]->(tnv)
+            DELETE l
+            WITH tnr, tnv
+            MATCH (tnr)-[lf:LATEST_FINAL]->(tnv)
+            DELETE lf
+            RETURN NULL as dummy
+        }}
+        RETURN count(*) AS merged
     }}
-    RETURN NULL as dummy
+    RETURN sum(merged) AS merged
     """
 
+    stats = new_stats()
     # <-[:CONTAINS_ATTRIBUTES]-(ctpcl:CTPackageCodelist)-[:CONTAINS_CODELIST]-(ctp:CTPackage)
-    existing_versions = run_single_query(
-        session, existing_query, parameters={"term": term}
-    )
-    names_to_merge, attrs_to_merge = extract_term_names_and_attributes(term)
-    if stats is None:
-        stats = {
-            "attrs_updated": 0,
-            "attrs_created": 0,
-            "attrs_unchanged": 0,
-            "names_updated": 0,
-            "names_created": 0,
-            "names_unchanged": 0,
-        }
+    existing_versions = {}
+    for record in tx.run(
+        existing_query, term_uids=[term["term"]["conceptId"] for term in terms]
+    ).data():
+        existing_versions.setdefault(record["term_uid"], record)
 
-    for attr in attrs_to_merge:
-        build_ct_package_term_uids(term, attr)
-        # neo4j doesn't like sets, convert to a list
-        attr["value"]["synonyms"] = list(attr["value"]["synonyms"])
-
-        if len(existing_versions) > 0 and len(existing_versions[0]["avs"]) > 0:
-            # There were already some versions of these attributes before the import started.
-            # We need to make sure to update these to match the new data.
-            start_date = datetime.fromisoformat(attr["start_date"]).replace(
-                tzinfo=timezone.utc
-            )
-            end_date = (
-                datetime.fromisoformat(attr.get("end_date")).replace(
-                    tzinfo=timezone.utc
-                )
-                if attr.get("end_date") is not None
-                else None
-            )
-            matching = find_item_with_matching_start_date(
-                start_date, existing_versions[0]["avs"]
-            )
-            if matching is not None:
-                if matching["end_date"] == end_date:
-                    # The version we are adding already exists, and the start and end dates are the same, so we are done
-                    stats["attrs_unchanged"] += 1
-                else:
-                    # a version with the same start date but different end date exists.
-                    # this means that this term has been updated in the standards data, and we need to retire the term also in the SB db.
-                    # Update the end date, and if the end date is not null (should normally be the case here), remove any LATEST and LATEST_FINAL relationships
-                    LOGGER.debug("attr, update end date: %s", matching)
-                    run_single_query(
-                        session,
-                        update_attr_end_date_query,
-                        parameters={
-                            "term_uid": term["term"]["conceptId"],
-                            "attr": attr,
-                        },
-                    )
-                # check if the properties are the same, if not warn. Or just update them?
-                # check if linked catalogues are the same, add any that are missing
-            else:
-                # a version with the same start date does not exist, this means we are adding a new version.
-                # Find the previous version and retire it, and remove any LATEST and LATEST_FINAL relationships.
-                # This will most of the time be handled by the previous block, but if we are importing a subset of packages
-                # this might not have been done yet.
-                LOGGER.debug(
-                    "attr find the previous version and update end date, then create the new version"
-                )
-                existing_active = find_item_active_at_date(
-                    start_date, existing_versions[0]["avs"]
-                )
-                if existing_active is not None:
-                    LOGGER.debug("Retire this attr: %s", existing_active)
-                    run_single_query(
-                        session,
-                        update_attr_end_date_query,
-                        parameters={
-                            "term_uid": existing_active["concept_id"],
-                            "attr": existing_active,
-                        },
-                    )
-                    stats["attrs_updated"] += 1
-                # and remove any LATEST and LATEST_FINAL relationships from it
-                # run_single_query(session, retire_previous_name_query, parameters={"codelist": codelist, "name": name})
-                run_single_query(
-                    session,
-                    create_attrs_query,
-                    parameters={
-                        "term_uid": term["term"]["conceptId"],
-                        "attr": attr,
-                        "user_initials": IMPORT_USERNAME,
-                    },
-                )
-                stats["attrs_created"] += 1
-        else:
-            stats["attrs_created"] += 1
-            run_single_query(
-                session,
-                create_attrs_query,
-                parameters={
-                    "term_uid": term["term"]["conceptId"],
-                    "attr": attr,
-                    "user_initials": IMPORT_USERNAME,
-                },
-            )
-            # raise ValueError("stop")
+    attrs_to_retire, attrs_to_create, names_to_retire, names_to_create = [], [], [], []
+    for term in terms:
+        term_uid = term["term"]["conceptId"]
+        existing = existing_versions.get(term_uid, {"avs": [], "nvs": []})
+        names_to_merge, attrs_to_merge = extract_term_names_and_attributes(term)
+        for attr in attrs_to_merge:
+            build_ct_package_term_uids(term, attr)
+            # neo4j doesn't like sets, convert to a list
+            attr["value"]["synonyms"] = list(attr["value"]["synonyms"])
+
+        to_retire, to_create = plan_version_merge(
+            term_uid, attrs_to_merge, existing["avs"], stats, "attrs"
+        )
+        attrs_to_retire.extend(to_retire)
+        attrs_to_create.extend(to_create)
+        to_retire, to_create = plan_version_merge(
+            term_uid, names_to_merge, existing["nvs"], stats, "names"
+        )
+        names_to_retire.extend(to_retire)
+        names_to_create.extend(to_create)
+
+    # Retire the versions that existed before the import, then create the new ones
+    run_query(tx, update_attr_end_date_query, {"rows": attrs_to_retire}).consume()
+    run_query(tx, update_name_end_date_query, {"rows": names_to_retire}).consume()
+    run_query(
+        tx,
+        create_attrs_query,
+        {"rows": attrs_to_create, "user_initials": IMPORT_USERNAME},
+    ).consume()
+    run_query(
+        tx,
+        create_name_query,
+        {"rows": names_to_create, "user_initials": IMPORT_USERNAME},
+    ).consume()
 
-    for name in names_to_merge:
-        if len(existing_versions) > 0 and len(existing_versions[0]["nvs"]) > 0:
-            # There were already some versions of this name before the import started.
-            # We need to make sure to update these to match the new data.
-            start_date = datetime.fromisoformat(name["start_date"]).replace(
-                tzinfo=timezone.utc
-            )
-            end_date = (
-                datetime.fromisoformat(name.get("end_date")).replace(
-                    tzinfo=timezone.utc
-                )
-                if name.get("end_date") is not None
-                else None
-            )
-            matching = find_item_with_matching_start_date(
-                start_date, existing_versions[0]["nvs"]
-            )
-            if matching is not None:
-                if matching["end_date"] == end_date:
-                    # The version we are adding already exists, and the start and end dates are the same, so we are done
-                    stats["names_unchanged"] += 1
-                else:
-                    # a version with the same start date but different end date exists.
-                    # this means that this term has been updated in the standards data, and we need to retire the term also in the SB db.
-                    # Update the end date, and if the end date is not null (should normally be the case here), remove any LATEST and LATEST_FINAL relationships
-                    stats["names_updated"] += 1
-                    LOGGER.debug("name, update end date: %s", matching)
-                    run_single_query(
-                        session,
-                        update_name_end_date_query,
-                        parameters={
-                            "term_uid": term["term"]["conceptId"],
-                            "name": name,
-                        },
-                    )
-                # check if the properties are the same, if not warn. Or just update them?
-            else:
-                # a version with the same start date does not exist, this means we are adding a new version.
-                # Find the previous version and retire it, and remove any LATEST and LATEST_FINAL relationships.
-                # This will most of the time be handled by the previous block, but if we are importing a subset of packages
-                # this might not have been done yet.
-                LOGGER.debug(
-                    "name find the previous version and update end date, then create the new version"
-                )
-                existing_active = find_item_active_at_date(
-                    start_date, existing_versions[0]["nvs"]
-                )
-                if existing_active is not None:
-                    LOGGER.debug("Retire this name: %s", existing_active)
-                    run_single_query(
-                        session,
-                        update_name_end_date_query,
-                        parameters={
-                            "term_uid": existing_active["concept_id"],
-                            "name": existing_active,
-                        },
-                    )
-                    stats["names_updated"] += 1
-                # and remove any LATEST and LATEST_FINAL relationships from it
-                # run_single_query(session, retire_previous_name_query, parameters={"codelist": codelist, "name": name})
-                run_single_query(
-                    session,
-                    create_name_query,
-                    parameters={
-                        "term_uid": term["term"]["conceptId"],
-                        "name": name,
-                        "user_initials": IMPORT_USERNAME,
-                    },
-                )
-                stats["names_created"] += 1
-        else:
-            # There are no existing versions yet, just create the new versions
-            stats["names_created"] += 1
-            run_single_query(
-                session,
-                create_name_query,
-                parameters={
-                    "term_uid": term["term"]["conceptId"],
-                    "name": name,
-                    "user_initials": IMPORT_USERNAME,
-                },
-            )
-            # raise ValueError("stop")
     return stats
 
 
@@ -1063,7 +964,13 @@ def extract_term_names_and_attributes(term):
     return names, attributes
 
 
-def merge_terms(staging_db_driver, sb_db_driver, sideload_data: bool = False):
+def merge_terms(
+    staging_db_driver,
+    sb_db_driver,
+    sideload_data: bool = False,
+    batch_size: int = IMPORT_BATCH_SIZE,
+    workers: int = IMPORT_WORKERS,
+):
     with staging_db_driver.session() as staging_session, sb_db_driver.session() as sb_session:
         # Terms
         LOGGER.info("Fetch staged terms")
@@ -1071,14 +978,22 @@ def merge_terms(staging_db_driver, sb_db_driver, sideload_data: bool = False):
         LOGGER.info("Clean package names")
         make_clean_term_package_names(terms)
         LOGGER.info("Merge term roots")
+        started = time.monotonic()
         merge_term_roots(sb_session, terms, sideload_data)
-        LOGGER.info("Merge term versions")
-        stats = None
-        for term in terms:
-            stats = merge_term_versions(
-                sb_session, term, stats=stats, sideload_data=sideload_data
-            )
-        print_stats(stats)
+        log_throughput("Merge term roots", len(terms), time.monotonic() - started)
+    LOGGER.info("Merge term versions")
+    stats = None
+    for batch_stats in run_in_batches(
+        sb_db_driver,
+        "Merge term versions",
+        terms,
+        merge_term_versions,
+        batch_size,
+        workers,
+        sideload_data,
+    ):
+        stats = add_stats(stats, batch_stats)
+    print_stats(stats)
 
 
 ##### Link terms to codelists
@@ -1094,30 +1009,43 @@ def fetch_codelists_with_terms(session):
     return run_single_query(session, query)
 
 
-def link_terms_to_codelist(session, data, sideload_data: bool = False):
+def link_terms_to_codelists_batch(tx, codelists, sideload_data: bool = False):
     suffix = SIDELOAD_SUFFIX if sideload_data else ""
     query = f"""
-        MATCH (clr:CTCodelistRoot{suffix} {{uid: $cl_cid}})
-        UNWIND $terms as term
-            MATCH (tr:CTTermRoot{suffix} {{uid: term.term_cid}})<-[:HAS_TERM_ROOT]-(clterm:CTCodelistTerm{suffix} {{submission_value: term.submval}})
-            MERGE (clr)-[ht:HAS_TERM {{start_date: datetime(term.start_date)}}]->(clterm)
-            SET ht.end_date = datetime(term.end_date)
+        UNWIND $codelists as cl
+        CALL {{
+            WITH cl
+            MATCH (clr:CTCodelistRoot{suffix} {{uid: cl.cl_cid}})
+            UNWIND cl.terms as term
+                MATCH (tr:CTTermRoot{suffix} {{uid: term.term_cid}})<-[:HAS_TERM_ROOT]-(clterm:CTCodelistTerm{suffix} {{submission_value: term.submval}})
+                MERGE (clr)-[ht:HAS_TERM {{start_date: datetime(term.start_date)}}]->(clterm)
+                SET ht.end_date = datetime(term.end_date)
+        }}
         """
-    run_single_query(
-        session, query, parameters={"cl_cid": data["cl_cid"], "terms": data["terms"]}
-    )
+    run_query(tx, query, {"codelists": codelists}).consume()
 
 
 def link_terms_to_codelists(
-    staging_db_driver, sb_db_driver, sideload_data: bool = False
+    staging_db_driver,
+    sb_db_driver,
+    sideload_data: bool = False,
+    batch_size: int = IMPORT_BATCH_SIZE,
+    workers: int = IMPORT_WORKERS,
 ):
-    with staging_db_driver.session() as staging_session, sb_db_driver.session() as sb_session:
+    with staging_db_driver.session() as staging_session:
         # Terms
         LOGGER.info("Fetch staged codelists with terms")
         codelist_data = fetch_codelists_with_terms(staging_session)
-        LOGGER.info("Add terms to codelists")
-        for cl in codelist_data:
-            link_terms_to_codelist(sb_session, cl, sideload_data=sideload_data)
+    LOGGER.info("Add terms to codelists")
+    run_in_batches(
+        sb_db_driver,
+        "Add terms to codelists",
+        codelist_data,
+        link_terms_to_codelists_batch,
+        batch_size,
+        workers,
+        sideload_data,
+    )
 
 
 def main():
@@ -1128,8 +1056,22 @@ def main():
         action="store_true",
         help="Sideload the data in the MDR database to keep existing data",
     )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=IMPORT_BATCH_SIZE,
+        help="Number of codelists or terms merged per transaction",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=IMPORT_WORKERS,
+        help="Number of transactions run in parallel",
+    )
     args = parser.parse_args()
     sideload_data = args.sideload_data
+    batch_size = max(args.batch_size, 1)
+    workers = max(args.workers, 1)
 
     # Connect to both databases
     staging_db_driver = get_staging_db_driver()
@@ -1142,12 +1084,28 @@ def main():
         staging_db_driver, sb_db_driver, sideload_data=sideload_data
     )
 
-    merge_codelists(staging_db_driver, sb_db_driver, sideload_data=sideload_data)
+    merge_codelists(
+        staging_db_driver,
+        sb_db_driver,
+        sideload_data=sideload_data,
+        batch_size=batch_size,
+        workers=workers,
+    )
 
-    merge_terms(staging_db_driver, sb_db_driver, sideload_data=sideload_data)
+    merge_terms(
+        staging_db_driver,
+        sb_db_driver,
+        sideload_data=sideload_data,
+        batch_size=batch_size,
+        workers=workers,
+    )
 
     link_terms_to_codelists(
-        staging_db_driver, sb_db_driver, sideload_data=sideload_data
+        staging_db_driver,
+        sb_db_driver,
+        sideload_data=sideload_data,
+        batch_size=batch_size,
+        workers=workers,
     )
 
 
@@ -7,6 +7,7 @@ from copy import deepcopy
 import openpyxl
 import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 from os import environ
 import argparse
 
@@ -43,6 +44,9 @@ if not CDISC_XLS_DIR:
 TERM_BATCH_SIZE = 1000
 CODELIST_BATCH_SIZE = 100
 
+# Number of codelist histories built in parallel
+STAGING_WORKERS = int(environ.get("CDISC_STAGING_WORKERS", "4"))
+
 
 def get_logger():
     loglevel = environ.get("LOG_LEVEL", "INFO")
@@ -224,7 +228,8 @@ def process_package(session, date, json_files):
             process_package_file(session, data)
 
 
-def process_all_packages(db_driver):
+def process_all_packages(db_driver, skip_dates=()):
+    """Loads the packages of all dates found in CDISC_JSON_DIR except `skip_dates`, returns the loaded dates"""
     # Get a list of files in the "CDISC_JSON_DIR" directory
     json_files = os.listdir(CDISC_JSON_DIR)
     json_files = [f for f in json_files if f.endswith(".json")]
@@ -236,10 +241,12 @@ def process_all_packages(db_driver):
         date = file[-15:-5]
         dates.add(date)
     LOGGER.debug(dates)
+    dates = sorted(dates - set(skip_dates))
 
     with db_driver.session(database=NEO4J_DATABASE) as session:
-        for date in sorted(dates):
+        for date in dates:
             process_package(session, date, json_files)
+    return dates
 
 
 ########################################################
@@ -259,6 +266,42 @@ def get_package_dates(session):
     return [record["package_date"] for record in result]
 
 
+def get_staged_package_dates(session):
+    """Returns the package dates recorded as fully staged by a previous run"""
+    query = "MATCH (s:StagedPackage) RETURN s.effectiveDate as package_date ORDER BY date(package_date)"
+    result = run_single_query(session, query)
+    return [record["package_date"] for record in result]
+
+
+def mark_package_dates_staged(session, package_dates):
+    query = """
+        UNWIND $package_dates AS package_date
+        MERGE (s:StagedPackage {effectiveDate: package_date})
+        SET s.stagedAt = datetime()
+        """
+    run_single_query(session, query, parameters={"package_dates": package_dates})
+
+
+def get_grouped_codelist_cids(session, package_dates):
+    """Returns the concept ids of the codelists present in any of the given packages"""
+    query = """
+        MATCH (p:RawPackage)-[:HAS_GROUPED_CODELIST]-(gc:GroupedCodelist) WHERE p.effectiveDate IN $package_dates
+        RETURN DISTINCT gc.conceptId as cid ORDER BY cid
+        """
+    result = run_single_query(session, query, parameters={"package_dates": package_dates})
+    return [record["cid"] for record in result]
+
+
+def get_grouped_term_cids(session, package_dates):
+    """Returns the concept ids of the terms present in any of the given packages"""
+    query = """
+        MATCH (p:RawPackage)-[:HAS_GROUPED_TERM]-(gt:GroupedTerm) WHERE p.effectiveDate IN $package_dates
+        RETURN DISTINCT gt.conceptId as cid ORDER BY cid
+        """
+    result = run_single_query(session, query, parameters={"package_dates": package_dates})
+    return [record["cid"] for record in result]
+
+
 def get_codelist_cids(session, package_date):
     query = "MATCH (:RawPackage {effectiveDate: $package_date})-[:HAS_RAW_CATALOGUE]-(:RawCatalogue)-[]-(cl:RawCodelist) RETURN DISTINCT cl.conceptId as cid ORDER BY cid"
     result = run_single_query(session, query, parameters={"package_date": package_date})
@@ -374,9 +417,9 @@ def add_grouped_codelist_terms(session, package_date, codelist_cid):
     )
 
 
-def group_data(db_driver):
+def group_data(db_driver, package_dates=None):
     with db_driver.session(database=NEO4J_DATABASE) as session:
-        dates = get_package_dates(session)
+        dates = package_dates if package_dates is not None else get_package_dates(session)
         for date in dates:
             codelists_cids = get_codelist_cids(session, date)
             create_grouped_codelists(session, date, codelists_cids)
@@ -765,10 +808,10 @@ def log_inconsistencies(session):
     )
 
 
-def group_data_and_identify_inconsistencies(db_driver):
+def group_data_and_identify_inconsistencies(db_driver, package_dates=None):
     db_driver = get_neo4j_driver()
     with db_driver.session(database=NEO4J_DATABASE) as session:
-        dates = get_package_dates(session)
+        dates = package_dates if package_dates is not None else get_package_dates(session)
         for package_date in dates:
             LOGGER.info(f"Processing date: {package_date}")
             merge_codelist_properties(session, package_date)
@@ -1241,9 +1284,9 @@ def log_unsolved_inconsistencies(session):
     )
 
 
-def resolve_inconsistencies(db_driver):
+def resolve_inconsistencies(db_driver, package_dates=None):
     with db_driver.session(database=NEO4J_DATABASE) as session:
-        dates = get_package_dates(session)
+        dates = package_dates if package_dates is not None else get_package_dates(session)
         for package_date in dates:
             LOGGER.info("Processing date: %s", package_date)
             resolve_codelist_inconsistencies_for_date(session, package_date)
@@ -1254,18 +1297,27 @@ def resolve_inconsistencies(db_driver):
 ## Step 5: Build up the history for codelists
 
 
-def create_codelist_nodes(session):
+def create_codelist_nodes(session, package_dates=None):
     query = """
-        MATCH (gc:GroupedCodelist) WITH DISTINCT gc.conceptId as cid, collect(gc) as gcs
+        MATCH (gc:GroupedCodelist)
+        WHERE $package_dates IS NULL OR EXISTS { (gc)-[:HAS_GROUPED_CODELIST]-(rp:RawPackage) WHERE rp.effectiveDate IN $package_dates }
+        WITH DISTINCT gc.conceptId as cid, collect(gc) as gcs
         MERGE (vc:VersionedCodelist {conceptId: cid})
         FOREACH (n IN gcs | MERGE (vc)-[:HAS_SOURCE_VERSION]->(n))
         """
-    run_single_query(session, query)
+    run_single_query(session, query, parameters={"package_dates": package_dates})
 
 
-def get_versioned_codelist_cids(session, start, nbr):
-    query = "MATCH (vc:VersionedCodelist) RETURN vc.conceptId as cid ORDER BY cid SKIP $start LIMIT $nbr"
-    result = run_single_query(session, query, parameters={"start": start, "nbr": nbr})
+def get_versioned_codelist_cids(session, start, nbr, codelist_cids=None):
+    query = """
+        MATCH (vc:VersionedCodelist) WHERE $codelist_cids IS NULL OR vc.conceptId IN $codelist_cids
+        RETURN vc.conceptId as cid ORDER BY cid SKIP $start LIMIT $nbr
+        """
+    result = run_single_query(
+        session,
+        query,
+        parameters={"start": start, "nbr": nbr, "codelist_cids": codelist_cids},
+    )
     return [record["cid"] for record in result]
 
 
@@ -1277,18 +1329,18 @@ def get_codelist_props_hash(props):
     return h
 
 
-def get_codelist_definitions(session, codelist_cid):
+def get_codelist_definitions(tx, codelist_cid):
     query = """
         MATCH (vc:VersionedCodelist {conceptId: $codelist_cid})-[:HAS_SOURCE_VERSION]->(gc:GroupedCodelist)-[:HAS_GROUPED_PROPERTIES]->(gp)
         MATCH (gc)-[:HAS_GROUPED_CODELIST]-(rp:RawPackage)
         RETURN rp.effectiveDate as package_date, properties(gp) as props 
     """
-    result = run_single_query(session, query, parameters={"codelist_cid": codelist_cid})
+    result = run_query(tx, query, parameters={"codelist_cid": codelist_cid}).data()
     return result
 
 
-def process_single_codelist(session, term_cid, all_package_dates):
-    definitions = get_codelist_definitions(session, term_cid)
+def process_single_codelist(tx, term_cid, all_package_dates):
+    definitions = get_codelist_definitions(tx, term_cid)
     distinct_defs = {}
     for definition in definitions:
         h = get_codelist_props_hash(definition["props"])
@@ -1368,36 +1420,68 @@ def process_single_codelist(session, term_cid, all_package_dates):
     return versioned
 
 
-def build_codelist_history(session):
-    all_package_dates = sorted(
-        get_package_dates(session),
-        key=lambda x: datetime.datetime.strptime(x, "%Y-%m-%d"),
-    )
+def build_codelist_history(db_driver, codelist_cids=None, workers=STAGING_WORKERS):
+    """
+    Builds the history of the given codelists, or of all codelists.
+    The codelists of each batch are processed in parallel by `workers` threads, each with its own session.
+    """
+    with db_driver.session(database=NEO4J_DATABASE) as session:
+        all_package_dates = sorted(
+            get_package_dates(session),
+            key=lambda x: datetime.datetime.strptime(x, "%Y-%m-%d"),
+        )
     start = 0
     total_nbr_codelists = 0
     total_nbr_versions = 0
-    while True:
-        codelist_cids = get_versioned_codelist_cids(session, start, CODELIST_BATCH_SIZE)
-        returned_nbr = len(codelist_cids)
-        LOGGER.info("Process codelists: start: %s, nbr: %s", start, returned_nbr)
-        if returned_nbr == 0:
-            break
-        start += returned_nbr
-        total_nbr_codelists += returned_nbr
-
-
-        for codelist_cid in codelist_cids:
-            versions = process_single_codelist(session, codelist_cid, all_package_dates)
-            store_codelist_versions(session, codelist_cid, versions)
-            total_nbr_versions += len(versions)
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while True:
+            with db_driver.session(database=NEO4J_DATABASE) as session:
+                batch_cids = get_versioned_codelist_cids(
+                    session, start, CODELIST_BATCH_SIZE, codelist_cids
+                )
+            returned_nbr = len(batch_cids)
+            LOGGER.info("Process codelists: start: %s, nbr: %s", start, returned_nbr)
+            if returned_nbr == 0:
+                break
+            start += returned_nbr
+            total_nbr_codelists += returned_nbr
+
+            total_nbr_versions += sum(
+                executor.map(
+                    lambda codelist_cid: build_single_codelist_history(
+                        db_driver, codelist_cid, all_package_dates
+                    ),
+                    batch_cids,
+                )
+            )
     LOGGER.info(
-        "Total codelists processed: %s, total versions created: %s",
+        "Total codelists processed: %s, total versions created: %s, in %.1f s",
         total_nbr_codelists,
         total_nbr_versions,
+        time.monotonic() - started,
     )
 
 
-def store_codelist_versions(session, codelist_cid, versions):
+def build_single_codelist_history(db_driver, codelist_cid, all_package_dates):
+    """
+    Builds the history of one codelist in a single write transaction.
+    Transient errors (deadlocks between parallel workers for instance) are retried by the driver.
+    Returns the number of versions of the codelist.
+    """
+    with db_driver.session(database=NEO4J_DATABASE) as session:
+        return session.execute_write(
+            build_single_codelist_history_tx, codelist_cid, all_package_dates
+        )
+
+
+def build_single_codelist_history_tx(tx, codelist_cid, all_package_dates):
+    versions = process_single_codelist(tx, codelist_cid, all_package_dates)
+    store_codelist_versions(tx, codelist_cid, versions)
+    return len(versions)
+
+
+def store_codelist_versions(tx, codelist_cid, versions):
     query = """
         MATCH (vc:VersionedCodelist {conceptId: $codelist_cid})-[:HAS_SOURCE_VERSION]->(gc:GroupedCodelist)
         UNWIND $versions as codelist_ver
@@ -1409,31 +1493,39 @@ def store_codelist_versions(session, codelist_cid, versions):
                 MATCH (gcp:GroupedCodelistProperties)<-[:HAS_GROUPED_PROPERTIES]-(gc)-[:HAS_GROUPED_CODELIST]-(rp:RawPackage {effectiveDate: date})
                 MERGE (v)-[:FROM_PACKAGE]->(gcp)
         """
-    run_single_query(
-        session, query, parameters={"codelist_cid": codelist_cid, "versions": versions}
-    )
+    run_query(
+        tx, query, parameters={"codelist_cid": codelist_cid, "versions": versions}
+    ).consume()
 
 
-def handle_codelist_history(db_driver):
+def handle_codelist_history(db_driver, package_dates=None, workers=STAGING_WORKERS):
     with db_driver.session(database=NEO4J_DATABASE) as session:
-        create_codelist_nodes(session)
-        build_codelist_history(session)
+        create_codelist_nodes(session, package_dates)
+        codelist_cids = (
+            get_grouped_codelist_cids(session, package_dates)
+            if package_dates is not None
+            else None
+        )
+    build_codelist_history(db_driver, codelist_cids, workers=workers)
 
 
 ## Step 6: Build history for terms
 
 
-def create_term_nodes(session):
+def create_term_nodes(session, package_dates=None):
     query = """
-        MATCH (gt:GroupedTerm) WITH DISTINCT gt.conceptId as cid, collect(gt) as gts
+        MATCH (gt:GroupedTerm)
+        WHERE $package_dates IS NULL OR EXISTS { (gt)-[:HAS_GROUPED_TERM]-(rp:RawPackage) WHERE rp.effectiveDate IN $package_dates }
+        WITH DISTINCT gt.conceptId as cid, collect(gt) as gts
         MERGE (vt:VersionedTerm {conceptId: cid})
         FOREACH (n IN gts | MERGE (vt)-[:HAS_SOURCE_VERSION]->(n))
         """
-    run_single_query(session, query)
+    run_single_query(session, query, parameters={"package_dates": package_dates})
 
-def get_versioned_terms_with_definitions(session, start, nbr):
+def get_versioned_terms_with_definitions(session, start, nbr, term_cids=None):
     query = """
-        MATCH (vc:VersionedTerm) WITH vc ORDER BY vc.conceptId SKIP $start LIMIT $nbr
+        MATCH (vc:VersionedTerm) WHERE $term_cids IS NULL OR vc.conceptId IN $term_cids
+        WITH vc ORDER BY vc.conceptId SKIP $start LIMIT $nbr
         CALL {
             WITH vc
             MATCH (vc)-[:HAS_SOURCE_VERSION]->(gt:GroupedTerm)-[:HAS_GROUPED_PROPERTIES]->(gp)
@@ -1442,7 +1534,11 @@ def get_versioned_terms_with_definitions(session, start, nbr):
         }
         RETURN vc.conceptId AS cid, collect({package_date: package_date, props: props}) as definitions
     """
-    result = run_single_query(session, query, parameters={"start": start, "nbr": nbr})
+    result = run_single_query(
+        session,
+        query,
+        parameters={"start": start, "nbr": nbr, "term_cids": term_cids},
+    )
     return result
 
 
@@ -1553,7 +1649,7 @@ def store_term_versions_multi(session, term_versions):
     )
 
 
-def build_term_history(session):
+def build_term_history(session, term_cids=None):
     all_package_dates = sorted(
         get_package_dates(session),
         key=lambda x: datetime.datetime.strptime(x, "%Y-%m-%d"),
@@ -1562,7 +1658,9 @@ def build_term_history(session):
     total_nbr_terms = 0
     total_nbr_versions = 0
     while True:
-        terms = get_versioned_terms_with_definitions(session, start, TERM_BATCH_SIZE)
+        terms = get_versioned_terms_with_definitions(
+            session, start, TERM_BATCH_SIZE, term_cids
+        )
         returned_nbr = len(terms)
         LOGGER.info("Process terms: start: %s, nbr: %s", start, returned_nbr)
         if returned_nbr == 0:
@@ -1579,10 +1677,15 @@ def build_term_history(session):
     LOGGER.info("Created %s versions for %s terms", total_nbr_versions, total_nbr_terms)
 
 
-def handle_term_history(db_driver):
+def handle_term_history(db_driver, package_dates=None):
     with db_driver.session(database=NEO4J_DATABASE) as session:
-        create_term_nodes(session)
-        build_term_history(session)
+        create_term_nodes(session, package_dates)
+        term_cids = (
+            get_grouped_term_cids(session, package_dates)
+            if package_dates is not None
+            else None
+        )
+        build_term_history(session, term_cids)
 
 
 ## Step 7: Add terms to versioned codelists
@@ -1690,23 +1793,30 @@ def link_terms_to_codelist(session, codelist_cid, terms_data):
 
 
 # Add the terms fo the versioned codelists
-def add_terms_to_versioned_codelists(session):
+def add_terms_to_versioned_codelists(session, codelist_cids=None):
     start = 0
     while True:
-        codelist_cids = get_versioned_codelist_cids(session, start, CODELIST_BATCH_SIZE)
-        returned_nbr = len(codelist_cids)
+        batch_cids = get_versioned_codelist_cids(
+            session, start, CODELIST_BATCH_SIZE, codelist_cids
+        )
+        returned_nbr = len(batch_cids)
         LOGGER.info("Process codelists: start: %s, nbr: %s", start, returned_nbr)
         start += returned_nbr
 
-        for codelist_cid in codelist_cids:
+        for codelist_cid in batch_cids:
             add_terms_to_single_codelist(session, codelist_cid)
         if returned_nbr < CODELIST_BATCH_SIZE:
             break
 
 
-def add_versioned_codelist_terms(db_driver):
+def add_versioned_codelist_terms(db_driver, package_dates=None):
     with db_driver.session(database=NEO4J_DATABASE) as session:
-        add_terms_to_versioned_codelists(session)
+        codelist_cids = (
+            get_grouped_codelist_cids(session, package_dates)
+            if package_dates is not None
+            else None
+        )
+        add_terms_to_versioned_codelists(session, codelist_cids)
 
 
 # Step 8: Connect name and code codelists based on SDTM Paired Codelist Excel file from CDISC
@@ -2090,9 +2200,10 @@ def make_sponsor_term_name(term_data):
     term_data["sponsor_name"] = newname
     term_data["method"] = method
 
-def list_versioned_terms(db_driver, page_size=100, page_number=1):
+def list_versioned_terms(db_driver, page_size=100, page_number=1, term_cids=None):
     query = """
         MATCH (tv:TermVersion)<-[hv:HAS_VERSION]-(vt:VersionedTerm)-[ht:HAS_TERM]-(vcl:VersionedCodelist)
+        WHERE $term_cids IS NULL OR vt.conceptId IN $term_cids
         WITH 
             tv.preferredTerm as term_name,
             vt.conceptId as term_cid,
@@ -2105,7 +2216,9 @@ def list_versioned_terms(db_driver, page_size=100, page_number=1):
     skip = (page_number - 1) * page_size
     with db_driver.session(database=NEO4J_DATABASE) as session:
         result = run_single_query(
-            session, query, parameters={"skip": skip, "limit": page_size}
+            session,
+            query,
+            parameters={"skip": skip, "limit": page_size, "term_cids": term_cids},
         )
     return result
 
@@ -2121,10 +2234,19 @@ def create_sponsor_name_nodes(db_driver, terms_data):
         run_single_query(session, query, parameters={"terms_data": terms_data})
 
 
-def add_sponsor_names_to_terms(db_driver):
+def add_sponsor_names_to_terms(db_driver, package_dates=None):
+    term_cids = None
+    if package_dates is not None:
+        with db_driver.session(database=NEO4J_DATABASE) as session:
+            term_cids = get_grouped_term_cids(session, package_dates)
     page_number = 1
     while True:
-        terms_data = list_versioned_terms(db_driver, page_number=page_number, page_size=TERM_BATCH_SIZE)
+        terms_data = list_versioned_terms(
+            db_driver,
+            page_number=page_number,
+            page_size=TERM_BATCH_SIZE,
+            term_cids=term_cids,
+        )
         LOGGER.info("Processing page %s of %s terms for sponsor names", page_number, len(terms_data))
         if not terms_data:
             break
@@ -2236,8 +2358,21 @@ def main():
         action="store_true",
         help="Clear the CDISC staging database before loading new data.",
     )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only stage the packages not staged by a previous run, and rebuild the history of the codelists and terms they contain.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=STAGING_WORKERS,
+        help="Number of codelist histories built in parallel.",
+    )
     args = parser.parse_args()
     clear_staging_db = args.clear_staging_db
+    if args.incremental and clear_staging_db:
+        parser.error("--incremental can't be combined with --clear-staging-db")
 
     LOGGER.info(f"Creating database '{NEO4J_DATABASE}' if it does not exist")
     db_driver = get_neo4j_driver(database=None)
@@ -2248,29 +2383,46 @@ def main():
     LOGGER.info("Step 1: create indexes")
     with db_driver.session(database=NEO4J_DATABASE) as session:
         create_indexes(session)
+        staged_dates = get_staged_package_dates(session) if args.incremental else []
 
     LOGGER.info("Step 2: Load the raw JSON data into the database")
-    process_all_packages(db_driver)
+    new_dates = process_all_packages(db_driver, skip_dates=staged_dates)
+
+    # None means all package dates, in a full run
+    package_dates = None
+    if args.incremental:
+        if not new_dates:
+            LOGGER.info("No new package to stage, all dates are already staged")
+            return
+        LOGGER.info("Incremental staging of package dates: %s", new_dates)
+        if staged_dates and min(new_dates) < max(staged_dates):
+            LOGGER.warning(
+                "Package dates %s are older than the latest staged package %s, "
+                "run a full staging with --clear-staging-db to rebuild all histories",
+                [date for date in new_dates if date < max(staged_dates)],
+                max(staged_dates),
+            )
+        package_dates = new_dates
 
     LOGGER.info("Step 3: Group terms and codelists based on concept id")
-    group_data(db_driver)
+    group_data(db_driver, package_dates)
 
     LOGGER.info(
         "Step 4: Group term and codelist definitions and identify inconsistencies"
     )
-    group_data_and_identify_inconsistencies(db_driver)
+    group_data_and_identify_inconsistencies(db_driver, package_dates)
 
     LOGGER.info("Step 5: Resolve term inconsistencies")
-    resolve_inconsistencies(db_driver)
+    resolve_inconsistencies(db_driver, package_dates)
 
     LOGGER.info("Step 6: Build up the history for codelists")
-    handle_codelist_history(db_driver)
+    handle_codelist_history(db_driver, package_dates, workers=args.workers)
 
     LOGGER.info("Step 7: Build history for terms")
-    handle_term_history(db_driver)
+    handle_term_history(db_driver, package_dates)
 
     LOGGER.info("Step 8: Add terms to versioned codelists")
-    add_versioned_codelist_terms(db_driver)
+    add_versioned_codelist_terms(db_driver, package_dates)
 
     LOGGER.info(
         "Step 9: Connect name and code codelists based on Paired Codelist Excel files from CDISC"
@@ -2278,7 +2430,13 @@ def main():
     connect_name_and_code_codelists(db_driver)
 
     LOGGER.info("Step 10: Create sponsor names for terms")
-    add_sponsor_names_to_terms(db_driver)
+    add_sponsor_names_to_terms(db_driver, package_dates)
+
+    with db_driver.session(database=NEO4J_DATABASE) as session:
+        mark_package_dates_staged(
+            session,
+            package_dates if package_dates is not None else get_package_dates(session),
+        )
 
     LOGGER.info("All steps completed successfully.")
 
@@ -0,0 +1,138 @@
+import os
+import sys
+from unittest import mock
+
+# the staging script reads its configuration when it is imported
+for name, value in {
+    "NEO4J_CDISC_IMPORT_HOST": "localhost",
+    "NEO4J_CDISC_IMPORT_BOLT_PORT": "7687",
+    "NEO4J_CDISC_IMPORT_AUTH_USER": "neo4j",
+    "NEO4J_CDISC_IMPORT_AUTH_PASSWORD": "password",
+    "NEO4J_CDISC_IMPORT_DATABASE": "cdisc-import",
+    "CDISC_JSON_DIR": "cdisc_data",
+    "CDISC_XLS_DIR": "CDISC_xls",
+}.items():
+    os.environ.setdefault(name, value)
+
+import cdisc_staging
+
+STEPS = [
+    "group_data",
+    "group_data_and_identify_inconsistencies",
+    "resolve_inconsistencies",
+    "handle_codelist_history",
+    "handle_term_history",
+    "add_versioned_codelist_terms",
+    "add_sponsor_names_to_terms",
+]
+
+
+def run_main(args, staged_dates, new_dates):
+    patches = {
+        name: mock.patch.object(cdisc_staging, name)
+        for name in STEPS
+        + [
+            "get_neo4j_driver",
+            "create_database",
+            "create_indexes",
+            "connect_name_and_code_codelists",
+            "log_summary",
+            "mark_package_dates_staged",
+            "get_package_dates",
+        ]
+    }
+    patches["get_staged_package_dates"] = mock.patch.object(
+        cdisc_staging, "get_staged_package_dates", return_value=staged_dates
+    )
+    patches["process_all_packages"] = mock.patch.object(
+        cdisc_staging, "process_all_packages", return_value=new_dates
+    )
+    mocks = {name: patch.start() for name, patch in patches.items()}
+    try:
+        with mock.patch.object(sys, "argv", ["cdisc_staging.py"] + args):
+            cdisc_staging.main()
+    finally:
+        mock.patch.stopall()
+    return mocks
+
+
+class TestIncrementalStaging:
+    def test__process_all_packages_skips_staged_dates(self, tmp_path):
+        # given
+        for file in [
+            "sdtmct_2024-03-29.json",
+            "adamct_2024-03-29.json",
+            "sdtmct_2024-06-28.json",
+            "adamct_2024-09-27.json",
+            "readme.txt",
+        ]:
+            (tmp_path / file).write_text("{}")
+
+        # when
+        with mock.patch.object(
+            cdisc_staging, "CDISC_JSON_DIR", str(tmp_path)
+        ), mock.patch.object(cdisc_staging, "process_package") as process_package:
+            dates = cdisc_staging.process_all_packages(
+                mock.MagicMock(), skip_dates=["2024-03-29"]
+            )
+
+        # then
+        assert dates == ["2024-06-28", "2024-09-27"]
+        assert [call.args[1] for call in process_package.call_args_list] == dates
+
+    def test__incremental_run_stages_only_new_dates(self):
+        # given, when
+        mocks = run_main(
+            ["--incremental"],
+            staged_dates=["2024-03-29"],
+            new_dates=["2024-06-28"],
+        )
+
+        # then
+        assert mocks["get_staged_package_dates"].called
+        assert mocks["process_all_packages"].call_args.kwargs == {
+            "skip_dates": ["2024-03-29"]
+        }
+        for name in STEPS:
+            assert mocks[name].call_args.args[1] == ["2024-06-28"], name
+        assert mocks["mark_package_dates_staged"].call_args.args[1] == ["2024-06-28"]
+
+    def test__incremental_run_without_new_dates_stops_after_loading(self):
+        # given, when
+        mocks = run_main(["--incremental"], staged_dates=["2024-03-29"], new_dates=[])
+
+        # then
+        for name in STEPS:
+            assert not mocks[name].called, name
+        assert not mocks["mark_package_dates_staged"].called
+
+    def test__full_run_stages_all_dates(self):
+        # given, when
+        mocks = run_main([], staged_dates=["2024-03-29"], new_dates=["2024-03-29"])
+
+        # then
+        assert not mocks["get_staged_package_dates"].called
+        assert mocks["process_all_packages"].call_args.kwargs == {"skip_dates": []}
+        for name in STEPS:
+            assert mocks[name].call_args.args[1] is None, name
+        assert (
+            mocks["mark_package_dates_staged"].call_args.args[1]
+            == mocks["get_package_dates"].return_value
+        )
+
+    def test__codelist_history_is_built_in_a_retried_write_transaction(self):
+        # given
+        db_driver = mock.MagicMock()
+        session = db_driver.session.return_value.__enter__.return_value
+        session.execute_write.return_value = 2
+
+        # when
+        nbr_versions = cdisc_staging.build_single_codelist_history(
+            db_driver, "C66781", ["2024-03-29"]
+        )
+
+        # then
+        assert nbr_versions == 2
+        session.execute_write.assert_called_once_with(
+            cdisc_staging.build_single_codelist_history_tx, "C66781", ["2024-03-29"]
+        )
@@ -230,6 +230,7 @@ CONSTRAINTS = [
     ("WeekInStudyRoot", "uid", CONSTRAINT_TYPE_NODE_KEY),
     ("FootnotePreInstanceRoot", "uid", CONSTRAINT_TYPE_NODE_KEY),
     ("OdmVendorElementRoot", "uid", CONSTRAINT_TYPE_NODE_KEY),
+    ("StudySummary", "uid", CONSTRAINT_TYPE_UNIQUE),
 ]
 
 
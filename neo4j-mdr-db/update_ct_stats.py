@@ -1,3 +1,7 @@
+import argparse
+import gzip
+import hashlib
+import json
 from neo4j import GraphDatabase
 from os import environ
 from neo4j.work.transaction import Transaction
@@ -5,36 +9,15 @@ from neo4j.work.transaction import Transaction
 # This reuses a lot of code from the API
 # clinical_mdr_api/repositories/ct_packages.py
 
-CODELIST_DATA_RETRIEVAL = """
-MATCH (old_package:CTPackage {name:$old_package_name})-[:CONTAINS_CODELIST]->(package_codelist:CTPackageCodelist)-[:CONTAINS_ATTRIBUTES]->
-(codelist_attr_val)<-[old_versions:HAS_VERSION]-(codelist_attr_root)<-[:HAS_ATTRIBUTES_ROOT]-(old_codelist_root)
-WITH old_codelist_root, codelist_attr_val, max(old_versions.start_date) AS latest_date
-WITH collect(apoc.map.fromValues([old_codelist_root.uid, {
+PACKAGE_CODELISTS_DATA_RETRIEVAL = """
+MATCH (package:CTPackage {name:$package_name})-[:CONTAINS_CODELIST]->(package_codelist:CTPackageCodelist)-[:CONTAINS_ATTRIBUTES]->
+(codelist_attr_val)<-[versions:HAS_VERSION]-(codelist_attr_root)<-[:HAS_ATTRIBUTES_ROOT]-(codelist_root)
+WITH codelist_root, codelist_attr_val, max(versions.start_date) AS latest_date
+WITH collect(apoc.map.fromValues([codelist_root.uid, {
+    uid: codelist_root.uid,
     value_node:codelist_attr_val,
-    change_date: latest_date}])) AS old_items
-
-MATCH (new_package:CTPackage {name:$new_package_name})-[:CONTAINS_CODELIST]->(package_codelist:CTPackageCodelist)-[:CONTAINS_ATTRIBUTES]->
-(codelist_attr_val)<-[new_versions:HAS_VERSION]-(codelist_attr_root)<-[:HAS_ATTRIBUTES_ROOT]-(new_codelist_root)
-WITH old_items, new_codelist_root, codelist_attr_val, max(new_versions.start_date) AS latest_date
-WITH old_items, collect(apoc.map.fromValues([new_codelist_root.uid, {
-    value_node:codelist_attr_val,
-    change_date: latest_date}])) AS new_items
-"""
-
-CODELIST_DIFF_CLAUSE = """
-CASE WHEN old_items_map[common_item] <> new_items_map[common_item] THEN
-apoc.map.fromValues([
-    'uid', common_item,
-    'value_node', apoc.diff.nodes(old_items_map[common_item].value_node, new_items_map[common_item].value_node),
-    'change_date', new_items_map[common_item].change_date,
-    'is_change_of_codelist', true
-    ])
-END AS diff
-"""
-
-CODELIST_RETURN_CLAUSE = """
-WITH collect(diff) as items_diffs, added_items, removed_items, new_items_map
-RETURN added_items, removed_items, items_diffs, new_items_map
+    change_date: latest_date}])) AS items
+RETURN apoc.map.mergeList(items) AS items_map
 """
 
 PACKAGE_TERMS_DATA_RETRIEVAL = """
@@ -53,42 +36,6 @@ WITH collect(apoc.map.fromValues([term_root.uid, {
 RETURN apoc.map.mergeList(items) AS items_map
 """
 
-COMPARISON_PART = """
-// From pattern comprehensions we get list of maps, where each map represents data for specific codelist or term.
-// The following section merge list of maps coming from pattern comprehensions into one map.
-// The created maps store codelist uids or term uids as a keys and attributes values as a map values.
-WITH old_items, new_items,
-apoc.map.mergeList(old_items) AS old_items_map,
-apoc.map.mergeList(new_items) AS new_items_map
-// The following section creates arrays with codelist uids or terms uids
-WITH old_items_map, new_items_map,
-keys(old_items_map) AS old_items_uids,
-keys(new_items_map) AS new_items_uids
-// In the following section the comparison of uid arrays is made to identify if given codelist or term:
-// was added, deleted, or is not moved in new package
-WITH old_items_map, new_items_map, old_items_uids, new_items_uids,
-apoc.coll.subtract(new_items_uids, old_items_uids) AS added_items,
-apoc.coll.subtract(old_items_uids, new_items_uids) AS removed_items,
-apoc.coll.intersection(old_items_uids, new_items_uids) AS common_items
-
-// Collect uids of added items in the new package
-WITH old_items_map, new_items_map, removed_items, common_items,
-  [ added_item IN added_items | apoc.map.merge(apoc.map.fromValues(['uid',added_item]), new_items_map[added_item])] AS added_items
-
-// Collect uids of removed items in the new package
-WITH old_items_map, new_items_map, added_items, common_items,
-  [ removed_item IN removed_items | apoc.map.merge(apoc.map.fromValues(['uid', removed_item]), old_items_map[removed_item])] AS removed_items
-
-// The following section unwinds list with uids of items that are present in old package and new package
-// to filter out common items from the map that contains all elements from new package.
-UNWIND
-  CASE WHEN common_items=[] THEN [NULL]
-  ELSE common_items
-  END AS common_item
-// The following section makes the comparison of nodes that are present in both packages
-WITH old_items_map, new_items_map, added_items, removed_items, common_items, common_item,
-"""
-
 STATS_UPDATE_QUERY = """
     MATCH (p1:CTPackage {name:$old_package_name})
     MATCH (p2:CTPackage {name:$new_package_name})
@@ -101,8 +48,40 @@ STATS_UPDATE_QUERY = """
       rel.added_codelists=$added_codelists,
       rel.deleted_codelists=$deleted_codelists,
       rel.updated_codelists=$updated_codelists
+    REMOVE rel.changes, rel.changes_format
+    MERGE (p1)-[:HAS_CHANGES]->(changes:CTPackageChanges)-[:CHANGES_TO]->(p2)
+    SET
+      changes.changes=$changes,
+      changes.format=$changes_format
+    """
+
+# Pairs of packages whose changes were already computed and stored
+COMPUTED_PAIRS_QUERY = """
+    MATCH (p1:CTPackage)-[:HAS_CHANGES]->(changes:CTPackageChanges)-[:CHANGES_TO]->(p2:CTPackage)
+    WHERE changes.format = $changes_format AND (p1)-[:NEXT_PACKAGE]->(p2)
+    RETURN p1.name AS old_package_name, p2.name AS new_package_name
     """
 
+# Relationships between packages that are no longer consecutive,
+# when a package was loaded in between them
+STALE_PAIRS_DELETE_QUERY = """
+    MATCH (p1:CTPackage)-[rel:NEXT_PACKAGE]->(p2:CTPackage)
+    WHERE NOT [p1.name, p2.name] IN $pairs
+    DELETE rel
+    RETURN count(rel) AS deleted
+    """
+
+# Changes between packages that are no longer consecutive
+STALE_CHANGES_DELETE_QUERY = """
+    MATCH (p1:CTPackage)-[:HAS_CHANGES]->(changes:CTPackageChanges)-[:CHANGES_TO]->(p2:CTPackage)
+    WHERE NOT [p1.name, p2.name] IN $pairs
+    DETACH DELETE changes
+    """
+
+# Version of the format of the changes stored as gzip compressed JSON on the CTPackageChanges nodes,
+# must match CT_PACKAGES_CHANGES_FORMAT in the API
+CT_PACKAGES_CHANGES_FORMAT = 2
+
 DATABASE = environ.get("NEO4J_MDR_DATABASE")
 NEO4J_PROTOCOL = environ.get("NEO4J_PROTOCOL", "neo4j")
 
@@ -137,16 +116,40 @@ def list_cats_and_packages(tx: Transaction):
     return run_querystring_read(tx, cypher)
 
 
-def are_terms_different(left_term, right_term):
-    left_value = left_term["value_node"]
-    right_value = right_term["value_node"]
-    return (
-        left_term["change_date"] != right_term["change_date"]
-        or left_value["preferred_term"] != right_value["preferred_term"]
-        or left_value.get("synonyms") != right_value.get("synonyms")
-        or left_value.get("code_submission_value") != right_value.get("code_submission_value")
-        or left_value.get("name_submission_value") != right_value.get("name_submission_value")
-        or left_value.get("definition") != right_value.get("definition")
+def fingerprint(*values) -> str:
+    # Hash of the compared properties of a term or codelist,
+    # so that items of two packages are compared with a single string comparison
+    return hashlib.blake2b(
+        json.dumps(values, default=str).encode("utf-8"), digest_size=16
+    ).hexdigest()
+
+
+def sorted_synonyms(value):
+    # Synonyms are compared as sets
+    synonyms = value.get("synonyms")
+    return sorted(set(synonyms)) if synonyms is not None else None
+
+
+def term_fingerprint(term) -> str:
+    value = term["value_node"]
+    return fingerprint(
+        term["change_date"],
+        value["preferred_term"],
+        sorted_synonyms(value),
+        value.get("definition"),
+    )
+
+
+def codelist_fingerprint(codelist) -> str:
+    value = codelist["value_node"]
+    return fingerprint(
+        codelist["change_date"],
+        value["preferred_term"],
+        sorted_synonyms(value),
+        value.get("name"),
+        value.get("definition"),
+        value.get("extensible"),
+        value.get("submission_value"),
     )
 
 
@@ -175,17 +178,18 @@ def diff_dicts(left, right):
     return diff
 
 
-def term_diff(left_term, right_term):
-    left_value = left_term["value_node"]
-    right_value = right_term["value_node"]
-
-    value_diff = diff_dicts(left_value, right_value)
-    result = {
-        "uid": right_term["uid"],
-        "change_date": right_term["change_date"],
-        "codelists": right_term["codelists"],
+def item_diff(left_item, right_item):
+    value_diff = diff_dicts(left_item["value_node"], right_item["value_node"])
+    return {
+        "uid": right_item["uid"],
+        "change_date": right_item["change_date"],
         "value_node": value_diff,
     }
+
+
+def term_diff(left_term, right_term):
+    result = item_diff(left_term, right_term)
+    result["codelists"] = right_term["codelists"]
     return result
 
 
@@ -231,91 +235,111 @@ def update_modified_codelists(output: dict, all_codelists_in_package: list):
     output["updated_codelists"].sort(key=lambda codelist: codelist["change_date"])
 
 
-def process_packages(session, data):
-    for row in data:
-        cat_name = row["cat"]["name"]
-        prev_package = row["packages"][0]
-        for package in row["packages"][1:]:
-            with session.begin_transaction() as tx:
-                process_ct_packages_changes(tx, prev_package["name"], package["name"])
-            prev_package = package
+def get_package_items(tx: Transaction, package_name: str) -> dict:
+    # Codelists and terms of a package by uid, with their fingerprints
+    params = {"package_name": package_name}
+    codelists = tx.run(PACKAGE_CODELISTS_DATA_RETRIEVAL, params).data()[0]["items_map"]
+    terms = tx.run(PACKAGE_TERMS_DATA_RETRIEVAL, params).data()[0]["items_map"]
+    return {
+        "codelists": codelists,
+        "terms": terms,
+        "codelist_fingerprints": {uid: codelist_fingerprint(codelist) for uid, codelist in codelists.items()},
+        "term_fingerprints": {uid: term_fingerprint(term) for uid, term in terms.items()},
+    }
 
 
-def process_ct_packages_changes(tx, old_package_name: str, new_package_name: str) -> dict:
-    print(f"\n{old_package_name} --> {new_package_name}")
-    query_params = {
-        "old_package_name": old_package_name,
-        "new_package_name": new_package_name,
-    }
+def compare_items(old_items: dict, new_items: dict, old_fingerprints: dict, new_fingerprints: dict, diff):
+    # Returns added, deleted and changed items, each sorted by change date
+    old_uids = set(old_items.keys())
+    new_uids = set(new_items.keys())
+    added_items = [new_items[uid] for uid in new_uids - old_uids]
+    deleted_items = [old_items[uid] for uid in old_uids - new_uids]
+    changed_items = [
+        diff(old_items[uid], new_items[uid])
+        for uid in new_uids & old_uids
+        if old_fingerprints[uid] != new_fingerprints[uid]
+    ]
+    return tuple(
+        sorted(items, key=lambda item: item["change_date"])
+        for items in (added_items, deleted_items, changed_items)
+    )
+
 
+def compute_ct_packages_changes(old_package: dict, new_package: dict) -> dict:
     output = {}
-    # codelists query
-    complete_codelist_query = " ".join(
-        [
-            CODELIST_DATA_RETRIEVAL,
-            COMPARISON_PART,
-            CODELIST_DIFF_CLAUSE,
-            CODELIST_RETURN_CLAUSE,
-        ]
+    (
+        output["new_codelists"],
+        output["deleted_codelists"],
+        output["updated_codelists"],
+    ) = compare_items(
+        old_package["codelists"],
+        new_package["codelists"],
+        old_package["codelist_fingerprints"],
+        new_package["codelist_fingerprints"],
+        item_diff,
     )
-    codelist_ret = tx.run(complete_codelist_query, query_params).data()
+    (
+        output["new_terms"],
+        output["deleted_terms"],
+        output["updated_terms"],
+    ) = compare_items(
+        old_package["terms"],
+        new_package["terms"],
+        old_package["term_fingerprints"],
+        new_package["term_fingerprints"],
+        term_diff,
+    )
+    update_modified_codelists(
+        output=output, all_codelists_in_package=new_package["codelists"]
+    )
+    return output
 
-    output["new_codelists"] = codelist_ret[0]["added_items"]
 
-    output["deleted_codelists"] = codelist_ret[0]["removed_items"]
+def serialize_value(value):
+    # Temporal values (change dates) are stored in ISO format
+    if hasattr(value, "iso_format"):
+        return value.iso_format()
+    return str(value)
 
-    output["updated_codelists"] = codelist_ret[0]["items_diffs"]
-    all_codelists_in_package = codelist_ret[0]["new_items_map"]
 
-    # terms query
-    # Fetch the terms and do the comparison here.
-    # Doing the comparison in cypher uses too much ram.
-    query_params_old = {
-        "package_name": old_package_name,
-    }
-    query_params_new = {
-        "package_name": new_package_name,
-    }
-    old_terms_ret = tx.run(PACKAGE_TERMS_DATA_RETRIEVAL, query_params_old).data()
-    new_terms_ret = tx.run(PACKAGE_TERMS_DATA_RETRIEVAL, query_params_new).data()
-    new_terms = new_terms_ret[0]['items_map']
-    old_terms = old_terms_ret[0]['items_map']
-    old_uids = set(old_terms.keys())
-    new_uids = set(new_terms.keys())
-    added_uids = new_uids - old_uids
-    deleted_uids = old_uids - new_uids
-    added_terms = [new_terms[uid] for uid in added_uids]
-    deleted_terms = [old_terms[uid] for uid in deleted_uids]
-
-    # Find changed terms
-    common_uids = new_uids & old_uids
-    changed_terms = []
-
-    for uid in common_uids:
-        old_term = old_terms[uid]
-        new_term = new_terms[uid]
-        if are_terms_different(old_term, new_term):
-            changed_terms.append(term_diff(old_term, new_term))
-
-    output["new_terms"] = (
-        sorted(added_terms, key=lambda ct_term: ct_term["change_date"])
-        if len(added_terms) > 0
-        else []
-    )
-    output["deleted_terms"] = (
-        sorted(deleted_terms, key=lambda ct_term: ct_term["change_date"])
-        if len(deleted_terms) > 0
-        else []
-    )
-    output["updated_terms"] = (
-        sorted(changed_terms, key=lambda ct_term: ct_term["change_date"])
-        if len(changed_terms) > 0
-        else []
-    )
+def get_computed_pairs(session) -> set:
+    records = session.run(COMPUTED_PAIRS_QUERY, {"changes_format": CT_PACKAGES_CHANGES_FORMAT}).data()
+    return {(record["old_package_name"], record["new_package_name"]) for record in records}
 
-    update_modified_codelists(
-        output=output, all_codelists_in_package=all_codelists_in_package
-    )
+
+def process_packages(session, data, incremental=False):
+    pairs = [
+        (old_package["name"], new_package["name"])
+        for row in data
+        for old_package, new_package in zip(row["packages"], row["packages"][1:])
+    ]
+
+    deleted = session.run(STALE_PAIRS_DELETE_QUERY, {"pairs": [list(pair) for pair in pairs]}).single()["deleted"]
+    session.run(STALE_CHANGES_DELETE_QUERY, {"pairs": [list(pair) for pair in pairs]}).consume()
+    if deleted:
+        print(f"Removed {deleted} stale relationships between packages that are no longer consecutive")
+
+    if incremental:
+        computed_pairs = get_computed_pairs(session)
+        pairs = [pair for pair in pairs if pair not in computed_pairs]
+        print(f"{len(computed_pairs)} package pairs already computed, {len(pairs)} to compute")
+
+    # The items of a package are reused for the next pair, where it is the old package
+    items = {}
+    for old_package_name, new_package_name in pairs:
+        with session.begin_transaction() as tx:
+            for package_name in (old_package_name, new_package_name):
+                if package_name not in items:
+                    items[package_name] = get_package_items(tx, package_name)
+            items = {name: items[name] for name in (old_package_name, new_package_name)}
+            process_ct_packages_changes(
+                tx, old_package_name, new_package_name, items[old_package_name], items[new_package_name]
+            )
+
+
+def process_ct_packages_changes(tx, old_package_name: str, new_package_name: str, old_package: dict, new_package: dict):
+    print(f"\n{old_package_name} --> {new_package_name}")
+    output = compute_ct_packages_changes(old_package, new_package)
 
     params = {
         "old_package_name": old_package_name,
@@ -326,6 +350,9 @@ def process_ct_packages_changes(tx, old_package_name: str, new_package_name: str
         "added_codelists": len(output["new_codelists"]),
         "deleted_codelists": len(output["deleted_codelists"]),
         "updated_codelists": len(output["updated_codelists"]),
+        # The changes of a pair can run into megabytes, they are kept compressed off the relationship
+        "changes": gzip.compress(json.dumps(output, default=serialize_value).encode("utf-8")),
+        "changes_format": CT_PACKAGES_CHANGES_FORMAT,
     }
     row_format ="{:<10}" + "{:>10}"*3
     print(row_format.format("", "Added", "Updated", "Deleted"))
@@ -335,10 +362,22 @@ def process_ct_packages_changes(tx, old_package_name: str, new_package_name: str
     tx.run(STATS_UPDATE_QUERY, params)
 
 
-with driver.session(database=DATABASE) as session:
-    with session.begin_transaction() as tx:
-        packages = list_cats_and_packages(tx)
-    process_packages(session, packages)
-    session.close()
+def main():
+    parser = argparse.ArgumentParser(description="Update the changes between consecutive CT packages")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only compute the pairs of packages that have no stored changes yet, typically for newly loaded packages",
+    )
+    args = parser.parse_args()
+
+    with driver.session(database=DATABASE) as session:
+        with session.begin_transaction() as tx:
+            packages = list_cats_and_packages(tx)
+        process_packages(session, packages, incremental=args.incremental)
+
+    driver.close()
+
 
-driver.close()
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+import asyncio
 import ssl
 import httpx
 import httpx_auth
@@ -6,6 +7,7 @@ import os
 import logging
 import sys
 import json
+import uuid
 
 OUTPUT_DIR = environ.get("OUTPUT_DIR", "./output")
 LOG_LEVEL = environ.get("LOG_LEVEL", "INFO")
@@ -13,6 +15,15 @@ LOG_LEVEL = environ.get("LOG_LEVEL", "INFO")
 INCLUDE_STUDY_NUMBERS = environ.get("INCLUDE_STUDY_NUMBERS", "")
 EXCLUDE_STUDY_NUMBERS = environ.get("EXCLUDE_STUDY_NUMBERS", "")
 
+# Export studies concurrently with an async client, at most EXPORT_CONCURRENCY requests at a time
+ASYNC_EXPORT = environ.get("ASYNC_EXPORT", "false").lower() in ("true", "1", "yes")
+EXPORT_CONCURRENCY = int(environ.get("EXPORT_CONCURRENCY", "8"))
+
+# Studies exported so far by a run, to resume it when interrupted. Removed once the export completes.
+MANIFEST_FILENAME = "export_manifest.json"
+# Id of an interrupted run to resume, as logged by that run. Without it, every run starts from scratch.
+RESUME_EXPORT_RUN_ID = environ.get("RESUME_EXPORT_RUN_ID", "")
+
 DEFAULT_QUERY_PARAMS = {
     "page_size": 0,
     "page_number": 1,
@@ -83,7 +94,23 @@ class StudyExporter:
                 client_id=client_id,
                 scope=scope,
             )
-        self.client = httpx.Client(base_url=self.api_base_url, auth=auth, verify=context, timeout=60)
+        self._client_kwargs = {
+            "base_url": self.api_base_url,
+            "auth": auth,
+            "verify": context,
+            "timeout": 60,
+        }
+        self.client = httpx.Client(**self._client_kwargs)
+
+    def _create_async_httpx_client(self, concurrency):
+        """
+        Creates an async HTTPX client with the same settings as the sync client,
+        to be used within a running event loop.
+        """
+        return httpx.AsyncClient(
+            **self._client_kwargs,
+            limits=httpx.Limits(max_connections=concurrency),
+        )
 
 
     # ---------------------------------------------------------------
@@ -103,17 +130,28 @@ class StudyExporter:
             )
             sys.exit(1)
 
-    def get_from_api(self, path, params=None, items_only=True):
+    def _with_default_params(self, params):
         # Make sure that we always provide the page_size parameter,
         # otherwise the api uses its default of 10.
         if params is None:
-            params = DEFAULT_QUERY_PARAMS
-        else:
-            for key, value in DEFAULT_QUERY_PARAMS.items():
-                if key not in params:
-                    params[key] = value
+            return DEFAULT_QUERY_PARAMS
+        for key, value in DEFAULT_QUERY_PARAMS.items():
+            if key not in params:
+                params[key] = value
+        return params
 
+    def get_from_api(self, path, params=None, items_only=True):
+        params = self._with_default_params(params)
         response = self.client.get(path, params=params)
+        return self._handle_response(path, response, items_only)
+
+    async def get_from_api_async(self, client, semaphore, path, params=None, items_only=True):
+        params = self._with_default_params(params)
+        async with semaphore:
+            response = await client.get(path, params=params)
+        return self._handle_response(path, response, items_only)
+
+    def _handle_response(self, path, response, items_only):
         if response.is_success:
             self.log.info(f"Successfully fetched data from: {path}")
             data = response.json()
@@ -162,7 +200,135 @@ class StudyExporter:
         path = os.path.join(dir, filename)
         with open(path, "w") as f:
             self.log.info(f"Saving to file: {path}")
-            f.write(json.dumps(data, indent=2, sort_keys=True))
+            json.dump(data, f, indent=2, sort_keys=True)
+
+    # ---------------------------------------------------------------
+    # Study export, with a checkpoint manifest to resume an interrupted export
+    # ---------------------------------------------------------------
+    #
+    def load_manifest(self, dir):
+        """
+        Starts the run. Resumes the run RESUME_EXPORT_RUN_ID from its manifest if it matches,
+        otherwise removes any stale manifest so that no study is skipped.
+        """
+        path = os.path.join(dir, MANIFEST_FILENAME)
+        manifest = None
+        if os.path.exists(path):
+            with open(path) as f:
+                manifest = json.load(f)
+
+        if RESUME_EXPORT_RUN_ID and manifest and manifest.get("run_id") == RESUME_EXPORT_RUN_ID:
+            self.run_id = RESUME_EXPORT_RUN_ID
+            self.completed_studies = set(manifest["completed_studies"])
+            self.log.info(
+                f"Resuming export run {self.run_id}, {len(self.completed_studies)} studies already exported"
+            )
+            return
+
+        if RESUME_EXPORT_RUN_ID:
+            self.log.warning(
+                f"No manifest of export run {RESUME_EXPORT_RUN_ID} found, exporting all studies"
+            )
+        elif manifest:
+            self.log.info("Removing the manifest of a previous export run")
+        self.remove_manifest(dir)
+        self.run_id = uuid.uuid4().hex
+        self.completed_studies = set()
+        self.log.info(
+            f"Export run {self.run_id}, set RESUME_EXPORT_RUN_ID={self.run_id} to resume it if interrupted"
+        )
+
+    def save_manifest(self, dir, completed):
+        path = os.path.join(dir, MANIFEST_FILENAME)
+        # Write to a temporary file first, so that an interruption never leaves a truncated manifest
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(
+                {"run_id": self.run_id, "completed_studies": sorted(completed)},
+                f,
+                indent=2,
+            )
+        os.replace(tmp_path, path)
+
+    def remove_manifest(self, dir):
+        path = os.path.join(dir, MANIFEST_FILENAME)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def study_export_paths(self, uid, fields):
+        """Returns the (api path, output filename) pairs exported for a study"""
+        paths = [(f"/studies/{uid}?fields={fields}", f"studies/{uid}.json")]
+        for ep in study_design_endpoints:
+            study_ep = ep.format(study_uid=uid)
+            paths.append((f"/{study_ep}", f"{study_ep}.json"))
+        return paths
+
+    def export_study(self, uid, fields):
+        """Exports the metadata and design of a study, returns False if any endpoint failed"""
+        self.log.info(f"Export study uid: {uid}")
+        success = True
+        for path, filename in self.study_export_paths(uid, fields):
+            data = self.get_from_api(path)
+            success = success and data is not None
+            self.save_formatted_json(data, OUTPUT_DIR, filename)
+        return success
+
+    async def export_study_async(self, client, semaphore, uid, fields):
+        """
+        Exports the metadata and design of a study, fetching all its endpoints concurrently
+        and saving each of them as soon as it is fetched. Returns False if any endpoint failed.
+        """
+        self.log.info(f"Export study uid: {uid}")
+
+        async def export_path(path, filename):
+            data = await self.get_from_api_async(client, semaphore, path)
+            self.save_formatted_json(data, OUTPUT_DIR, filename)
+            return data is not None
+
+        results = await asyncio.gather(
+            *(
+                export_path(path, filename)
+                for path, filename in self.study_export_paths(uid, fields)
+            )
+        )
+        return all(results)
+
+    def export_studies(self, study_uids, fields):
+        completed = set(self.completed_studies)
+        for uid in study_uids:
+            if uid in completed:
+                self.log.info(f"Skipping already exported study uid: {uid}")
+                continue
+            if self.export_study(uid, fields):
+                completed.add(uid)
+                self.save_manifest(OUTPUT_DIR, completed)
+            else:
+                self.log.error(f"Export of study uid {uid} is incomplete")
+        return completed.issuperset(study_uids)
+
+    async def export_studies_async(self, study_uids, fields, concurrency=EXPORT_CONCURRENCY):
+        completed = set(self.completed_studies)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def export_and_checkpoint(uid):
+            if await self.export_study_async(client, semaphore, uid, fields):
+                completed.add(uid)
+                self.save_manifest(OUTPUT_DIR, completed)
+            else:
+                self.log.error(f"Export of study uid {uid} is incomplete")
+
+        async with self._create_async_httpx_client(concurrency) as client:
+            for uid in study_uids:
+                if uid in completed:
+                    self.log.info(f"Skipping already exported study uid: {uid}")
+            await asyncio.gather(
+                *(
+                    export_and_checkpoint(uid)
+                    for uid in study_uids
+                    if uid not in completed
+                )
+            )
+        return completed.issuperset(study_uids)
 
     def filter_studies(self, studies):
         include_numbers = [
@@ -374,11 +540,9 @@ dictionaries = [
 
 
 def run_export():
-    try:
-        os.mkdir("output")
-    except FileExistsError:
-        pass
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
     api = StudyExporter()
+    api.load_manifest(OUTPUT_DIR)
 
     # Clinical programmes
     api.log.info("=== Export clinical programmes ===")
@@ -403,25 +567,17 @@ def run_export():
     study_uids = [s["uid"] for s in studies]
     api.log.info(f"Found studies {study_uids}")
 
-    # Study metadata
-    api.log.info("=== Export study metadata ===")
+    # Study metadata and design
+    api.log.info("=== Export study metadata and design ===")
     # Include all optional fields
     # , --> %2C
     # + --> %2B
     fields = "%2C".join(["%2B" + f for f in study_optional_fields])
-    for uid in study_uids:
-        api.log.info(f"Export metadata for study uid: {uid}")
-        study = api.get_from_api(f"/studies/{uid}?fields={fields}")
-        api.save_formatted_json(study, OUTPUT_DIR, f"studies/{uid}.json")
-
-    # Study design
-    api.log.info("=== Export study design ===")
-    for uid in study_uids:
-        api.log.info(f"Export study design for study uid: {uid}")
-        for ep in study_design_endpoints:
-            study_ep = ep.format(study_uid=uid)
-            data = api.get_from_api(f"/{study_ep}")
-            api.save_formatted_json(data, OUTPUT_DIR, f"{study_ep}.json")
+    if ASYNC_EXPORT:
+        api.log.info(f"Exporting studies concurrently, {EXPORT_CONCURRENCY} requests at a time")
+        studies_complete = asyncio.run(api.export_studies_async(study_uids, fields))
+    else:
+        studies_complete = api.export_studies(study_uids, fields)
 
     # Templates
     api.log.info("=== Export syntax templates ===")
@@ -505,6 +661,12 @@ def run_export():
 
 
     # All done
+    if not studies_complete:
+        api.log.error(
+            f"=== Export completed with incomplete studies, run again with RESUME_EXPORT_RUN_ID={api.run_id} to retry them ==="
+        )
+        sys.exit(1)
+    api.remove_manifest(OUTPUT_DIR)
     api.log.info(f"=== Export completed successfully ===")
 
 
@@ -4,7 +4,6 @@ import csv
 import json
 from functools import lru_cache
 
-import aiohttp
 
 from importers.functions.caselessdict import CaselessDict
 from importers.functions.parsers import map_boolean
@@ -1502,9 +1501,7 @@ class Activities(BaseImporter):
             "MDR_MIGRATION_ACTIVITY_ITEM_CLASSES"
         )
 
-        timeout = aiohttp.ClientTimeout(None)
-        conn = aiohttp.TCPConnector(limit=4, force_close=True)
-        async with aiohttp.ClientSession(timeout=timeout, connector=conn) as session:
+        async with self.api.async_session() as session:
             # Activity Groups
             if (
                 self._limit_import_to is None
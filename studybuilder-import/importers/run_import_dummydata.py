@@ -9,7 +9,6 @@ from functools import lru_cache
 from random import randint
 import time
 
-import requests
 
 from .utils.api_bindings import CODELIST_NAME_MAP
 from .utils.importer import BaseImporter
@@ -503,7 +502,7 @@ class DummyData(BaseImporter):
 
     @lru_cache(maxsize=10000)
     def get_term_uids_by_codelist(self, codelist_name):
-        rs = requests.get(
+        rs = self.api.session.get(
             f"{self.api.api_base_url}/ct/terms?page_size=0&codelist_name={codelist_name}",
             headers=self.api.api_headers,
         ).json()["items"]
@@ -541,7 +540,7 @@ class DummyData(BaseImporter):
             obj["body"]["name"] += " updated"
             if obj["body"].get("name_sentence_case"):
                 obj["body"]["name_sentence_case"] += " updated"
-        response = requests.api.request(
+        response = self.api.session.request(
             method=method,
             url=_url or url,
             headers=self.api.api_headers,
@@ -552,13 +551,13 @@ class DummyData(BaseImporter):
             data = response.json()
             uid = data["uid"]
             approve_url = path_join(url, uid, "approvals")
-            response = requests.post(approve_url, headers=self.api.api_headers)
+            response = self.api.session.post(approve_url, headers=self.api.api_headers)
             if response.ok:
                 self.log.info(f"Posted and approved {obj['path']}: {uid}")
 
                 if randint(0, 1):
                     new_version_url = path_join(url, uid, "versions")
-                    new_version_response = requests.post(
+                    new_version_response = self.api.session.post(
                         new_version_url,
                         headers=self.api.api_headers,
                         json={
@@ -589,7 +588,7 @@ class DummyData(BaseImporter):
 
     def simple_post(self, obj, return_key="uid"):
         url = path_join(self.api.api_base_url, obj["path"])
-        response = requests.post(
+        response = self.api.session.post(
             url,
             headers=self.api.api_headers,
             json=obj["body"],
@@ -612,7 +611,7 @@ class DummyData(BaseImporter):
     def simple_get(self, url, params=None, *, return_key=None):
         url = path_join(self.api.api_base_url, url)
 
-        response = requests.get(
+        response = self.api.session.get(
             url,
             params=params,
             headers=self.api.api_headers,
@@ -887,7 +886,7 @@ class DummyData(BaseImporter):
         self.project = self.simple_post(payload, return_key=None)
 
     def create_studies(self):
-        time_units = requests.get(
+        time_units = self.api.session.get(
             f"{self.api.api_base_url}/concepts/unit-definitions?subset=Study Time&page_size=0",
             headers=self.api.api_headers,
         ).json()["items"]
@@ -1069,7 +1068,7 @@ class DummyData(BaseImporter):
             self.studies[study_uid]["epochs"].append(uid)
 
     def create_study_activities(self, nbr_activities_per_study, study_uid):
-        activities = requests.get(
+        activities = self.api.session.get(
             f"""{self.api.api_base_url}/concepts/activities/activities?sort_by={{"uid": false}}&page_size={nbr_activities_per_study}""",
             headers=self.api.api_headers,
         ).json()["items"]
@@ -1143,7 +1142,7 @@ class DummyData(BaseImporter):
             self.studies[study_uid]["visits"].append(study_visit)
 
     def create_syntax_templates(self):
-        req = requests.get(
+        req = self.api.session.get(
             f"{self.api.api_base_url}/dictionaries/codelists?library_name=SNOMED&page_size=0",
             headers=self.api.api_headers,
         ).json()
@@ -1153,7 +1152,7 @@ class DummyData(BaseImporter):
             for codelist in req["items"]
             if codelist["name"] == "DiseaseDisorder"
         )["codelist_uid"]
-        disease_disorder_terms = requests.get(
+        disease_disorder_terms = self.api.session.get(
             f"{self.api.api_base_url}/dictionaries/terms?codelist_uid={disease_disorder_codelist_uid}&page_size=0",
             headers=self.api.api_headers,
         ).json()["items"]
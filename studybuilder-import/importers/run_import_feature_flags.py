@@ -2,7 +2,6 @@
 import argparse
 import csv
 
-import requests
 
 from .functions.utils import load_env
 from .functions.parsers import map_boolean
@@ -25,7 +24,7 @@ class FeatureFlags(BaseImporter):
 
     @open_file()
     def handle_feature_flags(self, csvfile, update: bool = False):
-        feature_flags_in_db = requests.get(
+        feature_flags_in_db = self.api.session.get(
             path_join(self.api.api_base_url, "/feature-flags"),
             headers=self.api.api_headers,
         ).json()
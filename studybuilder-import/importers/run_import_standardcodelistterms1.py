@@ -227,9 +227,7 @@ class StandardCodelistTerms1(BaseImporter):
 
 
     async def async_run(self):
-        timeout = aiohttp.ClientTimeout(None)
-        conn = aiohttp.TCPConnector(limit=4, force_close=True)
-        async with aiohttp.ClientSession(timeout=timeout, connector=conn) as session:
+        async with self.api.async_session() as session:
             await self.handle_codelist_definitions(
                 MDR_MIGRATION_SPONSOR_CODELIST_DEFINITIONS, session
             )
@@ -2,7 +2,6 @@ import asyncio
 import csv
 import sys
 
-import aiohttp
 
 from .functions.utils import create_logger, load_env
 from .utils.api_bindings import CODELIST_ELEMENT_TYPE, CODELIST_EPOCH_TYPE
@@ -206,15 +205,11 @@ class StandardCodelistTerms2(BaseImporter):
             (MDR_MIGRATION_UNLOCK_STUDY_MILESTONE, "Unlock Study Milestone"),
         ]
 
-        timeout = aiohttp.ClientTimeout(None)
         for file_path, codelist_name in codelists_to_import:
             if self.limit_to_codelists and codelist_name not in self.limit_to_codelists:
                 self.log.info(f"Skipping import of terms for codelist '{codelist_name}'")
                 continue
-            conn = aiohttp.TCPConnector(limit=4, force_close=True)
-            async with aiohttp.ClientSession(
-                timeout=timeout, connector=conn
-            ) as session:
+            async with self.api.async_session() as session:
                 await self.import_codelist_terms(
                     file_path,
                     session=session,
@@ -227,10 +222,7 @@ class StandardCodelistTerms2(BaseImporter):
             if self.limit_to_codelists and codelist_name not in self.limit_to_codelists:
                 self.log.info(f"Skipping ordering terms of codelist '{codelist_name}'")
                 continue
-            conn = aiohttp.TCPConnector(limit=4, force_close=True)
-            async with aiohttp.ClientSession(
-                timeout=timeout, connector=conn
-            ) as session:
+            async with self.api.async_session() as session:
                 await self.import_codelist_term_ordering(
                     file_path,
                     session=session,
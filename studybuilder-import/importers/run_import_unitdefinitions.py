@@ -2,7 +2,6 @@ import asyncio
 import csv
 import json
 
-import aiohttp
 
 from .functions.parsers import map_boolean, parse_float, parse_to_int
 from .functions.utils import create_logger, load_env
@@ -313,10 +312,7 @@ class Units(BaseImporter):
         return set(items)
 
     async def async_run(self):
-        timeout = aiohttp.ClientTimeout(None)
-
-        conn = aiohttp.TCPConnector(limit=4, force_close=True)
-        async with aiohttp.ClientSession(timeout=timeout, connector=conn) as session:
+        async with self.api.async_session() as session:
             await self.handle_unit_definitions(MDR_MIGRATION_UNIT_DIF, session)
 
     def run(self):
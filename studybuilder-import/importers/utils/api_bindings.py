@@ -5,10 +5,13 @@ import logging
 import math
 import sys
 import time
+from os import environ
 from typing import Sequence
 
 import aiohttp
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from importers.functions.caselessdict import CaselessDict
 from importers.utils.metrics import Metrics
@@ -86,6 +89,14 @@ UNIT_SUBSET_ENDPOINT_UNIT = "Endpoint Unit"
 
 SLEEP_BEFORE_APPROVE = 0.05
 
+# Maximum number of concurrent requests, also the size of the connection pools
+API_CONCURRENCY = int(environ.get("API_CONCURRENCY", "8"))
+# Retries of requests failing to connect, and of idempotent requests failing with a gateway error
+API_RETRIES = int(environ.get("API_RETRIES", "3"))
+# Delay before the first retry in seconds, doubled for each following retry
+API_RETRY_BACKOFF = float(environ.get("API_RETRY_BACKOFF", "0.5"))
+RETRY_STATUSES = (502, 503, 504)
+
 
 def status_ok(status):
     return 200 <= status < 300
@@ -104,18 +115,29 @@ def get_error_message(response):
 # ---------------------------------------------------------------
 #
 class ApiBinding:
-    def __init__(self, api_base_url, api_headers, metrics, logger=None):
+    def __init__(
+        self,
+        api_base_url,
+        api_headers,
+        metrics,
+        logger=None,
+        concurrency=API_CONCURRENCY,
+    ):
         self.api_headers = api_headers
         self.api_base_url = api_base_url
         if metrics is None:
             self.metrics = Metrics()
         else:
             self.metrics = metrics
-        self.sem = asyncio.Semaphore(8)
+        self.concurrency = concurrency
+        self.sem = asyncio.Semaphore(concurrency)
         if logger is not None:
             self.log = logger
         else:
             self.log = logging.getLogger("legacy_mdr_migrations - apibinding")
+        # Successful lookups of uids, shared by all importers using this binding
+        self.lookup_cache = {}
+        self.session = self._create_session()
         self.verify_connection()
 
         # execute the check if called methods is not db-schema-migration repository
@@ -125,6 +147,57 @@ class ApiBinding:
     def update_headers(self, api_headers):
         self.api_headers = api_headers
 
+    # ---------------------------------------------------------------
+    # Connection pools
+    # ---------------------------------------------------------------
+    #
+    def _create_session(self):
+        """
+        Creates a requests session keeping up to `concurrency` connections alive.
+        Requests failing to connect are retried, as well as idempotent requests failing with a gateway error.
+        """
+        retry = Retry(
+            total=API_RETRIES,
+            backoff_factor=API_RETRY_BACKOFF,
+            status_forcelist=RETRY_STATUSES,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=self.concurrency,
+            pool_maxsize=self.concurrency,
+            max_retries=retry,
+        )
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def async_session(self):
+        """
+        Creates an aiohttp session keeping up to `concurrency` connections alive,
+        to be used as an async context manager within the running event loop.
+        """
+        return aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(None),
+            connector=aiohttp.TCPConnector(limit=self.concurrency),
+        )
+
+    async def _request_async(
+        self, session: aiohttp.ClientSession, method: str, url: str, **kwargs
+    ):
+        """Sends a request, retrying with backoff when failing to connect"""
+        delay = API_RETRY_BACKOFF
+        for attempt in range(1, API_RETRIES + 1):
+            try:
+                return await session.request(method, url, **kwargs)
+            except aiohttp.ClientConnectorError as e:
+                self.log.warning(
+                    f"{method} {url} failed to connect, retry {attempt} of {API_RETRIES} in {delay} seconds: {e}"
+                )
+                await asyncio.sleep(delay)
+                delay = 2 * delay
+        return await session.request(method, url, **kwargs)
+
     # ---------------------------------------------------------------
     # Verify connection to api (and database)
     # ---------------------------------------------------------------
@@ -133,7 +206,7 @@ class ApiBinding:
     # TODO Replace with api health check resource ...
     def verify_connection(self):
         try:
-            response = requests.get(
+            response = self.session.get(
                 path_join(self.api_base_url, "openapi.json"), headers=self.api_headers
             )
             response.raise_for_status()
@@ -171,7 +244,7 @@ class ApiBinding:
     def simple_delete(self, path, simple_path=None):
         if simple_path is None:
             simple_path = path
-        response = requests.delete(
+        response = self.session.delete(
             path_join(self.api_base_url, path), headers=self.api_headers
         )
         if response.ok:
@@ -187,7 +260,7 @@ class ApiBinding:
     def simple_post_to_api(self, path, body, simple_path=None, params=None):
         if simple_path is None:
             simple_path = path
-        response = requests.post(
+        response = self.session.post(
             path_join(self.api_base_url, path),
             headers=self.api_headers,
             json=body,
@@ -220,14 +293,14 @@ class ApiBinding:
 
     def post_to_api(self, object, body=None, path=None):
         if path is None:
-            response = requests.post(
+            response = self.session.post(
                 path_join(self.api_base_url, object["path"]),
                 headers=self.api_headers,
                 json=object["body"],
             )
             path = object["path"]
         else:
-            response = requests.post(
+            response = self.session.post(
                 path_join(self.api_base_url, path), headers=self.api_headers, json=body
             )
         short_path = "".join([i for i in path if not i.isdigit()])
@@ -264,7 +337,7 @@ class ApiBinding:
 
     def patch_to_api(self, body, path):
         url = path_join(self.api_base_url, path, body["uid"])
-        response = requests.patch(url, headers=self.api_headers, json=body)
+        response = self.session.patch(url, headers=self.api_headers, json=body)
         if response.ok:
             self.metrics.icrement(path + "--Patch")
             self.log.info("Patch %s %s", path, "success")
@@ -284,7 +357,7 @@ class ApiBinding:
 
     def delete_to_api(self, path: str):
         url = path_join(self.api_base_url, path)
-        response = requests.delete(url, headers=self.api_headers)
+        response = self.session.delete(url, headers=self.api_headers)
         if response.ok:
             self.metrics.icrement(path + "--Delete")
             self.log.info("Delete %s %s", path, "success")
@@ -299,7 +372,7 @@ class ApiBinding:
 
     def approve_item(self, uid: str, url: str):
         full_url = path_join(self.api_base_url, url, uid, "approvals")
-        response = requests.post(full_url, headers=self.api_headers)
+        response = self.session.post(full_url, headers=self.api_headers)
         if not response.ok:
             self.log.warning("Failed to approve %s %s", uid, response.content)
             return None
@@ -308,12 +381,12 @@ class ApiBinding:
 
     def approve_item_names_and_attributes(self, uid: str, url: str):
         full_url = path_join(self.api_base_url, url, uid, "names/approvals")
-        response = requests.post(full_url, headers=self.api_headers)
+        response = self.session.post(full_url, headers=self.api_headers)
         if not response.ok:
             self.log.warning("Failed to approve names %s %s", uid, response.content)
             return False
         full_url = path_join(self.api_base_url, url, uid, "attributes/approvals")
-        response = requests.post(full_url, headers=self.api_headers)
+        response = self.session.post(full_url, headers=self.api_headers)
         if not response.ok:
             self.log.warning(
                 "Failed to approve attributes %s %s", uid, response.content
@@ -335,7 +408,7 @@ class ApiBinding:
             if "page_number" not in params:
                 params["page_number"] = 1
 
-        response = requests.get(
+        response = self.session.get(
             path_join(self.api_base_url, path), params=params, headers=self.api_headers
         )
 
@@ -375,6 +448,23 @@ class ApiBinding:
             )
         return None
 
+    def get_cached_from_api(self, path, params=None):
+        """
+        Same as `get_all_from_api`, for lookups of items that don't change during an import.
+        Non-empty results are memoized in `lookup_cache`, empty and failed lookups are retried on next call.
+        """
+        key = (path, tuple(sorted((params or {}).items())))
+        if key in self.lookup_cache:
+            self.metrics.icrement(path + "--CachedGET")
+            return self.lookup_cache[key]
+        result = self.get_all_from_api(path, params=dict(params or {}))
+        if result:
+            self.lookup_cache[key] = result
+        return result
+
+    def clear_lookup_cache(self):
+        self.lookup_cache.clear()
+
     def get_all_from_api_paged(
         self, path, params=None, items_only=True, page_size=1000
     ):
@@ -447,7 +537,7 @@ class ApiBinding:
         return identifiers
 
     def get_libraries(self):
-        response = requests.get(
+        response = self.session.get(
             path_join(self.api_base_url, "libraries"), headers=self.api_headers
         )
         response.raise_for_status()
@@ -458,7 +548,7 @@ class ApiBinding:
 
     def create_library(self, object):
         self.metrics.icrement("/libraries")
-        response = requests.post(
+        response = self.session.post(
             path_join(self.api_base_url, "libraries"),
             headers=self.api_headers,
             json=object,
@@ -475,7 +565,7 @@ class ApiBinding:
             }
         else:
             params = {"codelist_name": codelist_name, "page_number": 1, "page_size": 0}
-        response = requests.get(
+        response = self.session.get(
             path_join(self.api_base_url, "ct/terms"),
             params=params,
             headers=self.api_headers,
@@ -486,7 +576,7 @@ class ApiBinding:
 
     # Get all terms from a codelist identified by codelist uid
     def get_terms_for_codelist_uid(self, codelist_uid: str):
-        response = requests.get(
+        response = self.session.get(
             path_join(self.api_base_url, "ct/terms"),
             params={"codelist_uid": codelist_uid, "page_number": 1, "page_size": 0},
             headers=self.api_headers,
@@ -497,7 +587,7 @@ class ApiBinding:
 
     def get_filtered_terms(self, filters: dict):
         filters = json.dumps(filters)
-        response = requests.get(
+        response = self.session.get(
             self.api_base_url + "/ct/terms/attributes",
             params={
                 "page_number": 1,
@@ -523,7 +613,7 @@ class ApiBinding:
                 "op": "eq",
             }
         filters = json.dumps(filters_dict)
-        response = requests.get(
+        response = self.session.get(
             self.api_base_url + "/ct/terms/attributes",
             params={
                 "library_name": "CDISC",
@@ -539,7 +629,7 @@ class ApiBinding:
 
     # Get all dictionary mapping all codelist names to a uid
     def get_code_lists_uids(self):
-        response = requests.get(
+        response = self.session.get(
             path_join(
                 self.api_base_url, "ct/codelists/names?page_number=1&page_size=0"
             ),
@@ -614,7 +704,7 @@ class ApiBinding:
             "page_number": 1,
             "page_size": 0,
         }
-        response = requests.get(
+        response = self.session.get(
             path_join(self.api_base_url, "studies", study_uid, "study-objectives"),
             headers=self.api_headers,
             params=params,
@@ -631,7 +721,7 @@ class ApiBinding:
             "page_number": 1,
             "page_size": 0,
         }
-        response = requests.get(
+        response = self.session.get(
             path_join(self.api_base_url, path), headers=self.api_headers, params=params
         )
         response.raise_for_status()
@@ -644,7 +734,7 @@ class ApiBinding:
 
     def find_object_by_key(self, name, path, key="name"):
         params = {"filters": '{"' + key + '":{"v":["' + name + '"],"op":"eq"}}'}
-        response = requests.get(
+        response = self.session.get(
             path_join(self.api_base_url, path),
             params=params,
             headers=self.api_headers,
@@ -656,7 +746,7 @@ class ApiBinding:
 
     # Find the uid for a dictionary from its name
     def find_dictionary_uid(self, name):
-        response = requests.get(
+        response = self.session.get(
             path_join(self.api_base_url, "dictionaries/codelists"),
             params={"library_name": name},
             headers=self.api_headers,
@@ -669,7 +759,7 @@ class ApiBinding:
 
     # Find a term via its name from a dictionary
     def find_dictionary_item_uid_from_name(self, dict_uid, name):
-        response = requests.get(
+        response = self.session.get(
             path_join(self.api_base_url, "dictionaries/terms"),
             params={
                 "codelist_uid": dict_uid,
@@ -689,7 +779,7 @@ class ApiBinding:
             "page_number": 1,
             "page_size": 0,
         }
-        response = requests.get(
+        response = self.session.get(
             path_join(self.api_base_url, path), headers=self.api_headers, params=params
         )
         response.raise_for_status()
@@ -703,7 +793,7 @@ class ApiBinding:
 
     def simple_approve(self, path: str):
         path = path_join(self.api_base_url, path)
-        res = requests.post(path, headers=self.api_headers)
+        res = self.session.post(path, headers=self.api_headers)
         if not res.ok:
             self.log.warning("Failed to approve %s", path)
             return False
@@ -712,7 +802,9 @@ class ApiBinding:
 
     def simple_approve2(self, url: str, path: str, label=""):
         url = path_join(url, path)
-        res = requests.post(path_join(self.api_base_url, url), headers=self.api_headers)
+        res = self.session.post(
+            path_join(self.api_base_url, url), headers=self.api_headers
+        )
         if not res.ok:
             self.log.warning("Failed to approve %s", url)
             self.metrics.icrement(f"{url}--{label}ApproveError")
@@ -723,7 +815,7 @@ class ApiBinding:
 
     def simple_patch(self, body, url, path):
         full_url = path_join(self.api_base_url, url)
-        response = requests.patch(full_url, headers=self.api_headers, json=body)
+        response = self.session.patch(full_url, headers=self.api_headers, json=body)
         if response.ok:
             self.metrics.icrement(path + "--Patch")
             self.log.info("Patch %s %s", path, "success")
@@ -751,8 +843,12 @@ class ApiBinding:
     # ---------------------------------------------------------------
     #
     async def new_version_to_api_async(self, path: str, session: aiohttp.ClientSession):
-        async with session.post(
-            path_join(self.api_base_url, path), json={}, headers=self.api_headers
+        async with await self._request_async(
+            session,
+            "POST",
+            path_join(self.api_base_url, path),
+            json={},
+            headers=self.api_headers,
         ) as response:
             status = response.status
             try:
@@ -768,13 +864,19 @@ class ApiBinding:
     async def patch_to_api_async(
         self, path: str, body: dict, session: aiohttp.ClientSession
     ):
-        async with session.patch(
-            path_join(self.api_base_url, path), json=body, headers=self.api_headers
+        async with await self._request_async(
+            session,
+            "PATCH",
+            path_join(self.api_base_url, path),
+            json=body,
+            headers=self.api_headers,
         ) as response:
             status = response.status
 
             if status == 405:
-                async with session.put(
+                async with await self._request_async(
+                    session,
+                    "PUT",
                     path_join(self.api_base_url, path),
                     json=body,
                     headers=self.api_headers,
@@ -809,8 +911,12 @@ class ApiBinding:
         logfile_name: str | None = None,
     ):
         async with self.sem:
-            async with session.post(
-                path_join(self.api_base_url, url), json=body, headers=self.api_headers
+            async with await self._request_async(
+                session,
+                "POST",
+                path_join(self.api_base_url, url),
+                json=body,
+                headers=self.api_headers,
             ) as response:
                 status = response.status
                 try:
@@ -832,8 +938,12 @@ class ApiBinding:
                 return status, result
 
     async def approve_async(self, url: str, session: aiohttp.ClientSession):
-        async with session.post(
-            path_join(self.api_base_url, url), json={}, headers=self.api_headers
+        async with await self._request_async(
+            session,
+            "POST",
+            path_join(self.api_base_url, url),
+            json={},
+            headers=self.api_headers,
         ) as response:
             status = response.status
             if response.ok:
@@ -854,7 +964,9 @@ class ApiBinding:
         self, uid: str, url: str, session: aiohttp.ClientSession
     ):
         url = path_join(self.api_base_url, url, uid, "approvals")
-        async with session.post(
+        async with await self._request_async(
+            session,
+            "POST",
             url,
             json={},
             headers=self.api_headers,
@@ -905,7 +1017,7 @@ class ApiBinding:
         uid = response.get("uid")
         if approve is True and uid is not None:
             # Sleeping to avoid errors when running locally (with limited resources for the db).
-            time.sleep(SLEEP_BEFORE_APPROVE)
+            await asyncio.sleep(SLEEP_BEFORE_APPROVE)
             self.log.info(f"Approve object with uid '{uid}'")
             status, result = await self.approve_item_async(
                 uid=uid, url=data["approve_path"], session=session
@@ -939,7 +1051,7 @@ class ApiBinding:
         uid = response.get("uid")
         if approve and uid is not None:
             # Sleeping to avoid errors when running locally (with limited resources for the db).
-            time.sleep(SLEEP_BEFORE_APPROVE)
+            await asyncio.sleep(SLEEP_BEFORE_APPROVE)
             status, reponse = await self.approve_item_async(
                 uid=response.get("uid"), url=data["approve_path"], session=session
             )
@@ -953,7 +1065,7 @@ class ApiBinding:
         filters = json.dumps(
             {"submission_value": {"v": [codelist_submval], "op": "eq"}}
         )
-        result = self.get_all_from_api(
+        result = self.get_cached_from_api(
             "/ct/codelists/attributes", params={"filters": filters}
         )
         if result is not None and len(result) > 0:
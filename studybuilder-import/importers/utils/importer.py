@@ -432,7 +432,7 @@ class BaseImporter:
         params = {"filters": json.dumps(filt)}
         if subset:
             params["subset"] = subset
-        items = self.api.get_all_from_api(path, params={"filters": json.dumps(filt)})
+        items = self.api.get_cached_from_api(path, params={"filters": json.dumps(filt)})
         if items is not None and len(items) > 0:
             uid = items[0].get("uid", None)
             self.log.info(
@@ -465,7 +465,7 @@ class BaseImporter:
                 "filters": json.dumps(filt),
             }
         data = self.api.get_all_identifiers(
-            self.api.get_all_from_api("/ct/terms/names", params=params),
+            self.api.get_cached_from_api("/ct/terms/names", params=params),
             identifier=key,
             value=uid_key,
         )
@@ -535,8 +535,8 @@ class BaseImporter:
     @lru_cache(maxsize=10000)
     def get_codelist_uid_from_submval(self, submval):
         params = {"filters": json.dumps({"submission_value": {"v": [submval], "op": "eq"}}), "page_number": 1, "page_size": 0}
-        cl_attrs = self.api.get_all_from_api("/ct/codelists/attributes", params=params)
-        if len(cl_attrs) == 0:
+        cl_attrs = self.api.get_cached_from_api("/ct/codelists/attributes", params=params)
+        if not cl_attrs:
             self.log.warning(f"Unable to find codelist for submission value '{submval}'")
             return
         cl_uid = cl_attrs[0]["codelist_uid"]
@@ -591,7 +591,7 @@ class BaseImporter:
     @lru_cache(maxsize=10000)
     def lookup_dictionary_uid(self, name):
         self.log.info(f"Looking up dictionary with name '{name}'")
-        items = self.api.get_all_from_api(
+        items = self.api.get_cached_from_api(
             f"/dictionaries/codelists", params={"library_name": name}
         )
         if items is not None and len(items) > 0:
@@ -604,7 +604,7 @@ class BaseImporter:
     def lookup_ct_codelist_uid(self, name):
         self.log.info(f"Looking up ct codelist with name '{name}'")
         filt = {"name": {"v": [name], "op": "eq"}}
-        items = self.api.get_all_from_api(
+        items = self.api.get_cached_from_api(
             "/ct/codelists/names", params={"filters": json.dumps(filt)}
         )
         if items is not None and len(items) > 0:
@@ -632,7 +632,7 @@ class BaseImporter:
         )
         snomed_uid = self.lookup_dictionary_uid(dictionary_name)
         filt = {"name": {"v": [term_name], "op": "eq"}}
-        items = self.api.get_all_from_api(
+        items = self.api.get_cached_from_api(
             "/dictionaries/terms",
             params={"codelist_uid": snomed_uid, "filters": json.dumps(filt)},
         )
@@ -21,51 +21,54 @@ def main():
     dictmigrator = Dictionaries(metrics_inst=metr)
     dictmigrator.run()
 
+    # All importers share the connection pools and lookup cache of the same api binding
+    api = dictmigrator.api
+
     # General configuration
-    config = Configuration(metrics_inst=metr)
+    config = Configuration(api=api, metrics_inst=metr)
     config.run()
 
     # Import standard codelist terms, part 1
-    standardterms1 = StandardCodelistTerms1(metrics_inst=metr)
+    standardterms1 = StandardCodelistTerms1(api=api, metrics_inst=metr)
     standardterms1.run()
     #raise RuntimeError("stop here")
     # Import standard codelist terms, part 2
-    standardterms2 = StandardCodelistTerms2(metrics_inst=metr)
+    standardterms2 = StandardCodelistTerms2(api=api, metrics_inst=metr)
     standardterms2.run()
     #raise RuntimeError("stop here")
     # Import unit definitions
-    units = Units(metrics_inst=metr)
+    units = Units(api=api, metrics_inst=metr)
     units.run()
 
-    activities = Activities(metrics_inst=metr)
+    activities = Activities(api=api, metrics_inst=metr)
     activities.run()
 
     # Import sponsor models
-    sponsor_models = SponsorModels(metrics_inst=metr)
+    sponsor_models = SponsorModels(api=api, metrics_inst=metr)
     sponsor_models.run()
 
     # Finish up sponsor library
-    finishing = StandardCodelistFinish(metrics_inst=metr)
+    finishing = StandardCodelistFinish(api=api, metrics_inst=metr)
     finishing.run()
 
     # Import compounds
-    compounds = Compounds(metrics_inst=metr)
+    compounds = Compounds(api=api, metrics_inst=metr)
     compounds.run()
 
     # Import crfs
-    crfs = Crfs(metrics_inst=metr)
+    crfs = Crfs(api=api, metrics_inst=metr)
     crfs.run()
 
     # Import mock data
-    mockdata = Mockdata(metrics_inst=metr)
+    mockdata = Mockdata(api=api, metrics_inst=metr)
     mockdata.run()
 
     # Import mock data from json
-    mockdatajson = MockdataJson(metrics_inst=metr)
+    mockdatajson = MockdataJson(api=api, metrics_inst=metr)
     mockdatajson.run()
 
     # Import E2E specific data from json
-    mockdatae2e = MockdataJsonE2E(metrics_inst=metr)
+    mockdatae2e = MockdataJsonE2E(api=api, metrics_inst=metr)
     mockdatae2e.run()
 
     # Display metrics